@@ -0,0 +1,76 @@
+"""
+Conexões com o banco de dados
+
+configurar_conexoes() aplica a todos os bancos de DATABASES as opções de
+conexão definidas nas settings (ver o bloco "Conexões com o banco"):
+
+- DB_CONN_MAX_AGE: segundos em que cada worker reaproveita a mesma conexão
+  entre requisições (0 = uma conexão nova por requisição; None = sem limite);
+- DB_CONN_HEALTH_CHECKS: antes de reaproveitar uma conexão persistente o
+  Django verifica se ela continua válida e reconecta se o banco (ou um
+  balanceador/firewall) a tiver encerrado;
+- DB_PGBOUNCER: o banco é acessado através do PgBouncer em modo transaction.
+  Nesse modo um cursor do lado do servidor não sobrevive entre transações,
+  então eles são desativados e QuerySet.iterator() passa a buscar os
+  registros no cliente (os blocos de chunk_size continuam sendo usados para
+  montar os objetos);
+- DB_CONNECT_TIMEOUT: tempo máximo (segundos) para abrir uma conexão no
+  PostgreSQL.
+
+descrever_conexoes() resume a configuração efetiva de cada banco e é usado
+pela verificação de inicialização (core.checks) e pelo comando
+benchmark_conexoes.
+"""
+
+
+def configurar_conexoes(databases, conn_max_age=60, health_checks=True, pgbouncer=False, connect_timeout=10):
+    """
+    Aplica as opções de conexão persistente aos bancos de DATABASES.
+
+    Args:
+        databases: Dicionário DATABASES das settings (alterado no lugar)
+        conn_max_age: Valor de CONN_MAX_AGE
+        health_checks: Valor de CONN_HEALTH_CHECKS
+        pgbouncer: Se o banco é acessado através do PgBouncer (transaction pooling)
+        connect_timeout: Tempo máximo de conexão no PostgreSQL (0 = padrão do driver)
+
+    Returns:
+        O próprio dicionário databases
+    """
+    for banco in databases.values():
+        banco['CONN_MAX_AGE'] = conn_max_age
+        banco['CONN_HEALTH_CHECKS'] = health_checks
+        if pgbouncer:
+            banco['DISABLE_SERVER_SIDE_CURSORS'] = True
+        if 'postgresql' in banco.get('ENGINE', '') and connect_timeout:
+            banco.setdefault('OPTIONS', {}).setdefault('connect_timeout', connect_timeout)
+    return databases
+
+
+def ler_conn_max_age(valor):
+    """Converte o valor de DB_CONN_MAX_AGE ('none' = sem limite)"""
+    if valor is None or str(valor).strip().lower() in ('none', ''):
+        return None
+    return int(valor)
+
+
+def descrever_conexoes(databases):
+    """
+    Resume a configuração de conexão de cada banco.
+
+    Returns:
+        Lista de dicionários com alias, engine, host, conn_max_age,
+        health_checks, pgbouncer e connect_timeout
+    """
+    descricao = []
+    for alias, banco in databases.items():
+        descricao.append({
+            'alias': alias,
+            'engine': banco.get('ENGINE', '').rsplit('.', 1)[-1],
+            'host': banco.get('HOST') or 'local',
+            'conn_max_age': banco.get('CONN_MAX_AGE', 0),
+            'health_checks': banco.get('CONN_HEALTH_CHECKS', False),
+            'pgbouncer': banco.get('DISABLE_SERVER_SIDE_CURSORS', False),
+            'connect_timeout': banco.get('OPTIONS', {}).get('connect_timeout'),
+        })
+    return descricao
@@ -4,6 +4,7 @@ Django settings for abmepi project.
 
 from pathlib import Path
 import os
+from abmepi.conexoes import configurar_conexoes, ler_conn_max_age
 <<<<<<< HEAD
 from decouple import config
 =======
@@ -74,9 +75,11 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.SessaoDeslizanteMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'core.middleware.PrimeiroAcessoMiddleware',
+    'core.middleware.AuditoriaMiddleware',
 ]
 
 ROOT_URLCONF = 'abmepi.urls'
@@ -133,7 +136,34 @@ else:
     }
 >>>>>>> c00fe10f4bf493986d435556591fabb7aae9e070
 
+# Conexões com o banco (abmepi.conexoes): tempo de reaproveitamento da conexão
+# de cada worker (segundos; 0 = uma por requisição; 'none' = sem limite),
+# verificação da conexão antes de reaproveitá-la, acesso via PgBouncer em modo
+# transaction (desativa cursores do lado do servidor) e timeout de conexão
+DB_CONN_MAX_AGE = ler_conn_max_age(os.getenv('DB_CONN_MAX_AGE', '60'))
+DB_CONN_HEALTH_CHECKS = os.getenv('DB_CONN_HEALTH_CHECKS', 'True').lower() in ('true', '1', 'yes')
+DB_PGBOUNCER = os.getenv('DB_PGBOUNCER', 'False').lower() in ('true', '1', 'yes')
+DB_CONNECT_TIMEOUT = int(os.getenv('DB_CONNECT_TIMEOUT', '10'))
+configurar_conexoes(
+    DATABASES,
+    conn_max_age=DB_CONN_MAX_AGE,
+    health_checks=DB_CONN_HEALTH_CHECKS,
+    pgbouncer=DB_PGBOUNCER,
+    connect_timeout=DB_CONNECT_TIMEOUT,
+)
+
 # Password validation
+# O último hasher é usado apenas para senhas temporárias do provisionamento
+# em lote (core.services.provisionamento); o primeiro continua sendo o padrão
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+    'core.hashers.SenhaTemporariaPBKDF2PasswordHasher',
+]
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -172,6 +202,25 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
 
+# Pacotes de scripts (python manage.py agrupar_estaticos): cada pacote
+# concatena os arquivos listados em static/pacotes/<nome>.js. Com
+# ESTATICOS_AGRUPAR a tag {% pacote_estatico %} carrega o pacote (quando ele
+# existe) em vez dos arquivos individuais; a ordem da lista é a de execução
+ESTATICOS_PACOTES = {
+    'modais': [
+        'js/modal-loader.js',
+        'js/password_viewer.js',
+        'js/modal-fix.js',
+        'assejus/js/modais_assejus.js',
+        'js/modal-patterns.js',
+        'psicologia/js/modais.js',
+        'associados/js/modais.js',
+        'js/error-handling.js',
+        'js/busca-remota.js',
+    ],
+}
+ESTATICOS_AGRUPAR = os.getenv('ESTATICOS_AGRUPAR', 'False').lower() in ('true', '1', 'yes')
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -214,6 +263,111 @@ DATA_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
 # Session settings
 SESSION_COOKIE_AGE = 3600  # 1 hour
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
+# Engine das sessões: db (padrão), signed_cookies (sem acesso ao banco; a sessão
+# fica no cookie) ou cached_db (leitura pelo cache, gravação no banco). cached_db
+# exige cache compartilhado entre os workers (Redis/Memcached): com LocMemCache
+# cada worker teria sua própria cópia da sessão (ver core.checks, core.E001)
+SESSION_ENGINE = os.getenv('SESSION_ENGINE', 'django.contrib.sessions.backends.db')
+# Expiração deslizante (core.middleware.SessaoDeslizanteMiddleware): a sessão de
+# usuários autenticados só é regravada quando faltam menos de
+# SESSAO_RENOVAR_ANTES segundos para expirar
+SESSAO_RENOVAR_ANTES = 900
+
+# Cookie assinado que identifica visitantes anônimos nas curtidas do feed
+# (core.services.visitantes)
+VISITANTE_COOKIE = 'abmepi_visitante'
+VISITANTE_COOKIE_IDADE = 60 * 60 * 24 * 365
+
+# Cache da página institucional (segundos; 0 desativa)
+# Com LocMemCache cada worker tem sua própria cópia; o timeout limita o
+# tempo em que um worker pode exibir conteúdo desatualizado.
+INSTITUCIONAL_CACHE_TIMEOUT = 300
+
+# Buffer de visualizações das notícias ASSEJUR. Com cache compartilhado (ex.:
+# Redis/Memcached), sincronizar com: python manage.py sincronizar_visualizacoes_noticias.
+# Com LocMemCache cada processo grava as suas a cada INTERVALO_LOCAL segundos
+# (0 = direto no banco a cada visualização)
+ASSEJUR_VISUALIZACOES_BUFFER = True
+ASSEJUR_VISUALIZACOES_INTERVALO_LOCAL = 60
+ASSEJUR_VISUALIZACOES_DEDUP_SEGUNDOS = 1800  # 0 desativa a deduplicação por sessão
+
+# Retenção do log de atividades (python manage.py arquivar_logs_atividade)
+LOG_ATIVIDADE_RETENCAO_DIAS = 365
+LOG_ATIVIDADE_ARQUIVO_DIR = BASE_DIR / 'logs' / 'arquivo'
+
+# Conciliação bancária: distância máxima (dias) entre o crédito e o vencimento
+# da mensalidade para conciliação automática
+CONCILIACAO_JANELA_DIAS = 45
+
+# Tempo (segundos) de cache dos totais das listagens de mensalidades sem filtro;
+# o cache é invalidado sempre que uma mensalidade é alterada
+RECEBIVEIS_RESUMO_CACHE_TIMEOUT = 300
+
+# Tempo (segundos) de cache dos indicadores do dashboard administrativo
+DASHBOARD_KPIS_CACHE_TIMEOUT = 60
+
+# Aprovação de pré-cadastros em lote: itens por transação e threads de cópia de arquivos
+PRE_CADASTRO_APROVACAO_BLOCO = 50
+PRE_CADASTRO_COPIA_WORKERS = 4
+
+# Provisionamento de usuários em lote: algoritmo e iterações das senhas
+# temporárias e processos usados para calcular os hashes (0 = nº de CPUs)
+SENHA_TEMPORARIA_HASHER = 'pbkdf2_sha256_temporaria'
+SENHA_TEMPORARIA_ITERACOES = 20000
+PROVISIONAMENTO_PROCESSOS = 0
+
+# Importação de associados por planilha: linhas validadas e gravadas por bloco
+# e diretório das planilhas e relatórios de erros (fora de MEDIA_ROOT: têm
+# dados pessoais e só são baixados pelo admin)
+IMPORTACAO_ASSOCIADOS_BLOCO = 1000
+IMPORTACAO_ASSOCIADOS_DIR = BASE_DIR / 'privado' / 'importacoes_associados'
+
+# Geração de PDFs (core.services.pdf): processos do pool (0 = na própria
+# requisição), tempo máximo de espera síncrona e das tarefas em fila (segundos)
+# e fontes TrueType adicionais ({nome: caminho do .ttf})
+PDF_PROCESSOS = int(os.getenv('PDF_PROCESSOS', '2'))
+PDF_TIMEOUT = 60
+PDF_TIMEOUT_FILA = 600
+PDF_FONTES = {}
+
+# PDFs gerados em fila (core.models.TarefaPDF): diretório (fora de MEDIA_ROOT,
+# entregues só pelo download com verificação do solicitante) e validade em
+# segundos. Remoção dos vencidos: python manage.py limpar_tarefas_pdf
+PDF_TAREFAS_DIR = BASE_DIR / 'cache' / 'pdf_tarefas'
+PDF_TAREFAS_VALIDADE = 24 * 3600
+
+# Imagens derivadas (core.services.imagens): larguras geradas em WebP/JPEG para
+# srcset, qualidade, threads de geração (0 = na própria requisição) e campos
+# atendidos. Imagens existentes: python manage.py gerar_imagens_derivadas
+IMAGENS_DERIVADAS_TAMANHOS = {'miniatura': 320, 'media': 800, 'grande': 1600}
+IMAGENS_DERIVADAS_QUALIDADE = 80
+IMAGENS_DERIVADAS_WORKERS = 2
+IMAGENS_DERIVADAS_CAMPOS = [
+    'associados.Associado.foto',
+    'associados.Dependente.foto',
+    'hotel_transito.Hospede.foto',
+    'psicologia.Psicologo.foto',
+    'assejus.Advogado.foto',
+    'administrativo.Evento.imagem',
+    'core.InstitucionalConfig.hotel_transito_imagem',
+    'core.FeedPost.imagem',
+    'core.AssejurNews.imagem',
+    'core.ExPresidente.foto',
+    'core.HistoriaAssociacao.imagem',
+    'core.HistoriaImagem.imagem',
+]
+
+# Busca textual jurídica (assejus.services.busca): threads de extração do texto
+# dos documentos enviados (0 = na própria requisição) e tamanho máximo do texto
+# indexado por arquivo. Documentos existentes: python manage.py indexar_busca_juridica
+ASSEJUS_BUSCA_WORKERS = 1
+ASSEJUS_BUSCA_TEXTO_MAXIMO = 1_000_000
+
+# PDF de andamentos dos processos (assejus.services.relatorio_processo):
+# andamentos por parte gerada em paralelo no pool de PDF_PROCESSOS e diretório
+# dos relatórios já gerados (fora de MEDIA_ROOT: não deve ser servido publicamente)
+ASSEJUS_PDF_ANDAMENTOS_POR_PARTE = 150
+ASSEJUS_PDF_ANDAMENTOS_DIR = BASE_DIR / 'cache' / 'pdf_andamentos'
 
 # Messages
 MESSAGE_STORAGE = 'django.contrib.messages.storage.session.SessionStorage'
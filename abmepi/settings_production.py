@@ -37,10 +37,29 @@ DATABASES = {
         },
     }
 }
+configurar_conexoes(
+    DATABASES,
+    conn_max_age=DB_CONN_MAX_AGE,
+    health_checks=DB_CONN_HEALTH_CHECKS,
+    pgbouncer=DB_PGBOUNCER,
+    connect_timeout=DB_CONNECT_TIMEOUT,
+)
 
 # Configurações de arquivos estáticos para produção
 STATIC_ROOT = BASE_DIR / 'staticfiles'
-STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+# Nomes com hash do conteúdo (cache "immutable" no WhiteNoise/nginx) e versões
+# .gz/.br geradas no collectstatic (ver core.storage)
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'core.storage.ArmazenamentoEstatico',
+    },
+}
+# Arquivos sem hash no nome (ex.: referenciados sem {% static %})
+WHITENOISE_MAX_AGE = 3600
+ESTATICOS_AGRUPAR = os.environ.get('ESTATICOS_AGRUPAR', 'True').lower() in ('true', '1', 'yes')
 
 # Configurações de arquivos de mídia para produção
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -120,7 +139,9 @@ CACHES = {
 # Configurações de sessão para produção
 SESSION_COOKIE_AGE = 3600  # 1 hora
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
-SESSION_SAVE_EVERY_REQUEST = True
+# A expiração é renovada pelo core.middleware.SessaoDeslizanteMiddleware,
+# que só regrava a sessão perto de expirar (ver SESSAO_RENOVAR_ANTES)
+SESSION_SAVE_EVERY_REQUEST = False
 
 # Configurações de upload de arquivos
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
@@ -167,13 +188,16 @@ SHORT_DATETIME_FORMAT = 'd/m/Y H:i'
 # Configurações de middleware para produção
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.SessaoDeslizanteMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'core.middleware.PrimeiroAcessoMiddleware',
+    'core.middleware.AuditoriaMiddleware',
 ]
 
 # Configurações de aplicações instaladas
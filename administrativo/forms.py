@@ -2,6 +2,8 @@ from django import forms
 from .models import Evento, Comunicado, ParticipanteEvento, ListaPresenca, Presenca
 from django.utils import timezone
 
+from core.widgets import BuscaRemotaSelect, BuscaRemotaSelectMultiple
+
 
 class EventoForm(forms.ModelForm):
     class Meta:
@@ -78,7 +80,7 @@ class ComunicadoForm(forms.ModelForm):
             'prioridade': forms.Select(attrs={'class': 'form-control'}),
             'data_expiracao': forms.DateTimeInput(attrs={'class': 'form-control', 'type': 'datetime-local'}),
             'tipo_destinatarios': forms.Select(attrs={'class': 'form-control'}),
-            'associados_especificos': forms.SelectMultiple(attrs={'class': 'form-control', 'size': '8'}),
+            'associados_especificos': BuscaRemotaSelectMultiple(fonte='associados', attrs={'class': 'form-control', 'size': '8'}),
             'advogados_especificos': forms.SelectMultiple(attrs={'class': 'form-control', 'size': '8'}),
             'psicologos_especificos': forms.SelectMultiple(attrs={'class': 'form-control', 'size': '8'}),
             'destinatarios': forms.Textarea(attrs={'class': 'form-control', 'rows': 3, 'placeholder': 'Digite destinatários adicionais ou deixe em branco'}),
@@ -123,7 +125,7 @@ class ParticipanteEventoForm(forms.ModelForm):
         model = ParticipanteEvento
         fields = ['associado', 'status', 'observacoes']
         widgets = {
-            'associado': forms.Select(attrs={'class': 'form-control'}),
+            'associado': BuscaRemotaSelect(fonte='associados', attrs={'class': 'form-control'}),
             'status': forms.Select(attrs={'class': 'form-control'}),
             'observacoes': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
         }
@@ -165,7 +167,7 @@ class PresencaForm(forms.ModelForm):
         model = Presenca
         fields = ['associado', 'presente', 'horario_chegada', 'horario_saida', 'observacoes']
         widgets = {
-            'associado': forms.Select(attrs={'class': 'form-control'}),
+            'associado': BuscaRemotaSelect(fonte='associados', attrs={'class': 'form-control'}),
             'presente': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
             'horario_chegada': forms.TimeInput(attrs={'class': 'form-control', 'type': 'time'}),
             'horario_saida': forms.TimeInput(attrs={'class': 'form-control', 'type': 'time'}),
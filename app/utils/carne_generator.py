@@ -7,6 +7,8 @@ import io
 import os
 from datetime import datetime
 
+from core.services.pdf import imagem_logo
+
 def gerar_carne(nome_associado, endereco, mensalidades_lista, config_cobranca=None, pix=None, titular=None, banco=None):
     """
     Gera carnê em PDF com layout de duas partes:
@@ -131,24 +133,18 @@ def desenhar_boletim(c, x, y, largura, altura, numero_doc, vencimento, valor,
     # ===== PARTE ESQUERDA: COMPROVANTE =====
     # Logo ABMEPI no topo esquerdo (proporcional aos dados)
     try:
-        from reportlab.lib.utils import ImageReader
-        # Caminho absoluto para a logo
-        import os
-        # Navegar do diretório atual (app/utils/) para o diretório raiz do projeto
-        current_dir = os.path.dirname(os.path.abspath(__file__))  # app/utils/
-        app_dir = os.path.dirname(current_dir)                    # app/
-        project_dir = os.path.dirname(app_dir)                    # raiz do projeto
-        logo_path = os.path.join(project_dir, 'static', 'Logo_abmepi.png')
+        # Logo decodificada uma única vez por processo (core.services.pdf)
+        img = imagem_logo('Logo_abmepi.png')
         
-        if os.path.exists(logo_path):
-            img = ImageReader(logo_path)
+        if img is not None:
             # Calcular dimensões da logo (muito menor e proporcional)
             logo_width = largura_comprovante * 0.35  # 35% da largura do comprovante
-            logo_height = logo_width * (img._image.height / img._image.width)  # Manter proporção
+            largura_img, altura_img = img.getSize()
+            logo_height = logo_width * (altura_img / largura_img)  # Manter proporção
             # Centralizar a logo no topo
             logo_x = x + (largura_comprovante - logo_width) / 2
             logo_y = y + altura - logo_height - 2*mm  # 2mm do topo
-            c.drawImage(logo_path, logo_x, logo_y, logo_width, logo_height)
+            c.drawImage(img, logo_x, logo_y, logo_width, logo_height)
         else:
             # Fallback: texto ABMEPI se a imagem não existir
             c.setFont("Helvetica-Bold", 12)
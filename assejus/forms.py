@@ -6,6 +6,7 @@ from .models import (
     Andamento, ConsultaJuridica, RelatorioJuridico,
     ProcessoJuridico, ProcuracaoAdJudicia
 )
+from core.widgets import BuscaRemotaSelect
 
 User = get_user_model()
 
@@ -448,7 +449,7 @@ class AtendimentoJuridicoForm(forms.ModelForm):
             'advogado_responsavel', 'resultado', 'observacoes'
         ]
         widgets = {
-            'associado': forms.Select(attrs={'class': 'form-control'}),
+            'associado': BuscaRemotaSelect(fonte='associados', attrs={'class': 'form-control'}),
             'tipo_demanda': forms.Select(attrs={'class': 'form-control'}),
             'titulo': forms.TextInput(attrs={'class': 'form-control'}),
             'descricao': forms.Textarea(attrs={'class': 'form-control', 'rows': 4}),
@@ -819,7 +820,7 @@ class ConsultaJuridicaForm(forms.ModelForm):
             'status', 'prioridade', 'resposta', 'resolvida'
         ]
         widgets = {
-            'associado': forms.Select(attrs={'class': 'form-control'}),
+            'associado': BuscaRemotaSelect(fonte='associados', attrs={'class': 'form-control'}),
             'tipo': forms.Select(attrs={'class': 'form-control'}),
             'pergunta': forms.Textarea(attrs={'class': 'form-control', 'rows': 4}),
             'advogado_responsavel': forms.Select(attrs={'class': 'form-control'}),
@@ -942,7 +943,7 @@ class ProcuracaoAdJudiciaForm(forms.ModelForm):
             'telefone_contato', 'email_contato', 'texto_personalizado', 'observacoes'
         ]
         widgets = {
-            'outorgante': forms.Select(attrs={
+            'outorgante': BuscaRemotaSelect(fonte='associados', attrs={
                 'class': 'form-select',
                 'onchange': 'preencherDadosOutorgante()'
             }),
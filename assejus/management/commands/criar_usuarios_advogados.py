@@ -1,7 +1,8 @@
 from django.core.management.base import BaseCommand
-from django.contrib.auth.hashers import make_password
+from django.db import transaction
 from assejus.models import Advogado
 from core.models import Usuario
+from core.services.provisionamento import dividir_nome, provisionar_usuarios
 
 
 class Command(BaseCommand):
@@ -54,41 +55,64 @@ class Command(BaseCommand):
         erros = 0
         ja_existem = 0
         
-        for advogado in advogados:
-            try:
-                if advogado.user and not force:
-                    self.stdout.write(f'ℹ️  Advogado {advogado.nome} já possui usuário')
-                    ja_existem += 1
-                    continue
-                
-                if advogado.user and force:
-                    # Remover usuário existente se estiver no modo force
-                    self.stdout.write(f'🔄 Removendo usuário existente para {advogado.nome}...')
-                    if not dry_run:
-                        advogado.user.delete()
-                        advogado.user = None
-                        advogado.save(update_fields=['user'])
+        # Senha padrão fixa
+        senha_padrao = "12345678"
+        
+        pendentes = []
+        for advogado in advogados.select_related('user'):
+            if advogado.user and not force:
+                self.stdout.write(f'ℹ️  Advogado {advogado.nome} já possui usuário')
+                ja_existem += 1
+                continue
+            pendentes.append(advogado)
+        
+        if dry_run:
+            for advogado in pendentes:
+                criados += 1
+                self.stdout.write(
+                    self.style.WARNING(
+                        f'🔍 DRY-RUN: Usuário seria criado para {advogado.nome} - '
+                        f'Username: {advogado.cpf}, Senha: {senha_padrao}'
+                    )
+                )
+        elif pendentes:
+            with transaction.atomic():
+                if force:
+                    # Remover usuários existentes no modo force
+                    usuarios_ids = [advogado.user_id for advogado in pendentes if advogado.user_id]
+                    if usuarios_ids:
+                        self.stdout.write(f'🔄 Removendo {len(usuarios_ids)} usuário(s) existente(s)...')
+                        Advogado.objects.filter(user_id__in=usuarios_ids).update(user=None)
+                        Usuario.objects.filter(pk__in=usuarios_ids).delete()
                 
-                # Gerar senha padrão fixa
-                senha_padrao = "12345678"
+                # Criar todos os usuários de uma vez (core.services.provisionamento)
+                dados_usuarios = []
+                for advogado in pendentes:
+                    first_name, last_name = dividir_nome(advogado.nome)
+                    dados_usuarios.append({
+                        'username': advogado.cpf,
+                        'first_name': first_name,
+                        'last_name': last_name,
+                        'email': advogado.email,
+                        'tipo_usuario': 'advogado',
+                        'ativo': advogado.ativo,
+                    })
+                usuarios_criados, existentes = provisionar_usuarios(dados_usuarios, senha=senha_padrao)
+                usuarios = {usuario.username: usuario for usuario, _ in usuarios_criados}
                 
-                if not dry_run:
-                    # Criar usuário
-                    usuario = Usuario.objects.create(
-                        username=advogado.cpf,
-                        first_name=advogado.nome.split()[0] if advogado.nome else '',
-                        last_name=' '.join(advogado.nome.split()[1:]) if len(advogado.nome.split()) > 1 else '',
-                        email=advogado.email,
-                        password=make_password(senha_padrao),
-                        tipo_usuario='advogado',
-                        ativo=advogado.ativo,
-                        primeiro_acesso=True
-                    )
-                    
-                    # Associar usuário ao advogado
+                # Associar usuários aos advogados
+                vinculados = []
+                for advogado in pendentes:
+                    usuario = usuarios.pop(advogado.cpf, None)
+                    if usuario is None:
+                        erros += 1
+                        motivo = 'já existe um usuário com este CPF' if advogado.cpf in existentes else 'CPF repetido'
+                        self.stdout.write(
+                            self.style.ERROR(f'❌ Erro ao criar usuário para {advogado.nome}: {motivo}')
+                        )
+                        continue
                     advogado.user = usuario
-                    advogado.save(update_fields=['user'])
-                    
+                    vinculados.append(advogado)
                     criados += 1
                     self.stdout.write(
                         self.style.SUCCESS(
@@ -96,23 +120,7 @@ class Command(BaseCommand):
                             f'Username: {usuario.username}, Senha: {senha_padrao}'
                         )
                     )
-                else:
-                    # Modo dry-run
-                    criados += 1
-                    self.stdout.write(
-                        self.style.WARNING(
-                            f'🔍 DRY-RUN: Usuário seria criado para {advogado.nome} - '
-                            f'Username: {advogado.cpf}, Senha: {senha_padrao}'
-                        )
-                    )
-                    
-            except Exception as e:
-                erros += 1
-                self.stdout.write(
-                    self.style.ERROR(
-                        f'❌ Erro ao criar usuário para {advogado.nome}: {e}'
-                    )
-                )
+                Advogado.objects.bulk_update(vinculados, ['user'], batch_size=500)
         
         # Resumo final
         self.stdout.write('\n' + '='*50)
@@ -0,0 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from assejus.models import Andamento, DocumentoJuridico, IndiceBuscaJuridica, ProcessoJuridico
+from assejus.services import busca
+
+
+class Command(BaseCommand):
+    help = (
+        'Indexa processos, andamentos e documentos jurídicos para a busca textual, '
+        'extraindo o texto dos arquivos PDF/DOCX ainda não processados.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reextrair',
+            action='store_true',
+            help='Extrair novamente o texto de todos os arquivos',
+        )
+        parser.add_argument(
+            '--sem-arquivos',
+            action='store_true',
+            help='Indexar apenas os metadados, sem extrair o texto dos arquivos',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=getattr(settings, 'ASSEJUS_BUSCA_WORKERS', 1) or 1,
+            help='Threads usadas na extração de texto',
+        )
+
+    def handle(self, *args, **options):
+        processos = ProcessoJuridico.objects.select_related('parte_cliente')
+        andamentos = Andamento.objects.all()
+        documentos = DocumentoJuridico.objects.all()
+
+        for nome, queryset, indexar in (
+            ('processo(s)', processos, busca.indexar_processo),
+            ('andamento(s)', andamentos, busca.indexar_andamento),
+            ('documento(s)', documentos, lambda documento: busca.indexar_documento(documento, extrair=False)),
+        ):
+            quantidade = 0
+            for objeto in queryset.iterator(chunk_size=500):
+                indexar(objeto)
+                quantidade += 1
+            self.stdout.write(f'🔍 {quantidade} {nome} indexado(s)')
+
+        if options['sem_arquivos']:
+            self.stdout.write(self.style.SUCCESS('✅ Índice de busca atualizado (sem texto dos arquivos)!'))
+            return
+
+        pendentes = IndiceBuscaJuridica.objects.filter(tipo='documento')
+        if not options['reextrair']:
+            arquivos = dict(documentos.values_list('pk', 'arquivo'))
+            pendentes = [
+                objeto_id for objeto_id, indexado in pendentes.values_list('objeto_id', 'arquivo_indexado')
+                if arquivos.get(objeto_id, '') != indexado
+            ]
+        else:
+            pendentes = list(pendentes.values_list('objeto_id', flat=True))
+
+        self.stdout.write(f'🔍 Extraindo o texto de {len(pendentes)} arquivo(s)...')
+        with ThreadPoolExecutor(max_workers=max(1, options['workers'])) as pool:
+            extraidos = list(pool.map(busca.extrair_documento_em_thread, pendentes))
+        falhas = sum(1 for texto in extraidos if texto is None)
+        if falhas:
+            self.stdout.write(self.style.WARNING(f'⚠️  {falhas} arquivo(s) não puderam ser lidos (ver log)'))
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Índice de busca atualizado: {len(pendentes) - falhas} arquivo(s) extraído(s)!'))
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.2 on 2026-10-19 18:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assejus', '0025_modelopoderes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='procuracaoadjudicia',
+            name='numero',
+            field=models.PositiveIntegerField(blank=True, editable=False, help_text='Número sequencial da procuração no ano, gerado automaticamente', null=True, verbose_name='Número'),
+        ),
+    ]
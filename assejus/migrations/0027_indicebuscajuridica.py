@@ -0,0 +1,88 @@
+# Generated by Django 5.0.2 on 2026-10-19 18:55
+
+import django.db.models.deletion
+from django.db import OperationalError, migrations, models
+
+# Índice full-text: expressão GIN no PostgreSQL (deve ser idêntica a
+# assejus.services.busca.VETOR_POSTGRES) e tabela FTS5 externa mantida por
+# triggers no SQLite. Outros bancos usam a busca por icontains.
+VETOR_POSTGRES = (
+    "setweight(to_tsvector('portuguese', coalesce(titulo, '')), 'A') || "
+    "setweight(to_tsvector('portuguese', coalesce(conteudo, '')), 'B') || "
+    "setweight(to_tsvector('portuguese', coalesce(texto_arquivo, '')), 'C')"
+)
+
+SQLITE_FTS = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS assejus_indicebusca_fts USING fts5("
+    "titulo, conteudo, texto_arquivo, content='assejus_indicebuscajuridica', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS assejus_indicebusca_ai AFTER INSERT ON assejus_indicebuscajuridica BEGIN "
+    "INSERT INTO assejus_indicebusca_fts(rowid, titulo, conteudo, texto_arquivo) "
+    "VALUES (new.id, new.titulo, new.conteudo, new.texto_arquivo); END",
+    "CREATE TRIGGER IF NOT EXISTS assejus_indicebusca_ad AFTER DELETE ON assejus_indicebuscajuridica BEGIN "
+    "INSERT INTO assejus_indicebusca_fts(assejus_indicebusca_fts, rowid, titulo, conteudo, texto_arquivo) "
+    "VALUES ('delete', old.id, old.titulo, old.conteudo, old.texto_arquivo); END",
+    "CREATE TRIGGER IF NOT EXISTS assejus_indicebusca_au AFTER UPDATE ON assejus_indicebuscajuridica BEGIN "
+    "INSERT INTO assejus_indicebusca_fts(assejus_indicebusca_fts, rowid, titulo, conteudo, texto_arquivo) "
+    "VALUES ('delete', old.id, old.titulo, old.conteudo, old.texto_arquivo); "
+    "INSERT INTO assejus_indicebusca_fts(rowid, titulo, conteudo, texto_arquivo) "
+    "VALUES (new.id, new.titulo, new.conteudo, new.texto_arquivo); END",
+    "INSERT INTO assejus_indicebusca_fts(assejus_indicebusca_fts) VALUES ('rebuild')",
+]
+
+
+def criar_indice_fts(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS assejus_indicebusca_fts ON assejus_indicebuscajuridica "
+            f"USING GIN (({VETOR_POSTGRES}))"
+        )
+    elif vendor == 'sqlite':
+        try:
+            schema_editor.execute(SQLITE_FTS[0])
+        except OperationalError:
+            # SQLite compilado sem FTS5
+            return
+        for sql in SQLITE_FTS[1:]:
+            schema_editor.execute(sql)
+
+
+def remover_indice_fts(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS assejus_indicebusca_fts")
+    elif vendor == 'sqlite':
+        for gatilho in ('ai', 'ad', 'au'):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS assejus_indicebusca_{gatilho}")
+        schema_editor.execute("DROP TABLE IF EXISTS assejus_indicebusca_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assejus', '0026_procuracaoadjudicia_numero'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndiceBuscaJuridica',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('processo', 'Processo'), ('andamento', 'Andamento'), ('documento', 'Documento')], max_length=20, verbose_name='Tipo')),
+                ('objeto_id', models.PositiveBigIntegerField(verbose_name='ID do Objeto')),
+                ('titulo', models.CharField(max_length=255, verbose_name='Título')),
+                ('conteudo', models.TextField(blank=True, verbose_name='Conteúdo')),
+                ('texto_arquivo', models.TextField(blank=True, help_text='Texto extraído do PDF/DOCX do documento', verbose_name='Texto do Arquivo')),
+                ('arquivo_indexado', models.CharField(blank=True, help_text='Nome do arquivo cujo texto está em texto_arquivo', max_length=255, verbose_name='Arquivo Indexado')),
+                ('data_atualizacao', models.DateTimeField(auto_now=True)),
+                ('processo', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='indices_busca', to='assejus.processojuridico', verbose_name='Processo')),
+            ],
+            options={
+                'verbose_name': 'Índice de Busca Jurídica',
+                'verbose_name_plural': 'Índices de Busca Jurídica',
+                'unique_together': {('tipo', 'objeto_id')},
+            },
+        ),
+        migrations.RunPython(criar_indice_fts, remover_indice_fts),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.2 on 2026-10-19 19:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assejus', '0027_indicebuscajuridica'),
+        ('associados', '0015_importacaoassociados'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='atendimentojuridico',
+            name='ordem_status',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(status='concluido', then=models.Value(1)), default=models.Value(0)), output_field=models.PositiveSmallIntegerField(), verbose_name='Ordem por Status'),
+        ),
+        migrations.AddIndex(
+            model_name='atendimentojuridico',
+            index=models.Index(fields=['ordem_status', '-data_abertura', '-id'], name='assejus_ate_ordem_s_07c068_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='atendimentojuridico',
+            index=models.Index(fields=['advogado_responsavel', 'ordem_status', '-data_abertura', '-id'], name='assejus_ate_advogad_f4b0e8_idx'),
+        ),
+    ]
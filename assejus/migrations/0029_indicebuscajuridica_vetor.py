@@ -0,0 +1,61 @@
+# Generated by Django 5.0.2 on 2026-10-19 21:10
+
+import assejus.models
+from django.db import migrations
+
+# No PostgreSQL o vetor é gravado na coluna `vetor` por um trigger a cada
+# INSERT/UPDATE (a expressão deve ser idêntica à usada na carga inicial) e o
+# índice GIN passa a ser sobre a coluna, substituindo o índice de expressão
+# da migração 0027. Nos demais bancos a coluna fica nula.
+VETOR_POSTGRES = (
+    "setweight(to_tsvector('portuguese', coalesce({0}titulo, '')), 'A') || "
+    "setweight(to_tsvector('portuguese', coalesce({0}conteudo, '')), 'B') || "
+    "setweight(to_tsvector('portuguese', coalesce({0}texto_arquivo, '')), 'C')"
+)
+
+
+def criar_vetor(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        "CREATE OR REPLACE FUNCTION assejus_indicebusca_vetor() RETURNS trigger AS $$ "
+        f"BEGIN NEW.vetor := {VETOR_POSTGRES.format('NEW.')}; RETURN NEW; END "
+        "$$ LANGUAGE plpgsql"
+    )
+    schema_editor.execute(
+        "CREATE TRIGGER assejus_indicebusca_vetor BEFORE INSERT OR UPDATE "
+        "ON assejus_indicebuscajuridica FOR EACH ROW EXECUTE FUNCTION assejus_indicebusca_vetor()"
+    )
+    schema_editor.execute(f"UPDATE assejus_indicebuscajuridica SET vetor = {VETOR_POSTGRES.format('')}")
+    schema_editor.execute("DROP INDEX IF EXISTS assejus_indicebusca_fts")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS assejus_indicebusca_vetor ON assejus_indicebuscajuridica USING GIN (vetor)"
+    )
+
+
+def remover_vetor(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS assejus_indicebusca_vetor")
+    schema_editor.execute("DROP TRIGGER IF EXISTS assejus_indicebusca_vetor ON assejus_indicebuscajuridica")
+    schema_editor.execute("DROP FUNCTION IF EXISTS assejus_indicebusca_vetor()")
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS assejus_indicebusca_fts ON assejus_indicebuscajuridica "
+        f"USING GIN (({VETOR_POSTGRES.format('')}))"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assejus', '0028_atendimento_ordem_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='indicebuscajuridica',
+            name='vetor',
+            field=assejus.models.VetorBuscaField(editable=False, null=True, verbose_name='Vetor de Busca'),
+        ),
+        migrations.RunPython(criar_vetor, remover_vetor),
+    ]
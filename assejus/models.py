@@ -1,9 +1,12 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, Value, When
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 import re
 
+from core.services.sequencias import formatar_codigo, proximo_numero
+
 User = get_user_model()
 
 def validar_numero_processo_cnj(value):
@@ -173,7 +176,7 @@ class Advogado(models.Model):
     def criar_usuario_sistema(self):
         """Cria um usuário do sistema para o advogado"""
         from core.models import Usuario
-        from django.contrib.auth.hashers import make_password
+        from core.services.provisionamento import hash_senha_temporaria
         
         if not self.user:
             # Usar senha padrão fixa
@@ -185,7 +188,7 @@ class Advogado(models.Model):
                 first_name=self.nome.split()[0] if self.nome else '',
                 last_name=' '.join(self.nome.split()[1:]) if len(self.nome.split()) > 1 else '',
                 email=self.email,
-                password=make_password(senha_padrao),
+                password=hash_senha_temporaria(senha_padrao),
                 tipo_usuario='advogado',
                 ativo=self.ativo,
                 primeiro_acesso=True
@@ -273,10 +276,26 @@ class AtendimentoJuridico(models.Model):
     resultado = models.TextField(blank=True)
     observacoes = models.TextField(blank=True)
     
+    # Chave de ordenação da lista (ativos primeiro, concluídos por último),
+    # calculada pelo banco para ser indexável e nunca ficar desatualizada
+    ordem_status = models.GeneratedField(
+        expression=Case(
+            When(status='concluido', then=Value(1)),
+            default=Value(0),
+        ),
+        output_field=models.PositiveSmallIntegerField(),
+        db_persist=True,
+        verbose_name='Ordem por Status'
+    )
+    
     class Meta:
         verbose_name = 'Atendimento Juridico'
         verbose_name_plural = 'Atendimentos Juridicos'
         ordering = ['-data_abertura']
+        indexes = [
+            models.Index(fields=['ordem_status', '-data_abertura', '-id']),
+            models.Index(fields=['advogado_responsavel', 'ordem_status', '-data_abertura', '-id']),
+        ]
     
     def __str__(self):
         return f"{self.titulo} - {self.associado.nome}"
@@ -504,6 +523,13 @@ class ProcuracaoAdJudicia(models.Model):
         related_name='procuracaoes_criadas',
         verbose_name='Usuário que Criou'
     )
+    numero = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Número',
+        help_text='Número sequencial da procuração no ano, gerado automaticamente'
+    )
     observacoes = models.TextField(
         blank=True,
         null=True,
@@ -544,6 +570,25 @@ class ProcuracaoAdJudicia(models.Model):
     def __str__(self):
         return f"Procuração - {self.outorgante.nome} para {', '.join([adv.nome for adv in self.outorgados.all()])}"
     
+    def save(self, *args, **kwargs):
+        # Número e gravação na mesma transação (ver core.services.sequencias)
+        gerar = not self.numero
+        try:
+            with transaction.atomic():
+                if gerar:
+                    self.numero = proximo_numero('procuracao', (self.data_criacao or timezone.now()).year)
+                super().save(*args, **kwargs)
+        except Exception:
+            if gerar:
+                self.numero = None
+            raise
+    
+    def get_numero_formatado(self):
+        """Retorna o número formatado da procuração (ex: PROC-2025-00001)"""
+        if not self.numero:
+            return "N/A"
+        return formatar_codigo('PROC', self.numero, (self.data_criacao or timezone.now()).year)
+    
     @property
     def outorgados_nomes(self):
         """Retorna os nomes dos advogados outorgados"""
@@ -876,6 +921,65 @@ class DocumentoJuridico(models.Model):
         return "0 B"
 
 
+class VetorBuscaField(models.Field):
+    """
+    Coluna tsvector no PostgreSQL, como SearchVectorField de
+    django.contrib.postgres (que exige o driver psycopg mesmo em bancos
+    SQLite); nos demais bancos é uma coluna de texto que fica nula.
+    """
+    description = 'Vetor de busca textual'
+
+    def db_type(self, connection):
+        return 'tsvector' if connection.vendor == 'postgresql' else 'text'
+
+
+class IndiceBuscaJuridica(models.Model):
+    """
+    Texto pesquisável de processos, andamentos e documentos jurídicos,
+    mantido por assejus.services.busca (full-text no PostgreSQL, FTS5 no SQLite)
+    """
+    TIPO_CHOICES = [
+        ('processo', 'Processo'),
+        ('andamento', 'Andamento'),
+        ('documento', 'Documento'),
+    ]
+
+    tipo = models.CharField(max_length=20, choices=TIPO_CHOICES, verbose_name='Tipo')
+    objeto_id = models.PositiveBigIntegerField(verbose_name='ID do Objeto')
+    processo = models.ForeignKey(
+        ProcessoJuridico,
+        on_delete=models.CASCADE,
+        related_name='indices_busca',
+        verbose_name='Processo',
+        null=True,
+        blank=True
+    )
+    titulo = models.CharField(max_length=255, verbose_name='Título')
+    conteudo = models.TextField(blank=True, verbose_name='Conteúdo')
+    texto_arquivo = models.TextField(
+        blank=True,
+        verbose_name='Texto do Arquivo',
+        help_text='Texto extraído do PDF/DOCX do documento'
+    )
+    arquivo_indexado = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name='Arquivo Indexado',
+        help_text='Nome do arquivo cujo texto está em texto_arquivo'
+    )
+    data_atualizacao = models.DateTimeField(auto_now=True)
+    # Preenchido por um trigger do PostgreSQL a cada gravação (migração 0029)
+    vetor = VetorBuscaField(null=True, editable=False, verbose_name='Vetor de Busca')
+
+    class Meta:
+        verbose_name = 'Índice de Busca Jurídica'
+        verbose_name_plural = 'Índices de Busca Jurídica'
+        unique_together = ['tipo', 'objeto_id']
+
+    def __str__(self):
+        return f"{self.get_tipo_display()} {self.objeto_id} - {self.titulo}"
+
+
 class ConsultaJuridica(models.Model):
     associado = models.ForeignKey(
         'associados.Associado', on_delete=models.CASCADE,
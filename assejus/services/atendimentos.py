@@ -0,0 +1,112 @@
+"""
+Listagem de atendimentos jurídicos com paginação por cursor (keyset).
+
+A lista mostra os atendimentos ativos primeiro e os concluídos por último,
+sempre dos mais recentes para os mais antigos. A ordem usa a coluna gerada
+``ordem_status`` e o índice (ordem_status, -data_abertura, -id), de modo que
+qualquer página custa o mesmo que a primeira, sem OFFSET.
+"""
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Count, Q
+from django.utils import timezone
+
+ORDENACAO = ('ordem_status', '-data_abertura', '-pk')
+
+
+def codificar_cursor(atendimento):
+    """Gera o cursor 'ordem_AAAA-MM-DDTHH:MM:SS.ffffff_id' do último item da página"""
+    data_abertura = atendimento.data_abertura
+    if timezone.is_aware(data_abertura):
+        # Sempre em UTC e sem offset, para o cursor não carregar '+' na URL
+        data_abertura = data_abertura.astimezone(dt_timezone.utc).replace(tzinfo=None)
+    return f'{atendimento.ordem_status}_{data_abertura.isoformat()}_{atendimento.pk}'
+
+
+def decodificar_cursor(cursor):
+    """
+    Converte o cursor recebido do cliente.
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    ordem, data_texto, pk = cursor.split('_')
+    data_abertura = datetime.fromisoformat(data_texto)
+    if settings.USE_TZ:
+        data_abertura = data_abertura.replace(tzinfo=dt_timezone.utc)
+    return int(ordem), data_abertura, int(pk)
+
+
+def pagina_atendimentos(atendimentos, cursor=None, limite=20):
+    """
+    Retorna uma página de atendimentos a partir do cursor.
+
+    Args:
+        atendimentos: QuerySet já filtrado de AtendimentoJuridico
+        cursor: Cursor retornado pela página anterior (ou None)
+        limite: Quantidade de atendimentos por página
+
+    Returns:
+        Tupla (atendimentos, proximo_cursor); proximo_cursor é None na última página
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    if cursor:
+        ordem, data_abertura, pk = decodificar_cursor(cursor)
+        atendimentos = atendimentos.filter(
+            Q(ordem_status__gt=ordem)
+            | Q(ordem_status=ordem, data_abertura__lt=data_abertura)
+            | Q(ordem_status=ordem, data_abertura=data_abertura, pk__lt=pk)
+        )
+
+    pagina = list(atendimentos.order_by(*ORDENACAO)[:limite + 1])
+    proximo = None
+    if len(pagina) > limite:
+        pagina = pagina[:limite]
+        proximo = codificar_cursor(pagina[-1])
+    return pagina, proximo
+
+
+def inicio_concluidos(pagina, cursor=None):
+    """
+    Retorna o primeiro atendimento concluído da página quando a passagem de
+    ativos para concluídos acontece nela (para exibir o separador), ou None.
+    """
+    anterior = decodificar_cursor(cursor)[0] if cursor else None
+    for atendimento in pagina:
+        if atendimento.ordem_status and anterior == 0:
+            return atendimento
+        anterior = atendimento.ordem_status
+    return None
+
+
+def contar_atendimentos(atendimentos):
+    """Total, ativos e concluídos do conjunto filtrado em uma única consulta"""
+    contagem = atendimentos.order_by().aggregate(
+        total=Count('pk'),
+        concluidos=Count('pk', filter=Q(status='concluido')),
+    )
+    return {
+        'total': contagem['total'],
+        'ativos': contagem['total'] - contagem['concluidos'],
+        'concluidos': contagem['concluidos'],
+    }
+
+
+def serializar_atendimento(atendimento):
+    """Serializa um atendimento da lista para respostas JSON"""
+    return {
+        'id': atendimento.pk,
+        'titulo': atendimento.titulo,
+        'associado': atendimento.associado.nome,
+        'tipo_demanda': atendimento.get_tipo_demanda_display(),
+        'status': atendimento.status,
+        'status_display': atendimento.get_status_display(),
+        'prioridade': atendimento.prioridade,
+        'prioridade_display': atendimento.get_prioridade_display(),
+        'numero_processo': atendimento.numero_processo or '',
+        'data_abertura': timezone.localtime(atendimento.data_abertura).isoformat(),
+        'advogado': atendimento.advogado_responsavel.nome if atendimento.advogado_responsavel else None,
+    }
@@ -0,0 +1,445 @@
+"""
+Busca textual jurídica
+
+Processos (metadados), andamentos (descrição detalhada) e documentos (título,
+descrição e o texto extraído do PDF/DOCX enviado) são copiados para
+IndiceBuscaJuridica pelos sinais de assejus.signals. A pesquisa usa:
+
+- PostgreSQL: full-text em português (websearch_to_tsquery) sobre a coluna
+  tsvector `vetor`, mantida por trigger e com índice GIN (migração 0029),
+  com ts_rank e ts_headline;
+- SQLite: a tabela FTS5 assejus_indicebusca_fts (bm25 e snippet);
+- outros bancos (ou SQLite sem FTS5): icontains.
+
+A extração de texto dos arquivos é feita depois do commit em um pool de
+ASSEJUS_BUSCA_WORKERS threads (0 = na própria requisição); documentos já
+existentes são indexados pelo comando indexar_busca_juridica.
+"""
+import io
+import logging
+import os
+import re
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from xml.etree import ElementTree
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+
+logger = logging.getLogger(__name__)
+
+TABELA_FTS = 'assejus_indicebusca_fts'
+CONSULTA_POSTGRES = "websearch_to_tsquery('portuguese', %s)"
+
+# Marcadores do trecho destacado (substituídos por <mark> depois do escape)
+INICIO_DESTAQUE = '⟦'
+FIM_DESTAQUE = '⟧'
+
+MINIMO_CARACTERES = 3
+LIMITE_MAXIMO = 100
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+# Extração de texto
+
+def _texto_maximo():
+    return getattr(settings, 'ASSEJUS_BUSCA_TEXTO_MAXIMO', 1_000_000)
+
+
+def _extrair_pdf(arquivo):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        logger.warning('A extração de texto de PDFs requer o pacote pypdf.')
+        return ''
+
+    partes = []
+    tamanho = 0
+    for pagina in PdfReader(arquivo).pages:
+        texto = pagina.extract_text() or ''
+        partes.append(texto)
+        tamanho += len(texto)
+        if tamanho >= _texto_maximo():
+            break
+    return '\n'.join(partes)
+
+
+def _extrair_docx(arquivo):
+    palavra = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+    with zipfile.ZipFile(arquivo) as pacote:
+        raiz = ElementTree.fromstring(pacote.read('word/document.xml'))
+    paragrafos = []
+    for paragrafo in raiz.iter(f'{palavra}p'):
+        texto = ''.join(no.text or '' for no in paragrafo.iter(f'{palavra}t'))
+        if texto:
+            paragrafos.append(texto)
+    return '\n'.join(paragrafos)
+
+
+def _extrair_txt(arquivo):
+    conteudo = arquivo.read(_texto_maximo() * 4)
+    for codificacao in ('utf-8', 'latin-1'):
+        try:
+            return conteudo.decode(codificacao)
+        except UnicodeDecodeError:
+            continue
+    return ''
+
+
+EXTRATORES = {
+    '.pdf': _extrair_pdf,
+    '.docx': _extrair_docx,
+    '.txt': _extrair_txt,
+}
+
+
+def extrair_texto(arquivo):
+    """
+    Extrai o texto de um arquivo PDF, DOCX ou TXT.
+
+    Args:
+        arquivo: FieldFile (ou qualquer objeto com name e open())
+
+    Returns:
+        Texto extraído (vazio para formatos não suportados)
+    """
+    extensao = os.path.splitext(arquivo.name or '')[1].lower()
+    extrator = EXTRATORES.get(extensao)
+    if extrator is None:
+        return ''
+
+    with arquivo.open('rb') as origem:
+        dados = io.BytesIO(origem.read())
+    texto = extrator(dados)
+    # O NUL não é aceito em colunas de texto do PostgreSQL
+    return re.sub(r'\s+', ' ', texto.replace('\x00', ' ')).strip()[:_texto_maximo()]
+
+
+# Indexação
+
+def _modelo():
+    from assejus.models import IndiceBuscaJuridica
+    return IndiceBuscaJuridica
+
+
+def _gravar(tipo, objeto_id, processo_id, titulo, conteudo):
+    indice, _ = _modelo().objects.update_or_create(
+        tipo=tipo,
+        objeto_id=objeto_id,
+        defaults={
+            'processo_id': processo_id,
+            'titulo': (titulo or '')[:255],
+            'conteudo': conteudo,
+        },
+    )
+    return indice
+
+
+def _juntar(*partes):
+    return '\n'.join(str(parte) for parte in partes if parte)
+
+
+def indexar_processo(processo):
+    cliente = processo.parte_cliente.nome if processo.parte_cliente_id else ''
+    return _gravar(
+        'processo',
+        processo.pk,
+        processo.pk,
+        f'{processo.numero_processo} - {cliente}',
+        _juntar(
+            processo.get_tipo_processo_display(),
+            processo.get_tipo_acao_display() if processo.tipo_acao else '',
+            processo.get_tipo_processo_administrativo_display() if processo.tipo_processo_administrativo else '',
+            processo.vara_tribunal,
+            processo.unidade_militar_apuracao,
+            processo.parte_contraria,
+            processo.advogado_parte_contraria,
+            processo.observacoes_gerais,
+        ),
+    )
+
+
+def indexar_andamento(andamento):
+    return _gravar(
+        'andamento',
+        andamento.pk,
+        andamento.processo_id,
+        f'{andamento.get_tipo_andamento_display()} - {andamento.data_andamento:%d/%m/%Y}',
+        _juntar(andamento.descricao_detalhada, andamento.observacoes_cliente),
+    )
+
+
+def indexar_documento(documento, extrair=True):
+    """
+    Indexa os metadados do documento e, se o arquivo mudou desde a última
+    extração, agenda a extração do texto (após o commit).
+    """
+    indice = _gravar(
+        'documento',
+        documento.pk,
+        documento.processo_id,
+        documento.titulo,
+        _juntar(documento.get_tipo_documento_display(), documento.descricao),
+    )
+    nome = documento.arquivo.name if documento.arquivo else ''
+    if extrair and nome != indice.arquivo_indexado:
+        transaction.on_commit(lambda pk=documento.pk: agendar_extracao(pk))
+    return indice
+
+
+def extrair_documento(documento_id):
+    """Extrai o texto do arquivo do documento e grava no índice"""
+    from assejus.models import DocumentoJuridico
+
+    documento = DocumentoJuridico.objects.filter(pk=documento_id).first()
+    if documento is None:
+        return None
+
+    nome = documento.arquivo.name if documento.arquivo else ''
+    texto = extrair_texto(documento.arquivo) if nome else ''
+    _modelo().objects.filter(tipo='documento', objeto_id=documento_id).update(
+        texto_arquivo=texto,
+        arquivo_indexado=nome,
+    )
+    return texto
+
+
+def extrair_documento_com_log(documento_id):
+    """Como extrair_documento(), mas registra a falha no log em vez de propagá-la"""
+    try:
+        return extrair_documento(documento_id)
+    except Exception as e:
+        logger.warning(f'Não foi possível extrair o texto do documento {documento_id}: {e}')
+        return None
+
+
+def _obter_pool():
+    global _pool
+    workers = getattr(settings, 'ASSEJUS_BUSCA_WORKERS', 1)
+    if not workers:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='busca-juridica')
+        return _pool
+
+
+def extrair_documento_em_thread(documento_id):
+    close_old_connections()
+    try:
+        return extrair_documento_com_log(documento_id)
+    finally:
+        connection.close()
+
+
+def agendar_extracao(documento_id):
+    """Extrai o texto no pool de threads (ou imediatamente, sem pool)"""
+    pool = _obter_pool()
+    if pool is None:
+        return extrair_documento_com_log(documento_id)
+    return pool.submit(extrair_documento_em_thread, documento_id)
+
+
+def remover_do_indice(tipo, objeto_id):
+    _modelo().objects.filter(tipo=tipo, objeto_id=objeto_id).delete()
+
+
+# Pesquisa
+
+def backend():
+    """'postgresql', 'sqlite' (FTS5) ou 'simples' (icontains)"""
+    if connection.vendor == 'postgresql':
+        return 'postgresql'
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [TABELA_FTS])
+            if cursor.fetchone():
+                return 'sqlite'
+    return 'simples'
+
+
+def _consulta_fts5(termo):
+    """Converte o termo em uma consulta FTS5 segura (frases entre aspas, termos em AND)"""
+    partes = []
+    for frase in re.findall(r'"([^"]+)"', termo):
+        palavras = re.findall(r'\w+', frase)
+        if palavras:
+            partes.append('"' + ' '.join(palavras) + '"')
+    for palavra in re.findall(r'\w+', re.sub(r'"[^"]*"', ' ', termo)):
+        partes.append(f'"{palavra}"')
+    return ' '.join(partes)
+
+
+def _destacar(trecho):
+    trecho = escape(trecho or '')
+    return trecho.replace(INICIO_DESTAQUE, '<mark>').replace(FIM_DESTAQUE, '</mark>')
+
+
+def _trecho_simples(texto, termo, largura=120):
+    texto = texto or ''
+    posicao = texto.lower().find(termo.lower())
+    if posicao < 0:
+        return escape(texto[:largura * 2])
+    inicio = max(0, posicao - largura)
+    fim = posicao + len(termo) + largura
+    trecho = (
+        texto[inicio:posicao] + INICIO_DESTAQUE + texto[posicao:posicao + len(termo)]
+        + FIM_DESTAQUE + texto[posicao + len(termo):fim]
+    )
+    return ('…' if inicio else '') + _destacar(trecho) + ('…' if fim < len(texto) else '')
+
+
+def _base(tipos, processos):
+    indices = _modelo().objects.all()
+    if tipos:
+        indices = indices.filter(tipo__in=tipos)
+    if processos is not None:
+        indices = indices.filter(processo__in=processos)
+    return indices
+
+
+def _filtrar_postgres(termo, indices):
+    return indices.filter(RawSQL(f'vetor @@ {CONSULTA_POSTGRES}', [termo], output_field=BooleanField()))
+
+
+def _filtrar_sqlite(termo, indices):
+    consulta = _consulta_fts5(termo)
+    if not consulta:
+        return indices.none()
+    return indices.filter(pk__in=RawSQL(
+        f'SELECT rowid FROM {TABELA_FTS} WHERE {TABELA_FTS} MATCH %s', [consulta]
+    ))
+
+
+def _filtrar_simples(termo, indices):
+    return indices.filter(
+        Q(titulo__icontains=termo) | Q(conteudo__icontains=termo) | Q(texto_arquivo__icontains=termo)
+    )
+
+
+def _buscar_postgres(termo, indices, limite):
+    opcoes = (
+        f'StartSel="{INICIO_DESTAQUE}", StopSel="{FIM_DESTAQUE}", '
+        'MaxFragments=2, MaxWords=30, MinWords=10, FragmentDelimiter=" … "'
+    )
+    indices = _filtrar_postgres(termo, indices).annotate(
+        relevancia=RawSQL(f'ts_rank(vetor, {CONSULTA_POSTGRES})', [termo], output_field=FloatField()),
+        trecho=RawSQL(
+            f"ts_headline('portuguese', coalesce(conteudo, '') || ' ' || coalesce(texto_arquivo, ''), "
+            f"{CONSULTA_POSTGRES}, %s)",
+            [termo, opcoes],
+        ),
+    ).order_by('-relevancia', '-data_atualizacao')[:limite]
+    return [(indice, indice.relevancia, _destacar(indice.trecho)) for indice in indices]
+
+
+def _buscar_sqlite(termo, indices, limite):
+    consulta = _consulta_fts5(termo)
+    if not consulta:
+        return []
+
+    filtro_sql, filtro_parametros = indices.values('pk').query.sql_with_params()
+    sql = (
+        f"SELECT rowid, bm25({TABELA_FTS}, 10.0, 4.0, 1.0), "
+        f"snippet({TABELA_FTS}, -1, %s, %s, '…', 24) "
+        f"FROM {TABELA_FTS} WHERE {TABELA_FTS} MATCH %s AND rowid IN ({filtro_sql}) "
+        f"ORDER BY 2 LIMIT %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [INICIO_DESTAQUE, FIM_DESTAQUE, consulta, *filtro_parametros, limite])
+        linhas = cursor.fetchall()
+
+    por_id = _modelo().objects.in_bulk([linha[0] for linha in linhas])
+    return [
+        (por_id[pk], -posicao, _destacar(trecho))
+        for pk, posicao, trecho in linhas if pk in por_id
+    ]
+
+
+def _buscar_simples(termo, indices, limite):
+    indices = _filtrar_simples(termo, indices).order_by('-data_atualizacao')[:limite]
+    return [
+        (indice, 0.0, _trecho_simples(_juntar(indice.conteudo, indice.texto_arquivo), termo))
+        for indice in indices
+    ]
+
+
+def buscar(termo, tipos=None, processos=None, limite=20):
+    """
+    Pesquisa no índice jurídico.
+
+    Args:
+        termo: Texto pesquisado; frases entre aspas são buscadas literalmente
+        tipos: Restringe aos tipos informados ('processo', 'andamento', 'documento')
+        processos: Queryset de ProcessoJuridico permitidos (None = todos)
+        limite: Quantidade máxima de resultados
+
+    Returns:
+        Lista de dicionários ordenada por relevância, com tipo, objeto_id,
+        processo_id, numero_processo, titulo, trecho (HTML com <mark>) e relevancia
+    """
+    termo = (termo or '').strip()
+    if len(termo) < MINIMO_CARACTERES:
+        return []
+
+    limite = max(1, min(limite, LIMITE_MAXIMO))
+    indices = _base(tipos, processos)
+    buscas = {
+        'postgresql': _buscar_postgres,
+        'sqlite': _buscar_sqlite,
+        'simples': _buscar_simples,
+    }
+    encontrados = buscas[backend()](termo, indices, limite)
+
+    numeros = dict(
+        _modelo().objects.filter(pk__in=[indice.pk for indice, _, _ in encontrados], processo__isnull=False)
+        .values_list('pk', 'processo__numero_processo')
+    )
+    return [
+        {
+            'tipo': indice.tipo,
+            'objeto_id': indice.objeto_id,
+            'processo_id': indice.processo_id,
+            'numero_processo': numeros.get(indice.pk, ''),
+            'titulo': indice.titulo,
+            'trecho': trecho,
+            'relevancia': round(float(relevancia), 4),
+        }
+        for indice, relevancia, trecho in encontrados
+    ]
+
+
+def correspondentes(termo, tipos=None, processos=None):
+    """
+    Registros do índice que correspondem ao termo, sem ordenação por
+    relevância nem limite de quantidade (para filtrar listagens).
+
+    Returns:
+        QuerySet de IndiceBuscaJuridica (vazio para termos curtos)
+    """
+    termo = (termo or '').strip()
+    indices = _base(tipos, processos)
+    if len(termo) < MINIMO_CARACTERES:
+        return indices.none()
+    filtros = {
+        'postgresql': _filtrar_postgres,
+        'sqlite': _filtrar_sqlite,
+        'simples': _filtrar_simples,
+    }
+    return filtros[backend()](termo, indices)
+
+
+def ids_correspondentes(termo, tipo, processos=None):
+    """Subconsulta com os IDs dos objetos do tipo informado que correspondem ao termo"""
+    return correspondentes(termo, tipos=[tipo], processos=processos).values('objeto_id')
+
+
+def processos_correspondentes(termo, processos=None):
+    """Subconsulta com os IDs dos processos com algum registro (processo, andamento ou documento) correspondente"""
+    return correspondentes(termo, processos=processos).filter(processo__isnull=False).values('processo_id')
@@ -0,0 +1,146 @@
+"""
+Linha do tempo de um processo jurídico: andamentos e documentos intercalados
+do mais recente para o mais antigo, paginados por cursor.
+
+Cada página custa três consultas fixas (andamentos, anexos dos andamentos e
+documentos), independentemente da quantidade de itens exibidos.
+"""
+from datetime import datetime, timezone as dt_timezone
+from heapq import merge
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from ..models import Andamento, DocumentoJuridico
+
+# Desempate entre itens com a mesma data: andamentos antes de documentos
+ORDEM_TIPO = {'andamento': 1, 'documento': 0}
+
+
+def codificar_cursor(item):
+    """Gera o cursor 'AAAA-MM-DDTHH:MM:SS.ffffff_tipo_id' do último item da página"""
+    data = item['_data']
+    if timezone.is_aware(data):
+        # Sempre em UTC e sem offset, para o cursor não carregar '+' na URL
+        data = data.astimezone(dt_timezone.utc).replace(tzinfo=None)
+    return f"{data.isoformat()}_{item['tipo']}_{item['id']}"
+
+
+def decodificar_cursor(cursor):
+    """
+    Converte o cursor recebido do cliente.
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    data_texto, tipo, pk = cursor.split('_')
+    if tipo not in ORDEM_TIPO:
+        raise ValueError(f'Tipo inválido no cursor: {tipo}')
+    data = datetime.fromisoformat(data_texto)
+    if settings.USE_TZ:
+        data = data.replace(tzinfo=dt_timezone.utc)
+    return data, tipo, int(pk)
+
+
+def _antes_do_cursor(campo_data, tipo, cursor):
+    """Filtro dos itens de um tipo que vêm depois do cursor na ordem da linha do tempo"""
+    data, tipo_cursor, pk = cursor
+    filtro = Q(**{f'{campo_data}__lt': data})
+    if ORDEM_TIPO[tipo] < ORDEM_TIPO[tipo_cursor]:
+        filtro |= Q(**{campo_data: data})
+    elif tipo == tipo_cursor:
+        filtro |= Q(**{campo_data: data, 'pk__lt': pk})
+    return filtro
+
+
+def serializar_andamento(andamento):
+    return {
+        'tipo': 'andamento',
+        'id': andamento.pk,
+        'data': timezone.localtime(andamento.data_andamento).isoformat(),
+        'tipo_andamento': andamento.tipo_andamento,
+        'tipo_andamento_display': andamento.get_tipo_andamento_display(),
+        'descricao': andamento.descricao_detalhada,
+        'observacoes_cliente': andamento.observacoes_cliente or '',
+        'visualizado': andamento.cliente_visualizou,
+        'anexos': [
+            {'id': anexo.pk, 'titulo': anexo.titulo, 'url': anexo.arquivo.url if anexo.arquivo else None}
+            for anexo in andamento.anexos.all()
+        ],
+        '_data': andamento.data_andamento,
+    }
+
+
+def serializar_documento(documento):
+    return {
+        'tipo': 'documento',
+        'id': documento.pk,
+        'data': timezone.localtime(documento.data_upload).isoformat(),
+        'titulo': documento.titulo,
+        'tipo_documento': documento.tipo_documento,
+        'tipo_documento_display': documento.get_tipo_documento_display(),
+        'descricao': documento.descricao or '',
+        'url': documento.arquivo.url if documento.arquivo else None,
+        '_data': documento.data_upload,
+    }
+
+
+def linha_do_tempo(processo, cursor=None, limite=20):
+    """
+    Retorna uma página da linha do tempo do processo.
+
+    Args:
+        processo: ProcessoJuridico
+        cursor: Cursor retornado pela página anterior (ou None)
+        limite: Quantidade de itens por página
+
+    Returns:
+        Tupla (itens, proximo_cursor); proximo_cursor é None na última página
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    andamentos = Andamento.objects.filter(processo=processo).prefetch_related('anexos')
+    documentos = DocumentoJuridico.objects.filter(processo=processo)
+    if cursor:
+        posicao = decodificar_cursor(cursor)
+        andamentos = andamentos.filter(_antes_do_cursor('data_andamento', 'andamento', posicao))
+        documentos = documentos.filter(_antes_do_cursor('data_upload', 'documento', posicao))
+
+    # Cada fonte traz no máximo limite + 1 itens; a intercalação decide quais entram
+    andamentos = [
+        serializar_andamento(andamento)
+        for andamento in andamentos.order_by('-data_andamento', '-pk')[:limite + 1]
+    ]
+    documentos = [
+        serializar_documento(documento)
+        for documento in documentos.order_by('-data_upload', '-pk')[:limite + 1]
+    ]
+    itens = list(merge(
+        andamentos, documentos,
+        key=lambda item: (item['_data'], ORDEM_TIPO[item['tipo']], item['id']),
+        reverse=True,
+    ))[:limite + 1]
+
+    proximo = None
+    if len(itens) > limite:
+        itens = itens[:limite]
+        proximo = codificar_cursor(itens[-1])
+    for item in itens:
+        del item['_data']
+    return itens, proximo
+
+
+def marcar_visualizados(processo):
+    """
+    Marca como visualizados pelo cliente todos os andamentos ainda não vistos
+    do processo, em um único UPDATE.
+
+    Returns:
+        Quantidade de andamentos marcados
+    """
+    return Andamento.objects.filter(processo=processo, cliente_visualizou=False).update(
+        cliente_visualizou=True,
+        data_visualizacao_cliente=timezone.now(),
+    )
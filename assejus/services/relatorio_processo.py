@@ -0,0 +1,303 @@
+"""
+PDF com o histórico de andamentos de um processo jurídico.
+
+Processos antigos acumulam centenas de andamentos, então o relatório é
+dividido em partes de ASSEJUS_PDF_ANDAMENTOS_POR_PARTE andamentos, geradas em
+paralelo no pool de core.services.pdf e unidas em um único arquivo. O
+resultado fica salvo em ASSEJUS_PDF_ANDAMENTOS_DIR (fora de MEDIA_ROOT, pois
+o relatório só pode ser baixado pela view com verificação de permissão),
+identificado pela última atualização do processo, dos andamentos e dos dados
+do cabeçalho; downloads repetidos de um processo sem alterações reaproveitam
+o arquivo.
+
+Gerações simultâneas do mesmo processo gravam em arquivos temporários e os
+movem para o nome final com os.replace, de modo que nenhuma requisição lê um
+arquivo incompleto ou removido por outra.
+"""
+import hashlib
+import io
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import Count, Max, Min
+from django.utils import timezone
+
+from core.services import pdf
+
+logger = logging.getLogger(__name__)
+
+# Altere ao mudar o layout, para não servir arquivos gerados com o anterior
+VERSAO_LAYOUT = 1
+
+RODAPE_INSTITUCIONAL = [
+    'Reconhecimento de Utilidade Pública Estadual Lei nº 5.614 28/11/06',
+    'Reconhecimento de Utilidade Pública Municipal Lei nº 3.634 14/05/07',
+    'Fone: 86 3085-1722 | E-mail: abmepi@gmail.com',
+    'Endereço: Rua Coelho Rodrigues, 2242, Centro Sul, CEP: 64.000-080, Teresina – PI',
+]
+
+
+def _resumo(processo):
+    return processo.andamentos.aggregate(
+        total=Count('pk'),
+        ultima_atualizacao=Max('data_atualizacao'),
+        primeiro=Min('data_andamento'),
+        ultimo=Max('data_andamento'),
+    )
+
+
+def diretorio(processo_id):
+    """Diretório com os PDFs gerados para o processo"""
+    raiz = getattr(settings, 'ASSEJUS_PDF_ANDAMENTOS_DIR', settings.BASE_DIR / 'cache' / 'pdf_andamentos')
+    return Path(raiz) / str(processo_id)
+
+
+def chave_cache(processo, resumo=None):
+    """
+    Identifica o conteúdo do relatório: muda quando o processo, algum de seus
+    andamentos ou os dados exibidos no cabeçalho (parte cliente e advogado
+    responsável) são alterados.
+    """
+    resumo = resumo or _resumo(processo)
+    cliente = processo.parte_cliente
+    advogado = processo.advogado_responsavel
+    base = '|'.join(str(parte) for parte in (
+        VERSAO_LAYOUT,
+        processo.pk,
+        processo.data_atualizacao.isoformat(),
+        resumo['ultima_atualizacao'].isoformat() if resumo['ultima_atualizacao'] else '',
+        resumo['total'],
+        cliente.pk,
+        cliente.data_atualizacao.isoformat() if cliente.data_atualizacao else '',
+        advogado.pk if advogado else '',
+        advogado.get_full_name() if advogado else '',
+    ))
+    return hashlib.sha1(base.encode()).hexdigest()[:20]
+
+
+def _rodape(canvas, doc):
+    from reportlab.lib import colors
+
+    canvas.saveState()
+
+    # Linha separadora por toda a página
+    canvas.setStrokeColor(colors.grey)
+    canvas.setLineWidth(0.5)
+    canvas.line(0, 70, 612, 70)
+
+    # Logo da ABMEPI e dados de geração à esquerda
+    logo = pdf.imagem_logo('Logo_abmepi.png')
+    if logo is not None:
+        canvas.drawImage(logo, 20, 20, width=40, height=40, preserveAspectRatio=True)
+        canvas.setFont('Helvetica', 6)
+        canvas.setFillColor(colors.lightgrey)
+        canvas.drawString(20, 10, f"Documento gerado em {timezone.localtime().strftime('%d/%m/%Y às %H:%M')}")
+        canvas.drawString(20, 4, 'ASEJUR - ABMEPI')
+
+    # Informações institucionais alinhadas à direita
+    canvas.setFont('Helvetica', 7)
+    canvas.setFillColor(colors.black)
+    y_position = 50
+    for linha in RODAPE_INSTITUCIONAL:
+        canvas.drawRightString(580, y_position, linha)
+        y_position -= 10
+
+    canvas.restoreState()
+
+
+def _cabecalho(processo, resumo, cor_cinza_escuro):
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_LEFT
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Image, Paragraph, Spacer, Table, TableStyle
+
+    story = []
+    logo_path = pdf.caminho_logo('logo2assejur.png')
+    if logo_path:
+        # 8,61 cm x 2,41 cm
+        logo = Image(logo_path, width=8.61 / 2.54 * inch, height=2.41 / 2.54 * inch)
+        logo.hAlign = 'CENTER'
+        story.append(logo)
+        story.append(Spacer(1, 20))
+    else:
+        story.append(Spacer(1, 30))
+
+    story.append(Paragraph('Dados do Processo', pdf.estilo(
+        'ProcessTitle', fontSize=10, textColor=colors.grey, spaceAfter=15,
+        spaceBefore=0, alignment=TA_LEFT, fontName='Helvetica'
+    )))
+
+    processo_data = [
+        ['Número do Processo:', processo.numero_processo],
+        ['Vara/Tribunal:', processo.vara_tribunal],
+        ['Tipo de Ação:', processo.get_tipo_acao_display()],
+        ['Situação Atual:', processo.get_situacao_atual_display()],
+        ['Parte Cliente:', processo.parte_cliente.nome],
+        ['Parte Contrária:', processo.parte_contraria],
+        ['Advogado Responsável:', processo.advogado_responsavel.get_full_name() if processo.advogado_responsavel else 'Não informado'],
+        ['Total de Andamentos:', str(resumo['total'])],
+        ['Primeiro Andamento:', resumo['primeiro'].strftime('%d/%m/%Y') if resumo['primeiro'] else 'N/A'],
+        ['Último Andamento:', resumo['ultimo'].strftime('%d/%m/%Y') if resumo['ultimo'] else 'N/A'],
+    ]
+    processo_table = Table(processo_data, colWidths=[2 * inch, 4 * inch])
+    processo_table.setStyle(TableStyle([
+        ('TEXTCOLOR', (0, 0), (-1, -1), cor_cinza_escuro),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ('TOPPADDING', (0, 0), (-1, -1), 8),
+        ('LEFTPADDING', (0, 0), (-1, -1), 8),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ]))
+    story.append(processo_table)
+    story.append(Spacer(1, 25))
+    return story
+
+
+def renderizar_parte(processo_id, inicio, fim):
+    """
+    Gera a parte do relatório com os andamentos [inicio, fim) em ordem
+    cronológica; a primeira parte inclui o cabeçalho com os dados do processo.
+
+    Executada no pool de processos: recebe apenas ids/inteiros e retorna bytes.
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_JUSTIFY
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    from ..models import ProcessoJuridico
+
+    processo = ProcessoJuridico.objects.select_related(
+        'parte_cliente', 'advogado_responsavel'
+    ).get(pk=processo_id)
+    andamentos = list(processo.andamentos.order_by('data_andamento', 'pk')[inicio:fim])
+
+    cor_cinza_escuro = colors.Color(0.2, 0.2, 0.2)
+    normal_style = pdf.estilo(
+        'NormalText', fontSize=10, textColor=cor_cinza_escuro, spaceAfter=6,
+        alignment=TA_JUSTIFY, fontName='Helvetica'
+    )
+
+    story = []
+    if inicio == 0:
+        story += _cabecalho(processo, _resumo(processo), cor_cinza_escuro)
+
+    if andamentos:
+        andamentos_data = [['#', 'Data', 'Tipo', 'Descrição', 'Observações']]
+        for i, andamento in enumerate(andamentos, inicio + 1):
+            andamentos_data.append([
+                str(i),
+                andamento.data_andamento.strftime('%d/%m/%Y'),
+                andamento.get_tipo_andamento_display(),
+                Paragraph(andamento.descricao_detalhada or '', normal_style),
+                Paragraph(andamento.observacoes_cliente or '', normal_style),
+            ])
+
+        andamentos_table = Table(
+            andamentos_data,
+            colWidths=[0.3 * inch, 0.7 * inch, 0.8 * inch, 2.5 * inch, 2.7 * inch],
+            repeatRows=1,
+        )
+        andamentos_table.setStyle(TableStyle([
+            # Cabeçalho
+            ('TEXTCOLOR', (0, 0), (-1, 0), cor_cinza_escuro),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 9),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('VALIGN', (0, 0), (-1, 0), 'MIDDLE'),
+
+            # Dados
+            ('TEXTCOLOR', (0, 1), (-1, -1), cor_cinza_escuro),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('ALIGN', (0, 1), (0, -1), 'CENTER'),
+            ('ALIGN', (1, 1), (1, -1), 'CENTER'),
+            ('ALIGN', (2, 1), (-1, -1), 'LEFT'),
+            ('VALIGN', (0, 1), (-1, -1), 'TOP'),
+
+            # Bordas e espaçamento
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('LEFTPADDING', (0, 0), (-1, -1), 6),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+        ]))
+        story.append(andamentos_table)
+    elif inicio == 0:
+        story.append(Paragraph('Nenhum andamento registrado para este processo.', normal_style))
+
+    story.append(Spacer(1, 30))
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=18, bottomMargin=100)
+    doc.build(story, onFirstPage=_rodape, onLaterPages=_rodape)
+    return buffer.getvalue()
+
+
+def _partes(processo_id, total):
+    tamanho = max(getattr(settings, 'ASSEJUS_PDF_ANDAMENTOS_POR_PARTE', 150), 1)
+    if not pdf.pode_juntar():
+        if total > tamanho:
+            logger.warning('pypdf não instalado: o relatório de andamentos será gerado em uma única parte.')
+        tamanho = max(total, 1)
+    return [(processo_id, inicio, inicio + tamanho) for inicio in range(0, max(total, 1), tamanho)]
+
+
+def gerar_pdf_andamentos(processo):
+    """
+    Retorna o PDF de andamentos atualizado do processo, aberto para leitura
+    binária, gerando-o apenas quando o processo ou seus andamentos mudaram.
+
+    O arquivo é aberto antes da limpeza das versões anteriores, então
+    continua legível mesmo que outra requisição o remova em seguida.
+
+    Raises:
+        ErroGeracaoPDF: Se a geração falhar ou exceder o tempo
+    """
+    resumo = _resumo(processo)
+    pasta = diretorio(processo.pk)
+    chave = chave_cache(processo, resumo)
+    caminho = pasta / f'{chave}.pdf'
+    try:
+        return open(caminho, 'rb')
+    except FileNotFoundError:
+        pass
+
+    partes = pdf.renderizar_partes(renderizar_parte, _partes(processo.pk, resumo['total']))
+    conteudo = partes[0] if len(partes) == 1 else pdf.juntar(partes)
+
+    pasta.mkdir(parents=True, exist_ok=True)
+    descritor, temporario = tempfile.mkstemp(dir=pasta, prefix=f'.{chave}.', suffix='.tmp')
+    arquivo = None
+    try:
+        with os.fdopen(descritor, 'wb') as destino:
+            destino.write(conteudo)
+        arquivo = open(temporario, 'rb')
+        os.replace(temporario, caminho)
+    except BaseException:
+        if arquivo is not None:
+            arquivo.close()
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+    # Versões anteriores do relatório; temporários de gerações em andamento ficam
+    for anterior in pasta.glob('*.pdf'):
+        if anterior.name != caminho.name:
+            anterior.unlink(missing_ok=True)
+    return arquivo
+
+
+def remover_cache(processo_id):
+    """Remove os PDFs de andamentos já gerados para o processo"""
+    shutil.rmtree(diretorio(processo_id), ignore_errors=True)
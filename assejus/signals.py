@@ -0,0 +1,55 @@
+"""
+Sinais do app assejus
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Andamento, DocumentoJuridico, ProcessoJuridico
+from .services import busca, relatorio_processo
+
+# Campos que alimentam o índice de busca (saves restritos a outros campos não reindexam)
+CAMPOS_INDEXADOS = {
+    ProcessoJuridico: {
+        'numero_processo', 'parte_cliente', 'tipo_processo', 'tipo_acao', 'tipo_processo_administrativo',
+        'vara_tribunal', 'unidade_militar_apuracao', 'parte_contraria', 'advogado_parte_contraria',
+        'observacoes_gerais',
+    },
+    Andamento: {'processo', 'tipo_andamento', 'data_andamento', 'descricao_detalhada', 'observacoes_cliente'},
+    DocumentoJuridico: {'processo', 'titulo', 'tipo_documento', 'descricao', 'arquivo'},
+}
+
+INDEXADORES = {
+    ProcessoJuridico: busca.indexar_processo,
+    Andamento: busca.indexar_andamento,
+    DocumentoJuridico: busca.indexar_documento,
+}
+
+TIPOS = {
+    ProcessoJuridico: 'processo',
+    Andamento: 'andamento',
+    DocumentoJuridico: 'documento',
+}
+
+
+@receiver(post_save, sender=ProcessoJuridico)
+@receiver(post_save, sender=Andamento)
+@receiver(post_save, sender=DocumentoJuridico)
+def atualizar_indice_busca(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Mantém IndiceBuscaJuridica em dia com processos, andamentos e documentos"""
+    if raw:
+        return
+    if update_fields and not CAMPOS_INDEXADOS[sender] & set(update_fields):
+        return
+    INDEXADORES[sender](instance)
+
+
+@receiver(post_delete, sender=Andamento)
+@receiver(post_delete, sender=DocumentoJuridico)
+def remover_indice_busca(sender, instance, **kwargs):
+    # Os registros de processos excluídos saem em cascata (FK processo)
+    busca.remover_do_indice(TIPOS[sender], instance.pk)
+
+
+@receiver(post_delete, sender=ProcessoJuridico)
+def remover_pdf_andamentos(sender, instance, **kwargs):
+    relatorio_processo.remover_cache(instance.pk)
@@ -101,6 +101,7 @@ urlpatterns = [
     
     # Atendimentos AJAX
     path('atendimentos/<int:pk>/delete/', views.atendimento_delete_ajax, name='atendimento_delete_ajax'),
+    path('atendimentos/list-ajax/', views.atendimento_list_ajax, name='atendimento_list_ajax'),
     
     # Documentos
     path('documentos/', views.documento_list, name='documento_list'),
@@ -113,6 +114,9 @@ urlpatterns = [
     path('documentos/upload-ajax/', views.documento_upload_ajax, name='documento_upload_ajax'),
     path('documentos/list-ajax/', views.documento_list_ajax, name='documento_list_ajax'),
     path('documentos/<int:pk>/delete-ajax/', views.documento_delete_ajax, name='documento_delete_ajax'),
+
+    # Busca textual em processos, andamentos e documentos
+    path('ajax/busca-juridica/', views.busca_juridica_ajax, name='busca_juridica_ajax'),
     
 
     
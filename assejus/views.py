@@ -14,35 +14,17 @@ from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 import os
-
-
-def get_logo_path(filename):
-    """
-    Retorna o caminho correto para a logo, tentando primeiro em static (desenvolvimento)
-    e depois em staticfiles (produção)
-    """
-    from django.conf import settings
-    
-    # Tentar primeiro no diretório static (desenvolvimento)
-    logo_path = os.path.join(settings.BASE_DIR, 'static', filename)
-    if os.path.exists(logo_path):
-        return logo_path
-    
-    # Se não existir, tentar no staticfiles (produção)
-    logo_path = os.path.join(settings.STATIC_ROOT, filename)
-    if os.path.exists(logo_path):
-        return logo_path
-    
-    return None
+from core.services.pdf import caminho_logo, estilo, estilos
+from .services import atendimentos as servico_atendimentos
+from .services import busca
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 import io
 import os
 from django.conf import settings
 from .models import (
     Advogado, AtendimentoJuridico, DocumentoJuridico, 
-    Andamento, ConsultaJuridica, RelatorioJuridico, ProcessoJuridico,
+    Andamento, ConsultaJuridica, RelatorioJuridico, ProcessoJuridico, IndiceBuscaJuridica,
 <<<<<<< HEAD
     ProcuracaoAdJudicia, ModeloPoderes
 =======
@@ -451,8 +433,8 @@ def advogado_delete(request, pk):
 
 # Views para Atendimentos Jurídicos
 @require_user_type(['administrador_sistema', 'advogado', 'atendente_advogado'])
-def atendimento_list(request):
-    """Lista de atendimentos jurídicos"""
+def _filtrar_atendimentos(request):
+    """Atendimentos visíveis ao usuário com os filtros da lista aplicados"""
     search = request.GET.get('search', '')
     status = request.GET.get('status', '')
     tipo_demanda = request.GET.get('tipo_demanda', '')
@@ -501,45 +483,79 @@ def atendimento_list(request):
     if tipo_demanda:
         atendimentos = atendimentos.filter(tipo_demanda=tipo_demanda)
     
-    # Ordenação: primeiro por status (concluídos por último), depois por data de abertura
-    atendimentos = atendimentos.order_by(
-        Case(
-            When(status='concluido', then=Value(1)),
-            default=Value(0),
-            output_field=IntegerField(),
-        ),
-        '-data_abertura'
-    )
+    atendimentos = atendimentos.select_related('associado', 'advogado_responsavel')
+    return atendimentos, search, status, tipo_demanda
+
+
+@require_user_type(['administrador_sistema', 'advogado', 'atendente_advogado'])
+def atendimento_list(request):
+    """Lista de atendimentos jurídicos"""
+    atendimentos, search, status, tipo_demanda = _filtrar_atendimentos(request)
     
-    # Estatísticas para o contexto
-    total_atendimentos = atendimentos.count()
-    atendimentos_ativos = atendimentos.exclude(status='concluido').count()
-    atendimentos_concluidos = atendimentos.filter(status='concluido').count()
+    # Estatísticas para o contexto (uma única agregação condicional)
+    contagem = servico_atendimentos.contar_atendimentos(atendimentos)
     
     # Verifica se há transição entre ativos e concluídos
-    tem_transicao = atendimentos_ativos > 0 and atendimentos_concluidos > 0
+    tem_transicao = contagem['ativos'] > 0 and contagem['concluidos'] > 0
     
-    # Paginação
-    paginator = Paginator(atendimentos, 20)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Paginação por cursor: ativos primeiro, concluídos por último, mais recentes antes
+    cursor = request.GET.get('cursor') or None
+    try:
+        pagina, proximo_cursor = servico_atendimentos.pagina_atendimentos(atendimentos, cursor)
+    except ValueError:
+        cursor = None
+        pagina, proximo_cursor = servico_atendimentos.pagina_atendimentos(atendimentos)
+    
+    inicio_concluidos = None
+    if tem_transicao:
+        inicio_concluidos = servico_atendimentos.inicio_concluidos(pagina, cursor)
     
     context = {
-        'atendimentos': page_obj,
-        'page_obj': page_obj,
+        'atendimentos': pagina,
+        'page_obj': pagina,
+        'cursor': cursor,
+        'proximo_cursor': proximo_cursor,
         'search': search,
         'status': status,
         'tipo_demanda': tipo_demanda,
-        'total_atendimentos': total_atendimentos,
-        'atendimentos_ativos': atendimentos_ativos,
-        'atendimentos_concluidos': atendimentos_concluidos,
+        'total_atendimentos': contagem['total'],
+        'atendimentos_ativos': contagem['ativos'],
+        'atendimentos_concluidos': contagem['concluidos'],
         'tem_transicao': tem_transicao,
+        'inicio_concluidos': inicio_concluidos.pk if inicio_concluidos else None,
         'is_advogado_restricted': request.user.tipo_usuario == 'advogado',
     }
     
     return render(request, 'assejus/atendimento_list.html', context)
 
 
+@require_user_type(['administrador_sistema', 'advogado', 'atendente_advogado'])
+def atendimento_list_ajax(request):
+    """
+    Lista de atendimentos via AJAX
+    Paginação por cursor: o cliente reenvia o 'proximo_cursor' recebido
+    """
+    atendimentos, search, status, tipo_demanda = _filtrar_atendimentos(request)
+    
+    try:
+        limite = min(max(int(request.GET.get('per_page', 20)), 1), 100)
+        pagina, proximo_cursor = servico_atendimentos.pagina_atendimentos(
+            atendimentos, request.GET.get('cursor') or None, limite
+        )
+    except ValueError:
+        return JsonResponse({'success': False, 'message': 'Parâmetros de paginação inválidos'}, status=400)
+    
+    data = {
+        'success': True,
+        'atendimentos': [servico_atendimentos.serializar_atendimento(atendimento) for atendimento in pagina],
+        'proximo_cursor': proximo_cursor,
+    }
+    if not request.GET.get('cursor'):
+        # Contagens só na primeira página; as seguintes reaproveitam as do cliente
+        data['contagem'] = servico_atendimentos.contar_atendimentos(atendimentos)
+    return JsonResponse(data)
+
+
 @require_user_type(['administrador_sistema', 'advogado', 'atendente_advogado'])
 def atendimento_create(request):
     """Criar novo atendimento jurídico"""
@@ -873,7 +889,8 @@ def documento_list(request):
                 Q(titulo__icontains=search) |
                 Q(descricao__icontains=search) |
                 Q(processo__numero_processo__icontains=search) |
-                Q(processo__parte_cliente__nome__icontains=search)
+                Q(processo__parte_cliente__nome__icontains=search) |
+                Q(pk__in=busca.ids_correspondentes(search, 'documento'))
             )
         
         # Filtros específicos
@@ -1436,7 +1453,8 @@ def documento_list_ajax(request):
                     Q(titulo__icontains=search) |
                     Q(descricao__icontains=search) |
                     Q(processo__numero_processo__icontains=search) |
-                    Q(processo__parte_cliente__nome__icontains=search)
+                    Q(processo__parte_cliente__nome__icontains=search) |
+                    Q(pk__in=busca.ids_correspondentes(search, 'documento'))
                 )
             
             if tipo_documento:
@@ -1672,7 +1690,8 @@ def andamento_list(request):
             Q(descricao_detalhada__icontains=search) |
             Q(processo__numero_processo__icontains=search) |
             Q(processo__parte_cliente__nome__icontains=search) |
-            Q(tipo_andamento__icontains=search)
+            Q(tipo_andamento__icontains=search) |
+            Q(pk__in=busca.ids_correspondentes(search, 'andamento'))
         )
     
     andamentos = andamentos.order_by('-data_andamento')
@@ -1985,25 +2004,24 @@ def andamento_pdf(request, pk):
     story = []
     
     # Estilos
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
+    styles = estilos()
+    title_style = estilo(
         'CustomTitle',
-        parent=styles['Heading1'],
+        pai='Heading1',
         fontSize=18,
         spaceAfter=30,
         alignment=TA_CENTER
     )
-    heading_style = ParagraphStyle(
+    heading_style = estilo(
         'CustomHeading',
-        parent=styles['Heading2'],
+        pai='Heading2',
         fontSize=14,
         spaceAfter=20,
         alignment=TA_LEFT
     )
     normal_style = styles['Normal']
-    bold_style = ParagraphStyle(
+    bold_style = estilo(
         'BoldStyle',
-        parent=styles['Normal'],
         fontSize=12,
         spaceAfter=6,
         alignment=TA_LEFT
@@ -2053,7 +2071,7 @@ def andamento_pdf(request, pk):
     
     # Rodapé
     story.append(Paragraph(f"Documento gerado em {timezone.now().strftime('%d/%m/%Y às %H:%M')}", 
-                          ParagraphStyle('Footer', parent=styles['Normal'], fontSize=8, alignment=TA_CENTER)))
+                          estilo('Footer', fontSize=8, alignment=TA_CENTER)))
     
     # Construir PDF
     doc.build(story)
@@ -2065,15 +2083,13 @@ def andamento_pdf(request, pk):
 def processo_andamentos_pdf(request, pk):
     """
     Gerar PDF com todos os andamentos do processo
+    
+    O arquivo é gerado em partes paralelas e reaproveitado enquanto o processo
+    e seus andamentos não forem alterados (ver assejus.services.relatorio_processo).
     """
-    from reportlab.lib import colors
-    from reportlab.lib.units import inch
-    from reportlab.platypus import Table, TableStyle, Spacer, Paragraph, SimpleDocTemplate
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
-    from reportlab.lib.pagesizes import A4
-    from reportlab.graphics.shapes import Drawing, Rect, Line
-    from reportlab.graphics import renderPDF
+    from django.http import FileResponse
+    from core.services.pdf import ErroGeracaoPDF
+    from .services.relatorio_processo import gerar_pdf_andamentos
     
     processo = get_object_or_404(ProcessoJuridico, pk=pk)
     
@@ -2082,312 +2098,22 @@ def processo_andamentos_pdf(request, pk):
         from django.http import Http404
         raise Http404("Processo não encontrado ou você não tem permissão para visualizá-lo.")
     
-    # Buscar todos os andamentos do processo ordenados por data
-    andamentos = processo.andamentos.all().order_by('data_andamento')
-    
-    # Criar PDF
-    response = HttpResponse(content_type='application/pdf')
+    try:
+        arquivo = gerar_pdf_andamentos(processo)
+    except ErroGeracaoPDF as e:
+        messages.error(request, f'Não foi possível gerar o PDF dos andamentos: {e}')
+        return redirect('assejus:processo_detail', pk=processo.pk)
     
     # Nome do arquivo
     filename = f"andamentos_processo_{processo.numero_processo}_{timezone.now().strftime('%Y%m%d')}.pdf"
     
-    # Verificar se é para download ou visualização
-    if request.GET.get('download') == '1':
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-    else:
-        response['Content-Disposition'] = f'inline; filename="{filename}"'
-    
-    # Criar documento PDF com margens mínimas no topo para logo
-    doc = SimpleDocTemplate(response, pagesize=A4, 
-                           rightMargin=72, leftMargin=72, 
-                           topMargin=18, bottomMargin=100)  # Aumentar margem inferior para rodapé
-    story = []
-    
-    # Definir cores institucionais
-    cor_vermelho_sangue = colors.Color(0.8, 0.1, 0.1)  # Vermelho sangue
-    cor_cinza_escuro = colors.Color(0.2, 0.2, 0.2)     # Cinza escuro
-    cor_cinza_claro = colors.Color(0.9, 0.9, 0.9)      # Cinza claro
-    
-    # Estilos personalizados
-    styles = getSampleStyleSheet()
-    
-    # Estilo do cabeçalho institucional
-    header_style = ParagraphStyle(
-        'HeaderStyle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=cor_vermelho_sangue,
-        spaceAfter=6,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
-    
-    # Estilo do subtítulo do cabeçalho
-    header_subtitle_style = ParagraphStyle(
-        'HeaderSubtitleStyle',
-        parent=styles['Normal'],
-        fontSize=14,
-        textColor=cor_cinza_escuro,
-        spaceAfter=4,
-        alignment=TA_CENTER,
-        fontName='Helvetica'
-    )
-    
-    # Estilo do título do documento
-    title_style = ParagraphStyle(
-        'DocumentTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        textColor=cor_cinza_escuro,
-        spaceAfter=30,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
-    
-    # Estilo dos cabeçalhos de seção
-    section_style = ParagraphStyle(
-        'SectionHeader',
-        parent=styles['Heading2'],
-        fontSize=14,
-        textColor=cor_vermelho_sangue,
-        spaceAfter=15,
-        spaceBefore=20,
-        alignment=TA_LEFT,
-        fontName='Helvetica-Bold',
-        borderWidth=0,
-        borderColor=cor_vermelho_sangue,
-        borderPadding=5
-    )
-    
-    # Estilo dos subtítulos
-    subtitle_style = ParagraphStyle(
-        'Subtitle',
-        parent=styles['Heading3'],
-        fontSize=12,
-        textColor=cor_cinza_escuro,
-        spaceAfter=10,
-        spaceBefore=15,
-        alignment=TA_LEFT,
-        fontName='Helvetica-Bold'
-    )
-    
-    # Estilo do texto normal
-    normal_style = ParagraphStyle(
-        'NormalText',
-        parent=styles['Normal'],
-        fontSize=10,
-        textColor=cor_cinza_escuro,
-        spaceAfter=6,
-        alignment=TA_JUSTIFY,
-        fontName='Helvetica'
-    )
-    
-    # Estilo do rodapé
-    footer_style = ParagraphStyle(
-        'Footer',
-        parent=styles['Normal'],
-        fontSize=8,
-        textColor=colors.grey,
-        spaceAfter=0,
-        alignment=TA_CENTER,
-        fontName='Helvetica'
+    # Download (?download=1) ou visualização no navegador
+    return FileResponse(
+        arquivo,
+        as_attachment=request.GET.get('download') == '1',
+        filename=filename,
+        content_type='application/pdf'
     )
-    
-    # IMAGEM LOGO2 ASEJUR
-    try:
-        from reportlab.platypus import Image
-        import os
-        from django.conf import settings
-        
-        # Usar a função auxiliar para encontrar a logo
-        logo_path = get_logo_path('logo2assejur.png')
-        
-        if logo_path:
-<<<<<<< HEAD
-            print(f"✅ Logo encontrada em: {logo_path}")
-=======
->>>>>>> c00fe10f4bf493986d435556591fabb7aae9e070
-            # Converter cm para inch (1 inch = 2.54 cm)
-            width_cm = 8.61
-            height_cm = 2.41
-            width_inch = width_cm / 2.54
-            height_inch = height_cm / 2.54
-            logo = Image(logo_path, width=width_inch*inch, height=height_inch*inch)
-            logo.hAlign = 'CENTER'
-            story.append(logo)
-<<<<<<< HEAD
-            story.append(Spacer(1, 10))
-        else:
-            print("❌ Logo não encontrada.")
-            # Se a logo não for encontrada, pula o cabeçalho
-            story.append(Spacer(1, 30))
-    except Exception as e:
-        print(f"❌ Erro ao carregar logo: {e}")
-=======
-            story.append(Spacer(1, 20))
-        else:
-            # Se a logo não for encontrada, pula o cabeçalho
-            story.append(Spacer(1, 30))
-    except Exception as e:
->>>>>>> c00fe10f4bf493986d435556591fabb7aae9e070
-        # Em caso de erro, pula o cabeçalho
-        story.append(Spacer(1, 30))
-    
-    # Título discreto dos dados do processo
-    story.append(Paragraph("Dados do Processo", ParagraphStyle(
-        'ProcessTitle',
-        parent=styles['Normal'],
-        fontSize=10,
-        textColor=colors.grey,
-        spaceAfter=15,
-        spaceBefore=0,
-        alignment=TA_LEFT,
-        fontName='Helvetica'
-    )))
-    
-    # Dados do processo em uma única tabela
-    processo_data = [
-        ['Número do Processo:', processo.numero_processo],
-        ['Vara/Tribunal:', processo.vara_tribunal],
-        ['Tipo de Ação:', processo.get_tipo_acao_display()],
-        ['Situação Atual:', processo.get_situacao_atual_display()],
-        ['Parte Cliente:', processo.parte_cliente.nome],
-        ['Parte Contrária:', processo.parte_contraria],
-        ['Advogado Responsável:', processo.advogado_responsavel.get_full_name() if processo.advogado_responsavel else 'Não informado'],
-        ['Total de Andamentos:', str(andamentos.count())],
-        ['Primeiro Andamento:', andamentos.first().data_andamento.strftime('%d/%m/%Y') if andamentos.exists() else 'N/A'],
-        ['Último Andamento:', andamentos.last().data_andamento.strftime('%d/%m/%Y') if andamentos.exists() else 'N/A'],
-    ]
-    
-    # Criar tabela única com dados do processo
-    processo_table = Table(processo_data, colWidths=[2*inch, 4*inch])
-    processo_table.setStyle(TableStyle([
-        ('TEXTCOLOR', (0, 0), (-1, -1), cor_cinza_escuro),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('TOPPADDING', (0, 0), (-1, -1), 8),
-        ('LEFTPADDING', (0, 0), (-1, -1), 8),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-    ]))
-    
-    story.append(processo_table)
-    story.append(Spacer(1, 25))
-    
-    # Tabela de andamentos
-    if andamentos.exists():
-        # Cabeçalho da tabela de andamentos
-        andamentos_header = ['#', 'Data', 'Tipo', 'Descrição', 'Observações']
-        
-        # Dados dos andamentos
-        andamentos_data = [andamentos_header]
-        
-        for i, andamento in enumerate(andamentos, 1):
-            # Criar Paragraphs para permitir quebra de linha automática
-            descricao_para = Paragraph(andamento.descricao_detalhada or "", normal_style) if andamento.descricao_detalhada else Paragraph("", normal_style)
-            observacoes_para = Paragraph(andamento.observacoes_cliente or "", normal_style) if andamento.observacoes_cliente else Paragraph("", normal_style)
-            
-            andamentos_data.append([
-                str(i),
-                andamento.data_andamento.strftime('%d/%m/%Y'),
-                andamento.get_tipo_andamento_display(),
-                descricao_para,
-                observacoes_para
-            ])
-        
-        # Criar tabela de andamentos com larguras ajustadas para textos longos
-        andamentos_table = Table(andamentos_data, colWidths=[0.3*inch, 0.7*inch, 0.8*inch, 2.5*inch, 2.7*inch])
-        andamentos_table.setStyle(TableStyle([
-            # Cabeçalho
-            ('TEXTCOLOR', (0, 0), (-1, 0), cor_cinza_escuro),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 9),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, 0), 'MIDDLE'),
-            
-            # Dados
-            ('TEXTCOLOR', (0, 1), (-1, -1), cor_cinza_escuro),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ('ALIGN', (0, 1), (0, -1), 'CENTER'),  # Coluna #
-            ('ALIGN', (1, 1), (1, -1), 'CENTER'),  # Coluna Data
-            ('ALIGN', (2, 1), (-1, -1), 'LEFT'),   # Demais colunas
-            ('VALIGN', (0, 1), (-1, -1), 'TOP'),   # Alinhamento vertical no topo
-            
-            # Bordas e espaçamento
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('LEFTPADDING', (0, 0), (-1, -1), 6),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-        ]))
-        
-        story.append(andamentos_table)
-    else:
-        story.append(Paragraph("Nenhum andamento registrado para este processo.", normal_style))
-    
-    story.append(Spacer(1, 30))
-    
-    # Função para criar rodapé
-    def create_footer(canvas, doc):
-        canvas.saveState()
-        
-        # Texto do rodapé
-        footer_text = """
-        Reconhecimento de Utilidade Pública Estadual Lei nº 5.614 28/11/06 |
-        Reconhecimento de Utilidade Pública Municipal Lei nº 3.634 14/05/07 |
-        Fone: 86 3085-1722 | E-mail: abmepi@gmail.com |
-        Endereço: Rua Coelho Rodrigues, 2242, Centro Sul, CEP: 64.000-080, Teresina – PI
-        """
-        
-        # Posicionar rodapé na parte inferior da página
-        canvas.setFont('Helvetica', 7)
-        canvas.setFillColor(colors.black)  # Texto preto
-        
-        # Desenhar linha separadora por toda a página
-        canvas.setStrokeColor(colors.grey)
-        canvas.setLineWidth(0.5)
-        canvas.line(0, 70, 612, 70)  # Linha horizontal por toda a página (A4 width = 612pt)
-        
-        # Adicionar logo da ABMEPI do lado esquerdo
-        try:
-            logo_path = get_logo_path('Logo_abmepi.png')
-            if logo_path:
-                canvas.drawImage(logo_path, 20, 20, width=40, height=40, preserveAspectRatio=True)
-                
-                # Adicionar dados de geração do documento abaixo da logo
-                canvas.setFont('Helvetica', 6)
-                canvas.setFillColor(colors.lightgrey)  # Cor cinza claro
-                canvas.drawString(20, 10, f"Documento gerado em {timezone.now().strftime('%d/%m/%Y às %H:%M')}")
-                canvas.drawString(20, 4, "ASEJUR - ABMEPI")
-        except:
-            pass  # Se não conseguir carregar a logo, continua sem ela
-        
-        # Dividir o texto em linhas
-        lines = footer_text.strip().split('|')
-        y_position = 50  # Subiu de 30 para 50
-        
-        # Garantir que o texto das informações institucionais seja preto
-        canvas.setFont('Helvetica', 7)
-        canvas.setFillColor(colors.black)  # Texto preto
-        
-        for line in lines:
-            line = line.strip()
-            if line:
-                # Todas as linhas alinhadas à direita
-                canvas.drawRightString(580, y_position, line)
-                y_position -= 10
-        
-        canvas.restoreState()
-    
-    # Construir PDF com rodapé em todas as páginas
-    doc.build(story, onFirstPage=create_footer, onLaterPages=create_footer)
-    
-    return response
 
 
 # Views para Consultas
@@ -2811,17 +2537,17 @@ def relatorio_pdf(request, pk):
     story = []
     
     # Estilos
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
+    styles = estilos()
+    title_style = estilo(
         'CustomTitle',
-        parent=styles['Heading1'],
+        pai='Heading1',
         fontSize=18,
         spaceAfter=30,
         alignment=TA_CENTER
     )
-    heading_style = ParagraphStyle(
+    heading_style = estilo(
         'CustomHeading',
-        parent=styles['Heading2'],
+        pai='Heading2',
         fontSize=14,
         spaceAfter=20,
         alignment=TA_LEFT
@@ -3181,7 +2907,8 @@ def processos_list(request):
             Q(numero_processo__icontains=search) |
             Q(parte_cliente__nome__icontains=search) |
             Q(parte_contraria__icontains=search) |
-            Q(vara_tribunal__icontains=search)
+            Q(vara_tribunal__icontains=search) |
+            Q(pk__in=busca.processos_correspondentes(search))
         )
     if situacao:
         processos = processos.filter(situacao_atual=situacao)
@@ -3231,7 +2958,7 @@ def processo_detail(request, pk):
         if processo.advogado_responsavel != request.user:
             from django.http import Http404
             raise Http404("Processo não encontrado ou você não tem permissão para visualizá-lo.")
-    andamentos = processo.andamentos.all().order_by('-data_andamento')
+    andamentos = processo.andamentos.select_related('usuario_registro').order_by('-data_andamento')
     documentos = processo.documentos.all().order_by('-data_upload')
     
     # Filtros para andamentos
@@ -3572,7 +3299,6 @@ def procuracao_pdf(request, pk):
     from reportlab.lib import colors
     from reportlab.lib.units import inch
     from reportlab.platypus import Table, TableStyle, Spacer, Paragraph, SimpleDocTemplate, PageBreak, Image
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
     from reportlab.lib.pagesizes import A4
     from reportlab.graphics.shapes import Drawing, Rect, Line
@@ -3591,18 +3317,7 @@ def procuracao_pdf(request, pk):
     story = []
     
     # Estilos
-    styles = getSampleStyleSheet()
-    
-    # Função para obter logo
-    def get_logo_path(filename):
-        from django.conf import settings
-        logo_path = os.path.join(settings.BASE_DIR, 'static', filename)
-        if os.path.exists(logo_path):
-            return logo_path
-        logo_path = os.path.join(settings.STATIC_ROOT, filename)
-        if os.path.exists(logo_path):
-            return logo_path
-        return None
+    styles = estilos()
     
     # Função para criar rodapé
     def create_footer(canvas, doc):
@@ -3626,7 +3341,7 @@ def procuracao_pdf(request, pk):
         
         # Adicionar logo da ABMEPI
         try:
-            logo_path = get_logo_path('Logo_abmepi.png')
+            logo_path = caminho_logo('Logo_abmepi.png')
             if logo_path:
                 canvas.drawImage(logo_path, 20, 20, width=40, height=40, preserveAspectRatio=True)
                 
@@ -3656,7 +3371,7 @@ def procuracao_pdf(request, pk):
     
     # Adicionar logo2assejur.png no topo com proporção 8,66 por 2,41
     try:
-        logo_asejur2_path = get_logo_path('logo2assejur.png')
+        logo_asejur2_path = caminho_logo('logo2assejur.png')
         
         if logo_asejur2_path:
             # Proporção 8,66:2,41 = aproximadamente 3,59:1
@@ -3669,9 +3384,8 @@ def procuracao_pdf(request, pk):
         pass
     
     # Título do documento
-    title_style = ParagraphStyle(
+    title_style = estilo(
         'TitleStyle',
-        parent=styles['Normal'],
         fontSize=16,
         textColor=colors.black,
         spaceAfter=15,
@@ -3692,9 +3406,8 @@ def procuracao_pdf(request, pk):
 >>>>>>> c00fe10f4bf493986d435556591fabb7aae9e070
     
     # Texto da procuração
-    texto_style = ParagraphStyle(
+    texto_style = estilo(
         'TextoStyle',
-        parent=styles['Normal'],
         fontSize=12,
         textColor=colors.black,
         spaceAfter=4,
@@ -3760,9 +3473,8 @@ def procuracao_pdf(request, pk):
     data_pt = f"{data_atual.day} de {meses_pt[data_atual.month]} de {data_atual.year}"
     
     # Estilo para data e assinatura
-    assinatura_style = ParagraphStyle(
+    assinatura_style = estilo(
         'AssinaturaStyle',
-        parent=styles['Normal'],
         fontSize=12,
         textColor=colors.black,
         spaceAfter=20,
@@ -4292,4 +4004,33 @@ def excluir_modelo_poderes(request, modelo_id):
 >>>>>>> c00fe10f4bf493986d435556591fabb7aae9e070
 
 
+@require_user_type(['administrador_sistema', 'advogado', 'atendente_advogado'])
+def busca_juridica_ajax(request):
+    """
+    Busca textual em processos, andamentos e documentos (inclusive no texto
+    dos arquivos enviados), ordenada por relevância e com trechos destacados
+    """
+    termo = request.GET.get('q', '').strip()
+    tipos = [tipo for tipo in request.GET.getlist('tipo') if tipo in dict(IndiceBuscaJuridica.TIPO_CHOICES)]
+    try:
+        limite = int(request.GET.get('limite', 20))
+    except ValueError:
+        limite = 20
+
+    resultados = busca.buscar(termo, tipos=tipos, processos=_processos_visiveis(request.user), limite=limite)
+    for resultado in resultados:
+        if resultado['tipo'] == 'documento':
+            resultado['url'] = reverse('assejus:documento_detail', args=[resultado['objeto_id']])
+        elif resultado['processo_id']:
+            resultado['url'] = reverse('assejus:processo_detail', args=[resultado['processo_id']])
+        else:
+            resultado['url'] = ''
+
+    return JsonResponse({'success': True, 'results': resultados})
 
+
+def _processos_visiveis(user):
+    """Processos que o usuário pode consultar (None = todos), como em processos_list"""
+    if user.tipo_usuario == 'advogado':
+        return ProcessoJuridico.objects.filter(advogado_responsavel=user)
+    return None
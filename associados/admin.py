@@ -1,10 +1,13 @@
+import os
+
 from django.contrib import admin
+from django.http import FileResponse, Http404
 from django.utils.html import format_html
-from django.urls import reverse
+from django.urls import path, reverse
 from django.utils.safestring import mark_safe
 from django.contrib import messages
 from django.utils import timezone
-from .models import Associado, Documento, Dependente, PreCadastroAssociado, DependentePreCadastro
+from .models import Associado, Documento, Dependente, PreCadastroAssociado, DependentePreCadastro, LoteAprovacaoPreCadastro, ImportacaoAssociados
 
 
 @admin.register(Associado)
@@ -211,3 +214,86 @@ class DependentePreCadastroAdmin(admin.ModelAdmin):
     
     def get_queryset(self, request):
         return super().get_queryset(request).select_related('pre_cadastro')
+
+
+@admin.register(LoteAprovacaoPreCadastro)
+class LoteAprovacaoPreCadastroAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'total', 'processados', 'aprovados', 'arquivos_copiados', 'usuario', 'data_inicio', 'data_conclusao')
+    list_filter = ('status', 'data_inicio')
+    readonly_fields = ('pre_cadastro_ids', 'status', 'total', 'processados', 'aprovados', 'arquivos_copiados', 'erros', 'usuario', 'data_inicio', 'data_conclusao')
+    ordering = ('-data_inicio',)
+
+
+@admin.register(ImportacaoAssociados)
+class ImportacaoAssociadosAdmin(admin.ModelAdmin):
+    list_display = ('id', 'planilha_link', 'total_linhas', 'criados', 'atualizados', 'com_erro', 'relatorio_link', 'usuario', 'data_importacao')
+    list_filter = ('data_importacao',)
+    ordering = ('-data_importacao',)
+    
+    def get_fields(self, request, obj=None):
+        if obj is None:
+            return ('arquivo', 'atualizar_existentes')
+        return ('planilha_link', 'atualizar_existentes', 'total_linhas', 'criados', 'atualizados', 'com_erro', 'relatorio_link', 'usuario', 'data_importacao')
+    
+    def get_readonly_fields(self, request, obj=None):
+        if obj is None:
+            return ()
+        return self.get_fields(request, obj)
+    
+    def has_change_permission(self, request, obj=None):
+        return obj is None and super().has_change_permission(request, obj)
+    
+    def save_model(self, request, obj, form, change):
+        from .services.importacao import executar_importacao
+        
+        obj.usuario = request.user
+        super().save_model(request, obj, form, change)
+        try:
+            executar_importacao(obj)
+        except ValueError as e:
+            self.message_user(request, f'Não foi possível importar a planilha: {e}', messages.ERROR)
+            return
+        
+        mensagem = f'{obj.criados} associado(s) criado(s) e {obj.atualizados} atualizado(s).'
+        if obj.com_erro:
+            self.message_user(request, f'{mensagem} {obj.com_erro} linha(s) com erro; baixe o relatório de erros.', messages.WARNING)
+        else:
+            self.message_user(request, mensagem)
+    
+    def get_urls(self):
+        urls = [
+            path(
+                '<int:pk>/baixar/<str:campo>/',
+                self.admin_site.admin_view(self.baixar_arquivo),
+                name='associados_importacaoassociados_baixar',
+            ),
+        ]
+        return urls + super().get_urls()
+    
+    def baixar_arquivo(self, request, pk, campo):
+        """Entrega a planilha ou o relatório de erros (armazenamento privado)"""
+        obj = self.get_object(request, pk)
+        if obj is None or not self.has_view_permission(request, obj) or campo not in ('arquivo', 'relatorio_erros'):
+            raise Http404('Arquivo não encontrado.')
+        arquivo = getattr(obj, campo)
+        if not arquivo:
+            raise Http404('Arquivo não encontrado.')
+        if campo == 'arquivo':
+            nome = f'importacao_{obj.pk}{os.path.splitext(arquivo.name)[1]}'
+        else:
+            nome = f'erros_importacao_{obj.pk}.csv'
+        return FileResponse(arquivo.open('rb'), as_attachment=True, filename=nome)
+    
+    def _link_arquivo(self, obj, campo):
+        if obj.pk and getattr(obj, campo):
+            url = reverse('admin:associados_importacaoassociados_baixar', args=[obj.pk, campo])
+            return format_html('<a href="{}">Baixar</a>', url)
+        return '-'
+    
+    def planilha_link(self, obj):
+        return self._link_arquivo(obj, 'arquivo')
+    planilha_link.short_description = 'Planilha'
+    
+    def relatorio_link(self, obj):
+        return self._link_arquivo(obj, 'relatorio_erros')
+    relatorio_link.short_description = 'Relatório de Erros'
@@ -3,26 +3,7 @@ from django.contrib.auth.decorators import login_required
 from django.http import HttpResponse, Http404
 from django.utils import timezone
 from .models import Associado
-
-
-def get_logo_path(logo_filename):
-    """Função auxiliar para obter o caminho do logo"""
-    import os
-    from django.conf import settings
-    
-    # Tentar diferentes caminhos para o logo
-    possible_paths = [
-        os.path.join(settings.STATIC_ROOT, logo_filename),
-        os.path.join(settings.STATICFILES_DIRS[0], logo_filename),
-        os.path.join(settings.BASE_DIR, 'static', logo_filename),
-        os.path.join(settings.BASE_DIR, 'media', logo_filename),
-    ]
-    
-    for path in possible_paths:
-        if os.path.exists(path):
-            return path
-    
-    return None
+from core.services.pdf import caminho_logo, estilo, estilos
 
 
 @login_required
@@ -33,7 +14,6 @@ def gerar_ficha_cadastro_associado_pdf(request, associado_id):
     from reportlab.lib import colors
     from reportlab.lib.units import inch
     from reportlab.platypus import Table, TableStyle, Spacer, Paragraph, SimpleDocTemplate, PageBreak
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
     from reportlab.lib.pagesizes import A4
     from reportlab.graphics.shapes import Drawing, Rect, Line
@@ -66,12 +46,12 @@ def gerar_ficha_cadastro_associado_pdf(request, associado_id):
     story = []
     
     # Estilos personalizados
-    styles = getSampleStyleSheet()
+    styles = estilos()
     
     # Estilo do título principal
-    title_style = ParagraphStyle(
+    title_style = estilo(
         'TitleStyle',
-        parent=styles['Heading1'],
+        pai='Heading1',
         fontSize=18,
         textColor=colors.black,
         spaceAfter=20,
@@ -81,9 +61,9 @@ def gerar_ficha_cadastro_associado_pdf(request, associado_id):
     )
     
     # Estilo do subtítulo
-    subtitle_style = ParagraphStyle(
+    subtitle_style = estilo(
         'SubtitleStyle',
-        parent=styles['Heading2'],
+        pai='Heading2',
         fontSize=14,
         textColor=colors.black,
         spaceAfter=15,
@@ -93,9 +73,8 @@ def gerar_ficha_cadastro_associado_pdf(request, associado_id):
     )
     
     # Estilo do texto normal
-    normal_style = ParagraphStyle(
+    normal_style = estilo(
         'NormalText',
-        parent=styles['Normal'],
         fontSize=11,
         textColor=colors.black,
         spaceAfter=8,
@@ -105,9 +84,8 @@ def gerar_ficha_cadastro_associado_pdf(request, associado_id):
     )
     
     # Estilo para campos destacados
-    field_style = ParagraphStyle(
+    field_style = estilo(
         'FieldStyle',
-        parent=styles['Normal'],
         fontSize=11,
         textColor=colors.black,
         spaceAfter=8,
@@ -117,9 +95,9 @@ def gerar_ficha_cadastro_associado_pdf(request, associado_id):
     )
     
     # Estilo para seções
-    section_style = ParagraphStyle(
+    section_style = estilo(
         'SectionStyle',
-        parent=styles['Heading3'],
+        pai='Heading3',
         fontSize=12,
         textColor=colors.black,
         spaceAfter=10,
@@ -139,9 +117,9 @@ def gerar_ficha_cadastro_associado_pdf(request, associado_id):
         from reportlab.platypus import Image, Table, TableStyle
         
         # Usar Logo_abmepi.png como primeira opção no cabeçalho
-        logo_abmepi_path = get_logo_path('Logo_abmepi.png')
-        logo_asejur2_path = get_logo_path('logo2assejur.png')
-        logo_asejur_path = get_logo_path('Logo-assejur.png')
+        logo_abmepi_path = caminho_logo('Logo_abmepi.png')
+        logo_asejur2_path = caminho_logo('logo2assejur.png')
+        logo_asejur_path = caminho_logo('Logo-assejur.png')
         
         logo = None
         if logo_abmepi_path:
@@ -152,9 +130,8 @@ def gerar_ficha_cadastro_associado_pdf(request, associado_id):
             logo = Image(logo_asejur_path, width=60, height=60)
         
         # Estilo para o texto do cabeçalho (centralizado)
-        header_text_style = ParagraphStyle(
+        header_text_style = estilo(
             'HeaderTextStyle',
-            parent=styles['Normal'],
             fontSize=14,
             textColor=colors.black,
             alignment=TA_CENTER,  # Centralizado
@@ -194,9 +171,9 @@ def gerar_ficha_cadastro_associado_pdf(request, associado_id):
     story.append(Spacer(1, 20))
     
     # Título da ficha (centralizado)
-    title_centered_style = ParagraphStyle(
+    title_centered_style = estilo(
         'TitleCenteredStyle',
-        parent=styles['Heading1'],
+        pai='Heading1',
         fontSize=18,
         textColor=colors.black,
         spaceAfter=20,
@@ -235,9 +212,8 @@ def gerar_ficha_cadastro_associado_pdf(request, associado_id):
     
     
     # Estilo para o texto do requerimento (justificado, sem quebras)
-    requerimento_style = ParagraphStyle(
+    requerimento_style = estilo(
         'RequerimentoStyle',
-        parent=styles['Normal'],
         fontSize=11,
         textColor=colors.black,
         spaceAfter=15,
@@ -287,9 +263,9 @@ def gerar_ficha_cadastro_associado_pdf(request, associado_id):
     story.append(PageBreak())
     
     # Título do Termo de Compromisso
-    termo_title_style = ParagraphStyle(
+    termo_title_style = estilo(
         'TermoTitleStyle',
-        parent=styles['Heading1'],
+        pai='Heading1',
         fontSize=12,
         textColor=colors.black,
         spaceAfter=3,
@@ -302,9 +278,8 @@ def gerar_ficha_cadastro_associado_pdf(request, associado_id):
     story.append(Spacer(1, 5))
     
     # Estilo para o texto do termo
-    termo_style = ParagraphStyle(
+    termo_style = estilo(
         'TermoStyle',
-        parent=styles['Normal'],
         fontSize=9,
         textColor=colors.black,
         spaceAfter=8,
@@ -366,9 +341,9 @@ def gerar_ficha_cadastro_associado_pdf(request, associado_id):
     story.append(Spacer(1, 15))
     
     # Título do Termo de Autorização
-    autorizacao_title_style = ParagraphStyle(
+    autorizacao_title_style = estilo(
         'AutorizacaoTitleStyle',
-        parent=styles['Heading1'],
+        pai='Heading1',
         fontSize=10,
         textColor=colors.black,
         spaceAfter=3,
@@ -381,9 +356,8 @@ def gerar_ficha_cadastro_associado_pdf(request, associado_id):
     story.append(Spacer(1, 3))
     
     # Estilo para o texto da autorização
-    autorizacao_style = ParagraphStyle(
+    autorizacao_style = estilo(
         'AutorizacaoStyle',
-        parent=styles['Normal'],
         fontSize=9,
         textColor=colors.black,
         spaceAfter=8,
@@ -411,9 +385,8 @@ def gerar_ficha_cadastro_associado_pdf(request, associado_id):
     story.append(Spacer(1, 15))
     
     # Data e assinaturas
-    data_assinatura_style = ParagraphStyle(
+    data_assinatura_style = estilo(
         'DataAssinaturaStyle',
-        parent=styles['Normal'],
         fontSize=9,
         textColor=colors.black,
         spaceAfter=15,
@@ -442,9 +415,8 @@ def gerar_ficha_cadastro_associado_pdf(request, associado_id):
     story.append(Spacer(1, 20))
     
     # Assinaturas
-    assinaturas_style = ParagraphStyle(
+    assinaturas_style = estilo(
         'AssinaturasStyle',
-        parent=styles['Normal'],
         fontSize=9,
         textColor=colors.black,
         spaceAfter=8,
@@ -501,7 +473,7 @@ def gerar_ficha_cadastro_associado_pdf(request, associado_id):
         try:
             import os
             from django.conf import settings
-            logo_path = get_logo_path('Logo_abmepi.png')
+            logo_path = caminho_logo('Logo_abmepi.png')
             if logo_path:
                 canvas.drawImage(logo_path, 20, 20, width=40, height=40, preserveAspectRatio=True)
                 
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from associados.services.importacao import gerar_relatorio_erros, importar_associados
+
+
+class Command(BaseCommand):
+    help = (
+        'Importa associados de uma planilha CSV ou XLSX (cabeçalho na primeira linha). '
+        'Associados com CPF já cadastrado são atualizados; as linhas com erro são listadas '
+        'no relatório de erros.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('arquivo', help='Caminho da planilha (.csv ou .xlsx)')
+        parser.add_argument(
+            '--relatorio',
+            help='Caminho do relatório de erros (CSV); padrão: <arquivo>.erros.csv',
+        )
+        parser.add_argument(
+            '--nao-atualizar',
+            action='store_true',
+            help='Não atualiza associados existentes (CPF já cadastrado vira erro)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Apenas valida a planilha, sem gravar',
+        )
+
+    def handle(self, *args, **options):
+        caminho = options['arquivo']
+        self.stdout.write(f'🔍 Importando associados de {caminho}...')
+        try:
+            with open(caminho, 'rb') as arquivo:
+                resultado = importar_associados(
+                    arquivo,
+                    nome_arquivo=caminho,
+                    atualizar_existentes=not options['nao_atualizar'],
+                    dry_run=options['dry_run'],
+                )
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(f'   - Linhas processadas: {resultado["total"]}')
+        self.stdout.write(f'   - Criados: {resultado["criados"]}')
+        self.stdout.write(f'   - Atualizados: {resultado["atualizados"]}')
+        self.stdout.write(f'   - Com erro: {len(resultado["erros"])}')
+
+        if resultado['erros']:
+            caminho_relatorio = options['relatorio'] or f'{caminho}.erros.csv'
+            with open(caminho_relatorio, 'w', encoding='utf-8-sig', newline='') as relatorio:
+                gerar_relatorio_erros(resultado['erros'], relatorio)
+            self.stdout.write(self.style.WARNING(f'⚠️ Relatório de erros gravado em {caminho_relatorio}'))
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS('✅ Validação concluída (nenhum dado foi gravado).'))
+        else:
+            self.stdout.write(self.style.SUCCESS('✅ Importação concluída!'))
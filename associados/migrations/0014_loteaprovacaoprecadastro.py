@@ -0,0 +1,37 @@
+# Generated by Django 5.0.2 on 2026-10-19 18:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('associados', '0013_associado_nome_mae_associado_nome_pai_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LoteAprovacaoPreCadastro',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pre_cadastro_ids', models.JSONField(default=list, verbose_name='Pré-Cadastros Selecionados')),
+                ('status', models.CharField(choices=[('processando', 'Processando'), ('copiando_arquivos', 'Copiando Arquivos'), ('concluido', 'Concluído'), ('erro', 'Erro')], default='processando', max_length=20, verbose_name='Status')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Total')),
+                ('processados', models.PositiveIntegerField(default=0, verbose_name='Processados')),
+                ('aprovados', models.PositiveIntegerField(default=0, verbose_name='Aprovados')),
+                ('arquivos_copiados', models.PositiveIntegerField(default=0, verbose_name='Arquivos Copiados')),
+                ('erros', models.JSONField(blank=True, default=list, help_text='Lista de {"id", "nome", "erro"} dos pré-cadastros não aprovados', verbose_name='Erros')),
+                ('data_inicio', models.DateTimeField(auto_now_add=True, verbose_name='Data de Início')),
+                ('data_conclusao', models.DateTimeField(blank=True, null=True, verbose_name='Data de Conclusão')),
+                ('usuario', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Aprovado por')),
+            ],
+            options={
+                'verbose_name': 'Lote de Aprovação de Pré-Cadastros',
+                'verbose_name_plural': 'Lotes de Aprovação de Pré-Cadastros',
+                'ordering': ['-data_inicio'],
+            },
+        ),
+    ]
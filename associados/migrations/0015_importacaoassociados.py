@@ -0,0 +1,36 @@
+# Generated by Django 5.0.2 on 2026-10-19 18:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('associados', '0014_loteaprovacaoprecadastro'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportacaoAssociados',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('arquivo', models.FileField(help_text='Arquivo .csv ou .xlsx com uma linha de cabeçalho (CPF, Nome, Matrícula, ...)', upload_to='associados/importacoes/', verbose_name='Planilha')),
+                ('atualizar_existentes', models.BooleanField(default=True, help_text='Atualiza os dados dos associados cujo CPF já está cadastrado', verbose_name='Atualizar Associados Existentes')),
+                ('relatorio_erros', models.FileField(blank=True, upload_to='associados/importacoes/relatorios/', verbose_name='Relatório de Erros')),
+                ('total_linhas', models.PositiveIntegerField(default=0, verbose_name='Total de Linhas')),
+                ('criados', models.PositiveIntegerField(default=0, verbose_name='Criados')),
+                ('atualizados', models.PositiveIntegerField(default=0, verbose_name='Atualizados')),
+                ('com_erro', models.PositiveIntegerField(default=0, verbose_name='Com Erro')),
+                ('data_importacao', models.DateTimeField(auto_now_add=True, verbose_name='Data da Importação')),
+                ('usuario', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Importado por')),
+            ],
+            options={
+                'verbose_name': 'Importação de Associados',
+                'verbose_name_plural': 'Importações de Associados',
+                'ordering': ['-data_importacao'],
+            },
+        ),
+    ]
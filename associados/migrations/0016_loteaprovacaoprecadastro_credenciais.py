@@ -0,0 +1,23 @@
+# Generated by Django 5.0.2 on 2026-10-19 21:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('associados', '0015_importacaoassociados'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='loteaprovacaoprecadastro',
+            name='senhas_exibidas',
+            field=models.BooleanField(default=False, help_text='As senhas temporárias são exibidas uma única vez a quem aprovou o lote', verbose_name='Senhas Exibidas'),
+        ),
+        migrations.AddField(
+            model_name='loteaprovacaoprecadastro',
+            name='usuarios_criados',
+            field=models.JSONField(blank=True, default=list, help_text='Usernames das contas de acesso criadas pelo lote, com senha temporária', verbose_name='Usuários Criados'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.2 on 2026-10-19 19:51
+
+import associados.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('associados', '0016_loteaprovacaoprecadastro_credenciais'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='importacaoassociados',
+            name='arquivo',
+            field=models.FileField(help_text='Arquivo .csv ou .xlsx com uma linha de cabeçalho (CPF, Nome, Matrícula, ...)', storage=associados.models._armazenamento_importacoes, upload_to=associados.models._caminho_planilha_importacao, verbose_name='Planilha'),
+        ),
+        migrations.AlterField(
+            model_name='importacaoassociados',
+            name='relatorio_erros',
+            field=models.FileField(blank=True, storage=associados.models._armazenamento_importacoes, upload_to=associados.models._caminho_relatorio_importacao, verbose_name='Relatório de Erros'),
+        ),
+    ]
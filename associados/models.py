@@ -1,7 +1,10 @@
+import os
+
 from django.db import models
 from django.core.validators import RegexValidator
 from django.utils.translation import gettext_lazy as _
 from core.models import Usuario
+from core.storage import ArmazenamentoPrivado, nome_aleatorio
 from django.core.exceptions import ValidationError
 
 
@@ -875,14 +878,11 @@ class PreCadastroAssociado(models.Model):
         }
         return colors.get(self.status, 'secondary')
     
-    def converter_para_associado(self, usuario_aprovador):
+    def dados_associado(self):
         """
-        Converte o pré-cadastro aprovado em um associado real
+        Retorna os campos do Associado a ser criado a partir deste pré-cadastro
         """
         from django.utils import timezone
-        import shutil
-        import os
-        from django.conf import settings
         
         # Mapear campos do pré-cadastro para o associado
         dados_associado = {
@@ -931,31 +931,27 @@ class PreCadastroAssociado(models.Model):
         dados_associado['data_ingresso'] = timezone.now().date()
         dados_associado['situacao'] = 'ativo'
         dados_associado['ativo'] = True
-        
-        # Criar o associado
-        associado = Associado.objects.create(**dados_associado)
-        
-        # Transferir dependentes do pré-cadastro para o associado
-        dependentes_pre_cadastro = self.dependentes.all()
-        for dep_pre in dependentes_pre_cadastro:
-            Dependente.objects.create(
-                associado=associado,
-                nome=dep_pre.nome,
-                parentesco=dep_pre.parentesco,
-                data_nascimento=dep_pre.data_nascimento,
-                foto=dep_pre.foto,
-                cpf=dep_pre.cpf,
-                email=dep_pre.email,
-                observacoes=f"Transferido do pré-cadastro ID: {self.id}. {dep_pre.observacoes or ''}"
-            )
-        
-        # Transferir documentos do pré-cadastro para o associado
-        documentos_para_criar = []
+        return dados_associado
+    
+    def dados_dependente(self, dep_pre):
+        """Retorna os campos do Dependente criado a partir de um dependente do pré-cadastro"""
+        return {
+            'nome': dep_pre.nome,
+            'parentesco': dep_pre.parentesco,
+            'data_nascimento': dep_pre.data_nascimento,
+            'foto': dep_pre.foto,
+            'cpf': dep_pre.cpf,
+            'email': dep_pre.email,
+            'observacoes': f"Transferido do pré-cadastro ID: {self.id}. {dep_pre.observacoes or ''}",
+        }
+    
+    def dados_documentos(self):
+        """Retorna os campos dos Documentos transferidos do pré-cadastro"""
+        documentos = []
         
         # RG
         if self.copia_rg:
-            documentos_para_criar.append({
-                'associado': associado,
+            documentos.append({
                 'tipo': 'rg',
                 'arquivo': self.copia_rg,
                 'descricao': 'Cópia do RG - Transferido do pré-cadastro'
@@ -963,8 +959,7 @@ class PreCadastroAssociado(models.Model):
         
         # CPF
         if self.copia_cpf:
-            documentos_para_criar.append({
-                'associado': associado,
+            documentos.append({
                 'tipo': 'cpf',
                 'arquivo': self.copia_cpf,
                 'descricao': 'Cópia do CPF - Transferido do pré-cadastro'
@@ -972,22 +967,42 @@ class PreCadastroAssociado(models.Model):
         
         # Comprovante de Residência
         if self.comprovante_residencia:
-            documentos_para_criar.append({
-                'associado': associado,
+            documentos.append({
                 'tipo': 'comprovante_residencia',
                 'arquivo': self.comprovante_residencia,
                 'descricao': 'Comprovante de Residência - Transferido do pré-cadastro'
             })
         
-        # Criar os documentos
-        for doc_data in documentos_para_criar:
-            Documento.objects.create(**doc_data)
+        return documentos
+    
+    def marcar_aprovado(self, usuario_aprovador, associado, num_dependentes, num_documentos):
+        """Preenche os campos de aprovação (sem gravar)"""
+        from django.utils import timezone
         
-        # Atualizar o pré-cadastro
         self.status = 'aprovado'
         self.data_analise = timezone.now()
         self.analisado_por = usuario_aprovador
-        self.observacoes = f"{self.observacoes or ''}\n\nAprovado e convertido para associado ID: {associado.id}. Transferidos {dependentes_pre_cadastro.count()} dependentes e {len(documentos_para_criar)} documentos."
+        self.observacoes = f"{self.observacoes or ''}\n\nAprovado e convertido para associado ID: {associado.id}. Transferidos {num_dependentes} dependentes e {num_documentos} documentos."
+    
+    def converter_para_associado(self, usuario_aprovador):
+        """
+        Converte o pré-cadastro aprovado em um associado real
+        """
+        # Criar o associado
+        associado = Associado.objects.create(**self.dados_associado())
+        
+        # Transferir dependentes do pré-cadastro para o associado
+        dependentes_pre_cadastro = list(self.dependentes.all())
+        for dep_pre in dependentes_pre_cadastro:
+            Dependente.objects.create(associado=associado, **self.dados_dependente(dep_pre))
+        
+        # Transferir documentos do pré-cadastro para o associado
+        documentos_para_criar = self.dados_documentos()
+        for doc_data in documentos_para_criar:
+            Documento.objects.create(associado=associado, **doc_data)
+        
+        # Atualizar o pré-cadastro
+        self.marcar_aprovado(usuario_aprovador, associado, len(dependentes_pre_cadastro), len(documentos_para_criar))
         self.save()
         
         return associado
@@ -1071,3 +1086,186 @@ class DependentePreCadastro(models.Model):
             (date.today().month, date.today().day) < 
             (self.data_nascimento.month, self.data_nascimento.day)
         )
+
+
+class LoteAprovacaoPreCadastro(models.Model):
+    """
+    Aprovação em lote de pré-cadastros, com o andamento do processamento
+    (ver associados.services.aprovacao_lote)
+    """
+    STATUS_CHOICES = [
+        ('processando', 'Processando'),
+        ('copiando_arquivos', 'Copiando Arquivos'),
+        ('concluido', 'Concluído'),
+        ('erro', 'Erro'),
+    ]
+    
+    pre_cadastro_ids = models.JSONField(
+        default=list,
+        verbose_name=_('Pré-Cadastros Selecionados')
+    )
+    
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='processando',
+        verbose_name=_('Status')
+    )
+    
+    total = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Total')
+    )
+    
+    processados = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Processados')
+    )
+    
+    aprovados = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Aprovados')
+    )
+    
+    arquivos_copiados = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Arquivos Copiados')
+    )
+    
+    erros = models.JSONField(
+        default=list,
+        blank=True,
+        verbose_name=_('Erros'),
+        help_text=_('Lista de {"id", "nome", "erro"} dos pré-cadastros não aprovados')
+    )
+    
+    usuarios_criados = models.JSONField(
+        default=list,
+        blank=True,
+        verbose_name=_('Usuários Criados'),
+        help_text=_('Usernames das contas de acesso criadas pelo lote, com senha temporária')
+    )
+    
+    senhas_exibidas = models.BooleanField(
+        default=False,
+        verbose_name=_('Senhas Exibidas'),
+        help_text=_('As senhas temporárias são exibidas uma única vez a quem aprovou o lote')
+    )
+    
+    usuario = models.ForeignKey(
+        Usuario,
+        on_delete=models.SET_NULL,
+        null=True,
+        verbose_name=_('Aprovado por')
+    )
+    
+    data_inicio = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_('Data de Início')
+    )
+    
+    data_conclusao = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_('Data de Conclusão')
+    )
+    
+    class Meta:
+        verbose_name = _('Lote de Aprovação de Pré-Cadastros')
+        verbose_name_plural = _('Lotes de Aprovação de Pré-Cadastros')
+        ordering = ['-data_inicio']
+    
+    def __str__(self):
+        return f"Lote #{self.pk} - {self.aprovados}/{self.total} ({self.get_status_display()})"
+    
+    @property
+    def percentual(self):
+        """Percentual de pré-cadastros já processados"""
+        if not self.total:
+            return 100
+        return int(self.processados * 100 / self.total)
+
+
+def _armazenamento_importacoes():
+    return ArmazenamentoPrivado('IMPORTACAO_ASSOCIADOS_DIR')
+
+
+def _caminho_planilha_importacao(instance, filename):
+    # Mantém a extensão: o formato da planilha é identificado por ela
+    extensao = os.path.splitext(filename)[1].lstrip('.').lower() or 'csv'
+    return nome_aleatorio('planilhas', extensao)
+
+
+def _caminho_relatorio_importacao(instance, filename):
+    return nome_aleatorio('relatorios', 'csv')
+
+
+class ImportacaoAssociados(models.Model):
+    """
+    Importação de associados a partir de uma planilha CSV/XLSX
+    (ver associados.services.importacao).
+    
+    A planilha e o relatório de erros têm dados pessoais: ficam fora de
+    MEDIA_ROOT (IMPORTACAO_ASSOCIADOS_DIR), com nomes aleatórios, e só são
+    baixados pelo admin, por usuários da equipe com permissão de visualização.
+    """
+    arquivo = models.FileField(
+        upload_to=_caminho_planilha_importacao,
+        storage=_armazenamento_importacoes,
+        verbose_name=_('Planilha'),
+        help_text=_('Arquivo .csv ou .xlsx com uma linha de cabeçalho (CPF, Nome, Matrícula, ...)')
+    )
+    
+    atualizar_existentes = models.BooleanField(
+        default=True,
+        verbose_name=_('Atualizar Associados Existentes'),
+        help_text=_('Atualiza os dados dos associados cujo CPF já está cadastrado')
+    )
+    
+    relatorio_erros = models.FileField(
+        upload_to=_caminho_relatorio_importacao,
+        storage=_armazenamento_importacoes,
+        blank=True,
+        verbose_name=_('Relatório de Erros')
+    )
+    
+    total_linhas = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Total de Linhas')
+    )
+    
+    criados = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Criados')
+    )
+    
+    atualizados = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Atualizados')
+    )
+    
+    com_erro = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Com Erro')
+    )
+    
+    usuario = models.ForeignKey(
+        Usuario,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        verbose_name=_('Importado por')
+    )
+    
+    data_importacao = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_('Data da Importação')
+    )
+    
+    class Meta:
+        verbose_name = _('Importação de Associados')
+        verbose_name_plural = _('Importações de Associados')
+        ordering = ['-data_importacao']
+    
+    def __str__(self):
+        return f"Importação #{self.pk} - {self.criados} criado(s), {self.atualizados} atualizado(s)"
@@ -2,30 +2,13 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import HttpResponse, Http404
+from django.http import HttpResponse, Http404, JsonResponse
+from django.urls import reverse
 from django.utils import timezone
 from .models import Associado, PreCadastroAssociado
 import os
 
-
-def get_logo_path(filename):
-    """
-    Retorna o caminho correto para a logo, tentando primeiro em static (desenvolvimento)
-    e depois em staticfiles (produção)
-    """
-    from django.conf import settings
-    
-    # Tentar primeiro no diretório static (desenvolvimento)
-    logo_path = os.path.join(settings.BASE_DIR, 'static', filename)
-    if os.path.exists(logo_path):
-        return logo_path
-    
-    # Se não existir, tentar no staticfiles (produção)
-    logo_path = os.path.join(settings.STATIC_ROOT, filename)
-    if os.path.exists(logo_path):
-        return logo_path
-    
-    return None
+from core.services.pdf import caminho_logo, estilo, estilos
 
 
 def criptografar_cpf(cpf):
@@ -56,7 +39,6 @@ def gerar_declaracao_associados_pdf(request):
     from reportlab.lib import colors
     from reportlab.lib.units import inch
     from reportlab.platypus import Table, TableStyle, Spacer, Paragraph, SimpleDocTemplate, PageBreak
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
     from reportlab.lib.pagesizes import A4
     from reportlab.graphics.shapes import Drawing, Rect, Line
@@ -112,12 +94,12 @@ def gerar_declaracao_associados_pdf(request):
     story = []
     
     # Estilos personalizados
-    styles = getSampleStyleSheet()
+    styles = estilos()
     
     # Estilo do título
-    title_style = ParagraphStyle(
+    title_style = estilo(
         'TitleStyle',
-        parent=styles['Heading1'],
+        pai='Heading1',
         fontSize=18,
         textColor=colors.black,
         spaceAfter=20,
@@ -127,9 +109,8 @@ def gerar_declaracao_associados_pdf(request):
     )
     
     # Estilo do texto normal
-    normal_style = ParagraphStyle(
+    normal_style = estilo(
         'NormalText',
-        parent=styles['Normal'],
         fontSize=12,
         textColor=colors.black,
         spaceAfter=6,
@@ -144,9 +125,9 @@ def gerar_declaracao_associados_pdf(request):
         from reportlab.platypus import Image
         
         # Usar logo2assejur.png como primeira opção no cabeçalho
-        logo_asejur2_path = get_logo_path('logo2assejur.png')
-        logo_asejur_path = get_logo_path('Logo-assejur.png')
-        logo_abmepi_path = get_logo_path('Logo_abmepi.png')
+        logo_asejur2_path = caminho_logo('logo2assejur.png')
+        logo_asejur_path = caminho_logo('Logo-assejur.png')
+        logo_abmepi_path = caminho_logo('Logo_abmepi.png')
         
         if logo_asejur2_path:
             logo = Image(logo_asejur2_path, width=245.51, height=68.32)
@@ -186,9 +167,8 @@ def gerar_declaracao_associados_pdf(request):
             """
             
             # Estilo para o texto da declaração
-            declaracao_style = ParagraphStyle(
+            declaracao_style = estilo(
                 'DeclaracaoStyle',
-                parent=styles['Normal'],
                 fontSize=12,
                 textColor=colors.black,  # Fonte preta
                 spaceAfter=20,
@@ -207,9 +187,9 @@ def gerar_declaracao_associados_pdf(request):
             dependentes = associado.dependentes.all()
             if dependentes.exists():
                 # Estilo para título dos dependentes
-                dependentes_title_style = ParagraphStyle(
+                dependentes_title_style = estilo(
                     'DependentesTitleStyle',
-                    parent=styles['Heading3'],
+                    pai='Heading3',
                     fontSize=14,
                     textColor=colors.black,
                     spaceAfter=10,
@@ -232,9 +212,8 @@ def gerar_declaracao_associados_pdf(request):
             Teresina - PI, {timezone.now().strftime('%d de %B de %Y')}
             """
             
-            data_style = ParagraphStyle(
+            data_style = estilo(
                 'DataStyle',
-                parent=styles['Normal'],
                 fontSize=12,
                 textColor=colors.black,
                 spaceAfter=20,
@@ -252,9 +231,8 @@ def gerar_declaracao_associados_pdf(request):
             Presidente da ABMEPI
             """
             
-            assinatura_style = ParagraphStyle(
+            assinatura_style = estilo(
                 'AssinaturaStyle',
-                parent=styles['Normal'],
                 fontSize=12,
                 textColor=colors.black,
                 spaceAfter=20,
@@ -294,7 +272,7 @@ def gerar_declaracao_associados_pdf(request):
         try:
             import os
             from django.conf import settings
-            logo_path = get_logo_path('Logo_abmepi.png')
+            logo_path = caminho_logo('Logo_abmepi.png')
             if logo_path:
                 canvas.drawImage(logo_path, 20, 20, width=40, height=40, preserveAspectRatio=True)
                 
@@ -337,7 +315,6 @@ def gerar_requerimento_inscricao_pdf(request):
     from reportlab.lib import colors
     from reportlab.lib.units import inch
     from reportlab.platypus import Table, TableStyle, Spacer, Paragraph, SimpleDocTemplate, PageBreak
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
     from reportlab.lib.pagesizes import A4
     from reportlab.graphics.shapes import Drawing, Rect, Line
@@ -366,7 +343,6 @@ def gerar_requerimento_inscricao_pdf_content(request, pre_cadastro):
     from reportlab.lib import colors
     from reportlab.lib.units import inch
     from reportlab.platypus import Table, TableStyle, Spacer, Paragraph, SimpleDocTemplate, PageBreak
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
     from reportlab.lib.pagesizes import A4
     from reportlab.graphics.shapes import Drawing, Rect, Line
@@ -392,12 +368,12 @@ def gerar_requerimento_inscricao_pdf_content(request, pre_cadastro):
     story = []
     
     # Estilos personalizados
-    styles = getSampleStyleSheet()
+    styles = estilos()
     
     # Estilo do título principal
-    title_style = ParagraphStyle(
+    title_style = estilo(
         'TitleStyle',
-        parent=styles['Heading1'],
+        pai='Heading1',
         fontSize=16,
         textColor=colors.black,
         spaceAfter=20,
@@ -407,9 +383,8 @@ def gerar_requerimento_inscricao_pdf_content(request, pre_cadastro):
     )
     
     # Estilo para texto normal
-    normal_style = ParagraphStyle(
+    normal_style = estilo(
         'NormalStyle',
-        parent=styles['Normal'],
         fontSize=11,
         textColor=colors.black,
         spaceAfter=3,
@@ -420,9 +395,8 @@ def gerar_requerimento_inscricao_pdf_content(request, pre_cadastro):
     )
     
     # Estilo para texto em maiúsculas
-    uppercase_style = ParagraphStyle(
+    uppercase_style = estilo(
         'UppercaseStyle',
-        parent=styles['Normal'],
         fontSize=12,
         textColor=colors.black,
         spaceAfter=6,
@@ -437,9 +411,9 @@ def gerar_requerimento_inscricao_pdf_content(request, pre_cadastro):
         from reportlab.platypus import Image
         
         # Usar logo2assejur.png como primeira opção no cabeçalho
-        logo_asejur2_path = get_logo_path('logo2assejur.png')
-        logo_asejur_path = get_logo_path('Logo-assejur.png')
-        logo_abmepi_path = get_logo_path('Logo_abmepi.png')
+        logo_asejur2_path = caminho_logo('logo2assejur.png')
+        logo_asejur_path = caminho_logo('Logo-assejur.png')
+        logo_abmepi_path = caminho_logo('Logo_abmepi.png')
         
         if logo_asejur2_path:
             logo = Image(logo_asejur2_path, width=245.51, height=68.32)
@@ -566,7 +540,7 @@ def gerar_requerimento_inscricao_pdf_content(request, pre_cadastro):
         try:
             import os
             from django.conf import settings
-            logo_path = get_logo_path('Logo_abmepi.png')
+            logo_path = caminho_logo('Logo_abmepi.png')
             if logo_path:
                 canvas.drawImage(logo_path, 20, 20, width=40, height=40, preserveAspectRatio=True)
                 
@@ -606,7 +580,6 @@ def gerar_ficha_cadastro_pdf(request, pre_cadastro):
     from reportlab.lib import colors
     from reportlab.lib.units import inch
     from reportlab.platypus import Table, TableStyle, Spacer, Paragraph, SimpleDocTemplate, PageBreak
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
     from reportlab.lib.pagesizes import A4
     from reportlab.graphics.shapes import Drawing, Rect, Line
@@ -633,12 +606,12 @@ def gerar_ficha_cadastro_pdf(request, pre_cadastro):
     story = []
     
     # Estilos personalizados
-    styles = getSampleStyleSheet()
+    styles = estilos()
     
     # Estilo do título principal
-    title_style = ParagraphStyle(
+    title_style = estilo(
         'TitleStyle',
-        parent=styles['Heading1'],
+        pai='Heading1',
         fontSize=18,
         textColor=colors.black,
         spaceAfter=20,
@@ -648,9 +621,9 @@ def gerar_ficha_cadastro_pdf(request, pre_cadastro):
     )
     
     # Estilo do subtítulo
-    subtitle_style = ParagraphStyle(
+    subtitle_style = estilo(
         'SubtitleStyle',
-        parent=styles['Heading2'],
+        pai='Heading2',
         fontSize=14,
         textColor=colors.black,
         spaceAfter=15,
@@ -660,9 +633,8 @@ def gerar_ficha_cadastro_pdf(request, pre_cadastro):
     )
     
     # Estilo do texto normal
-    normal_style = ParagraphStyle(
+    normal_style = estilo(
         'NormalText',
-        parent=styles['Normal'],
         fontSize=11,
         textColor=colors.black,
         spaceAfter=8,
@@ -672,9 +644,8 @@ def gerar_ficha_cadastro_pdf(request, pre_cadastro):
     )
     
     # Estilo para campos destacados
-    field_style = ParagraphStyle(
+    field_style = estilo(
         'FieldStyle',
-        parent=styles['Normal'],
         fontSize=11,
         textColor=colors.black,
         spaceAfter=8,
@@ -684,9 +655,9 @@ def gerar_ficha_cadastro_pdf(request, pre_cadastro):
     )
     
     # Estilo para seções
-    section_style = ParagraphStyle(
+    section_style = estilo(
         'SectionStyle',
-        parent=styles['Heading3'],
+        pai='Heading3',
         fontSize=12,
         textColor=colors.black,
         spaceAfter=10,
@@ -706,9 +677,9 @@ def gerar_ficha_cadastro_pdf(request, pre_cadastro):
         from reportlab.platypus import Image, Table, TableStyle
         
         # Usar Logo_abmepi.png como primeira opção no cabeçalho
-        logo_abmepi_path = get_logo_path('Logo_abmepi.png')
-        logo_asejur2_path = get_logo_path('logo2assejur.png')
-        logo_asejur_path = get_logo_path('Logo-assejur.png')
+        logo_abmepi_path = caminho_logo('Logo_abmepi.png')
+        logo_asejur2_path = caminho_logo('logo2assejur.png')
+        logo_asejur_path = caminho_logo('Logo-assejur.png')
         
         logo = None
         if logo_abmepi_path:
@@ -719,9 +690,8 @@ def gerar_ficha_cadastro_pdf(request, pre_cadastro):
             logo = Image(logo_asejur_path, width=60, height=60)
         
         # Estilo para o texto do cabeçalho (centralizado)
-        header_text_style = ParagraphStyle(
+        header_text_style = estilo(
             'HeaderTextStyle',
-            parent=styles['Normal'],
             fontSize=14,
             textColor=colors.black,
             alignment=TA_CENTER,  # Centralizado
@@ -761,9 +731,9 @@ def gerar_ficha_cadastro_pdf(request, pre_cadastro):
     story.append(Spacer(1, 20))
     
     # Título da ficha (centralizado)
-    title_centered_style = ParagraphStyle(
+    title_centered_style = estilo(
         'TitleCenteredStyle',
-        parent=styles['Heading1'],
+        pai='Heading1',
         fontSize=18,
         textColor=colors.black,
         spaceAfter=20,
@@ -802,9 +772,8 @@ def gerar_ficha_cadastro_pdf(request, pre_cadastro):
     
     
     # Estilo para o texto do requerimento (justificado, sem quebras)
-    requerimento_style = ParagraphStyle(
+    requerimento_style = estilo(
         'RequerimentoStyle',
-        parent=styles['Normal'],
         fontSize=11,
         textColor=colors.black,
         spaceAfter=15,
@@ -860,9 +829,9 @@ def gerar_ficha_cadastro_pdf(request, pre_cadastro):
     story.append(PageBreak())
     
     # Título do Termo de Compromisso
-    termo_title_style = ParagraphStyle(
+    termo_title_style = estilo(
         'TermoTitleStyle',
-        parent=styles['Heading1'],
+        pai='Heading1',
         fontSize=12,
         textColor=colors.black,
         spaceAfter=3,
@@ -875,9 +844,8 @@ def gerar_ficha_cadastro_pdf(request, pre_cadastro):
     story.append(Spacer(1, 5))
     
     # Estilo para o texto do termo
-    termo_style = ParagraphStyle(
+    termo_style = estilo(
         'TermoStyle',
-        parent=styles['Normal'],
         fontSize=9,
         textColor=colors.black,
         spaceAfter=8,
@@ -939,9 +907,9 @@ def gerar_ficha_cadastro_pdf(request, pre_cadastro):
     story.append(Spacer(1, 15))
     
     # Título do Termo de Autorização
-    autorizacao_title_style = ParagraphStyle(
+    autorizacao_title_style = estilo(
         'AutorizacaoTitleStyle',
-        parent=styles['Heading1'],
+        pai='Heading1',
         fontSize=10,
         textColor=colors.black,
         spaceAfter=3,
@@ -954,9 +922,8 @@ def gerar_ficha_cadastro_pdf(request, pre_cadastro):
     story.append(Spacer(1, 3))
     
     # Estilo para o texto da autorização
-    autorizacao_style = ParagraphStyle(
+    autorizacao_style = estilo(
         'AutorizacaoStyle',
-        parent=styles['Normal'],
         fontSize=9,
         textColor=colors.black,
         spaceAfter=8,
@@ -984,9 +951,8 @@ def gerar_ficha_cadastro_pdf(request, pre_cadastro):
     story.append(Spacer(1, 15))
     
     # Data e assinaturas
-    data_assinatura_style = ParagraphStyle(
+    data_assinatura_style = estilo(
         'DataAssinaturaStyle',
-        parent=styles['Normal'],
         fontSize=9,
         textColor=colors.black,
         spaceAfter=15,
@@ -1016,9 +982,8 @@ def gerar_ficha_cadastro_pdf(request, pre_cadastro):
     story.append(Spacer(1, 20))
     
     # Assinaturas
-    assinaturas_style = ParagraphStyle(
+    assinaturas_style = estilo(
         'AssinaturasStyle',
-        parent=styles['Normal'],
         fontSize=9,
         textColor=colors.black,
         spaceAfter=8,
@@ -1075,7 +1040,7 @@ def gerar_ficha_cadastro_pdf(request, pre_cadastro):
         try:
             import os
             from django.conf import settings
-            logo_path = get_logo_path('Logo_abmepi.png')
+            logo_path = caminho_logo('Logo_abmepi.png')
             if logo_path:
                 canvas.drawImage(logo_path, 20, 20, width=40, height=40, preserveAspectRatio=True)
                 
@@ -1105,4 +1070,129 @@ def gerar_ficha_cadastro_pdf(request, pre_cadastro):
     # Construir PDF com rodapé
     doc.build(story, onFirstPage=create_footer, onLaterPages=create_footer)
     
-    return response
\ No newline at end of file
+    return response
+
+def renderizar_extrato_financeiro(associado_id):
+    """
+    Gera os bytes do PDF do extrato financeiro a partir do saldo pré-calculado
+    e do histórico completo de mensalidades (executado no pool de
+    core.services.pdf)
+    """
+    import io
+    from reportlab.lib import colors
+    from reportlab.platypus import Table, TableStyle, Spacer, Paragraph, SimpleDocTemplate, Image
+    from reportlab.lib.pagesizes import A4
+    from financeiro.models import Mensalidade
+    from financeiro.services.saldos import obter_saldo
+    
+    associado = Associado.objects.get(pk=associado_id)
+    saldo = obter_saldo(associado)
+    
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4,
+                           rightMargin=40, leftMargin=40,
+                           topMargin=30, bottomMargin=40)
+    styles = estilos()
+    story = []
+    
+    logo_path = caminho_logo('Logo_abmepi.png')
+    if logo_path:
+        logo = Image(logo_path, width=60, height=60)
+        logo.hAlign = 'CENTER'
+        story.append(logo)
+    
+    story.append(Paragraph('EXTRATO FINANCEIRO DO ASSOCIADO', styles['Title']))
+    story.append(Paragraph(
+        f'<b>{associado.nome}</b> - CPF {criptografar_cpf(associado.cpf)} - '
+        f'Matrícula {associado.matricula_militar or "N/A"}',
+        styles['Normal']
+    ))
+    story.append(Paragraph(f"Emitido em {timezone.localtime().strftime('%d/%m/%Y às %H:%M')}", styles['Normal']))
+    story.append(Spacer(1, 15))
+    
+    # Resumo
+    resumo = Table([
+        ['Total de mensalidades', saldo.total_mensalidades, f'R$ {saldo.valor_total_mensalidades:.2f}'],
+        ['Pagas', saldo.mensalidades_pagas, f'R$ {saldo.valor_pago:.2f}'],
+        ['Pendentes', saldo.mensalidades_pendentes, f'R$ {saldo.valor_pendente:.2f}'],
+        ['Atrasadas', saldo.mensalidades_atrasadas, f'R$ {saldo.valor_atrasado:.2f}'],
+        ['Saldo', '', f'R$ {saldo.saldo:.2f}'],
+    ], colWidths=[220, 80, 120])
+    resumo.setStyle(TableStyle([
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+        ('ALIGN', (1, 0), (-1, -1), 'RIGHT'),
+        ('BACKGROUND', (0, -1), (-1, -1), colors.whitesmoke),
+    ]))
+    story.append(resumo)
+    story.append(Spacer(1, 20))
+    
+    # Histórico completo (apenas as colunas necessárias, sem instanciar modelos)
+    status_display = dict(Mensalidade.STATUS_CHOICES)
+    linhas = [['Vencimento', 'Tipo', 'Valor', 'Status', 'Pagamento']]
+    for mensalidade in Mensalidade.objects.filter(associado=associado).order_by(
+        '-data_vencimento', '-pk'
+    ).values_list('data_vencimento', 'tipo__nome', 'valor', 'status', 'data_pagamento').iterator():
+        data_vencimento, tipo, valor, status, data_pagamento = mensalidade
+        linhas.append([
+            data_vencimento.strftime('%d/%m/%Y'),
+            tipo,
+            f'R$ {valor:.2f}',
+            status_display.get(status, status),
+            data_pagamento.strftime('%d/%m/%Y') if data_pagamento else '-',
+        ])
+    
+    historico = Table(linhas, colWidths=[75, 170, 80, 80, 75], repeatRows=1)
+    historico.setStyle(TableStyle([
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ('ALIGN', (2, 1), (2, -1), 'RIGHT'),
+    ]))
+    story.append(historico)
+    
+    doc.build(story)
+    return buffer.getvalue()
+
+
+@login_required
+def gerar_extrato_financeiro_pdf(request):
+    """
+    Gerar PDF do extrato financeiro do associado logado.
+    
+    Com ?fila=1 o PDF é gerado em segundo plano e a resposta é JSON com a URL
+    de acompanhamento (core:tarefa_pdf_status); sem o parâmetro, a requisição
+    espera a geração no pool de processos.
+    """
+    from core.services.pdf import ErroGeracaoPDF, enfileirar, renderizar
+    
+    if request.user.tipo_usuario != 'associado':
+        messages.error(request, 'Acesso negado. Esta funcionalidade é exclusiva para associados.')
+        return redirect('core:usuario_dashboard')
+    
+    associado = Associado.objects.filter(usuario=request.user).first()
+    if associado is None:
+        messages.error(request, 'Associado não encontrado. Entre em contato com a administração.')
+        return redirect('core:usuario_dashboard')
+    
+    filename = f"extrato_financeiro_{timezone.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+    
+    if request.GET.get('fila') == '1':
+        tarefa = enfileirar(renderizar_extrato_financeiro, associado.pk, nome_arquivo=filename, usuario=request.user)
+        return JsonResponse({
+            'success': tarefa.status != 'erro',
+            'tarefa': tarefa.pk,
+            'status_url': reverse('core:tarefa_pdf_status', args=[tarefa.pk]),
+            'message': tarefa.erro or 'O extrato está sendo gerado.',
+        })
+    
+    try:
+        pdf = renderizar(renderizar_extrato_financeiro, associado.pk)
+    except ErroGeracaoPDF as e:
+        messages.error(request, f'Não foi possível gerar o extrato: {e}')
+        return redirect('associados:associado_financeiro')
+    
+    response = HttpResponse(pdf, content_type='application/pdf')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,300 @@
+"""
+Aprovação de pré-cadastros em lote
+
+Os pré-cadastros selecionados são convertidos em blocos de
+PRE_CADASTRO_APROVACAO_BLOCO itens, cada bloco em uma única transação:
+
+- uma consulta para os CPFs/matrículas já cadastrados e os usuários existentes;
+- provisionamento dos usuários em lote (core.services.provisionamento), com
+  senhas temporárias aleatórias e troca obrigatória no primeiro acesso, e
+  bulk_create de Associado, Dependente e Documento;
+- bulk_update dos pré-cadastros aprovados.
+
+Um pré-cadastro com CPF ou matrícula já cadastrados é registrado nos erros do
+lote e continua pendente; se um bloco inteiro falhar, seus itens são
+registrados como erro e os blocos seguintes continuam.
+
+Depois da conversão os arquivos (foto, documentos e fotos dos dependentes) são
+copiados para as pastas do associado por um pool de PRE_CADASTRO_COPIA_WORKERS
+threads, e um único registro de atividade resume o lote. O andamento fica em
+LoteAprovacaoPreCadastro, consultado pelo endpoint de progresso, que exibe as
+senhas temporárias das contas criadas uma única vez a quem aprovou o lote.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from core.models import Usuario
+from core.services.auditoria import registrar_atividade
+from core.services.provisionamento import dividir_nome, provisionar_usuarios
+from associados.models import (
+    Associado, Dependente, DependentePreCadastro, Documento,
+    LoteAprovacaoPreCadastro, PreCadastroAssociado
+)
+
+logger = logging.getLogger(__name__)
+
+
+def iniciar_aprovacao_lote(pre_cadastro_ids, usuario, em_segundo_plano=True):
+    """
+    Cria o lote de aprovação e inicia o processamento.
+
+    Args:
+        pre_cadastro_ids: IDs dos pré-cadastros selecionados
+        usuario: Usuário que está aprovando
+        em_segundo_plano: Processar em uma thread separada (padrão) ou na
+            requisição atual
+
+    Returns:
+        O LoteAprovacaoPreCadastro criado
+    """
+    ids = sorted({int(pk) for pk in pre_cadastro_ids})
+    lote = LoteAprovacaoPreCadastro.objects.create(
+        pre_cadastro_ids=ids,
+        total=len(ids),
+        usuario=usuario,
+    )
+
+    if em_segundo_plano:
+        # Iniciar só depois do commit, para a thread enxergar o lote
+        transaction.on_commit(lambda: threading.Thread(
+            target=_processar_em_thread, args=(lote.pk,), daemon=True
+        ).start())
+    else:
+        processar_lote(lote.pk)
+        lote.refresh_from_db()
+    return lote
+
+
+def _processar_em_thread(lote_id):
+    close_old_connections()
+    try:
+        processar_lote(lote_id)
+    finally:
+        connection.close()
+
+
+def processar_lote(lote_id):
+    """Converte os pré-cadastros do lote e copia os arquivos"""
+    lote = LoteAprovacaoPreCadastro.objects.select_related('usuario').get(pk=lote_id)
+    tamanho = getattr(settings, 'PRE_CADASTRO_APROVACAO_BLOCO', 50)
+
+    copias = []
+    try:
+        for inicio in range(0, len(lote.pre_cadastro_ids), tamanho):
+            bloco_ids = lote.pre_cadastro_ids[inicio:inicio + tamanho]
+            try:
+                with transaction.atomic():
+                    aprovados, erros, copias_bloco, criados = _converter_bloco(bloco_ids, lote.usuario)
+            except Exception as e:
+                logger.exception(f'Erro ao aprovar bloco do lote {lote.pk}')
+                nomes = dict(PreCadastroAssociado.objects.filter(pk__in=bloco_ids).values_list('pk', 'nome'))
+                aprovados, copias_bloco, criados = 0, [], []
+                erros = [{'id': pk, 'nome': nomes.get(pk, ''), 'erro': str(e)} for pk in bloco_ids]
+
+            copias.extend(copias_bloco)
+            lote.erros.extend(erros)
+            lote.usuarios_criados.extend(criados)
+            lote.aprovados += aprovados
+            lote.processados += len(bloco_ids)
+            LoteAprovacaoPreCadastro.objects.filter(pk=lote.pk).update(
+                processados=lote.processados,
+                aprovados=lote.aprovados,
+                erros=lote.erros,
+                usuarios_criados=lote.usuarios_criados,
+            )
+
+        if copias:
+            LoteAprovacaoPreCadastro.objects.filter(pk=lote.pk).update(status='copiando_arquivos')
+            lote.arquivos_copiados = copiar_arquivos(copias, lote.pk)
+
+        lote.status = 'concluido'
+    except Exception:
+        logger.exception(f'Erro ao processar o lote de aprovação {lote.pk}')
+        lote.status = 'erro'
+
+    lote.data_conclusao = timezone.now()
+    lote.save(update_fields=['status', 'arquivos_copiados', 'data_conclusao'])
+
+    detalhes = f'Lote #{lote.pk}: {lote.aprovados} de {lote.total} pré-cadastro(s) aprovado(s)'
+    if lote.erros:
+        detalhes += f', {len(lote.erros)} com erro'
+    detalhes += f'. {lote.arquivos_copiados} arquivo(s) copiado(s).'
+    registrar_atividade(
+        usuario=lote.usuario,
+        acao='Aprovar pré-cadastros em lote',
+        detalhes=detalhes,
+        modulo='associados'
+    )
+    return lote
+
+
+def _converter_bloco(bloco_ids, usuario_aprovador):
+    """
+    Converte um bloco de pré-cadastros (deve ser chamado dentro de uma transação).
+
+    Returns:
+        Tupla (quantidade_aprovada, erros, copias, usuarios_criados); copias é
+        a lista de (modelo, pk, campo, nome_arquivo) a copiar depois do commit
+        e usuarios_criados os usernames das contas novas
+    """
+    pre_cadastros = list(
+        PreCadastroAssociado.objects.select_for_update().filter(pk__in=bloco_ids, status='pendente')
+    )
+    erros = [
+        {'id': pk, 'nome': '', 'erro': 'Pré-cadastro não encontrado ou já analisado.'}
+        for pk in sorted(set(bloco_ids) - {pre.pk for pre in pre_cadastros})
+    ]
+
+    dados = {pre.pk: pre.dados_associado() for pre in pre_cadastros}
+    cpfs = {pre.cpf for pre in pre_cadastros}
+    matriculas = {dados_pre['matricula_militar'] for dados_pre in dados.values()}
+    cpfs_existentes = set(Associado.objects.filter(cpf__in=cpfs).values_list('cpf', flat=True))
+    matriculas_existentes = set(
+        Associado.objects.filter(matricula_militar__in=matriculas).values_list('matricula_militar', flat=True)
+    )
+
+    validos = []
+    for pre in pre_cadastros:
+        matricula = dados[pre.pk]['matricula_militar']
+        if pre.cpf in cpfs_existentes:
+            erro = 'Já existe um associado com este CPF.'
+        elif matricula in matriculas_existentes:
+            erro = f'Já existe um associado com a matrícula {matricula}.'
+        else:
+            validos.append(pre)
+            cpfs_existentes.add(pre.cpf)
+            matriculas_existentes.add(matricula)
+            continue
+        erros.append({'id': pre.pk, 'nome': pre.nome, 'erro': erro})
+
+    if not validos:
+        return 0, erros, [], []
+
+    # Usuários: reaproveitar os que ainda não estão vinculados a um associado
+    usuarios = {u.username: u for u in Usuario.objects.filter(username__in=[pre.cpf for pre in validos])}
+    vinculados = set(Associado.objects.filter(
+        usuario__in=usuarios.values()
+    ).values_list('usuario_id', flat=True))
+    novos_usuarios = []
+    for pre in validos:
+        if pre.cpf not in usuarios:
+            primeiro_nome, sobrenome = dividir_nome(pre.nome)
+            novos_usuarios.append({
+                'username': pre.cpf,
+                'first_name': primeiro_nome,
+                'last_name': sobrenome,
+                'email': pre.email or '',
+                'tipo_usuario': Usuario.ASSOCIADO,
+            })
+    # Senhas temporárias aleatórias; a troca é exigida no primeiro acesso
+    criados, _ = provisionar_usuarios(novos_usuarios)
+    usuarios.update((usuario.username, usuario) for usuario, _ in criados)
+
+    associados = []
+    for pre in validos:
+        usuario = usuarios[pre.cpf]
+        associados.append(Associado(
+            usuario=None if usuario.pk in vinculados else usuario,
+            **dados[pre.pk]
+        ))
+    Associado.objects.bulk_create(associados, batch_size=500)
+    associado_por_pre = {pre.pk: associado for pre, associado in zip(validos, associados)}
+
+    dependentes_pre = {}
+    for dep_pre in DependentePreCadastro.objects.filter(pre_cadastro__in=validos).order_by('pk'):
+        dependentes_pre.setdefault(dep_pre.pre_cadastro_id, []).append(dep_pre)
+
+    dependentes = []
+    documentos = []
+    for pre in validos:
+        associado = associado_por_pre[pre.pk]
+        for dep_pre in dependentes_pre.get(pre.pk, []):
+            dependentes.append(Dependente(associado=associado, **pre.dados_dependente(dep_pre)))
+        documentos_pre = pre.dados_documentos()
+        for doc_data in documentos_pre:
+            documentos.append(Documento(associado=associado, **doc_data))
+        pre.marcar_aprovado(
+            usuario_aprovador, associado,
+            len(dependentes_pre.get(pre.pk, [])), len(documentos_pre)
+        )
+    Dependente.objects.bulk_create(dependentes, batch_size=500)
+    Documento.objects.bulk_create(documentos, batch_size=500)
+    PreCadastroAssociado.objects.bulk_update(
+        validos, ['status', 'data_analise', 'analisado_por', 'observacoes'], batch_size=500
+    )
+
+    copias = [(Associado, a.pk, 'foto', a.foto.name) for a in associados if a.foto]
+    copias += [(Dependente, d.pk, 'foto', d.foto.name) for d in dependentes if d.foto]
+    copias += [(Documento, d.pk, 'arquivo', d.arquivo.name) for d in documentos if d.arquivo]
+    return len(validos), erros, copias, [usuario.username for usuario, _ in criados]
+
+
+def credenciais_para_exibir(lote, usuario):
+    """
+    Retorna, uma única vez e apenas para quem aprovou o lote concluído, as
+    senhas temporárias ainda válidas das contas criadas.
+
+    Returns:
+        Lista de {'username', 'nome', 'senha'} (vazia nas demais chamadas)
+    """
+    if lote.status not in ('concluido', 'erro') or lote.usuario_id != usuario.pk or not lote.usuarios_criados:
+        return []
+    # UPDATE condicional: duas consultas simultâneas não exibem as senhas duas vezes
+    if not LoteAprovacaoPreCadastro.objects.filter(pk=lote.pk, senhas_exibidas=False).update(senhas_exibidas=True):
+        return []
+    usuarios = Usuario.objects.filter(
+        username__in=lote.usuarios_criados,
+        primeiro_acesso=True,
+        senha_temporaria__isnull=False,
+        senha_temporaria_expira__gt=timezone.now(),
+    ).order_by('first_name', 'last_name')
+    return [
+        {'username': u.username, 'nome': u.get_full_name(), 'senha': u.senha_temporaria}
+        for u in usuarios
+    ]
+
+
+def _copiar(campo, nome_origem):
+    """Copia o arquivo para a pasta (upload_to) do campo de destino"""
+    with campo.storage.open(nome_origem, 'rb') as origem:
+        destino = campo.generate_filename(None, os.path.basename(nome_origem))
+        return campo.storage.save(destino, origem)
+
+
+def copiar_arquivos(copias, lote_id=None):
+    """
+    Copia os arquivos em paralelo e atualiza os registros com os novos nomes.
+    Um arquivo que não pôde ser copiado continua apontando para o original.
+
+    Returns:
+        Quantidade de arquivos copiados
+    """
+    workers = getattr(settings, 'PRE_CADASTRO_COPIA_WORKERS', 4)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futuros = [
+            (modelo, pk, nome_campo, pool.submit(_copiar, modelo._meta.get_field(nome_campo), nome_origem))
+            for modelo, pk, nome_campo, nome_origem in copias
+        ]
+
+    atualizacoes = {}
+    for modelo, pk, nome_campo, futuro in futuros:
+        try:
+            novo_nome = futuro.result()
+        except Exception as e:
+            logger.warning(f'Lote {lote_id}: não foi possível copiar {modelo.__name__} {pk} ({nome_campo}): {e}')
+            continue
+        objeto = modelo(pk=pk)
+        setattr(objeto, nome_campo, novo_nome)
+        atualizacoes.setdefault((modelo, nome_campo), []).append(objeto)
+
+    copiados = 0
+    for (modelo, nome_campo), objetos in atualizacoes.items():
+        modelo.objects.bulk_update(objetos, [nome_campo], batch_size=500)
+        copiados += len(objetos)
+    return copiados
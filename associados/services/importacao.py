@@ -0,0 +1,416 @@
+"""
+Importação de associados a partir de planilhas CSV ou XLSX
+
+A planilha é lida em streaming (linha a linha) e processada em blocos de
+IMPORTACAO_ASSOCIADOS_BLOCO linhas:
+
+- os cabeçalhos são associados aos campos de Associado pelo nome do campo,
+  pelo rótulo (verbose_name) ou por um dos apelidos em APELIDOS;
+- cada coluna do bloco é convertida e validada de uma vez (CPF com dígitos
+  verificadores, datas, opções e campos obrigatórios);
+- CPFs e matrículas são comparados com um índice em memória dos associados
+  já cadastrados, carregado uma única vez, e com as linhas anteriores da
+  própria planilha;
+- as linhas válidas são gravadas com bulk_create(update_conflicts=True) pelo
+  CPF: associados novos são criados e os existentes atualizados.
+
+As linhas com erro não interrompem a importação; elas voltam no resultado e
+podem ser gravadas em um relatório CSV com gerar_relatorio_erros().
+"""
+import codecs
+import csv
+import io
+import re
+import unicodedata
+from datetime import date, datetime
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import BooleanField, CharField, DateField, EmailField, TextField
+from django.core.validators import validate_email
+from django.core.exceptions import ValidationError
+
+from associados.models import Associado, ImportacaoAssociados
+
+APELIDOS = {
+    'matricula': 'matricula_militar',
+    'nascimento': 'data_nascimento',
+    'ingresso': 'data_ingresso',
+    'data_de_ingresso': 'data_ingresso',
+    'endereco': 'rua',
+    'logradouro': 'rua',
+    'uf': 'estado',
+    'lotacao': 'unidade_lotacao',
+    'e_mail': 'email',
+    'pai': 'nome_pai',
+    'mae': 'nome_mae',
+}
+
+CAMPOS_IGNORADOS = {'id', 'foto', 'usuario', 'data_cadastro', 'data_atualizacao'}
+
+CAMPOS_IMPORTAVEIS = [
+    campo for campo in Associado._meta.concrete_fields
+    if campo.name not in CAMPOS_IGNORADOS
+]
+
+CAMPOS_OBRIGATORIOS = [
+    campo.name for campo in CAMPOS_IMPORTAVEIS
+    if not campo.blank and not campo.has_default()
+]
+
+FORMATOS_DATA = ('%d/%m/%Y', '%Y-%m-%d', '%d-%m-%Y', '%d/%m/%y')
+
+VERDADEIRO = {'1', 'sim', 's', 'true', 'verdadeiro', 'ativo', 'x'}
+
+
+def normalizar_cabecalho(texto):
+    """'Data de Nascimento' -> 'data_de_nascimento'"""
+    texto = unicodedata.normalize('NFKD', str(texto or '')).encode('ascii', 'ignore').decode()
+    return re.sub(r'[^a-z0-9]+', '_', texto.lower()).strip('_')
+
+
+def _mapa_cabecalhos():
+    mapa = dict(APELIDOS)
+    for campo in CAMPOS_IMPORTAVEIS:
+        mapa[normalizar_cabecalho(campo.verbose_name)] = campo.name
+        mapa[campo.name] = campo.name
+    return mapa
+
+
+def mapear_colunas(cabecalhos):
+    """
+    Associa os cabeçalhos da planilha aos campos de Associado.
+
+    Returns:
+        Dicionário {indice_coluna: nome_campo} (colunas desconhecidas são ignoradas)
+    """
+    mapa = _mapa_cabecalhos()
+    colunas = {}
+    for indice, cabecalho in enumerate(cabecalhos):
+        campo = mapa.get(normalizar_cabecalho(cabecalho))
+        if campo and campo not in colunas.values():
+            colunas[indice] = campo
+    return colunas
+
+
+TAMANHO_AMOSTRA = 65536
+
+
+def _ler_csv(arquivo):
+    amostra = arquivo.read(TAMANHO_AMOSTRA)
+    try:
+        # Decodificação incremental: um caractere multibyte cortado no fim da
+        # amostra não é um erro, a menos que o arquivo termine ali
+        codecs.getincrementaldecoder('utf-8')().decode(amostra, final=len(amostra) < TAMANHO_AMOSTRA)
+        codificacao = 'utf-8-sig'
+    except UnicodeDecodeError:
+        codificacao = 'latin-1'
+    arquivo.seek(0)
+
+    texto = io.TextIOWrapper(arquivo, encoding=codificacao, newline='')
+    try:
+        dialeto = csv.Sniffer().sniff(amostra.decode(codificacao, errors='ignore'), delimiters=';,\t')
+    except csv.Error:
+        dialeto = csv.excel
+    try:
+        yield from csv.reader(texto, dialeto)
+    finally:
+        texto.detach()
+
+
+def _ler_xlsx(arquivo):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError('A leitura de arquivos XLSX requer o pacote openpyxl.')
+
+    planilha = load_workbook(arquivo, read_only=True, data_only=True)
+    try:
+        for linha in planilha.active.iter_rows(values_only=True):
+            yield ['' if valor is None else valor for valor in linha]
+    finally:
+        planilha.close()
+
+
+def ler_planilha(arquivo, nome_arquivo=''):
+    """
+    Lê a planilha em streaming.
+
+    Args:
+        arquivo: Arquivo binário aberto (CSV ou XLSX)
+        nome_arquivo: Nome usado para detectar o formato pela extensão
+
+    Yields:
+        Listas com os valores das células, a primeira sendo o cabeçalho
+    """
+    nome_arquivo = (nome_arquivo or getattr(arquivo, 'name', '') or '').lower()
+    if nome_arquivo.endswith(('.xlsx', '.xlsm')):
+        return _ler_xlsx(arquivo)
+    if nome_arquivo.endswith(('.csv', '.txt')):
+        return _ler_csv(arquivo)
+    raise ValueError('Formato não suportado. Envie um arquivo .csv ou .xlsx.')
+
+
+def normalizar_cpf(valor):
+    """Retorna o CPF no formato XXX.XXX.XXX-XX ou None se for inválido"""
+    if isinstance(valor, (int, float)):
+        valor = f'{int(valor):011d}'
+    digitos = re.sub(r'\D', '', str(valor or ''))
+    if len(digitos) < 11 and digitos:
+        digitos = digitos.zfill(11)
+    if len(digitos) != 11 or digitos == digitos[0] * 11:
+        return None
+    for tamanho in (9, 10):
+        soma = sum(int(digito) * peso for digito, peso in zip(digitos[:tamanho], range(tamanho + 1, 1, -1)))
+        verificador = (soma * 10) % 11 % 10
+        if verificador != int(digitos[tamanho]):
+            return None
+    return f'{digitos[:3]}.{digitos[3:6]}.{digitos[6:9]}-{digitos[9:]}'
+
+
+def _converter_data(valor):
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    texto = str(valor).strip()
+    for formato in FORMATOS_DATA:
+        try:
+            return datetime.strptime(texto, formato).date()
+        except ValueError:
+            continue
+    raise ValueError('data inválida (use DD/MM/AAAA)')
+
+
+def _conversor(campo):
+    """Monta a função que converte e valida os valores de uma coluna"""
+    if campo.name == 'cpf':
+        def converter(valor):
+            cpf = normalizar_cpf(valor)
+            if cpf is None:
+                raise ValueError('CPF inválido')
+            return cpf
+        return converter
+
+    if isinstance(campo, DateField):
+        return _converter_data
+
+    if isinstance(campo, BooleanField):
+        return lambda valor: str(valor).strip().lower() in VERDADEIRO
+
+    if campo.choices:
+        opcoes = {}
+        for chave, rotulo in campo.flatchoices:
+            opcoes[normalizar_cabecalho(chave)] = chave
+            opcoes[normalizar_cabecalho(rotulo)] = chave
+
+        def converter(valor):
+            chave = opcoes.get(normalizar_cabecalho(valor))
+            if chave is None:
+                raise ValueError(f'opção inválida "{valor}"')
+            return chave
+        return converter
+
+    def converter(valor):
+        if isinstance(valor, float) and valor.is_integer():
+            valor = int(valor)
+        texto = str(valor).strip()
+        if isinstance(campo, (CharField, TextField)) and campo.max_length and len(texto) > campo.max_length:
+            raise ValueError(f'máximo de {campo.max_length} caracteres')
+        if isinstance(campo, EmailField):
+            try:
+                validate_email(texto)
+            except ValidationError:
+                raise ValueError('e-mail inválido')
+        return texto
+    return converter
+
+
+def _validar_bloco(linhas, colunas):
+    """
+    Converte e valida um bloco de linhas coluna a coluna.
+
+    Returns:
+        Lista de (numero_linha, valores, erros)
+    """
+    campos = {campo.name: campo for campo in CAMPOS_IMPORTAVEIS}
+    registros = [(numero, {}, []) for numero, _ in linhas]
+    invalidos = [set() for _ in linhas]
+
+    for indice, nome in colunas.items():
+        converter = _conversor(campos[nome])
+        rotulo = str(campos[nome].verbose_name)
+        for (_, celulas), (_, valores, erros), campos_invalidos in zip(linhas, registros, invalidos):
+            valor = celulas[indice] if indice < len(celulas) else ''
+            if valor is None or (isinstance(valor, str) and not valor.strip()):
+                continue
+            try:
+                valores[nome] = converter(valor)
+            except ValueError as e:
+                erros.append(f'{rotulo}: {e}')
+                campos_invalidos.add(nome)
+
+    for (_, valores, erros), campos_invalidos in zip(registros, invalidos):
+        faltando = [
+            str(campos[nome].verbose_name) for nome in CAMPOS_OBRIGATORIOS
+            if nome not in valores and nome not in campos_invalidos
+        ]
+        if faltando:
+            erros.append(f'Campos obrigatórios não preenchidos: {", ".join(faltando)}')
+    return registros
+
+
+def carregar_indice():
+    """Índice em memória {cpf: matricula} e {matricula: cpf} dos associados cadastrados"""
+    por_cpf = {}
+    por_matricula = {}
+    for cpf, matricula in Associado.objects.values_list('cpf', 'matricula_militar').iterator(chunk_size=5000):
+        por_cpf[cpf] = matricula
+        por_matricula[matricula] = cpf
+    return por_cpf, por_matricula
+
+
+def importar_associados(arquivo, nome_arquivo='', atualizar_existentes=True, dry_run=False):
+    """
+    Importa os associados da planilha.
+
+    Args:
+        arquivo: Arquivo binário aberto (CSV ou XLSX)
+        nome_arquivo: Nome do arquivo (para detectar o formato)
+        atualizar_existentes: Atualiza associados cujo CPF já está cadastrado;
+            se False, essas linhas são registradas como erro
+        dry_run: Apenas valida, sem gravar
+
+    Returns:
+        Dicionário com 'total', 'criados', 'atualizados' e 'erros' (lista de
+        {'linha', 'cpf', 'nome', 'erros'})
+
+    Raises:
+        ValueError: Se o formato não for suportado ou faltar a coluna de CPF
+    """
+    tamanho_bloco = getattr(settings, 'IMPORTACAO_ASSOCIADOS_BLOCO', 1000)
+    linhas = iter(ler_planilha(arquivo, nome_arquivo))
+    cabecalho = next(linhas, None)
+    if cabecalho is None:
+        raise ValueError('A planilha está vazia.')
+
+    colunas = mapear_colunas(cabecalho)
+    if 'cpf' not in colunas.values():
+        raise ValueError('A planilha precisa ter uma coluna "CPF".')
+
+    por_cpf, por_matricula = carregar_indice()
+    linhas_cpf = {}
+    resultado = {'total': 0, 'criados': 0, 'atualizados': 0, 'erros': []}
+    campos_atualizados = [nome for nome in dict.fromkeys(colunas.values()) if nome != 'cpf']
+
+    bloco = []
+    for numero, celulas in enumerate(linhas, start=2):
+        if not any(str(celula).strip() for celula in celulas):
+            continue
+        bloco.append((numero, celulas))
+        if len(bloco) >= tamanho_bloco:
+            _importar_bloco(bloco, colunas, campos_atualizados, por_cpf, por_matricula, linhas_cpf,
+                            atualizar_existentes, dry_run, resultado)
+            bloco = []
+    if bloco:
+        _importar_bloco(bloco, colunas, campos_atualizados, por_cpf, por_matricula, linhas_cpf,
+                        atualizar_existentes, dry_run, resultado)
+    return resultado
+
+
+def _importar_bloco(bloco, colunas, campos_atualizados, por_cpf, por_matricula, linhas_cpf,
+                    atualizar_existentes, dry_run, resultado):
+    """
+    Valida e grava um bloco. por_cpf/por_matricula (índice dos cadastrados) e
+    linhas_cpf ({cpf: linha} da própria planilha) são atualizados a cada linha.
+    """
+    indice_cpf = next(indice for indice, nome in colunas.items() if nome == 'cpf')
+    novos = []
+    existentes = []
+    for (_, celulas), (numero, valores, erros) in zip(bloco, _validar_bloco(bloco, colunas)):
+        resultado['total'] += 1
+        cpf = valores.get('cpf')
+        matricula = valores.get('matricula_militar')
+
+        if not erros and cpf in linhas_cpf:
+            erros.append(f'CPF repetido na planilha (linha {linhas_cpf[cpf]})')
+        if not erros and cpf in por_cpf and not atualizar_existentes:
+            erros.append('CPF já cadastrado')
+        if not erros and por_matricula.get(matricula, cpf) != cpf:
+            erros.append(f'Matrícula {matricula} já pertence ao CPF {por_matricula[matricula]}')
+
+        if erros:
+            resultado['erros'].append({
+                'linha': numero,
+                'cpf': cpf or (celulas[indice_cpf] if indice_cpf < len(celulas) else ''),
+                'nome': valores.get('nome', ''), 'erros': erros,
+            })
+            continue
+
+        linhas_cpf[cpf] = numero
+        if cpf in por_cpf:
+            existentes.append(cpf)
+            por_matricula.pop(por_cpf[cpf], None)
+        por_cpf[cpf] = matricula
+        por_matricula[matricula] = cpf
+        novos.append(Associado(**valores))
+
+    resultado['atualizados'] += len(existentes)
+    resultado['criados'] += len(novos) - len(existentes)
+    if dry_run or not novos:
+        return
+
+    with transaction.atomic():
+        Associado.objects.bulk_create(
+            novos,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=['cpf'],
+            update_fields=campos_atualizados + ['data_atualizacao'],
+        )
+
+
+def gerar_relatorio_erros(erros, destino):
+    """Grava o relatório de erros (CSV separado por ';') no arquivo texto `destino`"""
+    escritor = csv.writer(destino, delimiter=';')
+    escritor.writerow(['Linha', 'CPF', 'Nome', 'Erros'])
+    for erro in erros:
+        escritor.writerow([erro['linha'], erro['cpf'], erro['nome'], ' | '.join(erro['erros'])])
+
+
+def executar_importacao(importacao):
+    """
+    Processa a planilha de uma ImportacaoAssociados e grava os totais e o
+    relatório de erros (se houver).
+
+    Raises:
+        ValueError: Se a planilha não puder ser lida
+    """
+    with importacao.arquivo.open('rb') as arquivo:
+        resultado = importar_associados(
+            arquivo,
+            nome_arquivo=importacao.arquivo.name,
+            atualizar_existentes=importacao.atualizar_existentes,
+        )
+
+    importacao.total_linhas = resultado['total']
+    importacao.criados = resultado['criados']
+    importacao.atualizados = resultado['atualizados']
+    importacao.com_erro = len(resultado['erros'])
+    if resultado['erros']:
+        relatorio = io.StringIO()
+        gerar_relatorio_erros(resultado['erros'], relatorio)
+        importacao.relatorio_erros.save(
+            f'erros_importacao_{importacao.pk}.csv',
+            ContentFile(relatorio.getvalue().encode('utf-8-sig')),
+            save=False
+        )
+    ImportacaoAssociados.objects.filter(pk=importacao.pk).update(
+        total_linhas=importacao.total_linhas,
+        criados=importacao.criados,
+        atualizados=importacao.atualizados,
+        com_erro=importacao.com_erro,
+        relatorio_erros=importacao.relatorio_erros.name or '',
+    )
+    return resultado
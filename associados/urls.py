@@ -58,6 +58,8 @@ urlpatterns = [
     path('pre-cadastros/', views_pre_cadastro.PreCadastroListView.as_view(), name='pre_cadastro_list'),
     path('pre-cadastros/<int:pk>/', views_pre_cadastro.pre_cadastro_detail, name='pre_cadastro_detail'),
     path('pre-cadastros/<int:pk>/aprovar/', views_pre_cadastro.aprovar_pre_cadastro, name='aprovar_pre_cadastro'),
+    path('pre-cadastros/aprovar-lote/', views_pre_cadastro.aprovar_pre_cadastros_lote, name='aprovar_pre_cadastros_lote'),
+    path('pre-cadastros/aprovar-lote/<int:pk>/progresso/', views_pre_cadastro.progresso_aprovacao_lote, name='progresso_aprovacao_lote'),
     path('pre-cadastros/<int:pk>/rejeitar/', views_pre_cadastro.rejeitar_pre_cadastro, name='rejeitar_pre_cadastro'),
     path('pre-cadastros/historico/', views_pre_cadastro.pre_cadastro_historico, name='pre_cadastro_historico'),
     
@@ -65,7 +67,10 @@ urlpatterns = [
     path('minha-ficha/', views.minha_ficha, name='minha_ficha'),
     path('meus-atendimentos-juridicos/', views.meus_atendimentos_juridicos_nova, name='meus_atendimentos_juridicos'),
     path('meus-atendimentos-juridicos/<int:atendimento_id>/detalhes/', views.detalhes_atendimento_juridico, name='detalhes_atendimento_juridico'),
+    path('meus-processos-juridicos/<int:processo_id>/linha-do-tempo/', views.linha_do_tempo_processo, name='linha_do_tempo_processo'),
     path('meus-atendimentos-psicologicos/', views.meus_atendimentos_psicologicos, name='meus_atendimentos_psicologicos'),
     path('minhas-reservas-hotel/', views.minhas_reservas_hotel_nova, name='minhas_reservas_hotel'),
     path('meu-financeiro/', views.associado_financeiro, name='associado_financeiro'),
+    path('meu-financeiro/extrato/', views.associado_financeiro_extrato, name='associado_financeiro_extrato'),
+    path('meu-financeiro/extrato/pdf/', views.gerar_extrato_financeiro_pdf, name='associado_extrato_pdf'),
 ]
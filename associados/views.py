@@ -10,7 +10,8 @@ from django.core.paginator import Paginator
 from django.utils import timezone
 from django.contrib.auth.models import Group
 from django.core.exceptions import ValidationError
-from core.models import Usuario, LogAtividade
+from core.models import Usuario
+from core.services.auditoria import registrar_atividade
 from .models import Associado, Documento, Dependente
 from .forms import (
     AssociadoForm, AssociadoSearchForm, DocumentoForm, 
@@ -22,7 +23,7 @@ from django.core.mail import send_mail
 from django.conf import settings
 from .forms import PreCadastroAssociadoForm
 from .models import PreCadastroAssociado
-from .pdf_views import gerar_declaracao_associados_pdf, gerar_requerimento_inscricao_pdf
+from .pdf_views import gerar_declaracao_associados_pdf, gerar_requerimento_inscricao_pdf, gerar_extrato_financeiro_pdf
 <<<<<<< HEAD
 from .ficha_cadastro_associado import gerar_ficha_cadastro_associado_pdf
 =======
@@ -137,7 +138,7 @@ class AssociadoCreateView(LoginRequiredMixin, CreateView):
         response = super().form_valid(form)
         
         # Registrar log de atividade
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=self.request.user,
             acao='Associado criado',
             modulo='Associados',
@@ -167,7 +168,7 @@ class AssociadoUpdateView(LoginRequiredMixin, UpdateView):
         response = super().form_valid(form)
         
         # Registrar log de atividade
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=self.request.user,
             acao='Associado atualizado',
             modulo='Associados',
@@ -196,7 +197,7 @@ class AssociadoDeleteView(LoginRequiredMixin, DeleteView):
         associado = self.get_object()
         
         # Registrar log de atividade
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=request.user,
             acao='Associado excluído',
             modulo='Associados',
@@ -243,7 +244,7 @@ class AssociadoDetailView(LoginRequiredMixin, DetailView):
         
         context['total_mensalidades'] = mensalidades.count()
         context['mensalidades_pagas'] = mensalidades.filter(status='pago').count()
-        context['mensalidades_pendentes'] = mensalidades.filter(status='pendente').count()
+        context['mensalidades_pendentes'] = mensalidades.em_aberto().count()
         
         # Calcular valor total das mensalidades
         valor_total = mensalidades.aggregate(
@@ -300,73 +301,118 @@ def associado_financeiro(request):
         return redirect('core:usuario_dashboard')
     
     # Importar modelos financeiros
-    from financeiro.models import Mensalidade, Pagamento
+    from financeiro.models import Pagamento
+    from financeiro.services.saldos import historico_extrato, obter_saldo
     
-    # Buscar mensalidades do associado
-    mensalidades = Mensalidade.objects.filter(
-        associado=associado
-    ).select_related('tipo').order_by('-data_vencimento')
-    
-    # Estatísticas financeiras
-    total_mensalidades = mensalidades.count()
-    mensalidades_pagas = mensalidades.filter(status='pago').count()
-    mensalidades_pendentes = mensalidades.filter(status='pendente').count()
-    mensalidades_atrasadas = mensalidades.filter(status='atrasado').count()
-    
-    # Valores financeiros
-    from django.db.models import Sum
-    valor_total_mensalidades = mensalidades.aggregate(
-        total=Sum('valor')
-    )['total'] or 0
-    
-    valor_pago = mensalidades.filter(status='pago').aggregate(
-        total=Sum('valor')
-    )['total'] or 0
-    
-    valor_pendente = mensalidades.filter(status='pendente').aggregate(
-        total=Sum('valor')
-    )['total'] or 0
-    
-    valor_atrasado = mensalidades.filter(status='atrasado').aggregate(
-        total=Sum('valor')
-    )['total'] or 0
+    # Totais pré-calculados (financeiro.services.saldos) e primeira página do histórico
+    saldo = obter_saldo(associado)
+    mensalidades, proximo_cursor = historico_extrato(associado, limite=20)
     
     # Buscar pagamentos recentes
     pagamentos_recentes = Pagamento.objects.filter(
         mensalidade__associado=associado
     ).select_related('mensalidade__tipo').order_by('-data_pagamento')[:10]
     
-    # Mensalidades do ano atual
-    from datetime import date
-    ano_atual = date.today().year
-    mensalidades_ano = mensalidades.filter(
-        data_vencimento__year=ano_atual
-    )
-    
-    # Calcular saldo (valor pago - valor total)
-    saldo = valor_pago - valor_total_mensalidades
-    
     context = {
         'associado': associado,
-        'mensalidades': mensalidades[:20],  # Últimas 20 mensalidades
+        'mensalidades': mensalidades,  # Últimas 20 mensalidades
+        'proximo_cursor': proximo_cursor,
         'pagamentos_recentes': pagamentos_recentes,
-        'mensalidades_ano': mensalidades_ano,
         'estatisticas': {
-            'total_mensalidades': total_mensalidades,
-            'mensalidades_pagas': mensalidades_pagas,
-            'mensalidades_pendentes': mensalidades_pendentes,
-            'mensalidades_atrasadas': mensalidades_atrasadas,
-            'valor_total_mensalidades': valor_total_mensalidades,
-            'valor_pago': valor_pago,
-            'valor_pendente': valor_pendente,
-            'valor_atrasado': valor_atrasado,
-            'saldo': saldo,
+            'total_mensalidades': saldo.total_mensalidades,
+            'mensalidades_pagas': saldo.mensalidades_pagas,
+            'mensalidades_pendentes': saldo.mensalidades_pendentes,
+            'mensalidades_atrasadas': saldo.mensalidades_atrasadas,
+            'valor_total_mensalidades': saldo.valor_total_mensalidades,
+            'valor_pago': saldo.valor_pago,
+            'valor_pendente': saldo.valor_pendente,
+            'valor_atrasado': saldo.valor_atrasado,
+            'saldo': saldo.saldo,
         }
     }
     
     return render(request, 'associados/associado_financeiro.html', context)
 
 
+@login_required
+def associado_financeiro_extrato(request):
+    """
+    API do extrato financeiro do associado logado: saldo pré-calculado e
+    histórico de mensalidades paginado por cursor (parâmetros 'cursor' e 'limite')
+    """
+    if request.user.tipo_usuario != 'associado':
+        return JsonResponse({'success': False, 'message': 'Acesso negado.'}, status=403)
+    
+    associado = Associado.objects.filter(usuario=request.user).first()
+    if associado is None:
+        return JsonResponse({'success': False, 'message': 'Associado não encontrado.'}, status=404)
+    
+    from financeiro.services.saldos import (
+        historico_extrato, obter_saldo, resumo_saldo, serializar_lancamento
+    )
+    
+    try:
+        limite = min(max(int(request.GET.get('limite', 20)), 1), 100)
+        mensalidades, proximo_cursor = historico_extrato(
+            associado,
+            cursor=request.GET.get('cursor') or None,
+            limite=limite
+        )
+    except ValueError:
+        return JsonResponse({'success': False, 'message': 'Parâmetros de paginação inválidos.'}, status=400)
+    
+    return JsonResponse({
+        'success': True,
+        'saldo': resumo_saldo(obter_saldo(associado)),
+        'lancamentos': [serializar_lancamento(mensalidade) for mensalidade in mensalidades],
+        'proximo_cursor': proximo_cursor,
+    })
+
+
+@login_required
+def linha_do_tempo_processo(request, processo_id):
+    """
+    API da linha do tempo de um processo do associado logado: andamentos e
+    documentos paginados por cursor (parâmetros 'cursor' e 'limite'). Ao abrir
+    a primeira página, todos os andamentos não vistos são marcados como visualizados.
+    """
+    if request.user.tipo_usuario != 'associado':
+        return JsonResponse({'success': False, 'message': 'Acesso negado.'}, status=403)
+    
+    associado = Associado.objects.filter(usuario=request.user).first()
+    if associado is None:
+        return JsonResponse({'success': False, 'message': 'Associado não encontrado.'}, status=404)
+    
+    from assejus.models import ProcessoJuridico
+    from assejus.services.linha_tempo import linha_do_tempo, marcar_visualizados
+    
+    processo = ProcessoJuridico.objects.filter(pk=processo_id, parte_cliente=associado).first()
+    if processo is None:
+        return JsonResponse({'success': False, 'message': 'Processo não encontrado.'}, status=404)
+    
+    cursor = request.GET.get('cursor') or None
+    try:
+        limite = min(max(int(request.GET.get('limite', 20)), 1), 100)
+        itens, proximo_cursor = linha_do_tempo(processo, cursor=cursor, limite=limite)
+    except ValueError:
+        return JsonResponse({'success': False, 'message': 'Parâmetros de paginação inválidos.'}, status=400)
+    
+    # Os itens já serializados mantêm o estado anterior, para destacar os novos
+    novos = 0 if cursor else marcar_visualizados(processo)
+    
+    return JsonResponse({
+        'success': True,
+        'processo': {
+            'id': processo.pk,
+            'numero_processo': processo.numero_processo,
+            'situacao': processo.get_situacao_atual_display(),
+        },
+        'itens': itens,
+        'novos': novos,
+        'proximo_cursor': proximo_cursor,
+    })
+
+
 @login_required
 def exportar_associados(request, associados_ids=None):
     """
@@ -420,7 +466,7 @@ def documento_create(request, associado_id):
             documento.save()
             
             # Registrar log de atividade
-            LogAtividade.objects.create(
+            registrar_atividade(
                 usuario=request.user,
                 acao='Documento criado',
                 modulo='Associados',
@@ -451,7 +497,7 @@ def documento_delete(request, documento_id):
     
     if request.method == 'POST':
         # Registrar log de atividade
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=request.user,
             acao='Documento excluído',
             modulo='Associados',
@@ -486,7 +532,7 @@ def dependente_create(request, associado_id):
             dependente.save()
             
             # Registrar log de atividade
-            LogAtividade.objects.create(
+            registrar_atividade(
                 usuario=request.user,
                 acao='Dependente criado',
                 modulo='Associados',
@@ -520,7 +566,7 @@ def dependente_update(request, pk):
             form.save()
             
             # Registrar log de atividade
-            LogAtividade.objects.create(
+            registrar_atividade(
                 usuario=request.user,
                 acao='Dependente atualizado',
                 modulo='Associados',
@@ -552,7 +598,7 @@ def dependente_delete(request, pk):
     
     if request.method == 'POST':
         # Registrar log de atividade
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=request.user,
             acao='Dependente excluído',
             modulo='Associados',
@@ -5,9 +5,13 @@ from django.contrib import messages
 from django.views.generic import ListView
 from django.db.models import Q
 from django.core.paginator import Paginator
+from django.urls import reverse
 from django.utils import timezone
-from core.models import LogAtividade
-from .models import PreCadastroAssociado
+from django.http import JsonResponse
+from django.views.decorators.http import require_POST
+from core.services.auditoria import registrar_atividade
+from .models import LoteAprovacaoPreCadastro, PreCadastroAssociado
+from .services.aprovacao_lote import credenciais_para_exibir, iniciar_aprovacao_lote
 
 
 class PreCadastroListView(LoginRequiredMixin, ListView):
@@ -101,7 +105,7 @@ def aprovar_pre_cadastro(request, pk):
         if num_documentos > 0:
             detalhes_log += f'. Transferidos {num_documentos} documentos'
         
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=request.user,
             acao='Aprovar pré-cadastro',
             detalhes=detalhes_log,
@@ -114,6 +118,53 @@ def aprovar_pre_cadastro(request, pk):
     return redirect('associados:pre_cadastro_list')
 
 
+@login_required
+@require_POST
+def aprovar_pre_cadastros_lote(request):
+    """
+    Inicia a aprovação em lote dos pré-cadastros selecionados (AJAX)
+    """
+    try:
+        ids = [int(pk) for pk in request.POST.getlist('pre_cadastros')]
+    except ValueError:
+        return JsonResponse({'success': False, 'message': 'Seleção inválida.'}, status=400)
+    
+    if not ids:
+        return JsonResponse({'success': False, 'message': 'Nenhum pré-cadastro foi selecionado.'}, status=400)
+    
+    lote = iniciar_aprovacao_lote(ids, request.user)
+    
+    return JsonResponse({
+        'success': True,
+        'message': f'Aprovação de {lote.total} pré-cadastro(s) iniciada.',
+        'lote_id': lote.pk,
+        'progresso_url': reverse('associados:progresso_aprovacao_lote', args=[lote.pk]),
+    })
+
+
+@login_required
+def progresso_aprovacao_lote(request, pk):
+    """
+    Andamento de um lote de aprovação de pré-cadastros (AJAX)
+    """
+    lote = get_object_or_404(LoteAprovacaoPreCadastro, pk=pk)
+    
+    return JsonResponse({
+        'success': True,
+        'status': lote.status,
+        'status_display': lote.get_status_display(),
+        'total': lote.total,
+        'processados': lote.processados,
+        'aprovados': lote.aprovados,
+        'arquivos_copiados': lote.arquivos_copiados,
+        'percentual': lote.percentual,
+        'erros': lote.erros,
+        'concluido': lote.status in ('concluido', 'erro'),
+        # Senhas temporárias das contas criadas: só na primeira consulta após a conclusão
+        'credenciais': credenciais_para_exibir(lote, request.user),
+    })
+
+
 @login_required
 def rejeitar_pre_cadastro(request, pk):
     """
@@ -134,7 +185,7 @@ def rejeitar_pre_cadastro(request, pk):
         messages.success(request, f'Pré-cadastro de {pre_cadastro.nome} rejeitado com sucesso!')
         
         # Log da atividade
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=request.user,
             acao='Rejeitar pré-cadastro',
             detalhes=f'Rejeitou pré-cadastro de {pre_cadastro.nome} (ID: {pre_cadastro.id}). Motivo: {motivo}',
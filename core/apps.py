@@ -5,3 +5,9 @@ class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
     verbose_name = 'Core - Sistema Base'
+    
+    def ready(self):
+        import core.checks  # noqa: F401
+        import core.signals  # noqa: F401
+        from core.services.imagens import conectar_sinais
+        conectar_sinais()
@@ -0,0 +1,77 @@
+"""
+Verificações de inicialização (python manage.py check)
+
+Conferem a configuração de conexões com o banco aplicada por
+abmepi.conexoes (com --deploy também listam a configuração efetiva de cada
+banco) e se o engine de sessões é compatível com o cache configurado.
+"""
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from abmepi.conexoes import descrever_conexoes
+
+
+@checks.register('conexoes')
+def verificar_conexoes(app_configs, **kwargs):
+    """Avisa sobre combinações de opções de conexão que costumam causar problemas"""
+    avisos = []
+    for banco in descrever_conexoes(settings.DATABASES):
+        persistente = banco['conn_max_age'] is None or banco['conn_max_age'] > 0
+        if persistente and not banco['health_checks']:
+            avisos.append(checks.Warning(
+                f"O banco '{banco['alias']}' usa conexões persistentes sem CONN_HEALTH_CHECKS.",
+                hint='Uma conexão encerrada pelo servidor só será descartada após um erro na '
+                     'requisição. Defina DB_CONN_HEALTH_CHECKS=True.',
+                id='core.W001',
+            ))
+        if banco['pgbouncer'] and banco['conn_max_age'] is None:
+            avisos.append(checks.Warning(
+                f"O banco '{banco['alias']}' usa PgBouncer com conexões sem limite de tempo.",
+                hint='Defina DB_CONN_MAX_AGE com um valor menor que o server_idle_timeout do PgBouncer.',
+                id='core.W002',
+            ))
+    return avisos
+
+
+@checks.register('conexoes', deploy=True)
+def informar_conexoes(app_configs, **kwargs):
+    """Lista a configuração de conexão de cada banco (check --deploy)"""
+    informacoes = []
+    for banco in descrever_conexoes(settings.DATABASES):
+        max_age = 'sem limite' if banco['conn_max_age'] is None else f"{banco['conn_max_age']}s"
+        informacoes.append(checks.Info(
+            f"Banco '{banco['alias']}' ({banco['engine']}, {banco['host']}): "
+            f"CONN_MAX_AGE={max_age}, health checks={'sim' if banco['health_checks'] else 'não'}, "
+            f"PgBouncer={'sim' if banco['pgbouncer'] else 'não'}, "
+            f"connect_timeout={banco['connect_timeout'] or 'padrão'}",
+            id='core.I001',
+        ))
+    return informacoes
+
+
+# Engines de sessão que guardam a sessão no cache
+ENGINES_SESSAO_CACHE = (
+    'django.contrib.sessions.backends.cache',
+    'django.contrib.sessions.backends.cached_db',
+)
+
+
+@checks.register('sessoes')
+def verificar_sessoes(app_configs, **kwargs):
+    """Recusa sessões em cache quando o cache é local a cada processo"""
+    if settings.SESSION_ENGINE not in ENGINES_SESSAO_CACHE:
+        return []
+    cache = caches[getattr(settings, 'SESSION_CACHE_ALIAS', 'default')]
+    if not isinstance(cache, (LocMemCache, DummyCache)):
+        return []
+    return [checks.Error(
+        f"SESSION_ENGINE='{settings.SESSION_ENGINE}' usa um cache local ao processo "
+        f"({cache.__class__.__name__}).",
+        hint='Cada worker manteria sua própria cópia das sessões (logout e mensagens não '
+             'chegariam aos demais). Use django.contrib.sessions.backends.db ou configure '
+             'um cache compartilhado (Redis/Memcached).',
+        id='core.E001',
+    )]
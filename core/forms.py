@@ -3,6 +3,8 @@ from django.contrib.auth.forms import AuthenticationForm, UserCreationForm, User
 from django.core.validators import RegexValidator
 from django.conf import settings
 from .models import Usuario, InstitucionalConfig, FeedPost, AssejurNews, AssejurInformativo
+from .services.provisionamento import hash_senha_temporaria
+from .widgets import BuscaRemotaSelectMultiple
 import secrets
 import string
 
@@ -126,7 +128,7 @@ class UsuarioCreationForm(UserCreationForm):
         
         # Definir senha padrão
         senha_padrao = 'abmepi2025'
-        user.set_password(senha_padrao)
+        user.password = hash_senha_temporaria(senha_padrao)
         
         # Marcar como primeiro acesso (deve alterar senha)
         user.primeiro_acesso = True
@@ -1087,6 +1089,51 @@ class AtaReuniaoEditorForm(forms.ModelForm):
         return conteudo
 
 
+class AtaReuniaoEditorPresencasForm(AtaReuniaoEditorForm):
+    """
+    Formulário do editor avançado: inclui as listas de presença, que o
+    salvamento automático também envia
+    """
+
+    class Meta(AtaReuniaoEditorForm.Meta):
+        fields = AtaReuniaoEditorForm.Meta.fields + [
+            'membros_presentes', 'membros_ausentes',
+            'associados_presentes', 'associados_ausentes'
+        ]
+        widgets = {
+            **AtaReuniaoEditorForm.Meta.widgets,
+            'membros_presentes': forms.SelectMultiple(attrs={
+                'class': 'form-select',
+                'size': '6'
+            }),
+            'membros_ausentes': forms.SelectMultiple(attrs={
+                'class': 'form-select',
+                'size': '6'
+            }),
+            'associados_presentes': BuscaRemotaSelectMultiple(fonte='associados', attrs={
+                'class': 'form-control',
+                'size': '6'
+            }),
+            'associados_ausentes': BuscaRemotaSelectMultiple(fonte='associados', attrs={
+                'class': 'form-control',
+                'size': '6'
+            })
+        }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Listas de presença são opcionais no editor
+        for campo in ('membros_presentes', 'membros_ausentes', 'associados_presentes', 'associados_ausentes'):
+            self.fields[campo].required = False
+
+        # Atas antigas podem registrar membros que já deixaram a diretoria
+        from diretoria.models import MembroDiretoria
+        membros = MembroDiretoria.objects.select_related('associado', 'cargo')
+        self.fields['membros_presentes'].queryset = membros
+        self.fields['membros_ausentes'].queryset = membros
+
+
 class AtaReuniaoTemplateForm(forms.Form):
     """
     Formulário para seleção de templates de atas
@@ -0,0 +1,21 @@
+"""
+Hashers de senha do sistema ABMEPI
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class SenhaTemporariaPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2 com menos iterações para senhas temporárias de uso único.
+
+    Usado apenas no provisionamento de usuários (core.services.provisionamento),
+    que sempre marca primeiro_acesso=True: o usuário troca a senha no primeiro
+    login e, como este não é o hasher preferido, o Django regrava o hash com o
+    hasher padrão assim que a senha temporária é validada.
+    """
+    algorithm = 'pbkdf2_sha256_temporaria'
+
+    @property
+    def iterations(self):
+        return getattr(settings, 'SENHA_TEMPORARIA_ITERACOES', 20000)
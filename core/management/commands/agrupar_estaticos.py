@@ -0,0 +1,41 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.estaticos import DIRETORIO_PACOTES, gerar_pacote
+
+
+class Command(BaseCommand):
+    help = (
+        'Concatena os scripts de ESTATICOS_PACOTES em static/pacotes/<nome>.js. '
+        'Execute antes do collectstatic.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'pacotes',
+            nargs='*',
+            help='Nomes dos pacotes (padrão: todos)',
+        )
+
+    def handle(self, *args, **options):
+        nomes = options['pacotes'] or list(settings.ESTATICOS_PACOTES)
+        desconhecidos = [nome for nome in nomes if nome not in settings.ESTATICOS_PACOTES]
+        if desconhecidos:
+            raise CommandError(f'Pacote(s) não configurado(s): {", ".join(desconhecidos)}')
+
+        destino = os.path.join(settings.BASE_DIR, 'static', DIRETORIO_PACOTES)
+        self.stdout.write(f'🔍 Gerando {len(nomes)} pacote(s) em {destino}...')
+
+        for nome in nomes:
+            try:
+                caminho, tamanho = gerar_pacote(nome, destino)
+            except FileNotFoundError as e:
+                raise CommandError(f'Pacote {nome}: {e}')
+            self.stdout.write(
+                f'   - {nome}: {len(settings.ESTATICOS_PACOTES[nome])} arquivo(s), '
+                f'{tamanho / 1024:.1f} KB ({os.path.basename(caminho)})'
+            )
+
+        self.stdout.write(self.style.SUCCESS('✅ Pacotes gerados! Execute o collectstatic para publicá-los.'))
@@ -0,0 +1,68 @@
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import LogAtividade
+from core.services.auditoria import arquivar_logs
+
+
+class Command(BaseCommand):
+    help = (
+        'Arquiva em arquivos JSON Lines compactados (gzip) e remove do banco os '
+        'logs de atividade mais antigos que o período de retenção'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dias',
+            type=int,
+            default=getattr(settings, 'LOG_ATIVIDADE_RETENCAO_DIAS', 365),
+            help='Manter no banco os logs dos últimos N dias',
+        )
+        parser.add_argument(
+            '--diretorio',
+            default=str(getattr(settings, 'LOG_ATIVIDADE_ARQUIVO_DIR', settings.BASE_DIR / 'logs' / 'arquivo')),
+            help='Diretório onde os arquivos .jsonl.gz serão gravados',
+        )
+        parser.add_argument(
+            '--lote',
+            type=int,
+            default=5000,
+            help='Quantidade de registros processados por vez',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Mostra quantos registros seriam arquivados sem executar',
+        )
+
+    def handle(self, *args, **options):
+        limite = timezone.now() - timedelta(days=options['dias'])
+        total = LogAtividade.objects.no_periodo(fim=limite).count()
+        
+        if not total:
+            self.stdout.write(self.style.SUCCESS('✅ Nenhum log de atividade a arquivar.'))
+            return
+        
+        self.stdout.write(
+            f'🔍 {total} logs anteriores a {timezone.localtime(limite).strftime("%d/%m/%Y %H:%M")}'
+        )
+        
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('🔍 Modo DRY-RUN: Nenhuma alteração foi feita.'))
+            return
+        
+        os.makedirs(options['diretorio'], exist_ok=True)
+        destino = os.path.join(
+            options['diretorio'],
+            f'logs_atividade_ate_{timezone.localtime(limite).strftime("%Y%m%d_%H%M%S")}.jsonl.gz'
+        )
+        
+        arquivados = arquivar_logs(limite, destino, lote=options['lote'])
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ {arquivados} logs arquivados em {destino}')
+        )
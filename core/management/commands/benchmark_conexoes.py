@@ -0,0 +1,139 @@
+import statistics
+import time
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from abmepi.conexoes import descrever_conexoes
+
+
+class Command(BaseCommand):
+    help = (
+        'Mostra a configuração de conexões com o banco e mede o custo de abrir uma '
+        'conexão e a latência de requisições sem e com conexões persistentes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requisicoes',
+            type=int,
+            default=50,
+            help='Quantidade de conexões/requisições medidas em cada modo (padrão: 50)',
+        )
+        parser.add_argument(
+            '--url',
+            default='/',
+            help='Caminho requisitado no teste de latência (padrão: /)',
+        )
+        parser.add_argument(
+            '--host',
+            default='localhost',
+            help='Cabeçalho Host das requisições; deve estar em ALLOWED_HOSTS (padrão: localhost)',
+        )
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Banco medido (padrão: default)',
+        )
+
+    def handle(self, *args, **options):
+        quantidade = max(1, options['requisicoes'])
+        conexao = connections[options['database']]
+
+        self.stdout.write('🔍 Configuração de conexões:')
+        for banco in descrever_conexoes(settings.DATABASES):
+            max_age = 'sem limite' if banco['conn_max_age'] is None else f"{banco['conn_max_age']}s"
+            self.stdout.write(
+                f"   - {banco['alias']} ({banco['engine']}, {banco['host']}): CONN_MAX_AGE={max_age}, "
+                f"health checks={'sim' if banco['health_checks'] else 'não'}, "
+                f"PgBouncer={'sim' if banco['pgbouncer'] else 'não'}"
+            )
+        self._mostrar_limites_servidor(conexao)
+
+        self.stdout.write(f'\n🔍 Abrindo {quantidade} conexões...')
+        tempos = []
+        for _ in range(quantidade):
+            conexao.close()
+            inicio = time.perf_counter()
+            conexao.ensure_connection()
+            tempos.append(time.perf_counter() - inicio)
+        conexao.close()
+        self._mostrar_tempos('Abertura de conexão', tempos)
+
+        max_age_original = conexao.settings_dict['CONN_MAX_AGE']
+        persistente = max_age_original if max_age_original != 0 else 60
+        self.stdout.write(f"\n🔍 {quantidade} requisições GET {options['url']} por modo...")
+        try:
+            antes = self._medir_requisicoes(conexao, 0, quantidade, options['url'], options['host'])
+            depois = self._medir_requisicoes(conexao, persistente, quantidade, options['url'], options['host'])
+        finally:
+            conexao.settings_dict['CONN_MAX_AGE'] = max_age_original
+            conexao.close()
+        if antes is None or depois is None:
+            return
+
+        self._mostrar_tempos('Sem persistência (CONN_MAX_AGE=0)', antes)
+        self._mostrar_tempos(f'Persistente (CONN_MAX_AGE={persistente})', depois)
+
+        ganho = statistics.mean(antes) - statistics.mean(depois)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'✅ Diferença média por requisição: {ganho * 1000:.2f} ms '
+                f'({ganho / statistics.mean(antes) * 100:.1f}%)'
+            )
+        )
+
+    def _medir_requisicoes(self, conexao, max_age, quantidade, url, host):
+        """
+        Executa as requisições pelo WSGIHandler, que dispara request_started e
+        request_finished e, com isso, o descarte/reaproveitamento da conexão
+        como em um worker real.
+        """
+        conexao.close()
+        conexao.settings_dict['CONN_MAX_AGE'] = max_age
+        handler = WSGIHandler()
+        tempos = []
+        for _ in range(quantidade):
+            ambiente = {'PATH_INFO': url, 'HTTP_HOST': host}
+            setup_testing_defaults(ambiente)
+            status = []
+            inicio = time.perf_counter()
+            resposta = handler(ambiente, lambda codigo, cabecalhos, *args: status.append(codigo))
+            try:
+                for _ in resposta:
+                    pass
+            finally:
+                resposta.close()
+            tempos.append(time.perf_counter() - inicio)
+
+            if status and status[0][:1] not in ('2', '3'):
+                self.stdout.write(
+                    self.style.WARNING(f'⚠️  A requisição retornou {status[0]}; informe outra --url ou --host.')
+                )
+                return None
+        return tempos
+
+    def _mostrar_limites_servidor(self, conexao):
+        if conexao.vendor != 'postgresql':
+            return
+        with conexao.cursor() as cursor:
+            cursor.execute('SHOW max_connections')
+            maximo = int(cursor.fetchone()[0])
+            cursor.execute('SELECT count(*) FROM pg_stat_activity WHERE datname = current_database()')
+            abertas = cursor.fetchone()[0]
+        self.stdout.write(f'   - Servidor: {abertas} conexão(ões) abertas, max_connections={maximo}')
+        self.stdout.write(
+            '   - Com conexões persistentes cada worker (e cada thread) mantém uma conexão; '
+            'a soma dos workers de todas as instâncias deve ficar abaixo de max_connections.'
+        )
+
+    def _mostrar_tempos(self, titulo, tempos):
+        ordenados = sorted(tempos)
+        p95 = ordenados[min(len(ordenados) - 1, int(len(ordenados) * 0.95))]
+        self.stdout.write(
+            f'   - {titulo}: média {statistics.mean(tempos) * 1000:.2f} ms, '
+            f'mediana {statistics.median(tempos) * 1000:.2f} ms, p95 {p95 * 1000:.2f} ms'
+        )
@@ -0,0 +1,108 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.services.benchmark import (
+    PAGINAS, carregar_resultado, comparar_resultados, medir_paginas, salvar_resultado
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede latência e número de consultas das páginas principais e grava o resultado '
+        'em JSON, opcionalmente comparando com uma execução anterior.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeticoes',
+            type=int,
+            default=5,
+            help='Requisições medidas por página (padrão: 5)',
+        )
+        parser.add_argument(
+            '--pagina',
+            action='append',
+            dest='paginas',
+            choices=[nome for nome, _, _ in PAGINAS],
+            help='Medir apenas a página informada (pode ser repetido)',
+        )
+        parser.add_argument(
+            '--rotulo',
+            default='',
+            help='Identificação da execução (ex.: versão ou commit)',
+        )
+        parser.add_argument(
+            '--saida',
+            help='Arquivo JSON de saída (padrão: benchmarks/<data>.json)',
+        )
+        parser.add_argument(
+            '--comparar',
+            help='Arquivo JSON de uma execução anterior para comparação',
+        )
+        parser.add_argument(
+            '--tolerancia',
+            type=float,
+            default=0.2,
+            help='Aumento relativo da mediana considerado regressão (padrão: 0.2)',
+        )
+        parser.add_argument(
+            '--host',
+            default='localhost',
+            help='Cabeçalho Host das requisições; deve estar em ALLOWED_HOSTS (padrão: localhost)',
+        )
+        parser.add_argument(
+            '--https',
+            action='store_true',
+            help='Requisitar como HTTPS (quando SECURE_SSL_REDIRECT está ativo)',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"🔍 Medindo páginas ({options['repeticoes']} repetições cada)...")
+        resultado = medir_paginas(
+            repeticoes=options['repeticoes'],
+            paginas=options['paginas'],
+            host=options['host'],
+            https=options['https'],
+            rotulo=options['rotulo'],
+        )
+
+        volume = ', '.join(f'{nome}={quantidade}' for nome, quantidade in resultado['volume'].items())
+        self.stdout.write(f'   - Volume: {volume}')
+        for nome, medida in resultado['paginas'].items():
+            if 'erro' in medida:
+                self.stdout.write(self.style.WARNING(f"⚠️  {nome}: {medida['erro']}"))
+                continue
+            linha = (
+                f"   - {nome}: {medida['mediana_ms']:.1f} ms (p95 {medida['p95_ms']:.1f} ms), "
+                f"{medida['consultas']} consultas, HTTP {medida['status']}"
+            )
+            self.stdout.write(linha if medida['status'] < 400 else self.style.WARNING(linha))
+
+        saida = options['saida'] or (
+            settings.BASE_DIR / 'benchmarks' / f"{timezone.now():%Y%m%d-%H%M%S}.json"
+        )
+        caminho = salvar_resultado(resultado, saida)
+        self.stdout.write(self.style.SUCCESS(f'✅ Resultado gravado em {caminho}'))
+
+        if options['comparar']:
+            self._comparar(resultado, carregar_resultado(options['comparar']), options['tolerancia'])
+
+    def _comparar(self, resultado, anterior, tolerancia):
+        self.stdout.write(f"\n🔍 Comparação com {anterior.get('rotulo') or anterior.get('data')}:")
+        regressoes = 0
+        for item in comparar_resultados(resultado, anterior, tolerancia):
+            linha = (
+                f"   - {item['pagina']}: {item['mediana_anterior']:.1f} → {item['mediana_atual']:.1f} ms, "
+                f"{item['consultas_anterior']} → {item['consultas_atual']} consultas"
+            )
+            if item['regressao']:
+                regressoes += 1
+                self.stdout.write(self.style.WARNING(f'⚠️ {linha[5:]}'))
+            else:
+                self.stdout.write(linha)
+
+        if regressoes:
+            self.stdout.write(self.style.WARNING(f'⚠️  {regressoes} página(s) com regressão'))
+        else:
+            self.stdout.write(self.style.SUCCESS('✅ Nenhuma regressão encontrada!'))
@@ -0,0 +1,75 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.services.dados_sinteticos import gerar_dados_sinteticos, limpar_dados_sinteticos
+
+
+class Command(BaseCommand):
+    help = (
+        'Gera dados sintéticos (associados, dependentes, mensalidades, pagamentos, '
+        'processos, sessões e reservas) para testes de desempenho. Não use em produção.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--associados',
+            type=int,
+            default=1000,
+            help='Quantidade de associados (padrão: 1000)',
+        )
+        parser.add_argument(
+            '--anos',
+            type=int,
+            default=3,
+            help='Anos de mensalidades por associado (padrão: 3)',
+        )
+        parser.add_argument(
+            '--semente',
+            type=int,
+            default=42,
+            help='Semente do gerador aleatório (padrão: 42)',
+        )
+        parser.add_argument(
+            '--bloco',
+            type=int,
+            default=500,
+            help='Associados gravados por transação (padrão: 500)',
+        )
+        parser.add_argument(
+            '--limpar',
+            action='store_true',
+            help='Remover os dados sintéticos existentes antes de gerar',
+        )
+        parser.add_argument(
+            '--apenas-limpar',
+            action='store_true',
+            help='Apenas remover os dados sintéticos existentes',
+        )
+
+    def handle(self, *args, **options):
+        if options['limpar'] or options['apenas_limpar']:
+            removidos = limpar_dados_sinteticos()
+            self.stdout.write(f'🔍 {sum(removidos.values())} registro(s) sintético(s) removido(s)')
+            for modelo, quantidade in sorted(removidos.items()):
+                self.stdout.write(f'   - {modelo}: {quantidade}')
+            if options['apenas_limpar']:
+                return
+
+        self.stdout.write(f"🔍 Gerando {options['associados']} associado(s) com {options['anos']} ano(s) de mensalidades...")
+        inicio = time.perf_counter()
+        totais = gerar_dados_sinteticos(
+            associados=options['associados'],
+            anos=options['anos'],
+            semente=options['semente'],
+            bloco=max(1, options['bloco']),
+            progresso=lambda gerados, total: self.stdout.write(f'   - {gerados}/{total} associados'),
+        )
+
+        for nome, quantidade in totais.items():
+            self.stdout.write(f'   - {nome}: {quantidade}')
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'✅ {sum(totais.values())} registros gerados em {time.perf_counter() - inicio:.1f}s!'
+            )
+        )
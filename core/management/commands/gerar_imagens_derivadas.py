@@ -0,0 +1,66 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.imagens import campos_configurados, gerar_derivadas_com_log
+
+
+class Command(BaseCommand):
+    help = (
+        'Gera as imagens derivadas (WebP/JPEG responsivos) das imagens já enviadas '
+        'nos campos de IMAGENS_DERIVADAS_CAMPOS.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--modelo',
+            action='append',
+            dest='modelos',
+            help='Processar apenas o modelo informado, ex.: core.FeedPost (pode ser repetido)',
+        )
+        parser.add_argument(
+            '--forcar',
+            action='store_true',
+            help='Regerar as derivadas que já existem',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=getattr(settings, 'IMAGENS_DERIVADAS_WORKERS', 2) or 1,
+            help='Threads usadas na geração',
+        )
+
+    def handle(self, *args, **options):
+        campos = campos_configurados()
+        if options['modelos']:
+            selecionados = {rotulo.lower() for rotulo in options['modelos']}
+            campos = [(modelo, campo) for modelo, campo in campos if modelo._meta.label_lower in selecionados]
+            if not campos:
+                raise CommandError('Nenhum campo configurado para os modelos informados.')
+
+        total_imagens = 0
+        total_derivadas = 0
+        with ThreadPoolExecutor(max_workers=max(1, options['workers'])) as pool:
+            for modelo, nome_campo in campos:
+                nomes = set(
+                    modelo.objects.exclude(**{nome_campo: ''}).exclude(**{f'{nome_campo}__isnull': True})
+                    .values_list(nome_campo, flat=True)
+                )
+                self.stdout.write(f'🔍 {modelo._meta.label}.{nome_campo}: {len(nomes)} imagem(ns)')
+                if not nomes:
+                    continue
+
+                storage = modelo._meta.get_field(nome_campo).storage
+                geradas = list(pool.map(
+                    lambda nome: gerar_derivadas_com_log(nome, storage, forcar=options['forcar']),
+                    sorted(nomes)
+                ))
+                quantidade = sum(len(derivadas) for derivadas in geradas)
+                self.stdout.write(f'   - {quantidade} derivada(s) gerada(s)')
+                total_imagens += len(nomes)
+                total_derivadas += quantidade
+
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ {total_derivadas} derivada(s) gerada(s) para {total_imagens} imagem(ns)!')
+        )
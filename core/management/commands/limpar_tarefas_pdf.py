@@ -0,0 +1,49 @@
+import os
+import shutil
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from core.models import TarefaPDF
+
+
+class Command(BaseCommand):
+    help = 'Remove as tarefas de PDF vencidas (PDF_TAREFAS_VALIDADE) e os respectivos arquivos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Mostra o que seria removido sem executar a limpeza',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        
+        validade = timedelta(seconds=getattr(settings, 'PDF_TAREFAS_VALIDADE', 86400))
+        tarefas_vencidas = TarefaPDF.objects.filter(data_criacao__lt=timezone.now() - validade)
+        # Arquivos gerados antes da mudança para PDF_TAREFAS_DIR, ainda em MEDIA_ROOT
+        diretorio_antigo = os.path.join(settings.MEDIA_ROOT, 'pdfs', 'tarefas')
+        
+        total = tarefas_vencidas.count()
+        self.stdout.write(f'🔍 Encontradas {total} tarefas de PDF vencidas.')
+        if os.path.isdir(diretorio_antigo):
+            self.stdout.write(f'🔍 Diretório público antigo encontrado: {diretorio_antigo}')
+        
+        if dry_run:
+            self.stdout.write(
+                self.style.WARNING('\n🔍 Modo DRY-RUN: Nenhuma alteração foi feita.')
+            )
+            return
+        
+        for tarefa in tarefas_vencidas.iterator():
+            if tarefa.arquivo:
+                tarefa.arquivo.delete(save=False)
+        tarefas_vencidas.delete()
+        if os.path.isdir(diretorio_antigo):
+            shutil.rmtree(diretorio_antigo, ignore_errors=True)
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'\n✅ {total} tarefas de PDF vencidas foram removidas com sucesso!')
+        )
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from core.services.visualizacoes_buffer import buffer_disponivel, descarregar_visualizacoes
+
+
+class Command(BaseCommand):
+    help = (
+        'Grava no banco as visualizações de notícias ASSEJUR acumuladas no cache. '
+        'Execute periodicamente (ex.: a cada minuto via cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--noticia-id',
+            type=int,
+            action='append',
+            dest='noticia_ids',
+            help='ID de uma notícia específica (pode ser repetido)',
+        )
+
+    def handle(self, *args, **options):
+        if not buffer_disponivel():
+            self.stdout.write(
+                self.style.WARNING(
+                    '⚠️  Cache compartilhado não configurado: cada processo da aplicação '
+                    'grava as próprias visualizações no banco.'
+                )
+            )
+            return
+        
+        gravadas = descarregar_visualizacoes(options.get('noticia_ids'))
+        
+        for noticia_id, quantidade in gravadas.items():
+            self.stdout.write(f'   - Notícia {noticia_id}: +{quantidade} visualizações')
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'✅ {sum(gravadas.values())} visualizações sincronizadas em {len(gravadas)} notícias!'
+            )
+        )
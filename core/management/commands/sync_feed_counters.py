@@ -3,7 +3,11 @@ from core.models import FeedPost
 
 
 class Command(BaseCommand):
-    help = 'Sincroniza os contadores de likes e comentários dos posts do feed'
+    help = (
+        'Sincroniza os contadores de likes e comentários dos posts do feed. '
+        'Os contadores são mantidos pelas views; execute periodicamente (cron) '
+        'apenas para reconciliar divergências.'
+    )
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -30,18 +34,8 @@ class Command(BaseCommand):
                     self.style.ERROR(f'Post com ID {post_id} não encontrado')
                 )
         else:
-            # Sincronizar todos os posts
-            posts = FeedPost.objects.all()
-            total_posts = posts.count()
-            
-            self.stdout.write(f'Sincronizando {total_posts} posts...')
-            
-            for i, post in enumerate(posts, 1):
-                counters = post.sync_counters()
-                self.stdout.write(
-                    f'[{i}/{total_posts}] {post.titulo}: '
-                    f'{counters["likes"]} likes, {counters["comentarios"]} comentários'
-                )
+            # Reconciliar todos os posts em um único UPDATE
+            total_posts = FeedPost.reconciliar_contadores()
             
             self.stdout.write(
                 self.style.SUCCESS(f'✅ Sincronização concluída para {total_posts} posts!')
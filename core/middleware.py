@@ -1,3 +1,6 @@
+import time
+
+from django.conf import settings
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.contrib import messages
@@ -38,3 +41,57 @@ class PrimeiroAcessoMiddleware:
         
         response = self.get_response(request)
         return response
+
+
+class AuditoriaMiddleware:
+    """
+    Middleware que acumula os logs de atividade da requisição e os grava em
+    um único bulk_create ao final da resposta
+    """
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+    
+    def __call__(self, request):
+        from core.services import auditoria
+        
+        token = auditoria.iniciar_buffer()
+        try:
+            response = self.get_response(request)
+        finally:
+            auditoria.descarregar_buffer(token)
+        return response
+
+
+class SessaoDeslizanteMiddleware:
+    """
+    Middleware que renova a expiração da sessão de usuários autenticados sem
+    regravá-la a cada requisição (substitui SESSION_SAVE_EVERY_REQUEST).
+    
+    A sessão guarda o instante da última gravação; ela só é regravada quando
+    faltam menos de SESSAO_RENOVAR_ANTES segundos para expirar (ou quando a
+    própria requisição já a alterou). Deve ficar depois do SessionMiddleware
+    e do AuthenticationMiddleware.
+    """
+    
+    CHAVE = '_sessao_gravada_em'
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+    
+    def __call__(self, request):
+        response = self.get_response(request)
+        
+        usuario = getattr(request, 'user', None)
+        if usuario is not None and usuario.is_authenticated:
+            self.renovar(request.session)
+        return response
+    
+    def renovar(self, sessao):
+        agora = int(time.time())
+        if not sessao.modified:
+            gravada_em = sessao.get(self.CHAVE, 0)
+            limite = sessao.get_session_cookie_age() - getattr(settings, 'SESSAO_RENOVAR_ANTES', 900)
+            if agora - gravada_em < limite:
+                return
+        sessao[self.CHAVE] = agora
@@ -0,0 +1,25 @@
+# Generated by Django 5.0.2 on 2026-10-19 17:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_auto_20250905_2219'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='logatividade',
+            index=models.Index(fields=['-data_hora'], name='core_logati_data_ho_f2aac6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='logatividade',
+            index=models.Index(fields=['usuario', '-data_hora'], name='core_logati_usuario_9f0e09_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='logatividade',
+            index=models.Index(fields=['modulo', '-data_hora'], name='core_logati_modulo_73e5d8_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.2 on 2026-10-19 18:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0023_logatividade_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Sequencia',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('escopo', models.CharField(max_length=50, verbose_name='Escopo')),
+                ('ano', models.PositiveIntegerField(default=0, help_text='0 para sequências que não reiniciam a cada ano', verbose_name='Ano')),
+                ('valor', models.PositiveIntegerField(default=0, verbose_name='Último Número')),
+            ],
+            options={
+                'verbose_name': 'Sequência',
+                'verbose_name_plural': 'Sequências',
+                'ordering': ['escopo', '-ano'],
+                'unique_together': {('escopo', 'ano')},
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.2 on 2026-10-19 18:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0024_sequencia'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TarefaPDF',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nome_arquivo', models.CharField(max_length=200, verbose_name='Nome do Arquivo')),
+                ('status', models.CharField(choices=[('processando', 'Processando'), ('concluido', 'Concluído'), ('erro', 'Erro')], default='processando', max_length=20, verbose_name='Status')),
+                ('arquivo', models.FileField(blank=True, upload_to='pdfs/tarefas/%Y/%m/', verbose_name='Arquivo')),
+                ('erro', models.TextField(blank=True, verbose_name='Erro')),
+                ('data_criacao', models.DateTimeField(auto_now_add=True, verbose_name='Data de Criação')),
+                ('data_conclusao', models.DateTimeField(blank=True, null=True, verbose_name='Data de Conclusão')),
+                ('usuario', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Solicitado por')),
+            ],
+            options={
+                'verbose_name': 'Tarefa de PDF',
+                'verbose_name_plural': 'Tarefas de PDF',
+                'ordering': ['-data_criacao'],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.2 on 2026-10-19 19:49
+
+import core.models
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0025_tarefapdf'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='tarefapdf',
+            name='arquivo',
+            field=models.FileField(blank=True, storage=core.storage.armazenamento_tarefas_pdf, upload_to=core.models._caminho_tarefa_pdf, verbose_name='Arquivo'),
+        ),
+    ]
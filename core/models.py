@@ -1,7 +1,10 @@
 from django.contrib.auth.models import AbstractUser, Group, Permission
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Greatest
 from django.core.validators import RegexValidator
 from django.utils.translation import gettext_lazy as _
+from .storage import armazenamento_tarefas_pdf, nome_aleatorio
 
 
 class Usuario(AbstractUser):
@@ -107,9 +110,39 @@ class Usuario(AbstractUser):
         super().save(*args, **kwargs)
 
 
+class LogAtividadeQuerySet(models.QuerySet):
+    """
+    Consultas usadas pelos dashboards sobre o log de atividades
+    """
+    
+    def recentes(self, limite=10):
+        """Últimas atividades com o usuário já carregado"""
+        return self.select_related('usuario').order_by('-data_hora')[:limite]
+    
+    def do_usuario(self, usuario):
+        """Linha do tempo de um usuário (índice usuario, data_hora)"""
+        return self.filter(usuario=usuario).order_by('-data_hora')
+    
+    def do_modulo(self, modulo):
+        """Linha do tempo de um módulo (índice modulo, data_hora)"""
+        return self.filter(modulo=modulo).order_by('-data_hora')
+    
+    def no_periodo(self, inicio=None, fim=None):
+        """Atividades entre inicio (inclusive) e fim (exclusivo)"""
+        queryset = self
+        if inicio:
+            queryset = queryset.filter(data_hora__gte=inicio)
+        if fim:
+            queryset = queryset.filter(data_hora__lt=fim)
+        return queryset
+
+
 class LogAtividade(models.Model):
     """
     Modelo para registrar atividades dos usuários
+    
+    Para gravar novas atividades use core.services.auditoria.registrar_atividade,
+    que acumula os registros da requisição e os grava em um único bulk_create.
     """
     usuario = models.ForeignKey(
         Usuario,
@@ -143,10 +176,17 @@ class LogAtividade(models.Model):
         verbose_name=_('Data e Hora')
     )
     
+    objects = LogAtividadeQuerySet.as_manager()
+    
     class Meta:
         verbose_name = _('Log de Atividade')
         verbose_name_plural = _('Logs de Atividade')
         ordering = ['-data_hora']
+        indexes = [
+            models.Index(fields=['-data_hora']),
+            models.Index(fields=['usuario', '-data_hora']),
+            models.Index(fields=['modulo', '-data_hora']),
+        ]
     
     def __str__(self):
         return f"{self.usuario.username} - {self.acao} - {self.data_hora}"
@@ -452,8 +492,31 @@ class FeedPost(models.Model):
             return self.like_set.filter(usuario=user).exists()
         return False
     
+    def ajustar_contadores(self, likes=0, comentarios=0):
+        """
+        Incrementa/decrementa atomicamente os contadores desnormalizados.
+
+        Usa expressões F() para que likes e comentários simultâneos não
+        sobrescrevam uns aos outros; os valores nunca ficam negativos.
+        """
+        campos = {}
+        if likes:
+            campos['likes'] = Greatest(F('likes') + likes, 0)
+        if comentarios:
+            campos['comentarios'] = Greatest(F('comentarios') + comentarios, 0)
+        if not campos:
+            return
+
+        FeedPost.objects.filter(pk=self.pk).update(**campos)
+        self.refresh_from_db(fields=list(campos))
+
     def sync_counters(self):
-        """Sincroniza os contadores com os dados reais do banco"""
+        """
+        Sincroniza os contadores com os dados reais do banco.
+
+        Operação de reconciliação (ver comando sync_feed_counters); o fluxo
+        normal mantém os contadores via ajustar_contadores().
+        """
         # Atualizar contador de likes (autenticados + anônimos)
         likes_count = self.get_likes_count()
         
@@ -470,6 +533,29 @@ class FeedPost(models.Model):
             'comentarios': comments_count
         }
     
+    @classmethod
+    def reconciliar_contadores(cls, queryset=None):
+        """
+        Recalcula os contadores de todos os posts em um único UPDATE.
+
+        Corrige divergências causadas por alterações feitas fora das views
+        (admin, exclusões em cascata). Retorna o número de posts atualizados.
+        """
+        from django.db.models import Count, OuterRef, Subquery, Value
+        from django.db.models.functions import Coalesce
+
+        def _contagem(model, **filtros):
+            subquery = model.objects.filter(
+                post=OuterRef('pk'), **filtros
+            ).order_by().values('post').annotate(total=Count('pk')).values('total')
+            return Coalesce(Subquery(subquery), Value(0))
+
+        queryset = cls.objects.all() if queryset is None else queryset
+        return queryset.update(
+            likes=_contagem(Like) + _contagem(LikeAnonimo),
+            comentarios=_contagem(Comentario, ativo=True),
+        )
+
     def get_total_likes_count(self, session_likes=None):
         """Retorna o total de likes (já inclui anônimos do banco)"""
         return self.get_likes_count()
@@ -508,7 +594,10 @@ class Like(models.Model):
 
 class LikeAnonimo(models.Model):
     """
-    Modelo para likes anônimos dos posts do feed (usando sessão)
+    Modelo para likes anônimos dos posts do feed
+    
+    session_key guarda o identificador do visitante (cookie assinado, ver
+    core.services.visitantes); likes antigos usavam a chave da sessão.
     """
     post = models.ForeignKey(
         FeedPost,
@@ -845,10 +934,10 @@ class AssejurNews(models.Model):
         """Retorna os comentários ativos da notícia"""
         return self.comentarios.filter(ativo=True).select_related('usuario').order_by('data_criacao')
     
-    def incrementar_visualizacoes(self):
-        """Incrementa o contador de visualizações"""
-        self.visualizacoes += 1
-        self.save(update_fields=['visualizacoes'])
+    def incrementar_visualizacoes(self, quantidade=1):
+        """Incrementa atomicamente o contador de visualizações"""
+        AssejurNews.objects.filter(pk=self.pk).update(visualizacoes=F('visualizacoes') + quantidade)
+        self.visualizacoes += quantidade
 
 
 class AssejurInformativo(models.Model):
@@ -1100,6 +1189,127 @@ class ConfiguracaoCobranca(models.Model):
         return config
 
 
+
+class Sequencia(models.Model):
+    """
+    Contador de numeração por escopo e ano (atas, reservas, procurações...),
+    incrementado com UPDATE sob bloqueio de linha (ver core.services.sequencias)
+    """
+    escopo = models.CharField(
+        max_length=50,
+        verbose_name=_('Escopo')
+    )
+    
+    ano = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Ano'),
+        help_text=_('0 para sequências que não reiniciam a cada ano')
+    )
+    
+    valor = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Último Número')
+    )
+    
+    class Meta:
+        verbose_name = _('Sequência')
+        verbose_name_plural = _('Sequências')
+        ordering = ['escopo', '-ano']
+        unique_together = ['escopo', 'ano']
+    
+    def __str__(self):
+        return f"{self.escopo}/{self.ano}: {self.valor}"
+
+
+def _caminho_tarefa_pdf(instance, filename):
+    return nome_aleatorio('tarefas', 'pdf')
+
+
+class TarefaPDF(models.Model):
+    """
+    PDF gerado em segundo plano pelo pool de processos (ver core.services.pdf).
+    
+    O arquivo fica fora de MEDIA_ROOT (PDF_TAREFAS_DIR), com nome aleatório, e
+    só é entregue por core.views_pdf a quem o solicitou, por até
+    PDF_TAREFAS_VALIDADE segundos (ver o comando limpar_tarefas_pdf).
+    """
+    STATUS_CHOICES = [
+        ('processando', 'Processando'),
+        ('concluido', 'Concluído'),
+        ('erro', 'Erro'),
+    ]
+    
+    nome_arquivo = models.CharField(
+        max_length=200,
+        verbose_name=_('Nome do Arquivo')
+    )
+    
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='processando',
+        verbose_name=_('Status')
+    )
+    
+    arquivo = models.FileField(
+        upload_to=_caminho_tarefa_pdf,
+        storage=armazenamento_tarefas_pdf,
+        blank=True,
+        verbose_name=_('Arquivo')
+    )
+    
+    erro = models.TextField(
+        blank=True,
+        verbose_name=_('Erro')
+    )
+    
+    usuario = models.ForeignKey(
+        Usuario,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        verbose_name=_('Solicitado por')
+    )
+    
+    data_criacao = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_('Data de Criação')
+    )
+    
+    data_conclusao = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_('Data de Conclusão')
+    )
+    
+    class Meta:
+        verbose_name = _('Tarefa de PDF')
+        verbose_name_plural = _('Tarefas de PDF')
+        ordering = ['-data_criacao']
+    
+    def __str__(self):
+        return f"{self.nome_arquivo} ({self.get_status_display()})"
+    
+    @property
+    def expirada(self):
+        """Tarefa ainda em processamento além de PDF_TIMEOUT_FILA segundos"""
+        from datetime import timedelta
+        from django.conf import settings
+        from django.utils import timezone
+        
+        limite = timedelta(seconds=getattr(settings, 'PDF_TIMEOUT_FILA', 600))
+        return self.status == 'processando' and timezone.now() - self.data_criacao > limite
+    
+    @property
+    def vencida(self):
+        """PDF gerado há mais de PDF_TAREFAS_VALIDADE segundos: não é mais entregue"""
+        from datetime import timedelta
+        from django.conf import settings
+        from django.utils import timezone
+        
+        validade = timedelta(seconds=getattr(settings, 'PDF_TAREFAS_VALIDADE', 86400))
+        return timezone.now() - self.data_criacao > validade
+
 class Notificacao(models.Model):
     """
     Modelo para notificações do sistema
@@ -0,0 +1,112 @@
+"""
+Registro de atividades (auditoria) do sistema ABMEPI
+
+As views registram atividades com registrar_atividade(). Dentro de uma
+requisição os registros são acumulados em memória pelo AuditoriaMiddleware e
+gravados ao final da resposta em um único bulk_create, de modo que várias
+atividades na mesma requisição custam apenas um INSERT. Fora de uma
+requisição (comandos, shell) o registro é gravado imediatamente.
+"""
+import gzip
+import json
+import logging
+from contextvars import ContextVar
+
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_buffer_atividades = ContextVar('buffer_atividades', default=None)
+
+
+def registrar_atividade(usuario, acao, modulo, detalhes='', ip_address=None):
+    """
+    Registra uma atividade do usuário.
+
+    Args:
+        usuario: Usuário que executou a ação
+        acao: Descrição curta da ação
+        modulo: Módulo do sistema (ex.: 'Core', 'Associados')
+        detalhes: Texto livre com detalhes da ação
+        ip_address: Endereço IP de origem (opcional)
+    """
+    from core.models import LogAtividade
+
+    log = LogAtividade(
+        usuario=usuario,
+        acao=acao,
+        modulo=modulo,
+        detalhes=detalhes,
+        ip_address=ip_address,
+    )
+
+    buffer = _buffer_atividades.get()
+    if buffer is None:
+        log.save()
+    else:
+        buffer.append(log)
+    return log
+
+
+def iniciar_buffer():
+    """Inicia o buffer de atividades da requisição atual"""
+    return _buffer_atividades.set([])
+
+
+def descarregar_buffer(token):
+    """Grava as atividades acumuladas e encerra o buffer da requisição"""
+    from core.models import LogAtividade
+
+    buffer = _buffer_atividades.get()
+    _buffer_atividades.reset(token)
+    if not buffer:
+        return 0
+
+    try:
+        LogAtividade.objects.bulk_create(buffer)
+    except Exception as e:
+        # Falhas de auditoria não devem derrubar a resposta já gerada
+        logger.error(f"Erro ao gravar {len(buffer)} logs de atividade: {e}")
+        return 0
+    return len(buffer)
+
+
+def arquivar_logs(ate, destino, lote=5000):
+    """
+    Exporta para um arquivo JSON Lines compactado (gzip) e remove do banco os
+    logs de atividade anteriores a `ate`.
+
+    Args:
+        ate: Data/hora limite (exclusiva)
+        destino: Caminho do arquivo .jsonl.gz a ser criado
+        lote: Quantidade de registros lidos/removidos por vez
+
+    Returns:
+        Número de registros arquivados
+    """
+    from core.models import LogAtividade
+
+    campos = ('id', 'usuario_id', 'usuario__username', 'acao', 'modulo', 'detalhes', 'ip_address', 'data_hora')
+    queryset = LogAtividade.objects.no_periodo(fim=ate).order_by('id')
+
+    total = 0
+    ultimo_id = None
+    with gzip.open(destino, 'wt', encoding='utf-8') as arquivo:
+        for registro in queryset.values(*campos).iterator(chunk_size=lote):
+            registro['data_hora'] = timezone.localtime(registro['data_hora']).isoformat()
+            arquivo.write(json.dumps(registro, ensure_ascii=False) + '\n')
+            ultimo_id = registro['id']
+            total += 1
+
+    if ultimo_id is None:
+        return 0
+
+    # Remover somente depois que o arquivo foi gravado por completo
+    arquivados = queryset.filter(id__lte=ultimo_id)
+    while True:
+        ids = list(arquivados.values_list('id', flat=True)[:lote])
+        if not ids:
+            break
+        LogAtividade.objects.filter(id__in=ids).delete()
+
+    return total
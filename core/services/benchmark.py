@@ -0,0 +1,202 @@
+"""
+Benchmark das páginas principais
+
+medir_paginas() requisita cada página de PAGINAS com o Client de teste do
+Django (no processo atual, contra o banco configurado), autenticado como um
+superusuário sintético, e registra latência e número de consultas SQL. O
+resultado é um dicionário serializável em JSON (ver salvar_resultado) que
+pode ser comparado com o de outra versão por comparar_resultados().
+
+Use com um volume realista de dados (python manage.py gerar_dados_sinteticos).
+"""
+import json
+import platform
+import statistics
+import time
+from pathlib import Path
+
+import django
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import NoReverseMatch, reverse
+from django.utils import timezone
+
+from core.models import Usuario
+from core.services.dados_sinteticos import PREFIXO, USUARIO_PREFIXO
+
+
+def _primeiro_associado_sintetico():
+    from associados.models import Associado
+
+    associado = Associado.objects.filter(matricula_militar__startswith=f'{PREFIXO}-').order_by('pk').first()
+    return {'associado_id': associado.pk} if associado else None
+
+
+# (nome, nome da URL, função que retorna os kwargs da URL ou None)
+PAGINAS = [
+    ('home', 'institucional', None),
+    ('dashboard', 'core:dashboard', None),
+    ('dashboard_financeiro', 'financeiro:dashboard', None),
+    ('dashboard_assejus', 'assejus:dashboard', None),
+    ('dashboard_psicologia', 'psicologia:dashboard', None),
+    ('dashboard_hotel', 'hotel_transito:dashboard', None),
+    ('lista_associados', 'associados:associado_list', None),
+    ('lista_mensalidades', 'financeiro:mensalidade_list', None),
+    ('lista_atendimentos', 'assejus:atendimento_list', None),
+    ('lista_processos', 'assejus:processos_list', None),
+    ('lista_sessoes', 'psicologia:sessao_list', None),
+    ('lista_reservas', 'hotel_transito:reserva_list', None),
+    ('carne', 'financeiro:gerar_carne_associado', _primeiro_associado_sintetico),
+    ('exportar_associados', 'associados:exportar_associados', None),
+    ('exportar_mensalidades', 'financeiro:export_mensalidades_csv', None),
+]
+
+
+def usuario_benchmark():
+    """Superusuário usado nas medições (criado na primeira execução)"""
+    usuario, criado = Usuario.objects.get_or_create(
+        username=f'{USUARIO_PREFIXO}admin',
+        defaults={
+            'is_staff': True,
+            'is_superuser': True,
+            'tipo_usuario': Usuario.ADMINISTRADOR_SISTEMA,
+            'primeiro_acesso': False,
+        },
+    )
+    if criado:
+        usuario.set_unusable_password()
+        usuario.save(update_fields=['password'])
+    return usuario
+
+
+def _volume():
+    from associados.models import Associado
+    from assejus.models import Andamento, ProcessoJuridico
+    from financeiro.models import Mensalidade, Pagamento
+
+    return {
+        'associados': Associado.objects.count(),
+        'mensalidades': Mensalidade.objects.count(),
+        'pagamentos': Pagamento.objects.count(),
+        'processos': ProcessoJuridico.objects.count(),
+        'andamentos': Andamento.objects.count(),
+    }
+
+
+def _requisitar(cliente, url, https):
+    inicio = time.perf_counter()
+    with CaptureQueriesContext(connection) as consultas:
+        resposta = cliente.get(url, secure=https)
+        if resposta.streaming:
+            tamanho = sum(len(parte) for parte in resposta.streaming_content)
+        else:
+            tamanho = len(resposta.content)
+        resposta.close()
+    return time.perf_counter() - inicio, len(consultas), resposta.status_code, tamanho
+
+
+def medir_paginas(repeticoes=5, paginas=None, host='localhost', https=False, rotulo=''):
+    """
+    Mede as páginas de PAGINAS.
+
+    Args:
+        repeticoes: Requisições medidas por página (após uma de aquecimento)
+        paginas: Nomes das páginas a medir (padrão: todas)
+        host: Cabeçalho Host (deve estar em ALLOWED_HOSTS)
+        https: Requisitar como HTTPS (quando SECURE_SSL_REDIRECT está ativo)
+        rotulo: Identificação livre da execução (ex.: versão ou commit)
+
+    Returns:
+        Dicionário com metadados da execução e, por página, status, consultas,
+        bytes e latências (ms)
+    """
+    cliente = Client(HTTP_HOST=host)
+    cliente.force_login(usuario_benchmark())
+
+    resultados = {}
+    for nome, nome_url, argumentos in PAGINAS:
+        if paginas and nome not in paginas:
+            continue
+        kwargs = argumentos() if argumentos else {}
+        if kwargs is None:
+            resultados[nome] = {'erro': 'sem dados sintéticos para montar a URL'}
+            continue
+        try:
+            url = reverse(nome_url, kwargs=kwargs)
+        except NoReverseMatch:
+            resultados[nome] = {'erro': f'URL {nome_url} não encontrada'}
+            continue
+
+        _requisitar(cliente, url, https)
+        tempos = []
+        for _ in range(max(1, repeticoes)):
+            duracao, consultas, status, tamanho = _requisitar(cliente, url, https)
+            tempos.append(duracao * 1000)
+        ordenados = sorted(tempos)
+        resultados[nome] = {
+            'url': url,
+            'status': status,
+            'consultas': consultas,
+            'bytes': tamanho,
+            'media_ms': round(statistics.mean(tempos), 2),
+            'mediana_ms': round(statistics.median(tempos), 2),
+            'p95_ms': round(ordenados[min(len(ordenados) - 1, int(len(ordenados) * 0.95))], 2),
+            'min_ms': round(ordenados[0], 2),
+        }
+
+    return {
+        'rotulo': rotulo,
+        'data': timezone.now().isoformat(),
+        'ambiente': {
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'banco': connection.vendor,
+            'repeticoes': repeticoes,
+        },
+        'volume': _volume(),
+        'paginas': resultados,
+    }
+
+
+def salvar_resultado(resultado, caminho):
+    """Grava o resultado em JSON (cria o diretório se necessário)"""
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    caminho.write_text(json.dumps(resultado, indent=2, ensure_ascii=False), encoding='utf-8')
+    return caminho
+
+
+def carregar_resultado(caminho):
+    return json.loads(Path(caminho).read_text(encoding='utf-8'))
+
+
+def comparar_resultados(atual, anterior, tolerancia=0.2):
+    """
+    Compara duas execuções página a página.
+
+    Args:
+        tolerancia: Aumento relativo da mediana tolerado (0.2 = 20%)
+
+    Returns:
+        Lista de dicionários (pagina, mediana_anterior, mediana_atual,
+        consultas_anterior, consultas_atual, regressao)
+    """
+    comparacao = []
+    for nome, medida in atual['paginas'].items():
+        base = anterior.get('paginas', {}).get(nome)
+        if not base or 'erro' in medida or 'erro' in base:
+            continue
+        regressao = (
+            medida['mediana_ms'] > base['mediana_ms'] * (1 + tolerancia)
+            or medida['consultas'] > base['consultas']
+        )
+        comparacao.append({
+            'pagina': nome,
+            'mediana_anterior': base['mediana_ms'],
+            'mediana_atual': medida['mediana_ms'],
+            'consultas_anterior': base['consultas'],
+            'consultas_atual': medida['consultas'],
+            'regressao': regressao,
+        })
+    return comparacao
@@ -0,0 +1,103 @@
+"""
+Fontes da busca remota dos campos de seleção
+
+Campos de chave estrangeira com milhares de registros (associados, hóspedes)
+usam os widgets de core.widgets, que renderizam apenas o valor selecionado e
+carregam as opções sob demanda pelo endpoint core:busca_remota. Cada fonte
+registrada aqui define o queryset base, os campos pesquisados e o texto
+exibido de cada resultado.
+"""
+from django.db.models import Q
+
+MINIMO_CARACTERES = 2
+LIMITE_PADRAO = 20
+LIMITE_MAXIMO = 50
+
+FONTES = {}
+
+
+def registrar_fonte(nome, queryset, campos_busca, ordem, rotulo=str, permitir_associado=False):
+    """
+    Registra uma fonte de busca.
+
+    Args:
+        nome: Identificador usado na URL e nos widgets
+        queryset: Função sem argumentos que retorna o queryset base
+        campos_busca: Lookups combinados com OR, ex.: ('nome__icontains', 'cpf__startswith')
+        ordem: Campos de ordenação dos resultados
+        rotulo: Função que recebe o objeto e retorna o texto exibido
+        permitir_associado: Se usuários do tipo associado podem consultar a fonte
+    """
+    FONTES[nome] = {
+        'queryset': queryset,
+        'campos_busca': tuple(campos_busca),
+        'ordem': tuple(ordem),
+        'rotulo': rotulo,
+        'permitir_associado': permitir_associado,
+    }
+
+
+def obter_fonte(nome):
+    """Retorna a fonte registrada ou None"""
+    return FONTES.get(nome)
+
+
+def queryset_da_fonte(nome):
+    return FONTES[nome]['queryset']()
+
+
+def buscar(nome, termo, limite=LIMITE_PADRAO):
+    """
+    Busca na fonte os registros que correspondem ao termo.
+
+    Returns:
+        Lista de dicionários {'id', 'text'} (vazia se o termo for curto demais)
+    """
+    fonte = FONTES[nome]
+    termo = (termo or '').strip()
+    if len(termo) < MINIMO_CARACTERES:
+        return []
+
+    filtro = Q()
+    for lookup in fonte['campos_busca']:
+        filtro |= Q(**{lookup: termo})
+    limite = max(1, min(limite, LIMITE_MAXIMO))
+    objetos = fonte['queryset']().filter(filtro).order_by(*fonte['ordem'])[:limite]
+    return [{'id': objeto.pk, 'text': fonte['rotulo'](objeto)} for objeto in objetos]
+
+
+def _associados():
+    from associados.models import Associado
+    return Associado.objects.filter(ativo=True)
+
+
+def _dependentes():
+    from associados.models import Dependente
+    return Dependente.objects.select_related('associado')
+
+
+def _hospedes():
+    from hotel_transito.models import Hospede
+    return Hospede.objects.filter(ativo=True)
+
+
+registrar_fonte(
+    'associados',
+    _associados,
+    ('nome__icontains', 'cpf__startswith', 'matricula_militar__startswith'),
+    ordem=('nome',),
+    rotulo=lambda associado: f'{associado.nome} - CPF: {associado.cpf or "N/A"}',
+)
+registrar_fonte(
+    'dependentes',
+    _dependentes,
+    ('nome__icontains', 'associado__nome__icontains'),
+    ordem=('nome',),
+)
+registrar_fonte(
+    'hospedes',
+    _hospedes,
+    ('nome_completo__icontains', 'numero_documento__startswith'),
+    ordem=('nome_completo',),
+    rotulo=lambda hospede: f'{hospede.nome_completo} - {hospede.numero_documento}',
+)
@@ -0,0 +1,422 @@
+"""
+Dados sintéticos para medições de desempenho
+
+gerar_dados_sinteticos() cria, com bulk_create em blocos, um volume realista
+de dados: associados com dependentes, anos de mensalidades e pagamentos,
+atendimentos e processos jurídicos com andamentos e documentos, pacientes com
+sessões de psicologia e hóspedes com reservas no hotel de trânsito.
+
+Todos os registros são identificáveis pelo prefixo PREFIXO (matrícula dos
+associados, número dos processos, CRP dos psicólogos, quartos, documentos dos
+hóspedes e códigos de reserva) ou por usernames iniciados em 'sintetico_', e
+podem ser removidos com limpar_dados_sinteticos(). Não use em produção.
+
+Como bulk_create não dispara sinais, os saldos (financeiro.services.saldos)
+são recalculados ao final.
+"""
+import random
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import Usuario
+
+PREFIXO = 'SIN'
+USUARIO_PREFIXO = 'sintetico_'
+ARQUIVO_DOCUMENTO = 'sinteticos/documento.pdf'
+
+NOMES = [
+    'Ana', 'Antônio', 'Carlos', 'Francisca', 'Francisco', 'José', 'Maria', 'Paulo',
+    'Raimundo', 'Sebastião', 'Luiz', 'Juliana', 'Fernanda', 'Marcos', 'Patrícia', 'Rafael',
+]
+SOBRENOMES = [
+    'Silva', 'Sousa', 'Oliveira', 'Santos', 'Pereira', 'Lima', 'Carvalho', 'Costa',
+    'Araújo', 'Rodrigues', 'Almeida', 'Nascimento', 'Barros', 'Ribeiro', 'Moura', 'Rocha',
+]
+UNIDADES = ['1º BPM', '5º BPM', '13º BPM', 'CBMEPI - QCG', '1º GBM', 'BPRv', 'RONE', 'COPOM']
+TIPOS_ANDAMENTO = ['audiencia', 'despacho', 'prazo', 'sentenca', 'recurso', 'contato']
+
+
+def gerar_cpf(numero):
+    """CPF válido (com dígitos verificadores) derivado de um número sequencial"""
+    digitos = f'{numero % 10 ** 9:09d}'
+    for tamanho in (9, 10):
+        soma = sum(int(digito) * peso for digito, peso in zip(digitos, range(tamanho + 1, 1, -1)))
+        digitos += str((soma * 10) % 11 % 10)
+    return f'{digitos[:3]}.{digitos[3:6]}.{digitos[6:9]}-{digitos[9:]}'
+
+
+def _nome(aleatorio):
+    return f'{aleatorio.choice(NOMES)} {aleatorio.choice(SOBRENOMES)} {aleatorio.choice(SOBRENOMES)}'
+
+
+def _data(aleatorio, inicio, fim):
+    return inicio + timedelta(days=aleatorio.randint(0, max(0, (fim - inicio).days)))
+
+
+def _momento(dia, hora=10):
+    return timezone.make_aware(datetime.combine(dia, time(hora, 0)))
+
+
+def _meses(inicio, quantidade):
+    ano, mes = inicio.year, inicio.month
+    for _ in range(quantidade):
+        yield date(ano, mes, 10)
+        mes += 1
+        if mes > 12:
+            ano, mes = ano + 1, 1
+
+
+def limpar_dados_sinteticos():
+    """
+    Remove os registros criados por gerar_dados_sinteticos().
+
+    Returns:
+        Dicionário {modelo: quantidade removida}
+    """
+    from associados.models import Associado
+    from hotel_transito.models import Hospede, Quarto
+    from psicologia.models import Psicologo
+
+    removidos = {}
+    with transaction.atomic():
+        for rotulo, queryset in (
+            ('hotel_transito.Quarto', Quarto.objects.filter(numero__startswith=PREFIXO)),
+            ('hotel_transito.Hospede', Hospede.objects.filter(numero_documento__startswith=PREFIXO)),
+            ('psicologia.Psicologo', Psicologo.objects.filter(crp__startswith=PREFIXO)),
+            ('associados.Associado', Associado.objects.filter(matricula_militar__startswith=f'{PREFIXO}-')),
+            ('core.Usuario', Usuario.objects.filter(username__startswith=USUARIO_PREFIXO)),
+        ):
+            _, por_modelo = queryset.delete()
+            for modelo, quantidade in por_modelo.items():
+                removidos[modelo] = removidos.get(modelo, 0) + quantidade
+    return removidos
+
+
+def gerar_dados_sinteticos(associados=1000, anos=3, semente=42, bloco=500, progresso=None):
+    """
+    Gera o conjunto de dados sintéticos.
+
+    Args:
+        associados: Quantidade de associados
+        anos: Anos de mensalidades (uma por mês) de cada associado
+        semente: Semente do gerador aleatório (mesma semente, mesmos dados)
+        bloco: Associados processados por transação
+        progresso: Função opcional chamada com (gerados, total) a cada bloco
+
+    Returns:
+        Dicionário {nome: quantidade criada}
+    """
+    from associados.models import Associado
+    from financeiro.models import TipoMensalidade
+    from financeiro.services.saldos import recalcular_saldos
+
+    aleatorio = random.Random(semente)
+    totais = {}
+
+    tipo, _ = TipoMensalidade.objects.get_or_create(
+        nome='Mensalidade (sintética)',
+        defaults={'valor': Decimal('50.00'), 'descricao': 'Gerada por gerar_dados_sinteticos'},
+    )
+    if not default_storage.exists(ARQUIVO_DOCUMENTO):
+        default_storage.save(ARQUIVO_DOCUMENTO, ContentFile(b'%PDF-1.4\n%%EOF\n'))
+
+    psicologos = _criar_psicologos(aleatorio, max(1, associados // 200), totais)
+    quartos = _criar_quartos(totais)
+
+    inicio = Associado.objects.filter(matricula_militar__startswith=f'{PREFIXO}-').count()
+    cpfs_existentes = set()
+    for deslocamento in range(0, associados, bloco):
+        numeros = range(inicio + deslocamento, inicio + min(associados, deslocamento + bloco))
+        with transaction.atomic():
+            cpfs = {numero: gerar_cpf(900_000_000 + numero) for numero in numeros}
+            cpfs_existentes |= set(Associado.objects.filter(cpf__in=cpfs.values()).values_list('cpf', flat=True))
+            lote = _criar_associados(aleatorio, [(n, cpf) for n, cpf in cpfs.items() if cpf not in cpfs_existentes], totais)
+            _criar_dependentes(aleatorio, lote, totais)
+            _criar_mensalidades(aleatorio, lote, tipo, anos, totais)
+            _criar_juridico(aleatorio, lote, totais)
+            _criar_psicologia(aleatorio, lote, psicologos, totais)
+            _criar_hotel(aleatorio, lote, quartos, totais)
+        if progresso:
+            progresso(min(associados, deslocamento + bloco), associados)
+
+    recalcular_saldos()
+    return totais
+
+
+def _somar(totais, nome, quantidade):
+    totais[nome] = totais.get(nome, 0) + quantidade
+
+
+def _criar_associados(aleatorio, numeros_cpfs, totais):
+    from associados.models import Associado
+
+    hoje = date.today()
+    associados = []
+    for numero, cpf in numeros_cpfs:
+        associados.append(Associado(
+            nome=_nome(aleatorio),
+            cpf=cpf,
+            rg=f'{numero:08d}',
+            data_nascimento=_data(aleatorio, date(1960, 1, 1), date(2000, 12, 31)),
+            sexo=aleatorio.choice(['M', 'F']),
+            estado_civil=aleatorio.choice(['solteiro', 'casado', 'divorciado', 'viuvo', 'uniao_estavel']),
+            email=f'sintetico{numero}@exemplo.com',
+            celular=f'(86) 9{aleatorio.randint(8000, 9999)}-{aleatorio.randint(1000, 9999)}',
+            cep='64000-000',
+            rua='Rua Sintética',
+            numero=str(aleatorio.randint(1, 2000)),
+            bairro='Centro',
+            cidade='Teresina',
+            estado='PI',
+            tipo_socio=aleatorio.choice(['contribuinte', 'contribuinte', 'contribuinte', 'fundador']),
+            tipo_profissional=aleatorio.choice(['policial_militar', 'bombeiro_militar']),
+            matricula_militar=f'{PREFIXO}-{numero:07d}',
+            unidade_lotacao=aleatorio.choice(UNIDADES),
+            data_ingresso=_data(aleatorio, date(1990, 1, 1), hoje),
+            situacao=aleatorio.choice(['ativo', 'ativo', 'ativo', 'reserva', 'reformado']),
+        ))
+    Associado.objects.bulk_create(associados, batch_size=500)
+    _somar(totais, 'associados', len(associados))
+    return associados
+
+
+def _criar_dependentes(aleatorio, associados, totais):
+    from associados.models import Dependente
+
+    dependentes = [
+        Dependente(
+            associado=associado,
+            nome=_nome(aleatorio),
+            parentesco=aleatorio.choice(['filho', 'conjuge', 'pai', 'mae']),
+            data_nascimento=_data(aleatorio, date(1950, 1, 1), date.today()),
+        )
+        for associado in associados
+        for _ in range(aleatorio.randint(0, 3))
+    ]
+    Dependente.objects.bulk_create(dependentes, batch_size=1000)
+    _somar(totais, 'dependentes', len(dependentes))
+
+
+def _criar_mensalidades(aleatorio, associados, tipo, anos, totais):
+    from financeiro.models import Mensalidade, Pagamento
+
+    hoje = date.today()
+    primeiro_mes = date(hoje.year - anos, hoje.month, 1)
+    mensalidades = []
+    for associado in associados:
+        for vencimento in _meses(primeiro_mes, anos * 12 + 1):
+            if vencimento > hoje:
+                status = 'pendente'
+            else:
+                status = 'pago' if aleatorio.random() < 0.85 else 'atrasado'
+            mensalidades.append(Mensalidade(
+                associado=associado,
+                tipo=tipo,
+                valor=tipo.valor,
+                data_vencimento=vencimento,
+                status=status,
+                data_pagamento=vencimento + timedelta(days=aleatorio.randint(-5, 10)) if status == 'pago' else None,
+                forma_pagamento='pix' if status == 'pago' else '',
+            ))
+    Mensalidade.objects.bulk_create(mensalidades, batch_size=2000)
+
+    pagamentos = [
+        Pagamento(
+            mensalidade=mensalidade,
+            valor_pago=mensalidade.valor,
+            forma_pagamento=aleatorio.choice(['pix', 'pix', 'boleto', 'dinheiro', 'transferencia']),
+            data_pagamento=_momento(mensalidade.data_pagamento),
+        )
+        for mensalidade in mensalidades if mensalidade.status == 'pago'
+    ]
+    Pagamento.objects.bulk_create(pagamentos, batch_size=2000)
+    _somar(totais, 'mensalidades', len(mensalidades))
+    _somar(totais, 'pagamentos', len(pagamentos))
+
+
+def _criar_juridico(aleatorio, associados, totais):
+    from assejus.models import Andamento, AtendimentoJuridico, DocumentoJuridico, ProcessoJuridico
+
+    hoje = date.today()
+    atendimentos = [
+        AtendimentoJuridico(
+            associado=associado,
+            tipo_demanda=aleatorio.choice(['civil', 'trabalhista', 'previdenciario', 'penal', 'administrativo']),
+            titulo=f'Atendimento de {associado.nome}',
+            descricao='Demanda gerada para testes de desempenho.',
+            status=aleatorio.choice(['aberto', 'em_analise', 'em_andamento', 'aguardando_documentos']),
+            prioridade=aleatorio.choice(['baixa', 'media', 'media', 'alta', 'urgente']),
+        )
+        for associado in associados if aleatorio.random() < 0.15
+        for _ in range(aleatorio.randint(1, 3))
+    ]
+    AtendimentoJuridico.objects.bulk_create(atendimentos, batch_size=1000)
+
+    processos = [
+        ProcessoJuridico(
+            numero_processo=f'{PREFIXO}-{associado.matricula_militar[len(PREFIXO) + 1:]}-{indice}',
+            tipo_processo='judicial',
+            tipo_acao=aleatorio.choice(['civil', 'trabalhista', 'previdenciaria', 'administrativa']),
+            vara_tribunal=f'{aleatorio.randint(1, 12)}ª Vara de Teresina',
+            parte_cliente=associado,
+            parte_contraria='Estado do Piauí',
+            situacao_atual=aleatorio.choice(['andamento', 'andamento', 'suspenso', 'arquivado', 'concluido']),
+        )
+        for associado in associados if aleatorio.random() < 0.10
+        for indice in range(aleatorio.randint(1, 2))
+    ]
+    ProcessoJuridico.objects.bulk_create(processos, batch_size=1000)
+
+    andamentos = []
+    documentos = []
+    for processo in processos:
+        dia = _data(aleatorio, hoje - timedelta(days=365 * 3), hoje - timedelta(days=30))
+        for _ in range(aleatorio.randint(3, 10)):
+            dia = min(hoje, dia + timedelta(days=aleatorio.randint(1, 60)))
+            andamentos.append(Andamento(
+                processo=processo,
+                data_andamento=_momento(dia),
+                tipo_andamento=aleatorio.choice(TIPOS_ANDAMENTO),
+                descricao_detalhada='Andamento gerado para testes de desempenho.',
+            ))
+        for indice in range(aleatorio.randint(1, 3)):
+            documentos.append(DocumentoJuridico(
+                processo=processo,
+                titulo=f'Documento {indice + 1}',
+                tipo_documento=aleatorio.choice(['peticao', 'despacho', 'certidao', 'comprovante']),
+                arquivo=ARQUIVO_DOCUMENTO,
+            ))
+    Andamento.objects.bulk_create(andamentos, batch_size=2000)
+    DocumentoJuridico.objects.bulk_create(documentos, batch_size=2000)
+    _somar(totais, 'atendimentos', len(atendimentos))
+    _somar(totais, 'processos', len(processos))
+    _somar(totais, 'andamentos', len(andamentos))
+    _somar(totais, 'documentos_juridicos', len(documentos))
+
+
+def _criar_psicologos(aleatorio, quantidade, totais):
+    from psicologia.models import Psicologo
+
+    existentes = list(Psicologo.objects.filter(crp__startswith=PREFIXO))
+    if len(existentes) >= quantidade:
+        return existentes
+
+    senha = make_password(None)
+    usuarios = [
+        Usuario(
+            username=f'{USUARIO_PREFIXO}psicologo{indice}',
+            first_name='Psicólogo',
+            last_name=str(indice),
+            password=senha,
+            tipo_usuario=Usuario.PSICOLOGO,
+            primeiro_acesso=False,
+        )
+        for indice in range(len(existentes), quantidade)
+    ]
+    Usuario.objects.bulk_create(usuarios)
+    novos = [
+        Psicologo(
+            user=usuario,
+            nome_completo=_nome(aleatorio),
+            crp=f'{PREFIXO}{usuario.last_name.zfill(5)}',
+            uf_crp='PI',
+            email=f'{usuario.username}@exemplo.com',
+        )
+        for usuario in usuarios
+    ]
+    Psicologo.objects.bulk_create(novos)
+    _somar(totais, 'psicologos', len(novos))
+    return existentes + novos
+
+
+def _criar_psicologia(aleatorio, associados, psicologos, totais):
+    from psicologia.models import Paciente, Sessao
+
+    pacientes = [
+        Paciente(associado=associado, psicologo_responsavel=aleatorio.choice(psicologos))
+        for associado in associados if aleatorio.random() < 0.05
+    ]
+    Paciente.objects.bulk_create(pacientes, batch_size=1000)
+
+    hoje = date.today()
+    sessoes = []
+    for paciente in pacientes:
+        for _ in range(aleatorio.randint(5, 20)):
+            dia = _data(aleatorio, hoje - timedelta(days=720), hoje + timedelta(days=30))
+            sessoes.append(Sessao(
+                paciente=paciente,
+                psicologo=paciente.psicologo_responsavel,
+                data_hora=_momento(dia, aleatorio.randint(8, 17)),
+                tipo_sessao=aleatorio.choice(['avaliacao', 'terapia', 'terapia', 'retorno']),
+                status='agendada' if dia > hoje else aleatorio.choice(['realizada', 'realizada', 'cancelada']),
+            ))
+    Sessao.objects.bulk_create(sessoes, batch_size=2000)
+    _somar(totais, 'pacientes', len(pacientes))
+    _somar(totais, 'sessoes', len(sessoes))
+
+
+def _criar_quartos(totais, quantidade=10):
+    from hotel_transito.models import Quarto
+
+    existentes = list(Quarto.objects.filter(numero__startswith=PREFIXO))
+    if existentes:
+        return existentes
+    quartos = [
+        Quarto(
+            numero=f'{PREFIXO}{indice:02d}',
+            tipo='duplo' if indice % 2 else 'individual',
+            capacidade=2 if indice % 2 else 1,
+            valor_diaria=Decimal('80.00') if indice % 2 else Decimal('60.00'),
+        )
+        for indice in range(1, quantidade + 1)
+    ]
+    Quarto.objects.bulk_create(quartos)
+    _somar(totais, 'quartos', len(quartos))
+    return quartos
+
+
+def _criar_hotel(aleatorio, associados, quartos, totais):
+    from hotel_transito.models import Hospede, Reserva
+
+    hospedes = [
+        Hospede(
+            tipo_hospede='associado',
+            associado=associado,
+            nome_completo=associado.nome,
+            tipo_documento='outro',
+            numero_documento=f'{PREFIXO}{associado.matricula_militar[len(PREFIXO) + 1:]}',
+            telefone=associado.celular,
+            cidade=associado.cidade,
+            estado=associado.estado,
+        )
+        for associado in associados if aleatorio.random() < 0.05
+    ]
+    Hospede.objects.bulk_create(hospedes, batch_size=1000)
+
+    hoje = date.today()
+    reservas = []
+    for hospede in hospedes:
+        for indice in range(aleatorio.randint(1, 4)):
+            quarto = aleatorio.choice(quartos)
+            entrada = _data(aleatorio, hoje - timedelta(days=720), hoje + timedelta(days=60))
+            diarias = aleatorio.randint(1, 5)
+            reservas.append(Reserva(
+                codigo_reserva=f'{hospede.numero_documento}-{indice}',
+                quarto=quarto,
+                hospede=hospede,
+                data_entrada=entrada,
+                data_saida=entrada + timedelta(days=diarias),
+                valor_diaria=quarto.valor_diaria,
+                quantidade_diarias=diarias,
+                valor_total=quarto.valor_diaria * diarias,
+                status='confirmada' if entrada > hoje else aleatorio.choice(['finalizada', 'finalizada', 'cancelada']),
+            ))
+    Reserva.objects.bulk_create(reservas, batch_size=1000)
+    _somar(totais, 'hospedes', len(hospedes))
+    _somar(totais, 'reservas', len(reservas))
@@ -0,0 +1,102 @@
+"""
+Indicadores (KPIs) do dashboard administrativo
+
+Os indicadores exibidos pelo DashboardView e atualizados periodicamente pelo
+endpoint core:dashboard_stats são calculados aqui em duas consultas:
+
+- um aggregate com somas/contagens condicionais sobre as mensalidades, com o
+  mês corrente expresso como intervalo de datas (data_vencimento >= início e
+  < início do mês seguinte), que aproveita o índice de data_vencimento em vez
+  de aplicar EXTRACT() sobre a coluna;
+- um UNION ALL com as contagens de associados ativos, usuários ativos e casos
+  jurídicos em andamento.
+
+O resultado fica no cache por DASHBOARD_KPIS_CACHE_TIMEOUT segundos junto com
+um ETag calculado a partir dos valores, de modo que o polling do dashboard
+recebe 304 Not Modified enquanto nada mudou.
+"""
+import hashlib
+import json
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import CharField, Count, Q, Sum, Value
+
+from assejus.models import AtendimentoJuridico
+from associados.models import Associado
+from core.models import Usuario
+from financeiro.models import Mensalidade
+
+KPIS_CACHE_KEY = 'dashboard:kpis:{data}'
+
+
+def intervalo_mes(hoje):
+    """Retorna (primeiro dia do mês, primeiro dia do mês seguinte)"""
+    inicio = hoje.replace(day=1)
+    if inicio.month == 12:
+        return inicio, inicio.replace(year=inicio.year + 1, month=1)
+    return inicio, inicio.replace(month=inicio.month + 1)
+
+
+def _contagem(queryset, chave):
+    return queryset.order_by().annotate(
+        kpi=Value(chave, output_field=CharField())
+    ).values('kpi').annotate(total=Count('pk')).values_list('kpi', 'total')
+
+
+def calcular_kpis(hoje=None):
+    """
+    Calcula os indicadores do dashboard.
+
+    Returns:
+        Dicionário com total_associados, total_usuarios, casos_juridicos,
+        receita_mes, mensalidades_pendentes e mensalidades_vencidas
+    """
+    hoje = hoje or date.today()
+    inicio_mes, inicio_proximo_mes = intervalo_mes(hoje)
+    em_aberto = Q(status__in=Mensalidade.STATUS_EM_ABERTO)
+
+    kpis = Mensalidade.objects.order_by().aggregate(
+        receita_mes=Sum('valor', filter=Q(
+            status='pago',
+            data_vencimento__gte=inicio_mes,
+            data_vencimento__lt=inicio_proximo_mes
+        )),
+        mensalidades_pendentes=Count('pk', filter=em_aberto),
+        mensalidades_vencidas=Count('pk', filter=em_aberto & Q(data_vencimento__lt=hoje)),
+    )
+    kpis['receita_mes'] = kpis['receita_mes'] or 0
+
+    contagens = dict(
+        _contagem(Associado.objects.filter(ativo=True), 'total_associados').union(
+            _contagem(Usuario.objects.filter(ativo=True), 'total_usuarios'),
+            _contagem(AtendimentoJuridico.objects.filter(status='em_andamento'), 'casos_juridicos'),
+            all=True
+        )
+    )
+    for chave in ('total_associados', 'total_usuarios', 'casos_juridicos'):
+        kpis[chave] = contagens.get(chave, 0)
+    return kpis
+
+
+def calcular_etag(kpis):
+    conteudo = json.dumps(kpis, sort_keys=True, default=str).encode()
+    return hashlib.md5(conteudo).hexdigest()
+
+
+def obter_kpis():
+    """
+    Retorna (kpis, etag) usando o cache de curta duração.
+    """
+    hoje = date.today()
+    timeout = getattr(settings, 'DASHBOARD_KPIS_CACHE_TIMEOUT', 60)
+    chave = KPIS_CACHE_KEY.format(data=hoje.isoformat())
+
+    dados = cache.get(chave) if timeout else None
+    if dados is None:
+        kpis = calcular_kpis(hoje)
+        dados = {'kpis': kpis, 'etag': calcular_etag(kpis)}
+        if timeout:
+            cache.set(chave, dados, timeout)
+    return dados['kpis'], dados['etag']
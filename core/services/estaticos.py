@@ -0,0 +1,68 @@
+"""
+Pacotes de arquivos estáticos
+
+Os scripts de modais carregados em todas as páginas (ESTATICOS_PACOTES) podem
+ser concatenados em um único arquivo por pacote, static/pacotes/<nome>.js,
+gerado por python manage.py agrupar_estaticos antes do collectstatic (que
+então aplica o hash no nome e gera as versões comprimidas do pacote).
+
+A tag {% pacote_estatico %} (core.templatetags.estaticos) usa o pacote quando
+ESTATICOS_AGRUPAR está ativo e o arquivo existe, e os arquivos individuais
+caso contrário.
+"""
+import os
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+
+DIRETORIO_PACOTES = 'pacotes'
+
+
+def caminho_pacote(nome):
+    """Caminho estático do pacote (ex.: pacotes/modais.js)"""
+    return f'{DIRETORIO_PACOTES}/{nome}.js'
+
+
+@lru_cache(maxsize=None)
+def pacote_disponivel(nome):
+    """Indica se o pacote foi gerado (verificado uma vez por processo)"""
+    return finders.find(caminho_pacote(nome)) is not None
+
+
+def arquivos_do_pacote(nome):
+    """
+    Caminhos estáticos a carregar para o pacote: o próprio pacote ou os
+    arquivos individuais, conforme ESTATICOS_AGRUPAR.
+    """
+    arquivos = settings.ESTATICOS_PACOTES[nome]
+    if getattr(settings, 'ESTATICOS_AGRUPAR', False) and pacote_disponivel(nome):
+        return [caminho_pacote(nome)]
+    return list(arquivos)
+
+
+def gerar_pacote(nome, destino):
+    """
+    Concatena os arquivos do pacote em destino/<nome>.js.
+
+    Returns:
+        Tupla (caminho do arquivo gerado, tamanho em bytes)
+
+    Raises:
+        FileNotFoundError: Se algum arquivo do pacote não for encontrado
+    """
+    partes = []
+    for arquivo in settings.ESTATICOS_PACOTES[nome]:
+        origem = finders.find(arquivo)
+        if origem is None:
+            raise FileNotFoundError(f'Arquivo estático não encontrado: {arquivo}')
+        with open(origem, encoding='utf-8') as f:
+            # ';' evita que a última expressão de um arquivo continue no próximo
+            partes.append(f'/* {arquivo} */\n{f.read()}\n;')
+
+    os.makedirs(destino, exist_ok=True)
+    caminho = os.path.join(destino, f'{nome}.js')
+    conteudo = '\n'.join(partes).encode('utf-8')
+    with open(caminho, 'wb') as f:
+        f.write(conteudo)
+    return caminho, len(conteudo)
@@ -0,0 +1,226 @@
+"""
+Imagens derivadas (tamanhos responsivos)
+
+Para cada imagem enviada nos campos de IMAGENS_DERIVADAS_CAMPOS são geradas
+versões WebP e JPEG nas larguras de IMAGENS_DERIVADAS_TAMANHOS, gravadas ao
+lado do original no mesmo storage:
+
+    feed_posts/foto.png -> feed_posts/foto.png__miniatura.webp
+                           feed_posts/foto.png__miniatura.jpg
+                           feed_posts/foto.png__media.webp ...
+
+O nome completo do original (com a extensão) é mantido, para que foto.png e
+foto.jpg no mesmo diretório não compartilhem as mesmas derivadas.
+
+Larguras maiores ou iguais à do original não são geradas. A geração é feita
+depois do commit, em um pool de IMAGENS_DERIVADAS_WORKERS threads (0 = na
+própria requisição); imagens já existentes são processadas pelo comando
+gerar_imagens_derivadas. Ao final o sinal imagens_derivadas_geradas é enviado
+(core.signals o usa para invalidar o cache da página institucional).
+
+Nos templates, {% imagem_responsiva %} e o filtro imagem_url
+(core.templatetags.imagens) usam as derivadas existentes e recorrem ao
+original enquanto elas não foram geradas.
+"""
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, connection, transaction
+from django.db.models.signals import post_save
+from django.dispatch import Signal
+
+logger = logging.getLogger(__name__)
+
+# Enviado após gerar as derivadas de uma imagem (kwargs: nome, geradas)
+imagens_derivadas_geradas = Signal()
+
+FORMATOS = {
+    'webp': 'WEBP',
+    'jpg': 'JPEG',
+}
+
+_pool = None
+_pool_lock = threading.Lock()
+_campos_por_modelo = {}
+
+
+def tamanhos():
+    """Larguras configuradas, {nome: largura}, da menor para a maior"""
+    configurados = getattr(settings, 'IMAGENS_DERIVADAS_TAMANHOS', {})
+    return dict(sorted(configurados.items(), key=lambda item: item[1]))
+
+
+def caminho_derivada(nome, tamanho, extensao):
+    """Nome da derivada no storage (ex.: feed_posts/foto.png__media.webp)"""
+    return f'{nome}__{tamanho}.{extensao}'
+
+
+def derivadas_disponiveis(arquivo):
+    """
+    Retorna as derivadas já geradas de um FieldFile.
+
+    Returns:
+        Lista de (largura, url_webp, url_jpg), da menor para a maior
+    """
+    if not arquivo or not arquivo.name:
+        return []
+    storage = arquivo.storage
+    disponiveis = []
+    for tamanho, largura in tamanhos().items():
+        webp = caminho_derivada(arquivo.name, tamanho, 'webp')
+        if not storage.exists(webp):
+            continue
+        disponiveis.append((largura, storage.url(webp), storage.url(caminho_derivada(arquivo.name, tamanho, 'jpg'))))
+    return disponiveis
+
+
+def url_imagem(arquivo, tamanho):
+    """URL da derivada JPEG no tamanho informado, ou do original se ela não existe"""
+    if not arquivo or not arquivo.name:
+        return ''
+    nome = caminho_derivada(arquivo.name, tamanho, 'jpg')
+    if arquivo.storage.exists(nome):
+        return arquivo.storage.url(nome)
+    return arquivo.url
+
+
+def _preparar_jpeg(imagem):
+    from PIL import Image
+
+    if imagem.mode in ('RGBA', 'LA', 'P'):
+        imagem = imagem.convert('RGBA')
+        fundo = Image.new('RGB', imagem.size, (255, 255, 255))
+        fundo.paste(imagem, mask=imagem.getchannel('A'))
+        return fundo
+    if imagem.mode != 'RGB':
+        return imagem.convert('RGB')
+    return imagem
+
+
+def gerar_derivadas(nome, storage=None, forcar=False):
+    """
+    Gera as derivadas de uma imagem do storage.
+
+    Args:
+        nome: Nome do arquivo original no storage
+        storage: Storage do campo (padrão: default_storage)
+        forcar: Regerar derivadas já existentes
+
+    Returns:
+        Lista com os nomes das derivadas gravadas
+    """
+    from PIL import Image, ImageOps
+
+    if storage is None:
+        from django.core.files.storage import default_storage
+        storage = default_storage
+
+    with storage.open(nome, 'rb') as arquivo:
+        imagem = Image.open(arquivo)
+        imagem.load()
+    imagem = ImageOps.exif_transpose(imagem)
+    if imagem.mode not in ('RGB', 'RGBA'):
+        imagem = imagem.convert('RGBA' if 'A' in imagem.getbands() or imagem.mode == 'P' else 'RGB')
+
+    qualidade = getattr(settings, 'IMAGENS_DERIVADAS_QUALIDADE', 80)
+    geradas = []
+    # Da maior para a menor: cada redução parte da anterior
+    for tamanho, largura in reversed(list(tamanhos().items())):
+        if largura >= imagem.width:
+            continue
+        imagem = imagem.resize(
+            (largura, max(1, round(imagem.height * largura / imagem.width))),
+            Image.LANCZOS,
+        )
+        for extensao, formato in FORMATOS.items():
+            destino = caminho_derivada(nome, tamanho, extensao)
+            if storage.exists(destino):
+                if not forcar:
+                    continue
+                storage.delete(destino)
+
+            buffer = io.BytesIO()
+            if formato == 'JPEG':
+                _preparar_jpeg(imagem).save(buffer, formato, quality=qualidade, optimize=True, progressive=True)
+            else:
+                imagem.save(buffer, formato, quality=qualidade, method=4)
+            geradas.append(storage.save(destino, ContentFile(buffer.getvalue())))
+
+    imagens_derivadas_geradas.send(sender=None, nome=nome, geradas=geradas)
+    return geradas
+
+
+def _obter_pool():
+    global _pool
+    workers = getattr(settings, 'IMAGENS_DERIVADAS_WORKERS', 2)
+    if not workers:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='imagens')
+        return _pool
+
+
+def gerar_derivadas_com_log(nome, storage=None, forcar=False):
+    """Como gerar_derivadas(), mas registra a falha no log em vez de propagá-la"""
+    try:
+        return gerar_derivadas(nome, storage, forcar=forcar)
+    except Exception as e:
+        logger.warning(f'Não foi possível gerar as derivadas de {nome}: {e}')
+        return []
+
+
+def _gerar_em_thread(nome, storage, forcar=False):
+    # Os receptores de imagens_derivadas_geradas podem usar o banco
+    close_old_connections()
+    try:
+        return gerar_derivadas_com_log(nome, storage, forcar=forcar)
+    finally:
+        connection.close()
+
+
+def agendar_derivadas(nome, storage, forcar=False):
+    """Gera as derivadas no pool de threads (ou imediatamente, sem pool)"""
+    pool = _obter_pool()
+    if pool is None:
+        return gerar_derivadas_com_log(nome, storage, forcar=forcar)
+    return pool.submit(_gerar_em_thread, nome, storage, forcar)
+
+
+def _ao_salvar(sender, instance, **kwargs):
+    for campo in _campos_por_modelo.get(sender, []):
+        arquivo = getattr(instance, campo)
+        if not arquivo or not arquivo.name:
+            continue
+        menor = next(iter(tamanhos()), None)
+        if menor is None or arquivo.storage.exists(caminho_derivada(arquivo.name, menor, 'webp')):
+            continue
+        nome, storage = arquivo.name, arquivo.storage
+        transaction.on_commit(lambda nome=nome, storage=storage: agendar_derivadas(nome, storage))
+
+
+def campos_configurados():
+    """
+    Campos de IMAGENS_DERIVADAS_CAMPOS ('app.Modelo.campo').
+
+    Returns:
+        Lista de (modelo, nome_do_campo)
+    """
+    campos = []
+    for caminho in getattr(settings, 'IMAGENS_DERIVADAS_CAMPOS', []):
+        rotulo, nome_campo = caminho.rsplit('.', 1)
+        campos.append((apps.get_model(rotulo), nome_campo))
+    return campos
+
+
+def conectar_sinais():
+    """Conecta o post_save dos modelos configurados (chamado em CoreConfig.ready)"""
+    for modelo, nome_campo in campos_configurados():
+        if modelo not in _campos_por_modelo:
+            post_save.connect(_ao_salvar, sender=modelo, dispatch_uid=f'imagens_derivadas_{modelo._meta.label}')
+        _campos_por_modelo.setdefault(modelo, []).append(nome_campo)
@@ -0,0 +1,74 @@
+"""
+Cache da página institucional (página inicial pública) do sistema ABMEPI
+
+Os dados compartilhados entre visitantes (configuração, estatísticas, feed,
+notícias e presidente atual) são armazenados no cache sob uma chave que
+inclui uma versão de conteúdo. A versão é incrementada pelos sinais em
+core.signals sempre que FeedPost, Comentario, AssejurNews,
+InstitucionalConfig ou a diretoria são alterados, o que invalida todas as
+entradas antigas de uma só vez.
+
+O estado de curtidas de cada visitante não é armazenado aqui; ele é obtido
+pelo endpoint core:post_likes_state.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+VERSAO_CACHE_KEY = 'institucional:versao'
+DADOS_CACHE_KEY = 'institucional:dados:v{versao}'
+
+
+def get_versao_conteudo():
+    """
+    Retorna a versão atual do conteúdo da página institucional.
+
+    Quando a chave não existe (cache reiniciado ou expirado), a versão é
+    inicializada com o timestamp atual para não colidir com versões antigas.
+    """
+    versao = cache.get(VERSAO_CACHE_KEY)
+    if versao is None:
+        versao = int(time.time())
+        cache.add(VERSAO_CACHE_KEY, versao, None)
+        versao = cache.get(VERSAO_CACHE_KEY, versao)
+    return versao
+
+
+def invalidar_cache_institucional():
+    """Incrementa a versão do conteúdo, invalidando os dados em cache"""
+    try:
+        return cache.incr(VERSAO_CACHE_KEY)
+    except ValueError:
+        versao = int(time.time())
+        cache.set(VERSAO_CACHE_KEY, versao, None)
+        return versao
+
+
+def obter_dados_pagina(construir_dados):
+    """
+    Retorna os dados compartilhados da página institucional.
+
+    Args:
+        construir_dados: Função sem argumentos que monta o dicionário de
+            contexto quando não há entrada válida no cache.
+
+    Returns:
+        Dicionário de contexto (independente do visitante)
+    """
+    timeout = getattr(settings, 'INSTITUCIONAL_CACHE_TIMEOUT', 300)
+    if not timeout:
+        return construir_dados()
+
+    chave = DADOS_CACHE_KEY.format(versao=get_versao_conteudo())
+    dados = cache.get(chave)
+    if dados is None:
+        dados = construir_dados()
+        try:
+            cache.set(chave, dados, timeout)
+        except Exception as e:
+            logger.warning(f"Não foi possível armazenar a página institucional no cache: {e}")
+    return dados
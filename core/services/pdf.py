@@ -0,0 +1,316 @@
+"""
+Serviço central de geração de PDFs (ReportLab)
+
+Recursos compartilhados, preparados uma única vez por processo:
+
+- caminho_logo()/imagem_logo(): localização das logos (static, STATICFILES_DIRS,
+  STATIC_ROOT ou media) e a imagem já decodificada, em cache de módulo;
+- estilos()/estilo(): a folha de estilos base e os ParagraphStyle derivados,
+  em cache (não altere os objetos retornados);
+- registrar_fontes(): registra as fontes TrueType de PDF_FONTES.
+
+A renderização pode ser feita fora do processo da requisição, em um pool de
+PDF_PROCESSOS processos (0 = na própria requisição):
+
+- renderizar(funcao, *args): síncrona, espera o resultado por até
+  PDF_TIMEOUT segundos;
+- renderizar_partes(funcao, partes): idem, gerando várias partes de um mesmo
+  documento em paralelo (depois unidas com juntar());
+- enfileirar(funcao, *args, nome_arquivo=..., usuario=...): cria uma
+  TarefaPDF e retorna imediatamente; o arquivo fica disponível para download
+  quando a tarefa é concluída (ver core.views_pdf).
+
+As funções de renderização devem estar no nível de módulo, receber apenas
+argumentos simples (ids, strings, listas) e retornar os bytes do PDF, pois são
+executadas em outro processo.
+"""
+import io
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturoTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_lock = threading.Lock()
+_fontes_registradas = False
+_estilos_derivados = {}
+
+
+class ErroGeracaoPDF(Exception):
+    """Falha ou tempo esgotado na geração de um PDF"""
+
+
+@lru_cache(maxsize=None)
+def caminho_logo(nome_arquivo):
+    """
+    Retorna o caminho absoluto da logo (ou None), procurando em static,
+    STATICFILES_DIRS, STATIC_ROOT e media. O resultado fica em cache.
+    """
+    diretorios = [os.path.join(settings.BASE_DIR, 'static')]
+    diretorios += [str(diretorio) for diretorio in getattr(settings, 'STATICFILES_DIRS', [])]
+    diretorios += [settings.STATIC_ROOT, os.path.join(settings.BASE_DIR, 'media')]
+
+    for diretorio in diretorios:
+        if not diretorio:
+            continue
+        caminho = os.path.join(diretorio, nome_arquivo)
+        if os.path.exists(caminho):
+            return caminho
+    return None
+
+
+@lru_cache(maxsize=None)
+def imagem_logo(nome_arquivo):
+    """Retorna a logo como ImageReader (para canvas.drawImage) ou None"""
+    from reportlab.lib.utils import ImageReader
+
+    caminho = caminho_logo(nome_arquivo)
+    if caminho is None:
+        return None
+    return ImageReader(caminho)
+
+
+@lru_cache(maxsize=None)
+def estilos():
+    """Folha de estilos base do ReportLab, criada uma vez por processo"""
+    from reportlab.lib.styles import getSampleStyleSheet
+
+    registrar_fontes()
+    return getSampleStyleSheet()
+
+
+def estilo(nome, pai='Normal', **atributos):
+    """
+    Retorna um ParagraphStyle derivado de estilos()[pai], reaproveitando o
+    mesmo objeto para a mesma combinação de nome, pai e atributos.
+    """
+    from reportlab.lib.styles import ParagraphStyle
+
+    chave = (nome, pai, repr(sorted(atributos.items())))
+    if chave not in _estilos_derivados:
+        _estilos_derivados[chave] = ParagraphStyle(nome, parent=estilos()[pai], **atributos)
+    return _estilos_derivados[chave]
+
+
+def registrar_fontes():
+    """Registra as fontes de PDF_FONTES ({nome: caminho .ttf}) uma única vez"""
+    global _fontes_registradas
+    if _fontes_registradas:
+        return
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    for nome, caminho in getattr(settings, 'PDF_FONTES', {}).items():
+        try:
+            pdfmetrics.registerFont(TTFont(nome, caminho))
+        except Exception as e:
+            logger.warning(f'Não foi possível registrar a fonte {nome} ({caminho}): {e}')
+    _fontes_registradas = True
+
+
+def _inicializar_processo():
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+    registrar_fontes()
+
+
+def _executar(funcao, args, kwargs):
+    """Executa a renderização no processo do pool"""
+    close_old_connections()
+    try:
+        return funcao(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+def _obter_pool():
+    global _pool
+    processos = getattr(settings, 'PDF_PROCESSOS', 2)
+    if not processos:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # 'spawn' evita herdar as conexões de banco do processo da requisição
+            _pool = ProcessPoolExecutor(
+                max_workers=processos,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_inicializar_processo,
+            )
+        return _pool
+
+
+def _descartar_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def renderizar(funcao, *args, timeout=None, **kwargs):
+    """
+    Gera o PDF no pool de processos e espera o resultado.
+
+    Args:
+        funcao: Função de nível de módulo que retorna os bytes do PDF
+        timeout: Tempo máximo de espera em segundos (padrão: PDF_TIMEOUT)
+
+    Returns:
+        Bytes do PDF
+
+    Raises:
+        ErroGeracaoPDF: Se a geração falhar ou exceder o tempo
+    """
+    pool = _obter_pool()
+    if pool is None:
+        registrar_fontes()
+        return funcao(*args, **kwargs)
+
+    timeout = timeout or getattr(settings, 'PDF_TIMEOUT', 60)
+    try:
+        futuro = pool.submit(_executar, funcao, args, kwargs)
+        return futuro.result(timeout=timeout)
+    except FuturoTimeoutError:
+        futuro.cancel()
+        raise ErroGeracaoPDF(f'A geração do PDF excedeu {timeout} segundos.')
+    except BrokenProcessPool:
+        _descartar_pool()
+        raise ErroGeracaoPDF('O processo de geração de PDF foi interrompido.')
+
+
+def renderizar_partes(funcao, partes, timeout=None):
+    """
+    Gera as partes de um PDF em paralelo no pool e espera todas.
+
+    Args:
+        funcao: Função de nível de módulo que retorna os bytes de uma parte
+        partes: Lista de tuplas de argumentos, uma por parte
+        timeout: Tempo máximo de espera em segundos para o conjunto (padrão: PDF_TIMEOUT)
+
+    Returns:
+        Lista com os bytes de cada parte, na mesma ordem de partes
+
+    Raises:
+        ErroGeracaoPDF: Se a geração falhar ou exceder o tempo
+    """
+    pool = _obter_pool()
+    if pool is None:
+        registrar_fontes()
+        return [funcao(*args) for args in partes]
+
+    timeout = timeout or getattr(settings, 'PDF_TIMEOUT', 60)
+    prazo = time.monotonic() + timeout
+    futuros = []
+    try:
+        futuros = [pool.submit(_executar, funcao, args, {}) for args in partes]
+        return [futuro.result(timeout=max(prazo - time.monotonic(), 0)) for futuro in futuros]
+    except FuturoTimeoutError:
+        for futuro in futuros:
+            futuro.cancel()
+        raise ErroGeracaoPDF(f'A geração do PDF excedeu {timeout} segundos.')
+    except BrokenProcessPool:
+        _descartar_pool()
+        raise ErroGeracaoPDF('O processo de geração de PDF foi interrompido.')
+
+
+def juntar(partes):
+    """
+    Une PDFs (bytes) em um único documento, na ordem recebida.
+
+    Requer o pacote pypdf; veja pode_juntar().
+    """
+    from pypdf import PdfWriter
+
+    escritor = PdfWriter()
+    for conteudo in partes:
+        escritor.append(io.BytesIO(conteudo))
+    saida = io.BytesIO()
+    escritor.write(saida)
+    return saida.getvalue()
+
+
+@lru_cache(maxsize=None)
+def pode_juntar():
+    """Indica se juntar() está disponível (pacote pypdf instalado)"""
+    try:
+        import pypdf  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def enfileirar(funcao, *args, nome_arquivo='documento.pdf', usuario=None, **kwargs):
+    """
+    Cria uma TarefaPDF e agenda a geração no pool, sem esperar o resultado.
+
+    Returns:
+        A TarefaPDF criada (status 'processando', ou já concluída quando o
+        pool está desativado)
+    """
+    from core.models import TarefaPDF
+
+    tarefa = TarefaPDF.objects.create(
+        nome_arquivo=nome_arquivo,
+        usuario=usuario if usuario is not None and usuario.is_authenticated else None,
+    )
+
+    pool = _obter_pool()
+    if pool is None:
+        try:
+            registrar_fontes()
+            _concluir_tarefa(tarefa.pk, conteudo=funcao(*args, **kwargs))
+        except Exception as e:
+            logger.exception(f'Erro ao gerar o PDF da tarefa {tarefa.pk}')
+            _concluir_tarefa(tarefa.pk, erro=str(e))
+        tarefa.refresh_from_db()
+        return tarefa
+
+    try:
+        futuro = pool.submit(_executar, funcao, args, kwargs)
+    except BrokenProcessPool:
+        _descartar_pool()
+        _concluir_tarefa(tarefa.pk, erro='O processo de geração de PDF foi interrompido.')
+        tarefa.refresh_from_db()
+        return tarefa
+    futuro.add_done_callback(lambda f: _finalizar_em_thread(tarefa.pk, f))
+    return tarefa
+
+
+def _finalizar_em_thread(tarefa_id, futuro):
+    # Executado na thread interna do pool: usa uma conexão própria
+    close_old_connections()
+    try:
+        try:
+            _concluir_tarefa(tarefa_id, conteudo=futuro.result())
+        except Exception as e:
+            logger.warning(f'Erro ao gerar o PDF da tarefa {tarefa_id}: {e}')
+            _concluir_tarefa(tarefa_id, erro=str(e) or e.__class__.__name__)
+    finally:
+        connection.close()
+
+
+def _concluir_tarefa(tarefa_id, conteudo=None, erro=''):
+    from core.models import TarefaPDF
+
+    tarefa = TarefaPDF.objects.get(pk=tarefa_id)
+    if conteudo is not None:
+        tarefa.arquivo.save(tarefa.nome_arquivo, ContentFile(conteudo), save=False)
+        tarefa.status = 'concluido'
+    else:
+        tarefa.status = 'erro'
+        tarefa.erro = erro
+    tarefa.data_conclusao = timezone.now()
+    tarefa.save(update_fields=['arquivo', 'status', 'erro', 'data_conclusao'])
@@ -0,0 +1,126 @@
+"""
+Provisionamento de usuários em lote
+
+Cria contas de acesso (advogados, associados importados, pré-cadastros
+aprovados em lote) com bulk_create e senhas temporárias de uso único:
+
+- o hash das senhas temporárias usa o algoritmo SENHA_TEMPORARIA_HASHER
+  (por padrão core.hashers.SenhaTemporariaPBKDF2PasswordHasher, com menos
+  iterações); os usuários são criados com primeiro_acesso=True e trocam a
+  senha no primeiro login, quando o hash é regravado com o hasher padrão;
+- a partir de PROVISIONAMENTO_MINIMO_PARALELO senhas os hashes são calculados
+  em um pool de PROVISIONAMENTO_PROCESSOS processos (0 = número de CPUs).
+"""
+import multiprocessing
+import os
+import secrets
+import string
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+
+CARACTERES_SENHA = string.ascii_letters + string.digits
+
+
+def gerar_senha_temporaria(tamanho=10):
+    """Gera uma senha aleatória para o primeiro acesso"""
+    return ''.join(secrets.choice(CARACTERES_SENHA) for _ in range(tamanho))
+
+
+def hash_senha_temporaria(senha):
+    """Calcula o hash de uma senha temporária com o hasher configurado"""
+    return make_password(senha, hasher=getattr(settings, 'SENHA_TEMPORARIA_HASHER', 'default'))
+
+
+def _inicializar_processo():
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+
+def gerar_hashes(senhas):
+    """
+    Calcula os hashes das senhas temporárias, em paralelo quando a lista é grande.
+
+    Returns:
+        Lista de hashes na mesma ordem das senhas
+    """
+    senhas = list(senhas)
+    processos = getattr(settings, 'PROVISIONAMENTO_PROCESSOS', 0) or os.cpu_count() or 1
+    minimo = getattr(settings, 'PROVISIONAMENTO_MINIMO_PARALELO', 50)
+    if processos <= 1 or len(senhas) < minimo:
+        return [hash_senha_temporaria(senha) for senha in senhas]
+
+    bloco = max(1, len(senhas) // (processos * 4))
+    # 'spawn' evita herdar as conexões de banco e as threads do processo da
+    # requisição (ver core.services.pdf)
+    with ProcessPoolExecutor(
+        max_workers=processos,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_inicializar_processo,
+    ) as pool:
+        return list(pool.map(hash_senha_temporaria, senhas, chunksize=bloco))
+
+
+def dividir_nome(nome):
+    """Separa o nome completo em (first_name, last_name)"""
+    partes = (nome or '').split()
+    return (partes[0] if partes else '')[:150], ' '.join(partes[1:])[:150]
+
+
+def provisionar_usuarios(dados_usuarios, senha=None, validade=timedelta(hours=24), batch_size=500):
+    """
+    Cria usuários em lote com senhas temporárias.
+
+    Args:
+        dados_usuarios: Lista de dicionários com campos de Usuario (username
+            obrigatório; opcionalmente 'senha' para uma senha específica)
+        senha: Senha usada para todos os usuários sem 'senha' própria; se
+            None, cada usuário recebe uma senha aleatória
+        validade: Tempo de exibição da senha temporária para administradores
+        batch_size: Tamanho dos lotes do bulk_create
+
+    Returns:
+        Tupla (criados, existentes): criados é a lista de (usuario, senha) na
+        ordem recebida e existentes o conjunto de usernames ignorados por já
+        estarem cadastrados
+    """
+    # Importado aqui: os processos de gerar_hashes importam este módulo antes
+    # de django.setup()
+    from core.models import Usuario
+
+    dados_usuarios = list(dados_usuarios)
+    existentes = set(Usuario.objects.filter(
+        username__in=[dados['username'] for dados in dados_usuarios]
+    ).values_list('username', flat=True))
+
+    novos = []
+    vistos = set()
+    for dados in dados_usuarios:
+        if dados['username'] in existentes or dados['username'] in vistos:
+            existentes.add(dados['username'])
+            continue
+        vistos.add(dados['username'])
+        dados = dict(dados)
+        novos.append((dados, dados.pop('senha', None) or senha or gerar_senha_temporaria()))
+
+    hashes = gerar_hashes(senha_usuario for _, senha_usuario in novos)
+    expira = timezone.now() + validade
+    usuarios = []
+    for (dados, senha_usuario), senha_hash in zip(novos, hashes):
+        dados.setdefault('tipo_usuario', Usuario.ASSOCIADO)
+        usuarios.append(Usuario(
+            password=senha_hash,
+            primeiro_acesso=True,
+            senha_temporaria=senha_usuario,
+            senha_temporaria_expira=expira,
+            **dados
+        ))
+    Usuario.objects.bulk_create(usuarios, batch_size=batch_size)
+
+    return [(usuario, senha_usuario) for usuario, (_, senha_usuario) in zip(usuarios, novos)], existentes
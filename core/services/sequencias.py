@@ -0,0 +1,59 @@
+"""
+Numeração sequencial (atas, reservas, procurações...)
+
+Cada sequência é uma linha de core.Sequencia identificada por (escopo, ano).
+O próximo número é obtido com um único UPDATE valor = valor + 1 seguido da
+leitura do valor, na mesma transação: o UPDATE bloqueia a linha até o commit,
+de modo que gravações concorrentes recebem números distintos e consecutivos,
+em tempo constante, sem consultar o maior número já usado.
+
+Se a transação que reservou o número for desfeita, o incremento também é, e
+o número volta a ficar disponível. Para não haver buracos na numeração, quem
+chama deve reservar o número e gravar o registro na mesma transação (como
+fazem os save() de AtaReuniao, AtaSimples, Reserva e ProcuracaoAdJudicia):
+fora de uma transação, o número é confirmado no UPDATE e perdido se a
+gravação falhar.
+
+A linha é criada no primeiro uso da sequência; o valor inicial pode vir de
+uma função (por exemplo, o maior número já gravado antes da criação da
+sequência), executada apenas nessa primeira vez.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from core.models import Sequencia
+
+
+def proximo_numero(escopo, ano=0, inicial=None):
+    """
+    Reserva o próximo número da sequência (chame dentro da transação que
+    grava o registro numerado).
+
+    Args:
+        escopo: Nome da sequência (ex: 'ata:ordinaria', 'reserva')
+        ano: Ano da numeração (0 para sequências que não reiniciam por ano)
+        inicial: Função que retorna o último número já usado, chamada apenas
+            quando a sequência ainda não existe (padrão: 0)
+
+    Returns:
+        O número reservado (int)
+    """
+    sequencias = Sequencia.objects.filter(escopo=escopo, ano=ano)
+    with transaction.atomic():
+        if not sequencias.update(valor=F('valor') + 1):
+            ultimo = inicial() if inicial else 0
+            try:
+                with transaction.atomic():
+                    Sequencia.objects.create(escopo=escopo, ano=ano, valor=ultimo + 1)
+                return ultimo + 1
+            except IntegrityError:
+                # Outra transação criou a sequência ao mesmo tempo
+                sequencias.update(valor=F('valor') + 1)
+        return sequencias.values_list('valor', flat=True).get()
+
+
+def formatar_codigo(prefixo, numero, ano=None, digitos=5):
+    """Monta códigos como RES-2025-00001 (ou RES-00001, sem ano)"""
+    if ano:
+        return f"{prefixo}-{ano}-{numero:0{digitos}d}"
+    return f"{prefixo}-{numero:0{digitos}d}"
@@ -0,0 +1,84 @@
+"""
+Identificação de visitantes anônimos (curtidas no feed)
+
+O visitante é identificado por um cookie assinado próprio (VISITANTE_COOKIE),
+independente da sessão: as curtidas anônimas não gravam nada na sessão e
+continuam funcionando com qualquer SESSION_ENGINE, inclusive signed_cookies.
+O identificador é gravado em LikeAnonimo.session_key.
+
+Visitantes que ainda têm curtidas na sessão (formato antigo, chave
+'post_likes') são migrados na primeira requisição ao feed:
+migrar_curtidas_da_sessao() transfere os LikeAnonimo da chave de sessão para
+o identificador do visitante e remove a chave da sessão.
+"""
+import uuid
+
+from django.conf import settings
+
+SALT_VISITANTE = 'core.visitante'
+
+
+def obter_visitante_id(request, criar=False):
+    """
+    Retorna o identificador do visitante a partir do cookie assinado.
+
+    Args:
+        request: Requisição atual
+        criar: Gerar um novo identificador quando o cookie não existe; ele é
+            enviado ao navegador por definir_cookie_visitante()
+
+    Returns:
+        O identificador (32 caracteres) ou None
+    """
+    novo = getattr(request, '_visitante_id_novo', None)
+    if novo:
+        return novo
+
+    visitante_id = request.get_signed_cookie(
+        settings.VISITANTE_COOKIE, default=None, salt=SALT_VISITANTE
+    )
+    if visitante_id or not criar:
+        return visitante_id
+
+    request._visitante_id_novo = uuid.uuid4().hex
+    return request._visitante_id_novo
+
+
+def definir_cookie_visitante(request, response):
+    """Envia o cookie do visitante se o identificador foi criado nesta requisição"""
+    visitante_id = getattr(request, '_visitante_id_novo', None)
+    if visitante_id:
+        response.set_signed_cookie(
+            settings.VISITANTE_COOKIE,
+            visitante_id,
+            salt=SALT_VISITANTE,
+            max_age=settings.VISITANTE_COOKIE_IDADE,
+            secure=settings.SESSION_COOKIE_SECURE,
+            httponly=True,
+            samesite='Lax',
+        )
+    return response
+
+
+def migrar_curtidas_da_sessao(request):
+    """
+    Transfere as curtidas anônimas gravadas com a chave da sessão para o
+    identificador do visitante e remove 'post_likes' da sessão.
+
+    Returns:
+        O identificador do visitante (ou None se não havia o que migrar)
+    """
+    from core.models import LikeAnonimo
+
+    if 'post_likes' not in request.session:
+        return obter_visitante_id(request)
+
+    visitante_id = obter_visitante_id(request, criar=True)
+    chave_sessao = request.session.session_key
+    if chave_sessao:
+        ja_curtidos = LikeAnonimo.objects.filter(session_key=visitante_id).values('post_id')
+        LikeAnonimo.objects.filter(session_key=chave_sessao).exclude(
+            post_id__in=ja_curtidos
+        ).update(session_key=visitante_id)
+    del request.session['post_likes']
+    return visitante_id
@@ -0,0 +1,210 @@
+"""
+Buffer de visualizações das notícias ASSEJUR
+
+Cada abertura de notícia incrementa um contador no cache compartilhado em vez
+de atualizar a linha de AssejurNews. O comando
+sincronizar_visualizacoes_noticias descarrega os contadores acumulados no
+banco em um único UPDATE, evitando disputa de lock em notícias populares.
+
+Quando o cache configurado é local ao processo (LocMemCache/DummyCache, como
+em produção), os contadores do cache não seriam visíveis para o comando. Nesse
+caso cada processo acumula as visualizações em memória e as grava ele mesmo,
+em um único UPDATE, a cada ASSEJUR_VISUALIZACOES_INTERVALO_LOCAL segundos e
+ao encerrar (0 grava cada visualização diretamente com um UPDATE via F()).
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+
+logger = logging.getLogger(__name__)
+
+CONTADOR_CACHE_KEY = 'assejur:visualizacoes:{noticia_id}'
+SESSAO_CACHE_KEY = 'assejur:visualizacoes:{noticia_id}:sessao:{session_key}'
+
+# Buffer local ao processo (cache não compartilhado)
+_pendentes_locais = Counter()
+_lock_local = threading.Lock()
+_ultima_descarga_local = time.monotonic()
+
+
+def _buffer_ativo():
+    return getattr(settings, 'ASSEJUR_VISUALIZACOES_BUFFER', True)
+
+
+def _cache_compartilhado():
+    return not isinstance(caches['default'], (LocMemCache, DummyCache))
+
+
+def _intervalo_local():
+    return getattr(settings, 'ASSEJUR_VISUALIZACOES_INTERVALO_LOCAL', 60)
+
+
+def buffer_disponivel():
+    """Indica se o cache padrão é compartilhado entre processos"""
+    return _buffer_ativo() and _cache_compartilhado()
+
+
+def buffer_local_disponivel():
+    """Indica se as visualizações são acumuladas na memória de cada processo"""
+    return _buffer_ativo() and not _cache_compartilhado() and _intervalo_local() > 0
+
+
+def registrar_visualizacao(noticia, session_key=None):
+    """
+    Registra uma visualização da notícia.
+
+    Args:
+        noticia: Instância de AssejurNews
+        session_key: Chave da sessão do visitante, usada para deduplicação
+
+    Returns:
+        True se a visualização foi contabilizada, False se era repetida
+    """
+    janela = getattr(settings, 'ASSEJUR_VISUALIZACOES_DEDUP_SEGUNDOS', 1800)
+    if janela and session_key:
+        chave_sessao = SESSAO_CACHE_KEY.format(noticia_id=noticia.pk, session_key=session_key)
+        if not cache.add(chave_sessao, 1, janela):
+            return False
+
+    if buffer_local_disponivel():
+        _acumular_local(noticia.pk)
+        return True
+
+    if not buffer_disponivel():
+        noticia.incrementar_visualizacoes()
+        return True
+
+    chave = CONTADOR_CACHE_KEY.format(noticia_id=noticia.pk)
+    if not cache.add(chave, 1, None):
+        try:
+            cache.incr(chave)
+        except ValueError:
+            # A chave expirou entre o add e o incr
+            cache.set(chave, 1, None)
+    return True
+
+
+def get_visualizacoes_pendentes(noticia_id):
+    """Retorna as visualizações ainda não gravadas no banco"""
+    if buffer_local_disponivel():
+        return _pendentes_locais.get(noticia_id, 0)
+    if not buffer_disponivel():
+        return 0
+    return cache.get(CONTADOR_CACHE_KEY.format(noticia_id=noticia_id)) or 0
+
+
+def get_total_visualizacoes(noticia):
+    """Retorna o total de visualizações (banco + buffer)"""
+    return noticia.visualizacoes + get_visualizacoes_pendentes(noticia.pk)
+
+
+def descarregar_visualizacoes(noticia_ids=None):
+    """
+    Grava no banco as visualizações acumuladas no cache.
+
+    Os contadores são lidos em lote e decrementados do valor lido, de modo que
+    visualizações registradas durante a sincronização não se perdem.
+
+    Args:
+        noticia_ids: IDs das notícias a sincronizar (padrão: todas)
+
+    Returns:
+        Dicionário {noticia_id: visualizações gravadas}
+    """
+    from core.models import AssejurNews
+
+    if not buffer_disponivel():
+        return {}
+
+    if noticia_ids is None:
+        noticia_ids = AssejurNews.objects.values_list('id', flat=True)
+
+    chaves = {CONTADOR_CACHE_KEY.format(noticia_id=pk): pk for pk in noticia_ids}
+    pendentes = {}
+    for chave, valor in cache.get_many(list(chaves)).items():
+        if not valor:
+            continue
+        try:
+            cache.decr(chave, valor)
+        except ValueError:
+            continue
+        pendentes[chaves[chave]] = valor
+
+    if not pendentes:
+        return {}
+
+    try:
+        _gravar(pendentes)
+    except Exception:
+        # Devolver as visualizações ao buffer para a próxima execução
+        for pk, quantidade in pendentes.items():
+            chave = CONTADOR_CACHE_KEY.format(noticia_id=pk)
+            if not cache.add(chave, quantidade, None):
+                cache.incr(chave, quantidade)
+        logger.exception("Erro ao sincronizar visualizações das notícias ASSEJUR")
+        raise
+
+    return pendentes
+
+
+def _gravar(pendentes):
+    """Soma as visualizações {noticia_id: quantidade} no banco em um único UPDATE"""
+    from core.models import AssejurNews
+
+    incremento = Case(
+        *[When(pk=pk, then=Value(quantidade)) for pk, quantidade in pendentes.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    with transaction.atomic():
+        AssejurNews.objects.filter(pk__in=pendentes).update(
+            visualizacoes=F('visualizacoes') + incremento
+        )
+
+
+def _acumular_local(noticia_id):
+    global _ultima_descarga_local
+    with _lock_local:
+        _pendentes_locais[noticia_id] += 1
+        agora = time.monotonic()
+        if agora - _ultima_descarga_local < _intervalo_local():
+            return
+        _ultima_descarga_local = agora
+    descarregar_visualizacoes_locais()
+
+
+def descarregar_visualizacoes_locais():
+    """
+    Grava no banco as visualizações acumuladas na memória deste processo.
+
+    Returns:
+        Dicionário {noticia_id: visualizações gravadas}
+    """
+    with _lock_local:
+        pendentes = dict(_pendentes_locais)
+        _pendentes_locais.clear()
+    if not pendentes:
+        return {}
+
+    try:
+        _gravar(pendentes)
+    except Exception:
+        # Devolver as visualizações ao buffer para a próxima gravação
+        with _lock_local:
+            _pendentes_locais.update(pendentes)
+        logger.exception("Erro ao gravar as visualizações das notícias ASSEJUR")
+        return {}
+    return pendentes
+
+
+# Não perder as visualizações acumuladas quando o processo é encerrado
+atexit.register(descarregar_visualizacoes_locais)
@@ -0,0 +1,30 @@
+"""
+Sinais do app core
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import InstitucionalConfig, FeedPost, Comentario, AssejurNews
+from .services.imagens import imagens_derivadas_geradas
+from .services.institucional_cache import invalidar_cache_institucional
+
+
+@receiver([post_save, post_delete], sender=InstitucionalConfig)
+@receiver([post_save, post_delete], sender=FeedPost)
+@receiver([post_save, post_delete], sender=Comentario)
+@receiver([post_save, post_delete], sender=AssejurNews)
+@receiver([post_save, post_delete], sender='diretoria.MembroDiretoria')
+@receiver([post_save, post_delete], sender='diretoria.CargoDiretoria')
+def invalidar_pagina_institucional(sender, **kwargs):
+    """Invalida o cache da página institucional quando seu conteúdo muda"""
+    invalidar_cache_institucional()
+
+
+@receiver(imagens_derivadas_geradas)
+def invalidar_pagina_institucional_imagens(sender, nome, geradas, **kwargs):
+    """As derivadas das imagens do feed e das notícias mudam o HTML da página"""
+    prefixos = tuple(
+        modelo._meta.get_field('imagem').upload_to for modelo in (FeedPost, AssejurNews)
+    )
+    if geradas and nome.startswith(prefixos):
+        invalidar_cache_institucional()
@@ -0,0 +1,57 @@
+import os
+import secrets
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils import timezone
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+class ArmazenamentoEstatico(CompressedManifestStaticFilesStorage):
+    """
+    Arquivos estáticos com hash do conteúdo no nome e versões .gz/.br
+    (.br requer o pacote Brotli), gerados no collectstatic.
+    
+    Uma referência a um arquivo inexistente (em {% static %} ou em url() de
+    um CSS) mantém o nome original em vez de gerar erro na página.
+    """
+    
+    manifest_strict = False
+    
+    def hashed_name(self, name, content=None, filename=None):
+        try:
+            return super().hashed_name(name, content, filename)
+        except ValueError:
+            return name
+
+
+class ArmazenamentoPrivado(FileSystemStorage):
+    """
+    Arquivos fora de MEDIA_ROOT, no diretório indicado pela configuração
+    informada, sem URL pública: só são entregues por views que verificam a
+    permissão de quem baixa.
+    """
+    
+    def __init__(self, configuracao):
+        self.configuracao = configuracao
+        super().__init__()
+    
+    @property
+    def base_location(self):
+        return str(getattr(settings, self.configuracao))
+    
+    @property
+    def location(self):
+        return os.path.abspath(self.base_location)
+    
+    def url(self, name):
+        raise ValueError('Arquivos privados não têm URL pública.')
+
+
+def armazenamento_tarefas_pdf():
+    return ArmazenamentoPrivado('PDF_TAREFAS_DIR')
+
+
+def nome_aleatorio(prefixo, extensao):
+    """Caminho "<prefixo>/<ano>/<mês>/<token>.<extensao>" impossível de adivinhar"""
+    return f'{prefixo}/{timezone.now():%Y/%m}/{secrets.token_urlsafe(16)}.{extensao}'
@@ -0,0 +1,20 @@
+from django import template
+from django.templatetags.static import static
+from django.utils.html import format_html_join
+
+from core.services.estaticos import arquivos_do_pacote
+
+register = template.Library()
+
+
+@register.simple_tag
+def pacote_estatico(nome):
+    """
+    Gera as tags <script> de um pacote de ESTATICOS_PACOTES: o arquivo
+    agrupado ou os arquivos individuais (ver core.services.estaticos)
+    """
+    return format_html_join(
+        '\n    ',
+        '<script src="{}"></script>',
+        ((static(arquivo),) for arquivo in arquivos_do_pacote(nome))
+    )
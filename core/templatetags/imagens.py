@@ -0,0 +1,50 @@
+from django import template
+from django.utils.html import escapejs, format_html, format_html_join
+
+from core.services.imagens import derivadas_disponiveis, url_imagem
+
+register = template.Library()
+
+
+@register.simple_tag
+def imagem_responsiva(arquivo, sizes='100vw', fallback=None, **atributos):
+    """
+    Gera um <picture> com srcset WebP/JPEG das derivadas da imagem (ver
+    core.services.imagens); sem derivadas, apenas o <img> com o original.
+    Com fallback, a URL informada é exibida se a imagem não carregar.
+
+    Uso: {% imagem_responsiva post.imagem sizes="(max-width: 768px) 100vw, 600px" alt=post.titulo class="img-fluid" %}
+    """
+    if not arquivo or not arquivo.name:
+        return ''
+
+    if fallback:
+        # Remove as fontes do <picture> e o srcset, senão o navegador continuaria usando-os
+        atributos['onerror'] = (
+            "this.onerror=null; this.removeAttribute('srcset'); "
+            "if (this.parentNode.tagName === 'PICTURE') "
+            "{ this.parentNode.querySelectorAll('source').forEach(function (s) { s.remove(); }); } "
+            f"this.src='{escapejs(fallback)}';"
+        )
+
+    atributos.setdefault('loading', 'lazy')
+    atributos.setdefault('decoding', 'async')
+    extras = format_html_join(' ', '{}="{}"', atributos.items())
+
+    derivadas = derivadas_disponiveis(arquivo)
+    if not derivadas:
+        return format_html('<img src="{}" {}>', arquivo.url, extras)
+
+    srcset_webp = ', '.join(f'{webp} {largura}w' for largura, webp, _ in derivadas)
+    srcset_jpg = ', '.join(f'{jpg} {largura}w' for largura, _, jpg in derivadas)
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" {}></picture>',
+        srcset_webp, sizes, arquivo.url, srcset_jpg, sizes, extras
+    )
+
+
+@register.filter
+def imagem_url(arquivo, tamanho='media'):
+    """URL da derivada no tamanho informado (ou do original): {{ foto|imagem_url:'miniatura' }}"""
+    return url_imagem(arquivo, tamanho)
@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import views, views_busca, views_pdf
 
 app_name = 'core'
 
@@ -36,6 +36,7 @@ urlpatterns = [
     path('feed/posts/<int:pk>/excluir/', views.feed_post_delete_ajax, name='feed_post_delete'),
     
     # URLs para interações dos posts (like, comentários, compartilhamento)
+    path('posts/curtidas/', views.post_likes_state_ajax, name='post_likes_state'),
     path('posts/<int:post_id>/like/', views.post_like_ajax, name='post_like'),
     path('posts/<int:post_id>/comment/', views.post_comment_ajax, name='post_comment'),
     path('posts/<int:post_id>/comments/', views.post_comments_list_ajax, name='post_comments_list'),
@@ -84,6 +85,13 @@ urlpatterns = [
     path('emails/enviar/', views.email_batch_send, name='email_batch_send'),
     path('emails/preview/', views.email_batch_preview, name='email_batch_preview'),
     path('emails/historico/', views.email_batch_history, name='email_batch_history'),
+    
+    # PDFs gerados em segundo plano
+    path('pdfs/<int:pk>/status/', views_pdf.tarefa_pdf_status, name='tarefa_pdf_status'),
+    path('pdfs/<int:pk>/download/', views_pdf.tarefa_pdf_download, name='tarefa_pdf_download'),
+
+    # Busca remota dos campos de seleção (core.widgets)
+    path('busca/<slug:fonte>/', views_busca.busca_remota, name='busca_remota'),
 <<<<<<< HEAD
     
     # URLs para galeria de ex-presidentes e história
@@ -8,10 +8,11 @@ from django.urls import reverse_lazy
 <<<<<<< HEAD
 from django.db.models import Count, Sum, Q, Prefetch, Max
 =======
-from django.db.models import Count, Sum, Q
+from django.db.models import Count, Sum, Q, Prefetch
 >>>>>>> c00fe10f4bf493986d435556591fabb7aae9e070
 from django.utils import timezone
-from django.http import JsonResponse
+from django.http import JsonResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
 from django.contrib.auth.models import Group
 import logging
 
@@ -25,8 +26,11 @@ from .models import Usuario, LogAtividade, ConfiguracaoSistema, InstitucionalCon
 from .forms import LoginForm, UsuarioCreationForm, UsuarioChangeForm, InstitucionalConfigForm, FeedPostForm, AssejurNewsForm, AssejurInformativoForm
 >>>>>>> c00fe10f4bf493986d435556591fabb7aae9e070
 from .permissions import PermissionRequiredMixin
+from .services import dashboard_kpis, institucional_cache, visualizacoes_buffer
+from .services.auditoria import registrar_atividade
+from .services.imagens import url_imagem
+from .services.visitantes import definir_cookie_visitante, migrar_curtidas_da_sessao, obter_visitante_id
 from associados.models import Associado
-from financeiro.models import Mensalidade
 from assejus.models import AtendimentoJuridico
 from .forms import UsuarioProfileForm
 from django.contrib.auth import update_session_auth_hash
@@ -41,6 +45,19 @@ class InstitucionalView(TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
+        # Dados comuns a todos os visitantes vêm do cache versionado
+        context.update(institucional_cache.obter_dados_pagina(self.get_dados_compartilhados))
+        
+        # Estado de curtidas do visitante é hidratado via core:post_likes_state
+        for post in context['feed_posts']:
+            post.user_has_liked = False
+        
+        return context
+    
+    def get_dados_compartilhados(self):
+        """Monta o contexto da página que não depende do visitante"""
+        context = {}
+        
         # Obter configurações personalizadas
         config = InstitucionalConfig.get_config()
         context.update({
@@ -89,47 +106,32 @@ class InstitucionalView(TemplateView):
             context['total_usuarios'] = Usuario.objects.filter(ativo=True).count()
             context['casos_juridicos'] = AtendimentoJuridico.objects.filter(status='em_andamento').count()
         
-        # Posts do feed (apenas posts ativos)
-        feed_posts = FeedPost.objects.filter(ativo=True).order_by('-destaque', '-ordem_exibicao', '-data_publicacao')[:10]
-        
-        # Adicionar informações de likes e comentários para todos os usuários
-        session_likes = self.request.session.get('post_likes', {})
+        # Posts do feed (apenas posts ativos) em uma única consulta;
+        # contadores vêm das colunas mantidas por FeedPost.ajustar_contadores()
+        comentarios_recentes = Comentario.objects.filter(
+            ativo=True
+        ).select_related('usuario').order_by('data_criacao')[:5]
+        feed_posts = list(FeedPost.objects.filter(ativo=True).prefetch_related(
+            Prefetch('comentario_set', queryset=comentarios_recentes, to_attr='comments_list')
+        ).order_by('-destaque', '-ordem_exibicao', '-data_publicacao')[:10])
         
         for post in feed_posts:
-            # Sincronizar contadores do post
-            post.sync_counters()
-            
-            # Verificar se usuário curtiu (autenticado) ou usando sessão (anônimo)
-            if self.request.user.is_authenticated:
-                post.user_has_liked = post.user_liked(self.request.user)
-            else:
-                post.user_has_liked = str(post.id) in session_likes
-            
-            # Contar likes incluindo sessão para usuários anônimos
-            post.likes_count = post.get_likes_count()
-            
-            # Contar comentários ativos
-            post.comments_count = post.get_comentarios_count()
-            
-            # Obter comentários ativos do post (melhorados)
-            post.comments_list = post.comentario_set.filter(ativo=True).select_related('usuario').order_by('data_criacao')[:5]
-            
-            # Debug: Log informações do post
-            print(f"DEBUG - Post {post.id}: likes={post.likes_count}, comments={post.comments_count}, comments_list_count={len(post.comments_list)}")
+            post.likes_count = post.likes
+            post.comments_count = post.comentarios
         
         context['feed_posts'] = feed_posts
         
         # Notícias da Assessoria Jurídica para o carrossel (10 mais recentes)
-        assejur_news = AssejurNews.objects.filter(
+        assejur_news = list(AssejurNews.objects.filter(
             ativo=True
-        ).order_by('-destaque', '-ordem_exibicao', '-data_publicacao')[:10]
+        ).order_by('-destaque', '-ordem_exibicao', '-data_publicacao')[:10])
         
         context['assejur_news'] = assejur_news
         
         # Notícias anteriores (excluindo as 10 do carrossel)
-        noticias_anteriores = AssejurNews.objects.filter(
+        noticias_anteriores = list(AssejurNews.objects.filter(
             ativo=True
-        ).order_by('-destaque', '-ordem_exibicao', '-data_publicacao')[10:22]  # Próximas 12 notícias
+        ).order_by('-destaque', '-ordem_exibicao', '-data_publicacao')[10:22])  # Próximas 12 notícias
         
         context['noticias_anteriores'] = noticias_anteriores
         
@@ -150,7 +152,7 @@ class InstitucionalView(TemplateView):
                 'ativo': noticia.ativo,
                 'destaque': noticia.destaque,
                 'ordem_exibicao': noticia.ordem_exibicao or 0,
-                'imagem': noticia.imagem.url if noticia.imagem else '',
+                'imagem': url_imagem(noticia.imagem, 'media'),
                 'imagem_legenda': noticia.imagem_legenda or '',
             })
         
@@ -179,23 +181,12 @@ class DashboardView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        # Estatísticas gerais
-        context['total_associados'] = Associado.objects.filter(ativo=True).count()
-        context['total_usuarios'] = Usuario.objects.filter(ativo=True).count()
-        context['mensalidades_pendentes'] = Mensalidade.objects.filter(status='pendente').count()
-        context['casos_juridicos'] = AtendimentoJuridico.objects.filter(status='em_andamento').count()
-        
-        # Receitas do mês atual
-        mes_atual = timezone.now().month
-        ano_atual = timezone.now().year
-        context['receita_mes'] = Mensalidade.objects.filter(
-            status='pago',
-            data_vencimento__month=mes_atual,
-            data_vencimento__year=ano_atual
-        ).aggregate(total=Sum('valor'))['total'] or 0
+        # Indicadores (consultas agrupadas e cache curto em core.services.dashboard_kpis)
+        kpis, _ = dashboard_kpis.obter_kpis()
+        context.update(kpis)
         
         # Atividades recentes
-        context['atividades_recentes'] = LogAtividade.objects.select_related('usuario')[:10]
+        context['atividades_recentes'] = LogAtividade.objects.recentes(10)
         
         # Notificações pendentes
         context['notificacoes_pendentes'] = Notificacao.objects.filter(
@@ -215,7 +206,6 @@ class DashboardView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView):
         # Estatísticas adicionais
         context['associados_por_estado'] = Associado.objects.values('estado').annotate(total=Count('id'))[:10]
         context['associados_recentes'] = Associado.objects.order_by('-data_cadastro')[:5]
-        context['mensalidades_vencidas'] = Mensalidade.objects.filter(status='pendente', data_vencimento__lt=timezone.now()).count()
         
         return context
 
@@ -262,7 +252,7 @@ def login_view(request):
                     login(request, user)
                     
                     # Registrar log de atividade
-                    LogAtividade.objects.create(
+                    registrar_atividade(
                         usuario=user,
                         acao='Login realizado',
                         modulo='Sistema',
@@ -320,7 +310,7 @@ def primeiro_acesso_view(request):
             update_session_auth_hash(request, request.user)
             
             # Log da atividade
-            LogAtividade.objects.create(
+            registrar_atividade(
                 usuario=request.user,
                 acao='Alteração de senha no primeiro acesso',
                 modulo='Autenticação',
@@ -497,7 +487,7 @@ class UsuarioCreateView(LoginRequiredMixin, CreateView):
         )
         
         # Registrar log de atividade
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=self.request.user,
             acao='Usuário criado',
             modulo='Core',
@@ -565,7 +555,7 @@ class UsuarioUpdateView(LoginRequiredMixin, UpdateView):
                 return redirect_to_user_dashboard(self.object)
         
         # Registrar log de atividade
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=self.request.user,
             acao='Usuário atualizado',
             modulo='Core',
@@ -587,7 +577,7 @@ class UsuarioDeleteView(LoginRequiredMixin, DeleteView):
         usuario = self.get_object()
         
         # Registrar log de atividade
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=request.user,
             acao='Usuário excluído',
             modulo='Core',
@@ -652,7 +642,7 @@ def perfil_usuario(request):
                     messages.success(request, 'Perfil atualizado e senha alterada com sucesso!')
                 
                 # Registrar log de atividade
-                LogAtividade.objects.create(
+                registrar_atividade(
                     usuario=request.user,
                     acao='Perfil atualizado e senha alterada',
                     modulo='Core',
@@ -665,7 +655,7 @@ def perfil_usuario(request):
                 messages.success(request, 'Perfil atualizado com sucesso!')
                 
                 # Registrar log de atividade
-                LogAtividade.objects.create(
+                registrar_atividade(
                     usuario=request.user,
                     acao='Perfil atualizado',
                     modulo='Core',
@@ -741,8 +731,7 @@ def usuario_dashboard(request):
                 context['mensalidades'] = associado.mensalidades.all()[:5]
                 
                 # Registrar log de atividade
-                from core.models import LogAtividade
-                LogAtividade.objects.create(
+                registrar_atividade(
                     usuario=request.user,
                     acao='Associado vinculado automaticamente',
                     modulo='Core',
@@ -772,7 +761,7 @@ def usuario_dashboard(request):
             pass
     
     # Adicionar atividades recentes do usuário
-    context['atividades_recentes'] = LogAtividade.objects.filter(usuario=request.user)[:10]
+    context['atividades_recentes'] = LogAtividade.objects.do_usuario(request.user)[:10]
     
     return render(request, 'core/usuario_dashboard.html', context)
 
@@ -781,23 +770,21 @@ def usuario_dashboard(request):
 def dashboard_stats(request):
     """
     API para estatísticas do dashboard (AJAX)
+    
+    Responde com ETag; quando o cliente envia If-None-Match com o ETag atual
+    a resposta é 304 sem corpo.
     """
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-        # Estatísticas em tempo real
-        mes_atual = timezone.now().month
-        ano_atual = timezone.now().year
-        
-        stats = {
-            'total_associados': Associado.objects.filter(ativo=True).count(),
-            'receita_mes': Mensalidade.objects.filter(
-                status='pago',
-                data_vencimento__month=mes_atual,
-                data_vencimento__year=ano_atual
-            ).aggregate(total=Sum('valor'))['total'] or 0,
-            'mensalidades_pendentes': Mensalidade.objects.filter(status='pendente').count(),
-            'casos_juridicos': AtendimentoJuridico.objects.filter(status='em_andamento').count(),
-        }
-        return JsonResponse(stats)
+        kpis, etag = dashboard_kpis.obter_kpis()
+        etag = f'"{etag}"'
+        
+        if etag in request.headers.get('If-None-Match', ''):
+            response = HttpResponseNotModified()
+        else:
+            response = JsonResponse(kpis)
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
     
     return JsonResponse({'error': 'Requisição inválida'}, status=400)
 
@@ -819,7 +806,7 @@ class InstitucionalConfigEditView(LoginRequiredMixin, UpdateView):
         response = super().form_valid(form)
         
         # Registrar log de atividade
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=self.request.user,
             acao='Configuração institucional atualizada',
             modulo='Core',
@@ -883,7 +870,7 @@ class FeedPostCreateView(LoginRequiredMixin, CreateView):
         response = super().form_valid(form)
         
         # Registrar log de atividade
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=self.request.user,
             acao='Post do feed criado',
             modulo='Core',
@@ -907,7 +894,7 @@ class FeedPostUpdateView(LoginRequiredMixin, UpdateView):
         response = super().form_valid(form)
         
         # Registrar log de atividade
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=self.request.user,
             acao='Post do feed atualizado',
             modulo='Core',
@@ -930,7 +917,7 @@ class FeedPostDeleteView(LoginRequiredMixin, DeleteView):
         post = self.get_object()
         
         # Registrar log de atividade
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=request.user,
             acao='Post do feed excluído',
             modulo='Core',
@@ -983,7 +970,7 @@ def feed_post_create_ajax(request):
                 
                 # Registrar log de atividade
                 try:
-                    LogAtividade.objects.create(
+                    registrar_atividade(
                         usuario=request.user,
                         acao='Post do feed criado via AJAX',
                         modulo='Core',
@@ -1079,7 +1066,7 @@ def feed_post_update_ajax(request, pk):
                 
                 # Registrar log de atividade
                 try:
-                    LogAtividade.objects.create(
+                    registrar_atividade(
                         usuario=request.user,
                         acao='Post do feed atualizado via AJAX',
                         modulo='Core',
@@ -1137,7 +1124,7 @@ def feed_post_delete_ajax(request, pk):
         post.delete()
         
         # Registrar log de atividade
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=request.user,
             acao='Post do feed excluído via AJAX',
             modulo='Core',
@@ -1216,7 +1203,7 @@ def feed_post_create(request):
             post.save()
             
             # Registrar log de atividade
-            LogAtividade.objects.create(
+            registrar_atividade(
                 usuario=request.user,
                 acao='Post do feed criado',
                 modulo='Core',
@@ -1259,71 +1246,56 @@ def post_like_ajax(request, post_id):
                 if like_exists:
                     # Descurtir - remover like
                     like_exists.delete()
+                    post.ajustar_contadores(likes=-1)
                     liked = False
                     action = 'descurtiu'
                 else:
                     # Curtir - adicionar like
-                    Like.objects.create(post=post, usuario=request.user)
+                    _, criado = Like.objects.get_or_create(post=post, usuario=request.user)
+                    if criado:
+                        post.ajustar_contadores(likes=1)
                     liked = True
                     action = 'curtiu'
                 
                 # Registrar log de atividade
-                LogAtividade.objects.create(
+                registrar_atividade(
                     usuario=request.user,
                     acao=f'Post {action}',
                     modulo='Core',
                     detalhes=f'Post "{post.titulo}" {action} pelo usuário'
                 )
             else:
-                # Para usuários anônimos, usar sessão e persistir no banco
-                session_likes = request.session.get('post_likes', {})
-                post_id_str = str(post_id)
+                # Para usuários anônimos, identificar o visitante por cookie (sem gravar na sessão)
+                from core.models import LikeAnonimo
+                visitante_id = migrar_curtidas_da_sessao(request) or obter_visitante_id(request, criar=True)
                 
-                # Garantir que a sessão tenha uma chave
-                if not request.session.session_key:
-                    request.session.create()
-                
-                if post_id_str in session_likes:
-                    # Descurtir - remover da sessão e do banco
-                    del session_likes[post_id_str]
+                removidos, _ = LikeAnonimo.objects.filter(post=post, session_key=visitante_id).delete()
+                if removidos:
+                    # Descurtir
+                    post.ajustar_contadores(likes=-1)
                     liked = False
                     action = 'descurtiu'
-                    
-                    # Remover like anônimo do banco
-                    from core.models import LikeAnonimo
-                    LikeAnonimo.objects.filter(
-                        post=post,
-                        session_key=request.session.session_key
-                    ).delete()
                 else:
-                    # Curtir - adicionar na sessão e no banco
-                    session_likes[post_id_str] = True
-                    liked = True
-                    action = 'curtiu'
-                    
-                    # Criar like anônimo no banco
-                    from core.models import LikeAnonimo
-                    LikeAnonimo.objects.create(
+                    # Curtir
+                    _, criado = LikeAnonimo.objects.get_or_create(
                         post=post,
-                        session_key=request.session.session_key,
-                        nome_anonimo=request.session.get('nome_anonimo', 'Visitante')
+                        session_key=visitante_id,
+                        defaults={'nome_anonimo': 'Visitante'}
                     )
-                
-                request.session['post_likes'] = session_likes
-                request.session.modified = True
-            
-            # Sincronizar contadores do post
-            post.sync_counters()
+                    if criado:
+                        post.ajustar_contadores(likes=1)
+                    liked = True
+                    action = 'curtiu'
             
-            # Contar likes atuais incluindo sessão
-            likes_count = post.get_likes_count()
+            likes_count = post.likes
             
-            return JsonResponse({
+            response = JsonResponse({
                 'success': True,
                 'liked': liked,
                 'likes_count': likes_count,
                 'message': f'Post {action} com sucesso!'
             })
+            return definir_cookie_visitante(request, response)
             
         except Exception as e:
             return JsonResponse({
@@ -1334,6 +1306,46 @@ def post_like_ajax(request, post_id):
     return JsonResponse({'success': False, 'message': 'Método não permitido'})
 
 
+def post_likes_state_ajax(request):
+    """
+    View AJAX que retorna o estado de curtidas do visitante e os contadores
+    atuais dos posts informados em ?ids=1,2,3 (a página institucional pode
+    vir do cache e não conhece o visitante)
+    """
+    try:
+        ids = [int(pk) for pk in request.GET.get('ids', '').split(',') if pk.strip().isdigit()][:50]
+
+        contadores = FeedPost.objects.filter(id__in=ids, ativo=True).values_list('id', 'likes', 'comentarios')
+
+        if request.user.is_authenticated:
+            curtidos = set(
+                Like.objects.filter(post_id__in=ids, usuario=request.user).values_list('post_id', flat=True)
+            )
+        else:
+            from core.models import LikeAnonimo
+            visitante_id = migrar_curtidas_da_sessao(request)
+            curtidos = set(
+                LikeAnonimo.objects.filter(post_id__in=ids, session_key=visitante_id).values_list('post_id', flat=True)
+            ) if visitante_id else set()
+
+        posts = {
+            post_id: {
+                'liked': post_id in curtidos,
+                'likes_count': likes,
+                'comments_count': comentarios,
+            }
+            for post_id, likes, comentarios in contadores
+        }
+
+        return definir_cookie_visitante(request, JsonResponse({'success': True, 'posts': posts}))
+
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Erro ao carregar curtidas: {str(e)}'
+        })
+
+
 def post_comment_ajax(request, post_id):
     """
     View AJAX para adicionar comentários (aberto para todos)
@@ -1387,13 +1399,13 @@ def post_comment_ajax(request, post_id):
                     conteudo=conteudo
                 )
             
-            # Sincronizar contadores do post
-            counters = post.sync_counters()
-            comments_count = counters['comentarios']
+            # Atualizar contador de comentários do post
+            post.ajustar_contadores(comentarios=1)
+            comments_count = post.comentarios
             
             # Registrar log de atividade (apenas para usuários autenticados)
             if request.user.is_authenticated:
-                LogAtividade.objects.create(
+                registrar_atividade(
                     usuario=request.user,
                     acao='Comentário adicionado',
                     modulo='Core',
@@ -1509,7 +1521,7 @@ class AssejurNewsCreateView(LoginRequiredMixin, CreateView):
         response = super().form_valid(form)
         
         # Registrar log de atividade
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=self.request.user,
             acao='Notícia ASSEJUR criada',
             modulo='Core',
@@ -1540,7 +1552,7 @@ class AssejurNewsUpdateView(LoginRequiredMixin, UpdateView):
         response = super().form_valid(form)
         
         # Registrar log de atividade
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=self.request.user,
             acao='Notícia ASSEJUR atualizada',
             modulo='Core',
@@ -1570,7 +1582,7 @@ class AssejurNewsDeleteView(LoginRequiredMixin, DeleteView):
         noticia = self.get_object()
         
         # Registrar log de atividade
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=request.user,
             acao='Notícia ASSEJUR excluída',
             modulo='Core',
@@ -1632,7 +1644,7 @@ class AssejurInformativoCreateView(LoginRequiredMixin, CreateView):
         response = super().form_valid(form)
         
         # Registrar log de atividade
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=self.request.user,
             acao='Informativo ASSEJUR criado',
             modulo='Core',
@@ -1663,7 +1675,7 @@ class AssejurInformativoUpdateView(LoginRequiredMixin, UpdateView):
         response = super().form_valid(form)
         
         # Registrar log de atividade
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=self.request.user,
             acao='Informativo ASSEJUR atualizado',
             modulo='Core',
@@ -1693,7 +1705,7 @@ class AssejurInformativoDeleteView(LoginRequiredMixin, DeleteView):
         informativo = self.get_object()
         
         # Registrar log de atividade
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=request.user,
             acao='Informativo ASSEJUR excluído',
             modulo='Core',
@@ -1722,7 +1734,7 @@ def assejur_news_toggle_status_ajax(request, pk):
             noticia.save()
             
             # Registrar log de atividade
-            LogAtividade.objects.create(
+            registrar_atividade(
                 usuario=request.user,
                 acao='Status da notícia ASSEJUR alterado',
                 modulo='Core',
@@ -1755,7 +1767,7 @@ def assejur_informativo_toggle_status_ajax(request, pk):
             informativo.save()
             
             # Registrar log de atividade
-            LogAtividade.objects.create(
+            registrar_atividade(
                 usuario=request.user,
                 acao='Status do informativo ASSEJUR alterado',
                 modulo='Core',
@@ -1783,15 +1795,16 @@ def assejur_news_detail(request, pk):
     """
     noticia = get_object_or_404(AssejurNews, pk=pk, ativo=True)
     
-    # Incrementar visualizações
-    noticia.incrementar_visualizacoes()
+    # Registrar visualização no buffer (sincronizado periodicamente)
+    visualizacoes_buffer.registrar_visualizacao(noticia, request.session.session_key)
+    noticia.visualizacoes = visualizacoes_buffer.get_total_visualizacoes(noticia)
     
     # Obter comentários ativos da notícia
     comentarios = noticia.get_comentarios_ativos()
     
     # Registrar log de atividade se usuário autenticado
     if request.user.is_authenticated:
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=request.user,
             acao='Notícia ASSEJUR visualizada',
             modulo='Core',
@@ -1882,7 +1895,7 @@ def post_share_ajax(request, post_id):
             
             # Registrar log de atividade (apenas para usuários autenticados)
             if request.user.is_authenticated:
-                LogAtividade.objects.create(
+                registrar_atividade(
                     usuario=request.user,
                     acao='Post compartilhado',
                     modulo='Core',
@@ -1964,12 +1977,15 @@ def assejur_news_view_increment_ajax(request, news_id):
         try:
             noticia = get_object_or_404(AssejurNews, id=news_id, ativo=True)
             
-            # Incrementar visualizações
-            noticia.incrementar_visualizacoes()
+            # Registrar visualização no buffer; aberturas repetidas na mesma
+            # sessão não são contabilizadas nem registradas em log
+            contabilizada = visualizacoes_buffer.registrar_visualizacao(
+                noticia, request.session.session_key
+            )
             
             # Registrar log de atividade se usuário autenticado
-            if request.user.is_authenticated:
-                LogAtividade.objects.create(
+            if contabilizada and request.user.is_authenticated:
+                registrar_atividade(
                     usuario=request.user,
                     acao='Notícia ASSEJUR visualizada (modal)',
                     modulo='Core',
@@ -1978,7 +1994,7 @@ def assejur_news_view_increment_ajax(request, news_id):
             
             return JsonResponse({
                 'success': True,
-                'visualizacoes': noticia.visualizacoes,
+                'visualizacoes': visualizacoes_buffer.get_total_visualizacoes(noticia),
                 'message': 'Visualização registrada com sucesso!'
             })
             
@@ -2256,7 +2272,7 @@ def redefinir_senha_usuario(request, pk):
         usuario.save()
         
         # Registrar log de atividade
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=request.user,
             acao='Senha redefinida',
             modulo='Core',
@@ -2447,7 +2463,7 @@ def email_batch_send(request):
             
             if result:
                 # Registrar log de atividade
-                LogAtividade.objects.create(
+                registrar_atividade(
                     usuario=request.user,
                     acao='Envio de emails em lote',
                     modulo='Core',
@@ -2506,10 +2522,9 @@ def email_batch_history(request):
     from django.core.paginator import Paginator
     
     # Buscar logs de envio de emails
-    logs = LogAtividade.objects.filter(
-        acao__icontains='email',
-        modulo='Core'
-    ).order_by('-data_hora')
+    logs = LogAtividade.objects.do_modulo('Core').filter(
+        acao__icontains='email'
+    )
     
     paginator = Paginator(logs, 20)
     page_number = request.GET.get('page')
@@ -2632,7 +2647,7 @@ class ExPresidenteCreateView(LoginRequiredMixin, CreateView):
         response = super().form_valid(form)
         
         # Registrar log de atividade
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=self.request.user,
             acao='Ex-presidente criado',
             modulo='Core',
@@ -2656,7 +2671,7 @@ class ExPresidenteUpdateView(LoginRequiredMixin, UpdateView):
         response = super().form_valid(form)
         
         # Registrar log de atividade
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=self.request.user,
             acao='Ex-presidente atualizado',
             modulo='Core',
@@ -2679,7 +2694,7 @@ class ExPresidenteDeleteView(LoginRequiredMixin, DeleteView):
         nome = obj.nome
         
         # Registrar log de atividade
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=request.user,
             acao='Ex-presidente excluído',
             modulo='Core',
@@ -2714,7 +2729,7 @@ class HistoriaAssociacaoCreateView(LoginRequiredMixin, CreateView):
                 )
         
         # Registrar log de atividade
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=self.request.user,
             acao='Marco histórico criado',
             modulo='Core',
@@ -2764,7 +2779,7 @@ class HistoriaAssociacaoUpdateView(LoginRequiredMixin, UpdateView):
                 )
         
         # Registrar log de atividade
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=self.request.user,
             acao='Marco histórico atualizado',
             modulo='Core',
@@ -2787,7 +2802,7 @@ class HistoriaAssociacaoDeleteView(LoginRequiredMixin, DeleteView):
         titulo = obj.titulo
         
         # Registrar log de atividade
-        LogAtividade.objects.create(
+        registrar_atividade(
             usuario=request.user,
             acao='Marco histórico excluído',
             modulo='Core',
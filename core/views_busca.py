@@ -0,0 +1,29 @@
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from .models import Usuario
+from .services.busca_remota import LIMITE_PADRAO, buscar, obter_fonte
+
+
+@login_required
+@require_GET
+def busca_remota(request, fonte):
+    """
+    Resultados da busca dos widgets BuscaRemotaSelect (?q=termo&limite=20)
+    """
+    configuracao = obter_fonte(fonte)
+    if configuracao is None:
+        return JsonResponse({'success': False, 'message': 'Fonte de busca inválida.'}, status=404)
+    if request.user.tipo_usuario == Usuario.ASSOCIADO and not configuracao['permitir_associado']:
+        return JsonResponse({'success': False, 'message': 'Acesso negado.'}, status=403)
+
+    try:
+        limite = int(request.GET.get('limite', LIMITE_PADRAO))
+    except ValueError:
+        limite = LIMITE_PADRAO
+
+    return JsonResponse({
+        'success': True,
+        'results': buscar(fonte, request.GET.get('q', ''), limite),
+    })
@@ -0,0 +1,52 @@
+from django.contrib.auth.decorators import login_required
+from django.http import FileResponse, Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+
+from .models import TarefaPDF
+
+
+def _obter_tarefa(request, pk):
+    tarefa = get_object_or_404(TarefaPDF, pk=pk)
+    if tarefa.usuario_id != request.user.pk and not request.user.is_superuser:
+        raise Http404('Tarefa não encontrada.')
+    return tarefa
+
+
+@login_required
+def tarefa_pdf_status(request, pk):
+    """
+    Andamento de um PDF gerado em segundo plano (consultado periodicamente)
+    """
+    tarefa = _obter_tarefa(request, pk)
+    if tarefa.expirada:
+        tarefa.status = 'erro'
+        tarefa.erro = 'A geração do PDF excedeu o tempo limite.'
+        tarefa.save(update_fields=['status', 'erro'])
+    
+    dados = {
+        'success': tarefa.status != 'erro',
+        'status': tarefa.status,
+        'message': tarefa.erro or tarefa.get_status_display(),
+    }
+    if tarefa.status == 'concluido':
+        dados['download_url'] = reverse('core:tarefa_pdf_download', args=[tarefa.pk])
+    return JsonResponse(dados)
+
+
+@login_required
+def tarefa_pdf_download(request, pk):
+    """
+    Download do PDF de uma tarefa concluída
+    """
+    tarefa = _obter_tarefa(request, pk)
+    if tarefa.status != 'concluido' or not tarefa.arquivo:
+        raise Http404('O PDF ainda não está disponível.')
+    if tarefa.vencida:
+        raise Http404('O PDF expirou; gere o documento novamente.')
+    return FileResponse(
+        tarefa.arquivo.open('rb'),
+        as_attachment=True,
+        filename=tarefa.nome_arquivo,
+        content_type='application/pdf'
+    )
@@ -0,0 +1,73 @@
+"""
+Widgets de seleção com busca remota
+
+BuscaRemotaSelect e BuscaRemotaSelectMultiple substituem forms.Select e
+forms.SelectMultiple em campos ModelChoiceField/ModelMultipleChoiceField com
+muitos registros. Em vez de uma <option> por registro do queryset, renderizam
+apenas os valores selecionados; o script static/js/busca-remota.js adiciona
+uma caixa de pesquisa que consulta o endpoint core:busca_remota.
+
+A validação continua sendo a do campo: um único get()/filter(pk__in=...) no
+queryset definido no formulário.
+"""
+from django import forms
+from django.core.exceptions import ValidationError
+from django.forms.models import ModelChoiceIterator
+from django.urls import reverse
+
+from core.services.busca_remota import MINIMO_CARACTERES, obter_fonte
+
+
+class BuscaRemotaMixin:
+    def __init__(self, fonte, attrs=None, placeholder='Digite para pesquisar...'):
+        if obter_fonte(fonte) is None:
+            raise ValueError(f'Fonte de busca remota desconhecida: {fonte}')
+        self.fonte = fonte
+        self.placeholder = placeholder
+        super().__init__(attrs)
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs.setdefault('data-busca-remota', reverse('core:busca_remota', kwargs={'fonte': self.fonte}))
+        attrs.setdefault('data-minimo', MINIMO_CARACTERES)
+        attrs.setdefault('data-placeholder', self.placeholder)
+        return attrs
+
+    def use_required_attribute(self, initial):
+        # Select.use_required_attribute inspeciona a primeira opção, o que
+        # percorreria o queryset quando não há empty_label
+        if not isinstance(self.choices, ModelChoiceIterator):
+            return super().use_required_attribute(initial)
+        if not forms.Widget.use_required_attribute(self, initial):
+            return False
+        return self.allow_multiple_selected or self.choices.field.empty_label is not None
+
+    def optgroups(self, name, value, attrs=None):
+        if not isinstance(self.choices, ModelChoiceIterator):
+            return super().optgroups(name, value, attrs)
+
+        campo = self.choices.field
+        selecionados = {str(v) for v in value if v not in (None, '')}
+        opcoes = []
+        if not self.allow_multiple_selected and campo.empty_label is not None:
+            opcoes.append(self.create_option(name, '', campo.empty_label, not selecionados, 0, attrs=attrs))
+
+        if selecionados:
+            chave = campo.to_field_name or 'pk'
+            try:
+                objetos = list(campo.queryset.filter(**{f'{chave}__in': selecionados}))
+            except (ValueError, TypeError, ValidationError):
+                objetos = []
+            for objeto in objetos:
+                valor, rotulo = self.choices.choice(objeto)
+                opcoes.append(self.create_option(name, valor, rotulo, True, len(opcoes), attrs=attrs))
+
+        return [(None, opcoes, 0)]
+
+
+class BuscaRemotaSelect(BuscaRemotaMixin, forms.Select):
+    """Select de um valor com opções carregadas sob demanda"""
+
+
+class BuscaRemotaSelectMultiple(BuscaRemotaMixin, forms.SelectMultiple):
+    """Select múltiplo com opções carregadas sob demanda"""
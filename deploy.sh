@@ -147,6 +147,7 @@ python manage.py createsuperuser --settings=abmepi.settings_production || warnin
 
 # Coletar arquivos estáticos
 log "Coletando arquivos estáticos..."
+python manage.py agrupar_estaticos --settings=abmepi.settings_production
 python manage.py collectstatic --noinput --settings=abmepi.settings_production
 
 # Configurar Nginx
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import CargoDiretoria, MembroDiretoria, AtaReuniao, ResolucaoDiretoria, ModeloAtaPersonalizado, ModeloAtaUnificado
+from .models import CargoDiretoria, MembroDiretoria, AtaReuniao, AtaReuniaoRevisao, ResolucaoDiretoria, ModeloAtaPersonalizado, ModeloAtaUnificado
 
 
 @admin.register(CargoDiretoria)
@@ -30,6 +30,16 @@ class AtaReuniaoAdmin(admin.ModelAdmin):
     list_editable = ['aprovada']
     filter_horizontal = ['membros_presentes', 'membros_ausentes', 'associados_presentes', 'associados_ausentes']
     raw_id_fields = ['presidente', 'secretario']
+    readonly_fields = ['versao']
+
+
+@admin.register(AtaReuniaoRevisao)
+class AtaReuniaoRevisaoAdmin(admin.ModelAdmin):
+    list_display = ['ata', 'versao', 'autor', 'data_criacao']
+    search_fields = ['ata__titulo']
+    ordering = ['-data_criacao']
+    raw_id_fields = ['ata', 'autor']
+    readonly_fields = ['ata', 'versao', 'alteracoes', 'autor', 'data_criacao']
 
 
 @admin.register(ResolucaoDiretoria)
@@ -0,0 +1,314 @@
+"""
+Salvamento automático incremental das atas de reunião
+
+O editor envia apenas os campos alterados desde a última gravação (e, para o
+conteúdo completo, um patch com os trechos modificados) junto com a versão da
+ata que ele conhece. A gravação só é aplicada se a versão no banco ainda for a
+mesma (controle de concorrência otimista); caso contrário é retornado um
+conflito para que o editor recarregue a ata antes de sobrescrever o trabalho
+de outra pessoa.
+
+Formato da requisição (JSON):
+    {
+        "versao": 7,
+        "campos": {"titulo": "...", "presidente": 3},
+        "conteudo_patch": [{"inicio": 120, "fim": 135, "texto": "novo trecho"}],
+        "presencas": {"membros_presentes": [1, 2, 5]}
+    }
+
+As posições do patch são contadas em unidades UTF-16, como os índices das
+strings JavaScript: um emoji ocupa duas posições no editor e um caractere na
+string Python.
+
+O envio completo do formulário (salvar_formulario) passa pela mesma
+verificação de versão e também registra uma revisão.
+"""
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import AtaReuniao, AtaReuniaoRevisao
+
+CAMPOS_EDITAVEIS = [
+    'titulo', 'tipo_reuniao', 'data_reuniao', 'local',
+    'presidente', 'secretario', 'pauta', 'deliberacoes', 'observacoes',
+]
+
+CAMPOS_PRESENCA = [
+    'membros_presentes', 'membros_ausentes',
+    'associados_presentes', 'associados_ausentes',
+]
+
+
+class ConflitoVersao(Exception):
+    """A ata foi alterada por outra pessoa depois da versão enviada"""
+
+    def __init__(self, versao_atual):
+        self.versao_atual = versao_atual
+        super().__init__(f'A ata foi alterada por outro usuário (versão atual: {versao_atual})')
+
+
+def _indice(texto, posicao):
+    """Converte uma posição em unidades UTF-16 no índice correspondente da string"""
+    if len(texto.encode('utf-16-le')) == 2 * len(texto):
+        # Sem caracteres fora do BMP: as duas contagens coincidem
+        if not 0 <= posicao <= len(texto):
+            raise ValidationError('Patch de conteúdo fora dos limites do texto.')
+        return posicao
+
+    unidades = 0
+    for indice, caractere in enumerate(texto):
+        if unidades >= posicao:
+            break
+        unidades += 2 if ord(caractere) > 0xFFFF else 1
+    else:
+        indice = len(texto)
+    if posicao < 0 or unidades < posicao:
+        raise ValidationError('Patch de conteúdo fora dos limites do texto.')
+    if unidades > posicao:
+        raise ValidationError('Patch de conteúdo divide um caractere.')
+    return indice
+
+
+def _posicao(texto, indice):
+    """Converte um índice da string na posição em unidades UTF-16"""
+    return len(texto[:indice].encode('utf-16-le')) // 2
+
+
+def aplicar_patch(texto, operacoes):
+    """
+    Aplica operações de substituição de trechos ao texto.
+
+    Cada operação {'inicio', 'fim', 'texto'} substitui o trecho entre as
+    posições inicio e fim (em unidades UTF-16); as posições referem-se ao
+    texto já modificado pelas operações anteriores.
+    """
+    for operacao in operacoes:
+        try:
+            inicio = int(operacao['inicio'])
+            fim = int(operacao['fim'])
+            trecho = str(operacao.get('texto', ''))
+            trecho.encode('utf-8')
+        except (KeyError, TypeError, ValueError):
+            raise ValidationError('Patch de conteúdo inválido.')
+        if inicio > fim:
+            raise ValidationError('Patch de conteúdo fora dos limites do texto.')
+        inicio, fim = _indice(texto, inicio), _indice(texto, fim)
+        texto = texto[:inicio] + trecho + texto[fim:]
+    return texto
+
+
+def calcular_patch(origem, destino):
+    """
+    Calcula uma operação que transforma `origem` em `destino`, descartando
+    o prefixo e o sufixo comuns (tempo linear no tamanho do texto). As
+    posições seguem o formato de aplicar_patch.
+    """
+    limite = min(len(origem), len(destino))
+    prefixo = 0
+    while prefixo < limite and origem[prefixo] == destino[prefixo]:
+        prefixo += 1
+
+    sufixo = 0
+    while (sufixo < limite - prefixo and
+           origem[len(origem) - 1 - sufixo] == destino[len(destino) - 1 - sufixo]):
+        sufixo += 1
+
+    return [{
+        'inicio': _posicao(origem, prefixo),
+        'fim': _posicao(origem, len(origem) - sufixo),
+        'texto': destino[prefixo:len(destino) - sufixo],
+    }]
+
+
+def _serializar(valor):
+    if hasattr(valor, 'isoformat'):
+        return valor.isoformat()
+    return valor
+
+
+def salvar_alteracoes(pk, versao, usuario, campos=None, conteudo_patch=None, presencas=None):
+    """
+    Aplica um salvamento automático incremental à ata.
+
+    Args:
+        pk: ID da ata
+        versao: Versão da ata conhecida pelo editor
+        usuario: Usuário que está editando
+        campos: Dicionário {campo: valor} apenas com os campos alterados
+        conteudo_patch: Lista de operações sobre conteudo_completo
+        presencas: Dicionário {campo_m2m: [ids]} apenas com as listas alteradas
+
+    Returns:
+        A ata atualizada
+
+    Raises:
+        ConflitoVersao: Se a versão enviada não é a versão atual
+        ValidationError: Se algum campo ou patch for inválido
+    """
+    campos = campos or {}
+    presencas = presencas or {}
+    conteudo_patch = conteudo_patch or []
+    if not isinstance(campos, dict) or not isinstance(presencas, dict):
+        raise ValidationError('Campos e presenças devem ser enviados como objetos {campo: valor}.')
+    if not isinstance(conteudo_patch, list):
+        raise ValidationError('Patch de conteúdo inválido.')
+
+    desconhecidos = (set(campos) - set(CAMPOS_EDITAVEIS)) | (set(presencas) - set(CAMPOS_PRESENCA))
+    if desconhecidos:
+        raise ValidationError(f'Campos não permitidos: {", ".join(sorted(desconhecidos))}')
+
+    # Validar apenas os campos enviados
+    erros = {}
+    valores = {}
+    for nome, valor in campos.items():
+        campo_form = AtaReuniao._meta.get_field(nome).formfield()
+        try:
+            valores[nome] = campo_form.clean(valor)
+        except ValidationError as e:
+            erros[nome] = e.messages
+    if erros:
+        raise ValidationError(erros)
+
+    with transaction.atomic():
+        ata = AtaReuniao.objects.select_for_update().get(pk=pk)
+        if ata.versao != versao:
+            raise ConflitoVersao(ata.versao)
+
+        anteriores = {}
+        alterados = []
+        for nome, valor in valores.items():
+            campo = AtaReuniao._meta.get_field(nome)
+            atual = getattr(ata, campo.attname)
+            novo = valor.pk if campo.is_relation and valor is not None else valor
+            if atual != novo:
+                anteriores[nome] = _serializar(atual)
+                setattr(ata, campo.attname, novo)
+                alterados.append(campo.name)
+
+        patch_inverso = None
+        if conteudo_patch:
+            conteudo_atual = ata.conteudo_completo or ''
+            conteudo_novo = aplicar_patch(conteudo_atual, conteudo_patch)
+            if conteudo_novo != conteudo_atual:
+                patch_inverso = calcular_patch(conteudo_novo, conteudo_atual)
+                ata.conteudo_completo = conteudo_novo
+                alterados.append('conteudo_completo')
+
+        # Listas de presença só são regravadas quando realmente mudaram
+        presencas_anteriores = {}
+        for nome, ids in presencas.items():
+            relacao = getattr(ata, nome)
+            atuais = set(relacao.values_list('pk', flat=True))
+            try:
+                ids = [int(pk_item) for pk_item in ids]
+            except (TypeError, ValueError):
+                raise ValidationError({nome: ['Lista de IDs inválida.']})
+            novos = set(relacao.model.objects.filter(pk__in=ids).values_list('pk', flat=True))
+            if atuais != novos:
+                relacao.set(novos)
+                presencas_anteriores[nome] = sorted(atuais)
+
+        if not (alterados or presencas_anteriores):
+            return ata
+
+        ata.versao += 1
+        ata.data_atualizacao = timezone.now()
+        ata.save(update_fields=alterados + ['versao', 'data_atualizacao'])
+
+        _registrar_revisao(ata, usuario, anteriores, patch_inverso, presencas_anteriores)
+
+    return ata
+
+
+def salvar_formulario(form, versao, usuario):
+    """
+    Grava o envio completo do formulário do editor.
+
+    A gravação é um único UPDATE condicionado à versão enviada, de modo que
+    dois envios simultâneos da mesma versão não sobrescrevem um ao outro.
+
+    Args:
+        form: AtaReuniaoEditorForm já validado, com instance=ata
+        versao: Versão da ata conhecida pelo editor (None para não verificar)
+        usuario: Usuário que está editando
+
+    Returns:
+        A ata atualizada
+
+    Raises:
+        ConflitoVersao: Se a versão enviada não é a versão atual
+    """
+    ata = form.instance
+    campos = [AtaReuniao._meta.get_field(nome) for nome in form.cleaned_data]
+    simples = [campo for campo in campos if not campo.many_to_many]
+    relacoes = [campo.name for campo in campos if campo.many_to_many]
+
+    with transaction.atomic():
+        anterior = AtaReuniao.objects.get(pk=ata.pk)
+        if versao is None:
+            versao = anterior.versao
+        if anterior.versao != versao:
+            raise ConflitoVersao(anterior.versao)
+
+        agora = timezone.now()
+        atualizadas = AtaReuniao.objects.filter(pk=ata.pk, versao=versao).update(
+            data_atualizacao=agora,
+            versao=F('versao') + 1,
+            **{campo.attname: getattr(ata, campo.attname) for campo in simples}
+        )
+        if not atualizadas:
+            raise ConflitoVersao(
+                AtaReuniao.objects.filter(pk=ata.pk).values_list('versao', flat=True).first()
+            )
+        ata.versao = versao + 1
+        ata.data_atualizacao = agora
+
+        anteriores = {}
+        for campo in simples:
+            if campo.name not in CAMPOS_EDITAVEIS:
+                continue
+            atual = getattr(anterior, campo.attname)
+            if atual != getattr(ata, campo.attname):
+                anteriores[campo.name] = _serializar(atual)
+
+        patch_inverso = None
+        conteudo_anterior = anterior.conteudo_completo or ''
+        if 'conteudo_completo' in form.cleaned_data and (ata.conteudo_completo or '') != conteudo_anterior:
+            patch_inverso = calcular_patch(ata.conteudo_completo or '', conteudo_anterior)
+
+        presencas_anteriores = {}
+        for nome in relacoes:
+            atuais = set(getattr(anterior, nome).values_list('pk', flat=True))
+            novos = {objeto.pk for objeto in form.cleaned_data[nome]}
+            if atuais != novos:
+                getattr(ata, nome).set(novos)
+                presencas_anteriores[nome] = sorted(atuais)
+
+        _registrar_revisao(ata, usuario, anteriores, patch_inverso, presencas_anteriores)
+
+    return ata
+
+
+def _registrar_revisao(ata, usuario, anteriores, patch_inverso, presencas_anteriores):
+    """Registra a revisão da versão recém-gravada e descarta as mais antigas"""
+    alteracoes = {}
+    if anteriores:
+        alteracoes['campos'] = anteriores
+    if patch_inverso:
+        alteracoes['conteudo_patch'] = patch_inverso
+    if presencas_anteriores:
+        alteracoes['presencas'] = presencas_anteriores
+    AtaReuniaoRevisao.objects.create(
+        ata=ata,
+        versao=ata.versao,
+        alteracoes=alteracoes,
+        autor=usuario,
+    )
+
+    # Manter apenas as revisões mais recentes
+    maximo = getattr(settings, 'ATA_REVISOES_MAXIMO', 50)
+    if maximo:
+        AtaReuniaoRevisao.objects.filter(ata=ata, versao__lte=ata.versao - maximo).delete()
@@ -2,16 +2,28 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.core.paginator import Paginator
+import json
+
 from django.db.models import Q
 from django.http import JsonResponse
 from django.utils import timezone
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.urls import reverse_lazy
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.exceptions import PermissionDenied
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.views.decorators.http import require_GET, require_POST
 
 from .models import AtaReuniao
-from core.forms import AtaReuniaoEditorForm, AtaReuniaoTemplateForm, AtaReuniaoSearchForm
+from .autosave import ConflitoVersao, salvar_alteracoes, salvar_formulario
+from core.forms import (
+    AtaReuniaoEditorForm, AtaReuniaoEditorPresencasForm, AtaReuniaoTemplateForm, AtaReuniaoSearchForm
+)
+
+
+def _versao_enviada(request):
+    """Versão da ata enviada pelo editor, ou None se ausente"""
+    versao = request.POST.get('versao')
+    return int(versao) if versao and versao.isdigit() else None
 
 
 class AtaEditorView(LoginRequiredMixin, CreateView):
@@ -19,7 +31,7 @@ class AtaEditorView(LoginRequiredMixin, CreateView):
     View para criar ata com editor avançado similar ao SEI
     """
     model = AtaReuniao
-    form_class = AtaReuniaoEditorForm
+    form_class = AtaReuniaoEditorPresencasForm
     template_name = 'diretoria/ata_editor_avancado.html'
     
     def get_context_data(self, **kwargs):
@@ -49,7 +61,7 @@ class AtaEditorEditView(LoginRequiredMixin, UpdateView):
     View para editar ata com editor avançado
     """
     model = AtaReuniao
-    form_class = AtaReuniaoEditorForm
+    form_class = AtaReuniaoEditorPresencasForm
     template_name = 'diretoria/ata_editor_avancado.html'
     
     def get_context_data(self, **kwargs):
@@ -59,16 +71,20 @@ class AtaEditorEditView(LoginRequiredMixin, UpdateView):
         return context
     
     def form_valid(self, form):
-        # Atualizar data de modificação
-        form.instance.data_atualizacao = timezone.now()
-        form.instance.modificado_por = self.request.user
+        # Recusar a gravação se outra pessoa salvou a ata depois que ela foi aberta
+        try:
+            self.object = salvar_formulario(form, _versao_enviada(self.request), self.request.user)
+        except ConflitoVersao:
+            mensagem = 'A ata foi alterada por outro usuário. Recarregue a página antes de salvar.'
+            form.add_error(None, mensagem)
+            messages.error(self.request, mensagem)
+            return self.form_invalid(form)
         
-        response = super().form_valid(form)
         messages.success(
             self.request, 
             f'Ata "{form.instance.titulo}" atualizada com sucesso!'
         )
-        return response
+        return redirect(self.get_success_url())
     
     def get_success_url(self):
         return reverse_lazy('diretoria:ata_editor_edit', kwargs={'pk': self.object.pk})
@@ -140,21 +156,27 @@ def salvar_ata_ajax(request, pk=None):
                 form = AtaReuniaoEditorForm(request.POST)
             
             if form.is_valid():
-                ata = form.save(commit=False)
-                if not pk:
+                if pk:
+                    try:
+                        ata = salvar_formulario(form, _versao_enviada(request), request.user)
+                    except ConflitoVersao as e:
+                        return JsonResponse({
+                            'success': False,
+                            'message': 'A ata foi alterada por outro usuário. Recarregue a página antes de salvar.',
+                            'versao': e.versao_atual
+                        }, status=409)
+                else:
+                    ata = form.save(commit=False)
                     ata.criado_por = request.user
                     ata.data_criacao = timezone.now()
-                else:
-                    ata.modificado_por = request.user
-                    ata.data_atualizacao = timezone.now()
-                
-                ata.save()
-                form.save_m2m()  # Salvar relacionamentos many-to-many
+                    ata.save()
+                    form.save_m2m()  # Salvar relacionamentos many-to-many
                 
                 return JsonResponse({
                     'success': True,
                     'message': 'Ata salva com sucesso!',
                     'ata_id': ata.id,
+                    'versao': ata.versao,
                     'data_atualizacao': ata.data_atualizacao.strftime('%d/%m/%Y %H:%M')
                 })
             else:
@@ -172,6 +194,81 @@ def salvar_ata_ajax(request, pk=None):
         }, status=500)
 
 
+@login_required
+@require_POST
+def autosave_ata_ajax(request, pk):
+    """
+    API de salvamento automático incremental
+
+    Recebe apenas os campos alterados (JSON) e a versão conhecida pelo editor.
+    Retorna 409 quando a ata foi alterada por outra pessoa.
+    """
+    try:
+        dados = json.loads(request.body or '{}')
+        versao = int(dados['versao'])
+    except (ValueError, KeyError, TypeError):
+        return JsonResponse({
+            'success': False,
+            'message': 'Requisição inválida: informe a versão da ata.'
+        }, status=400)
+
+    if not AtaReuniao.objects.filter(pk=pk).exists():
+        return JsonResponse({'error': 'Ata não encontrada'}, status=404)
+
+    try:
+        ata = salvar_alteracoes(
+            pk,
+            versao,
+            request.user,
+            campos=dados.get('campos'),
+            conteudo_patch=dados.get('conteudo_patch'),
+            presencas=dados.get('presencas'),
+        )
+    except ConflitoVersao as e:
+        return JsonResponse({
+            'success': False,
+            'message': 'A ata foi alterada por outro usuário. Recarregue a página antes de continuar.',
+            'versao': e.versao_atual
+        }, status=409)
+    except ValidationError as e:
+        return JsonResponse({
+            'success': False,
+            'message': 'Dados inválidos.',
+            'errors': e.message_dict if hasattr(e, 'error_dict') else {'__all__': e.messages}
+        }, status=400)
+
+    return JsonResponse({
+        'success': True,
+        'message': 'Ata salva automaticamente.',
+        'versao': ata.versao,
+        'data_atualizacao': timezone.localtime(ata.data_atualizacao).strftime('%d/%m/%Y %H:%M')
+    })
+
+
+@login_required
+@require_GET
+def revisoes_ata_ajax(request, pk):
+    """
+    API para listar as revisões recentes de uma ata
+    """
+    ata = get_object_or_404(AtaReuniao, pk=pk)
+    revisoes = ata.revisoes.select_related('autor')[:20]
+
+    return JsonResponse({
+        'success': True,
+        'versao': ata.versao,
+        'revisoes': [
+            {
+                'versao': revisao.versao,
+                'autor': revisao.autor.get_full_name() or revisao.autor.username if revisao.autor else None,
+                'data': timezone.localtime(revisao.data_criacao).strftime('%d/%m/%Y %H:%M'),
+                'campos': revisao.get_campos_alterados(),
+            }
+            for revisao in revisoes
+        ]
+    })
+
+
 @login_required
 def aplicar_template_ajax(request):
     """
@@ -0,0 +1,38 @@
+# Generated by Django 5.0.2 on 2026-10-19 18:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('diretoria', '0009_atareuniao_associados_ausentes_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='atareuniao',
+            name='versao',
+            field=models.PositiveIntegerField(default=1, help_text='Incrementada a cada gravação; usada para detectar edições concorrentes', verbose_name='Versão'),
+        ),
+        migrations.CreateModel(
+            name='AtaReuniaoRevisao',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('versao', models.PositiveIntegerField(help_text='Versão da ata gerada por esta gravação', verbose_name='Versão')),
+                ('alteracoes', models.JSONField(default=dict, help_text='Valores anteriores dos campos alterados e patch inverso do conteúdo', verbose_name='Alterações')),
+                ('data_criacao', models.DateTimeField(auto_now_add=True, verbose_name='Data de Criação')),
+                ('ata', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='revisoes', to='diretoria.atareuniao', verbose_name='Ata')),
+                ('autor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='revisoes_atas', to=settings.AUTH_USER_MODEL, verbose_name='Autor')),
+            ],
+            options={
+                'verbose_name': 'Revisão de Ata',
+                'verbose_name_plural': 'Revisões de Atas',
+                'ordering': ['-versao'],
+                'unique_together': {('ata', 'versao')},
+            },
+        ),
+    ]
@@ -1,7 +1,9 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Max
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils.translation import gettext_lazy as _
 from associados.models import Associado
+from core.services.sequencias import proximo_numero
 
 
 class CargoDiretoria(models.Model):
@@ -280,6 +282,12 @@ class AtaReuniao(models.Model):
         verbose_name=_('Data de Atualização')
     )
     
+    versao = models.PositiveIntegerField(
+        default=1,
+        verbose_name=_('Versão'),
+        help_text=_('Incrementada a cada gravação; usada para detectar edições concorrentes')
+    )
+    
     class Meta:
         ordering = ['-data_reuniao']
         verbose_name = _('Ata de Reunião')
@@ -295,18 +303,17 @@ class AtaReuniao(models.Model):
         if self.numero_sequencial:
             return self.numero_sequencial
             
-        # Busca o último número para este tipo de reunião no mesmo ano
+        # Contador por tipo de reunião e ano; na primeira ata do ano (ou de
+        # uma sequência ainda não criada) parte do maior número já gravado
         ano_atual = self.data_reuniao.year
-        ultima_ata = AtaReuniao.objects.filter(
-            tipo_reuniao=self.tipo_reuniao,
-            data_reuniao__year=ano_atual,
-            numero_sequencial__isnull=False
-        ).order_by('-numero_sequencial').first()
-        
-        if ultima_ata and ultima_ata.numero_sequencial:
-            return ultima_ata.numero_sequencial + 1
-        else:
-            return 1
+        return proximo_numero(
+            f'ata:{self.tipo_reuniao}',
+            ano_atual,
+            inicial=lambda: AtaReuniao.objects.filter(
+                tipo_reuniao=self.tipo_reuniao,
+                data_reuniao__year=ano_atual,
+            ).aggregate(ultimo=Max('numero_sequencial'))['ultimo'] or 0
+        )
     
     def get_numero_formatado(self):
         """
@@ -326,10 +333,73 @@ class AtaReuniao(models.Model):
         return f"{prefixo}-{self.numero_sequencial:03d}/{ano}"
     
     def save(self, *args, **kwargs):
-        # Gera o número sequencial se não existir
-        if not self.numero_sequencial:
-            self.numero_sequencial = self.gerar_numero_sequencial()
-        super().save(*args, **kwargs)
+        # Número e gravação na mesma transação: se a gravação falhar, o
+        # número volta para a sequência (e é descartado também aqui)
+        gerar = not self.numero_sequencial
+        try:
+            with transaction.atomic():
+                if gerar:
+                    self.numero_sequencial = self.gerar_numero_sequencial()
+                super().save(*args, **kwargs)
+        except Exception:
+            if gerar:
+                self.numero_sequencial = None
+            raise
+
+
+class AtaReuniaoRevisao(models.Model):
+    """
+    Revisão compacta de uma ata: guarda apenas os valores anteriores dos
+    campos alterados em cada gravação, permitindo reconstruir versões antigas
+    """
+    ata = models.ForeignKey(
+        AtaReuniao,
+        on_delete=models.CASCADE,
+        related_name='revisoes',
+        verbose_name=_('Ata')
+    )
+    
+    versao = models.PositiveIntegerField(
+        verbose_name=_('Versão'),
+        help_text=_('Versão da ata gerada por esta gravação')
+    )
+    
+    alteracoes = models.JSONField(
+        default=dict,
+        verbose_name=_('Alterações'),
+        help_text=_('Valores anteriores dos campos alterados e patch inverso do conteúdo')
+    )
+    
+    autor = models.ForeignKey(
+        'core.Usuario',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='revisoes_atas',
+        verbose_name=_('Autor')
+    )
+    
+    data_criacao = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_('Data de Criação')
+    )
+    
+    class Meta:
+        ordering = ['-versao']
+        verbose_name = _('Revisão de Ata')
+        verbose_name_plural = _('Revisões de Atas')
+        unique_together = ('ata', 'versao')
+    
+    def __str__(self):
+        return f"{self.ata} - versão {self.versao}"
+    
+    def get_campos_alterados(self):
+        """Retorna os nomes dos campos alterados nesta revisão"""
+        campos = list(self.alteracoes.get('campos', {}))
+        campos += list(self.alteracoes.get('presencas', {}))
+        if self.alteracoes.get('conteudo_patch'):
+            campos.append('conteudo_completo')
+        return campos
 
 
 class ModeloAta(models.Model):
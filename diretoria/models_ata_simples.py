@@ -1,9 +1,12 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Max
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 import uuid
 import os
 
+from core.services.sequencias import proximo_numero
+
 User = get_user_model()
 
 def upload_ata_path(instance, filename):
@@ -81,18 +84,17 @@ class AtaSimples(models.Model):
         if self.numero_sequencial:
             return self.numero_sequencial
             
-        # Busca o último número para este tipo de reunião no mesmo ano
+        # Contador por tipo de reunião e ano; na primeira ata do ano (ou de
+        # uma sequência ainda não criada) parte do maior número já gravado
         ano_atual = self.data_reuniao.year
-        ultima_ata = AtaSimples.objects.filter(
-            tipo_reuniao=self.tipo_reuniao,
-            data_reuniao__year=ano_atual,
-            numero_sequencial__isnull=False
-        ).order_by('-numero_sequencial').first()
-        
-        if ultima_ata and ultima_ata.numero_sequencial:
-            return ultima_ata.numero_sequencial + 1
-        else:
-            return 1
+        return proximo_numero(
+            f'ata_simples:{self.tipo_reuniao}',
+            ano_atual,
+            inicial=lambda: AtaSimples.objects.filter(
+                tipo_reuniao=self.tipo_reuniao,
+                data_reuniao__year=ano_atual,
+            ).aggregate(ultimo=Max('numero_sequencial'))['ultimo'] or 0
+        )
     
     def get_numero_formatado(self):
         """
@@ -115,11 +117,18 @@ class AtaSimples(models.Model):
         if not self.titulo_slug:
             self.titulo_slug = self.titulo.lower().replace(' ', '-').replace('ã', 'a').replace('ç', 'c')
         
-        # Gera o número sequencial se não existir
-        if not self.numero_sequencial:
-            self.numero_sequencial = self.gerar_numero_sequencial()
-            
-        super().save(*args, **kwargs)
+        # Número e gravação na mesma transação: se a gravação falhar, o
+        # número volta para a sequência (e é descartado também aqui)
+        gerar = not self.numero_sequencial
+        try:
+            with transaction.atomic():
+                if gerar:
+                    self.numero_sequencial = self.gerar_numero_sequencial()
+                super().save(*args, **kwargs)
+        except Exception:
+            if gerar:
+                self.numero_sequencial = None
+            raise
     
     def gerar_html(self):
         """Gera o conteúdo HTML da ata"""
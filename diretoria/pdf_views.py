@@ -5,25 +5,7 @@ from django.utils import timezone
 from .models import AtaReuniao, CargoDiretoria, MembroDiretoria
 import re
 
-
-def get_logo_path(logo_filename):
-    """Função auxiliar para obter o caminho do logo"""
-    import os
-    from django.conf import settings
-    
-    # Tentar diferentes caminhos para o logo
-    possible_paths = [
-        os.path.join(settings.STATIC_ROOT, logo_filename),
-        os.path.join(settings.STATICFILES_DIRS[0], logo_filename),
-        os.path.join(settings.BASE_DIR, 'static', logo_filename),
-        os.path.join(settings.BASE_DIR, 'media', logo_filename),
-    ]
-    
-    for path in possible_paths:
-        if os.path.exists(path):
-            return path
-    
-    return None
+from core.services.pdf import caminho_logo, estilo, estilos
 
 
 def clean_html_for_pdf(html_content):
@@ -102,7 +84,6 @@ def gerar_ata_pdf(request, pk):
     from reportlab.lib import colors
     from reportlab.lib.units import inch
     from reportlab.platypus import Table, TableStyle, Spacer, Paragraph, SimpleDocTemplate, PageBreak
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
     from reportlab.lib.pagesizes import A4
     from reportlab.graphics.shapes import Drawing, Rect, Line
@@ -142,12 +123,12 @@ def gerar_ata_pdf(request, pk):
     story = []
     
     # Estilos personalizados
-    styles = getSampleStyleSheet()
+    styles = estilos()
     
     # Estilo do título principal
-    title_style = ParagraphStyle(
+    title_style = estilo(
         'TitleStyle',
-        parent=styles['Heading1'],
+        pai='Heading1',
         fontSize=18,
         textColor=colors.black,
         spaceAfter=20,
@@ -157,9 +138,9 @@ def gerar_ata_pdf(request, pk):
     )
     
     # Estilo do subtítulo
-    subtitle_style = ParagraphStyle(
+    subtitle_style = estilo(
         'SubtitleStyle',
-        parent=styles['Heading2'],
+        pai='Heading2',
         fontSize=14,
         textColor=colors.black,
         spaceAfter=15,
@@ -169,9 +150,9 @@ def gerar_ata_pdf(request, pk):
     )
     
     # Estilo para seções
-    section_style = ParagraphStyle(
+    section_style = estilo(
         'SectionStyle',
-        parent=styles['Heading3'],
+        pai='Heading3',
         fontSize=12,
         textColor=colors.black,
         spaceAfter=10,
@@ -181,9 +162,8 @@ def gerar_ata_pdf(request, pk):
     )
     
     # Estilo para texto normal
-    normal_style = ParagraphStyle(
+    normal_style = estilo(
         'NormalStyle',
-        parent=styles['Normal'],
         fontSize=10,
         textColor=colors.black,
         spaceAfter=6,
@@ -194,9 +174,8 @@ def gerar_ata_pdf(request, pk):
     )
     
     # Estilo para metadados
-    meta_style = ParagraphStyle(
+    meta_style = estilo(
         'MetaStyle',
-        parent=styles['Normal'],
         fontSize=9,
         textColor=colors.black,
         spaceAfter=4,
@@ -213,9 +192,9 @@ def gerar_ata_pdf(request, pk):
         from reportlab.platypus import Image, Table, TableStyle
         
         # Usar Logo_abmepi.png como primeira opção no cabeçalho
-        logo_abmepi_path = get_logo_path('Logo_abmepi.png')
-        logo_asejur2_path = get_logo_path('logo2assejur.png')
-        logo_asejur_path = get_logo_path('Logo-assejur.png')
+        logo_abmepi_path = caminho_logo('Logo_abmepi.png')
+        logo_asejur2_path = caminho_logo('logo2assejur.png')
+        logo_asejur_path = caminho_logo('Logo-assejur.png')
         
         logo = None
         if logo_abmepi_path:
@@ -226,9 +205,8 @@ def gerar_ata_pdf(request, pk):
             logo = Image(logo_asejur_path, width=60, height=60)
         
         # Estilo para o texto do cabeçalho (centralizado)
-        header_text_style = ParagraphStyle(
+        header_text_style = estilo(
             'HeaderTextStyle',
-            parent=styles['Normal'],
             fontSize=14,
             textColor=colors.black,
             alignment=TA_CENTER,  # Centralizado
@@ -268,9 +246,9 @@ def gerar_ata_pdf(request, pk):
     story.append(Spacer(1, 20))
     
     # Título da Ata (centralizado)
-    title_centered_style = ParagraphStyle(
+    title_centered_style = estilo(
         'TitleCenteredStyle',
-        parent=styles['Heading1'],
+        pai='Heading1',
         fontSize=18,
         textColor=colors.black,
         spaceAfter=20,
@@ -292,9 +270,8 @@ def gerar_ata_pdf(request, pk):
     ]
     
     # Estilo para metadados
-    meta_style = ParagraphStyle(
+    meta_style = estilo(
         'MetaStyle',
-        parent=styles['Normal'],
         fontSize=11,
         textColor=colors.black,
         spaceAfter=8,
@@ -345,12 +322,12 @@ def gerar_ata_pdf(request, pk):
     mes_pt = meses_pt.get(data_brasil.strftime('%B'), data_brasil.strftime('%B'))
     
     story.append(Paragraph(f"{cidade}, {data_brasil.strftime('%d')} de {mes_pt} de {data_brasil.strftime('%Y')}", 
-                          ParagraphStyle('DataStyle', parent=styles['Normal'], fontSize=11, 
+                          estilo('DataStyle', fontSize=11, 
                                        alignment=TA_CENTER, fontName='Helvetica-Bold')))
     
     # Assinaturas dos Membros da Diretoria (centralizadas)
     story.append(Spacer(1, 30))
-    story.append(Paragraph("Membros da Diretoria", ParagraphStyle('DiretoriaTitle', parent=styles['Heading3'], 
+    story.append(Paragraph("Membros da Diretoria", estilo('DiretoriaTitle', pai='Heading3', 
                                                                   fontSize=12, alignment=TA_CENTER, 
                                                                   fontName='Helvetica-Bold')))
     story.append(Spacer(1, 15))
@@ -362,24 +339,24 @@ def gerar_ata_pdf(request, pk):
     for membro in membros_diretoria:
         # Linha para assinatura centralizada (acima do nome)
         story.append(Paragraph("_" * 60, 
-                              ParagraphStyle('LinhaAssinatura', parent=styles['Normal'], fontSize=10, 
+                              estilo('LinhaAssinatura', fontSize=10, 
                                            alignment=TA_CENTER, fontName='Helvetica')))
         
         # Nome centralizado
         story.append(Paragraph(f"{membro.associado.nome}", 
-                              ParagraphStyle('MembroNome', parent=styles['Normal'], fontSize=11, 
+                              estilo('MembroNome', fontSize=11, 
                                            alignment=TA_CENTER, fontName='Helvetica-Bold')))
         
         # Cargo centralizado
         story.append(Paragraph(f"{membro.cargo.nome}", 
-                              ParagraphStyle('MembroCargo', parent=styles['Normal'], fontSize=10, 
+                              estilo('MembroCargo', fontSize=10, 
                                            alignment=TA_CENTER, fontName='Helvetica')))
         story.append(Spacer(1, 20))
     
     # Lista numerada dos Associados Presentes (não membros da diretoria)
     if ata.associados_presentes.exists():
         story.append(Spacer(1, 20))
-        story.append(Paragraph("Associados Presentes", ParagraphStyle('PresentesTitle', parent=styles['Heading3'], 
+        story.append(Paragraph("Associados Presentes", estilo('PresentesTitle', pai='Heading3', 
                                                                       fontSize=12, alignment=TA_CENTER, 
                                                                       fontName='Helvetica-Bold')))
         story.append(Spacer(1, 15))
@@ -466,7 +443,7 @@ def gerar_ata_pdf(request, pk):
         try:
             import os
             from django.conf import settings
-            logo_path = get_logo_path('Logo_abmepi.png')
+            logo_path = caminho_logo('Logo_abmepi.png')
             if logo_path:
                 canvas.drawImage(logo_path, 20, 20, width=40, height=40, preserveAspectRatio=True)
                 
@@ -40,6 +40,8 @@ urlpatterns = [
     path('editor-atas/<int:pk>/editar/', editor_views.AtaEditorEditView.as_view(), name='ata_editor_edit'),
     path('api/editor-atas/salvar/', editor_views.salvar_ata_ajax, name='api_ata_editor_save'),
     path('api/editor-atas/<int:pk>/salvar/', editor_views.salvar_ata_ajax, name='api_ata_editor_update'),
+    path('api/editor-atas/<int:pk>/autosave/', editor_views.autosave_ata_ajax, name='api_ata_editor_autosave'),
+    path('api/editor-atas/<int:pk>/revisoes/', editor_views.revisoes_ata_ajax, name='api_ata_editor_revisoes'),
     path('api/editor-atas/template/', editor_views.aplicar_template_ajax, name='api_ata_template'),
     
     # Editor Personalizado de Atas
@@ -564,11 +564,8 @@ class AtaReuniaoCreateView(LoginRequiredMixin, CreateView):
         print("=" * 50)
         
         try:
-            # Gerar número sequencial automaticamente
-            if not form.instance.numero_sequencial:
-                form.instance.numero_sequencial = form.instance.gerar_numero_sequencial()
-            
-            # Salvar a ata (os campos data_criacao e data_atualizacao são automáticos)
+            # Salvar a ata (os campos data_criacao e data_atualizacao são
+            # automáticos e o número sequencial é gerado em AtaReuniao.save())
             response = super().form_valid(form)
             print(f"Ata salva com sucesso! ID: {self.object.pk}")
             print(f"Número da ata: {self.object.get_numero_formatado()}")
@@ -1,7 +1,12 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.db.models import Sum
-from .models import TipoMensalidade, Mensalidade, Pagamento, Despesa, RelatorioFinanceiro, ConfiguracaoCobranca
+from .models import (
+    TipoMensalidade, Mensalidade, Pagamento, Despesa, RelatorioFinanceiro, ConfiguracaoCobranca,
+    ExtratoBancario, ItemExtrato, SaldoAssociado
+)
+from .services.resumo import invalidar_resumo_recebiveis
+from .services.saldos import recalcular_saldos
 
 
 @admin.register(TipoMensalidade)
@@ -36,12 +41,16 @@ class MensalidadeAdmin(admin.ModelAdmin):
         ('Status e Pagamento', {
             'fields': ('status', 'data_pagamento', 'forma_pagamento')
         }),
+        ('Encargos por Atraso', {
+            'fields': ('valor_multa', 'valor_juros', 'encargos_calculados_em'),
+            'classes': ('collapse',)
+        }),
         ('Outros', {
             'fields': ('observacoes',)
         }),
     )
     
-    readonly_fields = ('data_criacao', 'data_atualizacao')
+    readonly_fields = ('data_criacao', 'data_atualizacao', 'valor_multa', 'valor_juros', 'encargos_calculados_em')
     
     def dias_atraso(self, obj):
         dias = obj.get_dias_atraso()
@@ -64,12 +73,24 @@ class MensalidadeAdmin(admin.ModelAdmin):
     
     def marcar_como_pago(self, request, queryset):
         from django.utils import timezone
+        associado_ids = set(queryset.values_list('associado_id', flat=True))
         updated = queryset.update(status='pago', data_pagamento=timezone.now().date())
+        invalidar_resumo_recebiveis()
+        recalcular_saldos(associado_ids)
         self.message_user(request, f'{updated} mensalidade(s) marcada(s) como paga(s).')
     marcar_como_pago.short_description = "Marcar como pago"
     
     def marcar_como_pendente(self, request, queryset):
-        updated = queryset.update(status='pendente', data_pagamento=None)
+        associado_ids = set(queryset.values_list('associado_id', flat=True))
+        updated = queryset.update(
+            status='pendente',
+            data_pagamento=None,
+            valor_multa=0,
+            valor_juros=0,
+            encargos_calculados_em=None
+        )
+        invalidar_resumo_recebiveis()
+        recalcular_saldos(associado_ids)
         self.message_user(request, f'{updated} mensalidade(s) marcada(s) como pendente(s).')
     marcar_como_pendente.short_description = "Marcar como pendente"
 
@@ -213,3 +234,46 @@ class ConfiguracaoCobrancaAdmin(admin.ModelAdmin):
         if obj.ativo:
             ConfiguracaoCobranca.objects.exclude(pk=obj.pk).update(ativo=False)
         super().save_model(request, obj, form, change)
+
+
+class ItemExtratoInline(admin.TabularInline):
+    model = ItemExtrato
+    extra = 0
+    fields = ('data', 'valor', 'documento', 'nome_pagador', 'status', 'motivo', 'mensalidade')
+    readonly_fields = fields
+    raw_id_fields = ('mensalidade', 'pagamento')
+    can_delete = False
+    show_change_link = True
+
+
+@admin.register(ExtratoBancario)
+class ExtratoBancarioAdmin(admin.ModelAdmin):
+    list_display = ('data_importacao', 'formato', 'total_itens', 'total_conciliados', 'total_revisao', 'total_duplicados', 'usuario_importacao')
+    list_filter = ('formato', 'data_importacao')
+    readonly_fields = ('total_itens', 'total_conciliados', 'total_revisao', 'total_duplicados', 'data_importacao')
+    ordering = ('-data_importacao',)
+    inlines = [ItemExtratoInline]
+
+
+@admin.register(ItemExtrato)
+class ItemExtratoAdmin(admin.ModelAdmin):
+    list_display = ('data', 'valor', 'nome_pagador', 'documento', 'status', 'mensalidade')
+    list_filter = ('status', 'data')
+    search_fields = ('nome_pagador', 'documento', 'identificador', 'descricao')
+    raw_id_fields = ('extrato', 'mensalidade', 'pagamento')
+    ordering = ('-data',)
+
+
+@admin.register(SaldoAssociado)
+class SaldoAssociadoAdmin(admin.ModelAdmin):
+    list_display = (
+        'associado', 'total_mensalidades', 'mensalidades_atrasadas',
+        'valor_total_mensalidades', 'valor_pago', 'valor_atrasado', 'data_atualizacao'
+    )
+    search_fields = ('associado__nome', 'associado__cpf')
+    raw_id_fields = ('associado',)
+    readonly_fields = (
+        'total_mensalidades', 'mensalidades_pagas', 'mensalidades_pendentes', 'mensalidades_atrasadas',
+        'valor_total_mensalidades', 'valor_pago', 'valor_pendente', 'valor_atrasado',
+        'total_pagamentos', 'data_atualizacao'
+    )
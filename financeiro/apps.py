@@ -5,3 +5,6 @@ class FinanceiroConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'financeiro'
     verbose_name = 'Financeiro'
+    
+    def ready(self):
+        import financeiro.signals  # noqa: F401
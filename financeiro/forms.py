@@ -1,7 +1,8 @@
 from django import forms
 from django.core.validators import MinValueValidator
 from django.utils.translation import gettext_lazy as _
-from .models import TipoMensalidade, Mensalidade, Pagamento, Despesa, ConfiguracaoCobranca
+from .models import TipoMensalidade, Mensalidade, Pagamento, Despesa, ConfiguracaoCobranca, ExtratoBancario
+from .services.extratos import detectar_formato
 
 
 class TipoMensalidadeForm(forms.ModelForm):
@@ -230,8 +231,8 @@ class PagamentoForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        # Filtrar apenas mensalidades pendentes
-        self.fields['mensalidade'].queryset = self.fields['mensalidade'].queryset.filter(status='pendente')
+        # Filtrar apenas mensalidades em aberto (pendentes ou atrasadas)
+        self.fields['mensalidade'].queryset = self.fields['mensalidade'].queryset.em_aberto()
 
     def clean_valor_pago(self):
         valor_pago = self.cleaned_data.get('valor_pago')
@@ -442,3 +443,40 @@ class ConfiguracaoCobrancaForm(forms.ModelForm):
             ConfiguracaoCobranca.objects.exclude(pk=self.instance.pk if self.instance else None).update(ativo=False)
         
         return cleaned_data
+
+
+class ExtratoBancarioForm(forms.ModelForm):
+    """
+    Formulário para importação de extratos bancários (OFX, CSV ou retorno CNAB)
+    """
+    formato = forms.ChoiceField(
+        choices=[('', 'Detectar automaticamente')] + ExtratoBancario.FORMATO_CHOICES,
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    
+    class Meta:
+        model = ExtratoBancario
+        fields = ['arquivo', 'formato']
+        widgets = {
+            'arquivo': forms.FileInput(attrs={
+                'class': 'form-control',
+                'accept': '.ofx,.csv,.txt,.ret,.rem'
+            }),
+        }
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        arquivo = cleaned_data.get('arquivo')
+        
+        if arquivo and not cleaned_data.get('formato'):
+            primeira_linha = arquivo.readline().decode('latin-1')
+            arquivo.seek(0)
+            formato = detectar_formato(arquivo.name, primeira_linha)
+            if not formato:
+                raise forms.ValidationError(
+                    'Não foi possível identificar o formato do extrato. Selecione o formato manualmente.'
+                )
+            cleaned_data['formato'] = formato
+        
+        return cleaned_data
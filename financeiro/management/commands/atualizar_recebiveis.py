@@ -0,0 +1,47 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from financeiro.models import Mensalidade
+from financeiro.services.recebiveis import atualizar_recebiveis
+
+
+class Command(BaseCommand):
+    help = (
+        'Marca como atrasadas as mensalidades pendentes vencidas e atualiza multa e juros. '
+        'Execute uma vez por dia (ex.: via cron logo após a meia-noite).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--data',
+            help='Data de referência no formato AAAA-MM-DD (padrão: hoje)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Mostra quantas mensalidades seriam atualizadas sem executar',
+        )
+
+    def handle(self, *args, **options):
+        hoje = None
+        if options['data']:
+            try:
+                hoje = datetime.strptime(options['data'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError('Data inválida. Use o formato AAAA-MM-DD.')
+
+        if options['dry_run']:
+            vencidas = Mensalidade.objects.vencidas(hoje)
+            self.stdout.write(f'🔍 {vencidas.filter(status="pendente").count()} mensalidades seriam marcadas como atrasadas')
+            self.stdout.write(f'🔍 {vencidas.count()} mensalidades teriam multa e juros recalculados')
+            self.stdout.write(self.style.WARNING('🔍 Modo DRY-RUN: Nenhuma alteração foi feita.'))
+            return
+
+        resultado = atualizar_recebiveis(hoje)
+
+        self.stdout.write(f'   - Novas atrasadas: {resultado["novas_atrasadas"]}')
+        self.stdout.write(f'   - Encargos atualizados: {resultado["encargos_atualizados"]}')
+        if resultado['reabertas']:
+            self.stdout.write(f'   - Reabertas (vencimento alterado): {resultado["reabertas"]}')
+        self.stdout.write(self.style.SUCCESS('✅ Recebíveis atualizados com sucesso!'))
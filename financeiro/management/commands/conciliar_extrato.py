@@ -0,0 +1,61 @@
+import os
+
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Usuario
+from financeiro.models import ExtratoBancario
+from financeiro.services.conciliacao import conciliar_extrato
+from financeiro.services.extratos import LEITORES, detectar_formato
+
+
+class Command(BaseCommand):
+    help = 'Importa um extrato bancário (OFX, CSV ou retorno CNAB) e concilia os créditos com as mensalidades em aberto'
+
+    def add_arguments(self, parser):
+        parser.add_argument('arquivo', help='Caminho do arquivo do extrato')
+        parser.add_argument(
+            '--formato',
+            choices=sorted(LEITORES),
+            help='Formato do arquivo (padrão: detectar automaticamente)',
+        )
+        parser.add_argument(
+            '--usuario',
+            help='Username do usuário responsável pela importação',
+        )
+
+    def handle(self, *args, **options):
+        caminho = options['arquivo']
+        if not os.path.isfile(caminho):
+            raise CommandError(f'Arquivo não encontrado: {caminho}')
+
+        formato = options['formato']
+        if not formato:
+            with open(caminho, 'rb') as arquivo:
+                formato = detectar_formato(caminho, arquivo.readline().decode('latin-1'))
+            if not formato:
+                raise CommandError('Não foi possível identificar o formato. Use --formato.')
+
+        usuario = None
+        if options['usuario']:
+            usuario = Usuario.objects.filter(username=options['usuario']).first()
+            if usuario is None:
+                raise CommandError(f'Usuário não encontrado: {options["usuario"]}')
+
+        with open(caminho, 'rb') as arquivo:
+            extrato = ExtratoBancario(formato=formato, usuario_importacao=usuario)
+            extrato.arquivo.save(os.path.basename(caminho), File(arquivo), save=False)
+        extrato.save()
+
+        self.stdout.write(f'🔍 Conciliando extrato {extrato.get_formato_display()}...')
+        try:
+            resultado = conciliar_extrato(extrato, usuario)
+        except ValueError as e:
+            extrato.delete()
+            raise CommandError(f'Erro ao ler o extrato: {e}')
+
+        self.stdout.write(f'   - Créditos: {resultado["total"]}')
+        self.stdout.write(f'   - Conciliados: {resultado["conciliados"]}')
+        self.stdout.write(f'   - Para revisão: {resultado["revisao"]}')
+        self.stdout.write(f'   - Duplicados ignorados: {resultado["duplicados"]}')
+        self.stdout.write(self.style.SUCCESS(f'✅ Extrato #{extrato.pk} conciliado com sucesso!'))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from financeiro.services.saldos import recalcular_saldos
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcula os saldos pré-calculados dos associados a partir das mensalidades e pagamentos. '
+        'A rotina atualizar_recebiveis já faz isso diariamente; use após cargas ou correções manuais.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--associado',
+            type=int,
+            action='append',
+            help='ID do associado (pode ser repetido; padrão: todos)',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('🔍 Recalculando saldos dos associados...')
+        total = recalcular_saldos(options['associado'])
+        self.stdout.write(f'   - Saldos gravados: {total}')
+        self.stdout.write(self.style.SUCCESS('✅ Saldos recalculados com sucesso!'))
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.2 on 2026-10-19 18:03
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('associados', '0013_associado_nome_mae_associado_nome_pai_and_more'),
+        ('financeiro', '0007_update_configuracao_cobranca'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mensalidade',
+            name='encargos_calculados_em',
+            field=models.DateField(blank=True, null=True, verbose_name='Encargos Calculados em'),
+        ),
+        migrations.AddField(
+            model_name='mensalidade',
+            name='valor_juros',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='Calculados pela rotina diária de recebíveis', max_digits=10, verbose_name='Juros por Atraso'),
+        ),
+        migrations.AddField(
+            model_name='mensalidade',
+            name='valor_multa',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='Calculada pela rotina diária de recebíveis', max_digits=10, verbose_name='Multa por Atraso'),
+        ),
+        migrations.AddIndex(
+            model_name='mensalidade',
+            index=models.Index(fields=['status', 'data_vencimento'], name='financeiro__status_b5e3fa_idx'),
+        ),
+    ]
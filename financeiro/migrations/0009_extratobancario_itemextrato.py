@@ -0,0 +1,58 @@
+# Generated by Django 5.0.2 on 2026-10-19 18:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('financeiro', '0008_mensalidade_encargos_calculados_em_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExtratoBancario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('arquivo', models.FileField(upload_to='financeiro/extratos/', verbose_name='Arquivo')),
+                ('formato', models.CharField(choices=[('ofx', 'OFX'), ('csv', 'CSV'), ('cnab240', 'CNAB 240 (retorno)'), ('cnab400', 'CNAB 400 (retorno)')], max_length=10, verbose_name='Formato')),
+                ('total_itens', models.PositiveIntegerField(default=0, verbose_name='Total de Créditos')),
+                ('total_conciliados', models.PositiveIntegerField(default=0, verbose_name='Conciliados Automaticamente')),
+                ('total_revisao', models.PositiveIntegerField(default=0, verbose_name='Enviados para Revisão')),
+                ('total_duplicados', models.PositiveIntegerField(default=0, verbose_name='Duplicados Ignorados')),
+                ('data_importacao', models.DateTimeField(auto_now_add=True, verbose_name='Data de Importação')),
+                ('usuario_importacao', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Usuário que Importou')),
+            ],
+            options={
+                'verbose_name': 'Extrato Bancário',
+                'verbose_name_plural': 'Extratos Bancários',
+                'ordering': ['-data_importacao'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ItemExtrato',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data', models.DateField(verbose_name='Data do Crédito')),
+                ('valor', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Valor')),
+                ('documento', models.CharField(blank=True, help_text='Somente dígitos', max_length=14, verbose_name='CPF/CNPJ do Pagador')),
+                ('nome_pagador', models.CharField(blank=True, max_length=200, verbose_name='Nome do Pagador')),
+                ('descricao', models.CharField(blank=True, max_length=255, verbose_name='Descrição')),
+                ('identificador', models.CharField(blank=True, help_text='FITID, end-to-end do PIX ou nosso número', max_length=100, verbose_name='Identificador no Banco')),
+                ('status', models.CharField(choices=[('conciliado', 'Conciliado'), ('revisao', 'Aguardando Revisão'), ('ignorado', 'Ignorado')], default='revisao', max_length=20, verbose_name='Status')),
+                ('motivo', models.CharField(blank=True, max_length=200, verbose_name='Motivo')),
+                ('extrato', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='itens', to='financeiro.extratobancario', verbose_name='Extrato')),
+                ('mensalidade', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='itens_extrato', to='financeiro.mensalidade', verbose_name='Mensalidade')),
+                ('pagamento', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='itens_extrato', to='financeiro.pagamento', verbose_name='Pagamento')),
+            ],
+            options={
+                'verbose_name': 'Item de Extrato',
+                'verbose_name_plural': 'Itens de Extrato',
+                'ordering': ['data', 'id'],
+                'indexes': [models.Index(fields=['status', 'data'], name='financeiro__status_a03d06_idx'), models.Index(fields=['identificador'], name='financeiro__identif_a37b25_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.0.2 on 2026-10-19 18:13
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('associados', '0013_associado_nome_mae_associado_nome_pai_and_more'),
+        ('financeiro', '0009_extratobancario_itemextrato'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SaldoAssociado',
+            fields=[
+                ('associado', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='saldo_financeiro', serialize=False, to='associados.associado', verbose_name='Associado')),
+                ('total_mensalidades', models.PositiveIntegerField(default=0, verbose_name='Total de Mensalidades')),
+                ('mensalidades_pagas', models.PositiveIntegerField(default=0, verbose_name='Mensalidades Pagas')),
+                ('mensalidades_pendentes', models.PositiveIntegerField(default=0, verbose_name='Mensalidades Pendentes')),
+                ('mensalidades_atrasadas', models.PositiveIntegerField(default=0, verbose_name='Mensalidades Atrasadas')),
+                ('valor_total_mensalidades', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12, verbose_name='Valor Total')),
+                ('valor_pago', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12, verbose_name='Valor Pago')),
+                ('valor_pendente', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12, verbose_name='Valor Pendente')),
+                ('valor_atrasado', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12, verbose_name='Valor Atrasado')),
+                ('total_pagamentos', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12, verbose_name='Total de Pagamentos Registrados')),
+                ('data_atualizacao', models.DateTimeField(auto_now=True, verbose_name='Data de Atualização')),
+            ],
+            options={
+                'verbose_name': 'Saldo do Associado',
+                'verbose_name_plural': 'Saldos dos Associados',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='mensalidade',
+            index=models.Index(fields=['associado', 'data_vencimento'], name='financeiro__associa_6cb374_idx'),
+        ),
+    ]
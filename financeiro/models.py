@@ -58,10 +58,37 @@ class TipoMensalidade(models.Model):
         return f"{self.nome} - R$ {self.valor}"
 
 
+class MensalidadeQuerySet(models.QuerySet):
+    """
+    Consultas reutilizáveis de mensalidades
+    """
+    
+    def em_aberto(self):
+        """Mensalidades ainda não pagas (pendentes ou atrasadas)"""
+        return self.filter(status__in=Mensalidade.STATUS_EM_ABERTO)
+    
+    def vencidas(self, hoje=None):
+        """
+        Mensalidades vencidas. Inclui as pendentes com vencimento passado que
+        ainda não foram marcadas como atrasadas pela rotina diária.
+        """
+        hoje = hoje or date.today()
+        return self.filter(
+            models.Q(status='atrasado') |
+            models.Q(status='pendente', data_vencimento__lt=hoje)
+        )
+
+
 class Mensalidade(models.Model):
     """
     Modelo para controle de mensalidades dos associados
     """
+    # Encargos por atraso
+    MULTA_PERCENTUAL = Decimal('0.02')  # 2% de multa
+    JUROS_DIARIO_PERCENTUAL = Decimal('0.001')  # 0.1% ao dia
+    
+    STATUS_EM_ABERTO = ['pendente', 'atrasado']
+    
     STATUS_CHOICES = [
         ('pendente', 'Pendente'),
         ('pago', 'Pago'),
@@ -112,7 +139,27 @@ class Mensalidade(models.Model):
         verbose_name=_('Forma de Pagamento')
     )
     
-
+    valor_multa = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        verbose_name=_('Multa por Atraso'),
+        help_text=_('Calculada pela rotina diária de recebíveis')
+    )
+    
+    valor_juros = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        verbose_name=_('Juros por Atraso'),
+        help_text=_('Calculados pela rotina diária de recebíveis')
+    )
+    
+    encargos_calculados_em = models.DateField(
+        null=True,
+        blank=True,
+        verbose_name=_('Encargos Calculados em')
+    )
     
     observacoes = models.TextField(
         blank=True,
@@ -129,6 +176,8 @@ class Mensalidade(models.Model):
         verbose_name=_('Data de Atualização')
     )
     
+    objects = MensalidadeQuerySet.as_manager()
+    
     class Meta:
         verbose_name = _('Mensalidade')
         verbose_name_plural = _('Mensalidades')
@@ -137,26 +186,36 @@ class Mensalidade(models.Model):
             models.Index(fields=['status']),
             models.Index(fields=['data_vencimento']),
             models.Index(fields=['associado', 'status']),
+            models.Index(fields=['status', 'data_vencimento']),
+            models.Index(fields=['associado', 'data_vencimento']),
         ]
     
     def __str__(self):
         return f"{self.associado.nome} - {self.tipo.nome} - {self.data_vencimento}"
     
+    def esta_vencida(self):
+        """Indica se a mensalidade está em aberto com vencimento passado"""
+        return self.status in self.STATUS_EM_ABERTO and self.data_vencimento < date.today()
+    
     def get_dias_atraso(self):
         """Calcula os dias de atraso da mensalidade"""
-        if self.status == 'pendente' and self.data_vencimento < date.today():
+        if self.esta_vencida():
             return (date.today() - self.data_vencimento).days
         return 0
     
     def get_valor_com_multa(self):
-        """Calcula o valor com multa por atraso"""
-        if self.status == 'pendente' and self.data_vencimento < date.today():
-            dias_atraso = self.get_dias_atraso()
-            if dias_atraso > 0:
-                multa = self.valor * Decimal('0.02')  # 2% de multa
-                juros = self.valor * Decimal('0.001') * dias_atraso  # 0.1% ao dia
-                return self.valor + multa + juros
-        return self.valor
+        """
+        Retorna o valor com multa e juros por atraso. Usa os encargos gravados
+        pela rotina diária quando estão atualizados e calcula na hora caso
+        contrário.
+        """
+        if not self.esta_vencida():
+            return self.valor
+        if self.encargos_calculados_em == date.today():
+            return self.valor + self.valor_multa + self.valor_juros
+        multa = self.valor * self.MULTA_PERCENTUAL
+        juros = self.valor * self.JUROS_DIARIO_PERCENTUAL * self.get_dias_atraso()
+        return self.valor + multa + juros
 
 
 class Pagamento(models.Model):
@@ -225,6 +284,253 @@ class Pagamento(models.Model):
         return f"{self.mensalidade.associado.nome} - R$ {self.valor_pago} - {self.get_forma_pagamento_display()}"
 
 
+class SaldoAssociado(models.Model):
+    """
+    Totais financeiros pré-calculados de cada associado, mantidos a cada
+    alteração de Mensalidade/Pagamento (ver financeiro.services.saldos)
+    """
+    associado = models.OneToOneField(
+        Associado,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='saldo_financeiro',
+        verbose_name=_('Associado')
+    )
+    
+    total_mensalidades = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Total de Mensalidades')
+    )
+    
+    mensalidades_pagas = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Mensalidades Pagas')
+    )
+    
+    mensalidades_pendentes = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Mensalidades Pendentes')
+    )
+    
+    mensalidades_atrasadas = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Mensalidades Atrasadas')
+    )
+    
+    valor_total_mensalidades = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        verbose_name=_('Valor Total')
+    )
+    
+    valor_pago = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        verbose_name=_('Valor Pago')
+    )
+    
+    valor_pendente = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        verbose_name=_('Valor Pendente')
+    )
+    
+    valor_atrasado = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        verbose_name=_('Valor Atrasado')
+    )
+    
+    total_pagamentos = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        verbose_name=_('Total de Pagamentos Registrados')
+    )
+    
+    data_atualizacao = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_('Data de Atualização')
+    )
+    
+    class Meta:
+        verbose_name = _('Saldo do Associado')
+        verbose_name_plural = _('Saldos dos Associados')
+    
+    def __str__(self):
+        return f"{self.associado.nome} - Saldo R$ {self.saldo}"
+    
+    @property
+    def saldo(self):
+        """Valor pago menos o valor total das mensalidades"""
+        return self.valor_pago - self.valor_total_mensalidades
+
+
+class ExtratoBancario(models.Model):
+    """
+    Arquivo de extrato bancário (OFX, CSV ou retorno CNAB) importado para
+    conciliação automática dos recebimentos
+    """
+    FORMATO_CHOICES = [
+        ('ofx', 'OFX'),
+        ('csv', 'CSV'),
+        ('cnab240', 'CNAB 240 (retorno)'),
+        ('cnab400', 'CNAB 400 (retorno)'),
+    ]
+    
+    arquivo = models.FileField(
+        upload_to='financeiro/extratos/',
+        verbose_name=_('Arquivo')
+    )
+    
+    formato = models.CharField(
+        max_length=10,
+        choices=FORMATO_CHOICES,
+        verbose_name=_('Formato')
+    )
+    
+    total_itens = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Total de Créditos')
+    )
+    
+    total_conciliados = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Conciliados Automaticamente')
+    )
+    
+    total_revisao = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Enviados para Revisão')
+    )
+    
+    total_duplicados = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Duplicados Ignorados')
+    )
+    
+    usuario_importacao = models.ForeignKey(
+        Usuario,
+        on_delete=models.SET_NULL,
+        null=True,
+        verbose_name=_('Usuário que Importou')
+    )
+    
+    data_importacao = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_('Data de Importação')
+    )
+    
+    class Meta:
+        verbose_name = _('Extrato Bancário')
+        verbose_name_plural = _('Extratos Bancários')
+        ordering = ['-data_importacao']
+    
+    def __str__(self):
+        return f"{self.get_formato_display()} - {self.data_importacao:%d/%m/%Y %H:%M}"
+
+
+class ItemExtrato(models.Model):
+    """
+    Crédito lido de um extrato bancário e o resultado da sua conciliação
+    """
+    STATUS_CHOICES = [
+        ('conciliado', 'Conciliado'),
+        ('revisao', 'Aguardando Revisão'),
+        ('ignorado', 'Ignorado'),
+    ]
+    
+    extrato = models.ForeignKey(
+        ExtratoBancario,
+        on_delete=models.CASCADE,
+        related_name='itens',
+        verbose_name=_('Extrato')
+    )
+    
+    data = models.DateField(
+        verbose_name=_('Data do Crédito')
+    )
+    
+    valor = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        verbose_name=_('Valor')
+    )
+    
+    documento = models.CharField(
+        max_length=14,
+        blank=True,
+        verbose_name=_('CPF/CNPJ do Pagador'),
+        help_text=_('Somente dígitos')
+    )
+    
+    nome_pagador = models.CharField(
+        max_length=200,
+        blank=True,
+        verbose_name=_('Nome do Pagador')
+    )
+    
+    descricao = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name=_('Descrição')
+    )
+    
+    identificador = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name=_('Identificador no Banco'),
+        help_text=_('FITID, end-to-end do PIX ou nosso número')
+    )
+    
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='revisao',
+        verbose_name=_('Status')
+    )
+    
+    motivo = models.CharField(
+        max_length=200,
+        blank=True,
+        verbose_name=_('Motivo')
+    )
+    
+    mensalidade = models.ForeignKey(
+        Mensalidade,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='itens_extrato',
+        verbose_name=_('Mensalidade')
+    )
+    
+    pagamento = models.ForeignKey(
+        Pagamento,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='itens_extrato',
+        verbose_name=_('Pagamento')
+    )
+    
+    class Meta:
+        verbose_name = _('Item de Extrato')
+        verbose_name_plural = _('Itens de Extrato')
+        ordering = ['data', 'id']
+        indexes = [
+            models.Index(fields=['status', 'data']),
+            models.Index(fields=['identificador']),
+        ]
+    
+    def __str__(self):
+        return f"{self.data:%d/%m/%Y} - R$ {self.valor} - {self.nome_pagador or self.documento}"
+
+
 class Despesa(models.Model):
     """
     Modelo para controle de despesas da associação
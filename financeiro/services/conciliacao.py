@@ -0,0 +1,261 @@
+"""
+Conciliação de extratos bancários com as mensalidades em aberto
+
+Os créditos lidos do extrato são comparados com um índice em memória das
+mensalidades em aberto, montado com uma única consulta:
+
+- pelo ID da mensalidade informado no título (retornos CNAB), desde que o
+  CPF/CNPJ do pagador seja o do associado da mensalidade, ou
+- pelo CPF/CNPJ do pagador + valor (original ou com multa e juros), com
+  vencimento dentro da janela CONCILIACAO_JANELA_DIAS da data do crédito.
+
+Pagamentos, baixas e itens do extrato são gravados em lote (bulk_create /
+bulk_update) em uma única transação. Créditos sem correspondência vão para a
+fila de revisão (ItemExtrato com status 'revisao').
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from financeiro.models import ItemExtrato, Mensalidade, Pagamento
+from .extratos import ler_extrato
+from .resumo import invalidar_resumo_recebiveis
+from .saldos import recalcular_saldos
+
+
+def formatar_cpf(digitos):
+    """Converte 11 dígitos para o formato XXX.XXX.XXX-XX usado no cadastro"""
+    if len(digitos) != 11:
+        return None
+    return f'{digitos[:3]}.{digitos[3:6]}.{digitos[6:9]}-{digitos[9:]}'
+
+
+def _centavos(valor):
+    return int(round(valor * 100))
+
+
+def _data_hora(data):
+    return timezone.make_aware(datetime.combine(data, datetime.min.time()).replace(hour=12))
+
+
+def conciliar_extrato(extrato, usuario=None):
+    """
+    Lê o arquivo do extrato e concilia os créditos encontrados.
+
+    Returns:
+        Dicionário com 'total', 'conciliados', 'revisao' e 'duplicados'
+    """
+    with extrato.arquivo.open('rb') as arquivo:
+        lancamentos = list(ler_extrato(arquivo, extrato.formato))
+    return conciliar_lancamentos(extrato, lancamentos, usuario)
+
+
+def conciliar_lancamentos(extrato, lancamentos, usuario=None):
+    """
+    Concilia uma lista de lançamentos (ver financeiro.services.extratos) com
+    as mensalidades em aberto e grava o resultado.
+    """
+    janela = timedelta(days=getattr(settings, 'CONCILIACAO_JANELA_DIAS', 45))
+    lancamentos = sorted(lancamentos, key=lambda lancamento: lancamento['data'])
+
+    # Créditos já importados em extratos anteriores (ou repetidos no arquivo)
+    identificadores = {lancamento['identificador'] for lancamento in lancamentos if lancamento['identificador']}
+    vistos = set(
+        ItemExtrato.objects.filter(identificador__in=identificadores).values_list('identificador', flat=True)
+    )
+    novos = []
+    duplicados = 0
+    for lancamento in lancamentos:
+        identificador = lancamento['identificador']
+        if identificador and identificador in vistos:
+            duplicados += 1
+            continue
+        if identificador:
+            vistos.add(identificador)
+        novos.append(lancamento)
+
+    cpfs = {formatar_cpf(lancamento['documento']) for lancamento in novos} - {None}
+    referencias = {lancamento['referencia'] for lancamento in novos if lancamento['referencia']}
+
+    with transaction.atomic():
+        # Índice em memória das mensalidades em aberto dos pagadores do extrato
+        abertas = Mensalidade.objects.em_aberto().filter(
+            Q(associado__cpf__in=cpfs) | Q(pk__in=referencias)
+        ).select_for_update(of=('self',)).values(
+            'id', 'associado_id', 'associado__cpf', 'valor', 'valor_multa', 'valor_juros', 'data_vencimento'
+        ).order_by('data_vencimento')
+
+        por_id = {}
+        por_documento = defaultdict(list)
+        for mensalidade in abertas:
+            mensalidade['valores'] = {
+                _centavos(mensalidade['valor']),
+                _centavos(mensalidade['valor'] + mensalidade['valor_multa'] + mensalidade['valor_juros']),
+            }
+            por_id[mensalidade['id']] = mensalidade
+            mensalidade['documento'] = mensalidade['associado__cpf'].replace('.', '').replace('-', '')
+            por_documento[mensalidade['documento']].append(mensalidade)
+
+        usadas = set()
+        associados_afetados = set()
+        itens = []
+        pagamentos = []
+        baixas = []
+        agora = timezone.now()
+
+        for lancamento in novos:
+            centavos = _centavos(lancamento['valor'])
+            mensalidade, motivo = None, ''
+
+            referencia = por_id.get(lancamento['referencia'])
+            if (
+                referencia and referencia['id'] not in usadas and centavos in referencia['valores']
+                and lancamento['documento'] == referencia['documento']
+            ):
+                # A referência só vale para o próprio associado da mensalidade
+                mensalidade = referencia
+            elif lancamento['documento'] in por_documento:
+                candidatas = [
+                    candidata for candidata in por_documento[lancamento['documento']]
+                    if candidata['id'] not in usadas
+                    and centavos in candidata['valores']
+                    and abs(candidata['data_vencimento'] - lancamento['data']) <= janela
+                ]
+                if candidatas:
+                    mensalidade = min(
+                        candidatas,
+                        key=lambda candidata: abs(candidata['data_vencimento'] - lancamento['data'])
+                    )
+                else:
+                    motivo = 'Nenhuma mensalidade em aberto do pagador com este valor e vencimento próximo'
+            elif referencia and not lancamento['documento']:
+                motivo = 'Título sem CPF/CNPJ do pagador para confirmar a referência'
+            elif referencia and lancamento['documento'] != referencia['documento']:
+                motivo = 'Referência do título pertence a outro associado que não o pagador'
+            elif lancamento['documento']:
+                motivo = 'CPF/CNPJ do pagador sem mensalidades em aberto'
+            else:
+                motivo = 'Pagador não identificado no extrato'
+
+            item = ItemExtrato(
+                extrato=extrato,
+                data=lancamento['data'],
+                valor=lancamento['valor'],
+                documento=lancamento['documento'][:14],
+                nome_pagador=lancamento['nome'][:200],
+                descricao=lancamento['descricao'][:255],
+                identificador=lancamento['identificador'][:100],
+                status='revisao',
+                motivo=motivo,
+            )
+
+            if mensalidade:
+                usadas.add(mensalidade['id'])
+                associados_afetados.add(mensalidade['associado_id'])
+                item.status = 'conciliado'
+                item.mensalidade_id = mensalidade['id']
+                pagamentos.append((item, Pagamento(
+                    mensalidade_id=mensalidade['id'],
+                    valor_pago=lancamento['valor'],
+                    forma_pagamento=lancamento['forma_pagamento'],
+                    data_pagamento=_data_hora(lancamento['data']),
+                    observacoes=f'Conciliação automática do extrato #{extrato.pk} {lancamento["identificador"]}'.strip(),
+                    usuario_registro=usuario,
+                )))
+                baixas.append(Mensalidade(
+                    pk=mensalidade['id'],
+                    status='pago',
+                    data_pagamento=lancamento['data'],
+                    forma_pagamento=lancamento['forma_pagamento'],
+                    data_atualizacao=agora,
+                ))
+            itens.append(item)
+
+        Pagamento.objects.bulk_create([pagamento for _, pagamento in pagamentos], batch_size=500)
+        for item, pagamento in pagamentos:
+            item.pagamento = pagamento
+        ItemExtrato.objects.bulk_create(itens, batch_size=500)
+        Mensalidade.objects.bulk_update(
+            baixas,
+            ['status', 'data_pagamento', 'forma_pagamento', 'data_atualizacao'],
+            batch_size=500
+        )
+        recalcular_saldos(associados_afetados)
+
+        extrato.total_itens = len(itens)
+        extrato.total_conciliados = len(pagamentos)
+        extrato.total_revisao = len(itens) - len(pagamentos)
+        extrato.total_duplicados = duplicados
+        extrato.save(update_fields=['total_itens', 'total_conciliados', 'total_revisao', 'total_duplicados'])
+
+    if baixas:
+        invalidar_resumo_recebiveis()
+
+    return {
+        'total': extrato.total_itens,
+        'conciliados': extrato.total_conciliados,
+        'revisao': extrato.total_revisao,
+        'duplicados': duplicados,
+    }
+
+
+def conciliar_item_manual(item, mensalidade_id, usuario=None):
+    """
+    Concilia manualmente um item da fila de revisão com uma mensalidade.
+
+    Raises:
+        ValueError: Se o item já foi tratado ou a mensalidade não está em aberto
+    """
+    with transaction.atomic():
+        item = ItemExtrato.objects.select_for_update().get(pk=item.pk)
+        if item.status != 'revisao':
+            raise ValueError('Este crédito já foi tratado.')
+
+        mensalidade = Mensalidade.objects.select_for_update().filter(pk=mensalidade_id).first()
+        if mensalidade is None or mensalidade.status not in Mensalidade.STATUS_EM_ABERTO:
+            raise ValueError('Mensalidade não encontrada ou já paga.')
+
+        forma_pagamento = 'pix' if 'PIX' in f'{item.nome_pagador} {item.descricao}'.upper() else 'transferencia'
+        pagamento = Pagamento.objects.create(
+            mensalidade=mensalidade,
+            valor_pago=item.valor,
+            forma_pagamento=forma_pagamento,
+            data_pagamento=_data_hora(item.data),
+            observacoes=f'Conciliação manual do extrato #{item.extrato_id} {item.identificador}'.strip(),
+            usuario_registro=usuario,
+        )
+
+        mensalidade.status = 'pago'
+        mensalidade.data_pagamento = item.data
+        mensalidade.forma_pagamento = forma_pagamento
+        mensalidade.save(update_fields=['status', 'data_pagamento', 'forma_pagamento', 'data_atualizacao'])
+
+        item.status = 'conciliado'
+        item.mensalidade = mensalidade
+        item.pagamento = pagamento
+        item.motivo = ''
+        item.save(update_fields=['status', 'mensalidade', 'pagamento', 'motivo'])
+
+    return pagamento
+
+
+def sugerir_mensalidades(itens):
+    """
+    Anexa a cada item (atributo `sugestoes`) as mensalidades em aberto do
+    pagador, usando uma única consulta para todos os itens.
+    """
+    cpfs = {formatar_cpf(item.documento) for item in itens} - {None}
+    por_cpf = defaultdict(list)
+    if cpfs:
+        for mensalidade in Mensalidade.objects.em_aberto().filter(
+            associado__cpf__in=cpfs
+        ).select_related('associado', 'tipo').order_by('data_vencimento'):
+            por_cpf[mensalidade.associado.cpf].append(mensalidade)
+
+    for item in itens:
+        item.sugestoes = por_cpf.get(formatar_cpf(item.documento), [])[:5]
+    return itens
@@ -0,0 +1,309 @@
+"""
+Leitura de extratos bancários para conciliação
+
+Cada leitor recebe um arquivo binário e produz, linha a linha, um dicionário
+por crédito encontrado, sem carregar o arquivo inteiro na memória:
+
+    {
+        'data': date,
+        'valor': Decimal,
+        'documento': '12345678900',   # CPF/CNPJ do pagador, só dígitos
+        'nome': 'Fulano de Tal',
+        'descricao': 'PIX RECEBIDO',
+        'identificador': 'E0000000020240105...',  # FITID / end-to-end / nosso número
+        'referencia': 123,            # ID da mensalidade informado no título, se houver
+        'forma_pagamento': 'pix',
+    }
+
+Nos retornos CNAB o "número do documento" (seu número) do título é
+interpretado como o ID da mensalidade cobrada.
+"""
+import csv
+import io
+import re
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+DOCUMENTO_REGEX = re.compile(r'\b(\d{3}\.?\d{3}\.?\d{3}-?\d{2}|\d{2}\.?\d{3}\.?\d{3}/?\d{4}-?\d{2})\b')
+OFX_TAG_REGEX = re.compile(r'<(/?)(\w+)>([^<\r\n]*)')
+MILHAR_REGEX = re.compile(r'^-?[1-9]\d{0,2}[.,]\d{3}$')
+
+# Códigos de movimento de liquidação nos retornos CNAB
+CNAB_OCORRENCIAS_LIQUIDACAO = {'06', '07', '08', '17'}
+
+# Aliases aceitos no cabeçalho dos arquivos CSV
+CSV_COLUNAS = {
+    'data': ['data', 'data_credito', 'data do credito', 'data_lancamento', 'data lançamento', 'date'],
+    'valor': ['valor', 'valor_credito', 'valor do credito', 'amount'],
+    'documento': ['documento', 'cpf', 'cpf_cnpj', 'cpf/cnpj', 'cpf_pagador', 'documento_pagador'],
+    'nome': ['nome', 'pagador', 'nome_pagador', 'nome do pagador'],
+    'descricao': ['descricao', 'descrição', 'historico', 'histórico', 'memo'],
+    'identificador': ['identificador', 'id', 'end_to_end', 'e2e', 'id_transacao', 'fitid'],
+    'referencia': ['referencia', 'referência', 'mensalidade', 'mensalidade_id'],
+}
+
+
+def somente_digitos(valor):
+    return re.sub(r'\D', '', valor or '')
+
+
+def extrair_documento(*textos):
+    """Procura um CPF/CNPJ nos textos informados"""
+    for texto in textos:
+        if not texto:
+            continue
+        encontrado = DOCUMENTO_REGEX.search(texto)
+        if encontrado:
+            return somente_digitos(encontrado.group(1))
+    return ''
+
+
+def converter_valor(texto):
+    """Converte '1.234,56', '1,234.56', '1.234', '1234.56' ou '-50,00' para Decimal"""
+    texto = (texto or '').strip().replace('R$', '').replace(' ', '')
+    if MILHAR_REGEX.match(texto):
+        # Um único separador seguido de exatamente 3 dígitos é de milhares:
+        # '1.234' / '1,234' (mas '0,500' continua decimal)
+        texto = texto.replace(',', '').replace('.', '')
+    if ',' in texto and '.' in texto:
+        # O último separador é o decimal; o outro separa os milhares
+        milhar = '.' if texto.rfind(',') > texto.rfind('.') else ','
+        texto = texto.replace(milhar, '')
+    if texto.count(',') > 1 or texto.count('.') > 1:
+        # Separador repetido só pode ser de milhares: '1.234.567' / '1,234,567'
+        texto = texto.replace(',', '').replace('.', '')
+    texto = texto.replace(',', '.')
+    try:
+        return Decimal(texto)
+    except InvalidOperation:
+        return None
+
+
+def converter_data(texto):
+    texto = (texto or '').strip()
+    for formato in ('%d/%m/%Y', '%Y-%m-%d', '%d/%m/%y', '%d-%m-%Y'):
+        try:
+            return datetime.strptime(texto[:10], formato).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _linhas(arquivo, encoding):
+    """Itera sobre as linhas de um arquivo binário sem lê-lo por completo"""
+    texto = io.TextIOWrapper(arquivo, encoding=encoding, errors='replace', newline='')
+    try:
+        for linha in texto:
+            yield linha.rstrip('\r\n')
+    finally:
+        texto.detach()
+
+
+def _inteiro(texto):
+    try:
+        return int(texto)
+    except (TypeError, ValueError):
+        return None
+
+
+def ler_ofx(arquivo):
+    """Lê as transações de crédito (<STMTTRN>) de um arquivo OFX 1.x/2.x"""
+    transacao = None
+    for linha in _linhas(arquivo, 'latin-1'):
+        for fechamento, tag, valor in OFX_TAG_REGEX.findall(linha):
+            tag = tag.upper()
+            valor = valor.strip()
+            if tag == 'STMTTRN':
+                if not fechamento:
+                    transacao = {}
+                    continue
+                if transacao is not None:
+                    lancamento = _lancamento_ofx(transacao)
+                    if lancamento:
+                        yield lancamento
+                transacao = None
+            elif transacao is not None and not fechamento:
+                transacao[tag] = valor
+
+
+def _lancamento_ofx(transacao):
+    valor = converter_valor(transacao.get('TRNAMT'))
+    data = None
+    if transacao.get('DTPOSTED'):
+        try:
+            data = datetime.strptime(transacao['DTPOSTED'][:8], '%Y%m%d').date()
+        except ValueError:
+            pass
+    if valor is None or valor <= 0 or data is None:
+        return None
+    nome = transacao.get('NAME', '')
+    memo = transacao.get('MEMO', '')
+    return {
+        'data': data,
+        'valor': valor,
+        'documento': extrair_documento(nome, memo),
+        'nome': nome,
+        'descricao': memo,
+        'identificador': transacao.get('FITID', ''),
+        'referencia': None,
+        'forma_pagamento': 'pix' if 'PIX' in f'{nome} {memo}'.upper() else 'transferencia',
+    }
+
+
+def ler_csv(arquivo):
+    """
+    Lê um extrato CSV com cabeçalho (separador ';' ou ','). As colunas são
+    reconhecidas pelos nomes em CSV_COLUNAS; apenas valores positivos são
+    considerados créditos.
+    """
+    linhas = _linhas(arquivo, 'utf-8-sig')
+    cabecalho = next(linhas, '')
+    delimitador = ';' if cabecalho.count(';') >= cabecalho.count(',') else ','
+    nomes = [coluna.strip().lower() for coluna in next(csv.reader([cabecalho], delimiter=delimitador))]
+
+    indices = {}
+    for campo, aliases in CSV_COLUNAS.items():
+        for alias in aliases:
+            if alias in nomes:
+                indices[campo] = nomes.index(alias)
+                break
+    if 'data' not in indices or 'valor' not in indices:
+        raise ValueError('O CSV deve ter ao menos as colunas "data" e "valor".')
+
+    for registro in csv.reader(linhas, delimiter=delimitador):
+        def coluna(campo):
+            indice = indices.get(campo)
+            return registro[indice].strip() if indice is not None and indice < len(registro) else ''
+
+        valor = converter_valor(coluna('valor'))
+        data = converter_data(coluna('data'))
+        if valor is None or valor <= 0 or data is None:
+            continue
+        descricao = coluna('descricao')
+        yield {
+            'data': data,
+            'valor': valor,
+            'documento': somente_digitos(coluna('documento')) or extrair_documento(descricao),
+            'nome': coluna('nome'),
+            'descricao': descricao,
+            'identificador': coluna('identificador'),
+            'referencia': _inteiro(coluna('referencia')),
+            'forma_pagamento': 'pix' if 'PIX' in descricao.upper() else 'transferencia',
+        }
+
+
+def _valor_cnab(texto):
+    valor = _inteiro(texto)
+    return Decimal(valor) / 100 if valor is not None else None
+
+
+def _data_cnab(texto, formato='%d%m%Y'):
+    try:
+        return datetime.strptime(texto, formato).date()
+    except ValueError:
+        return None
+
+
+def _documento_cnab(tipo_inscricao, numero):
+    """Número de inscrição do pagador (1 = CPF, 2 = CNPJ) sem zeros à esquerda do campo"""
+    numero = somente_digitos(numero)
+    if tipo_inscricao == '1':
+        return numero[-11:]
+    if tipo_inscricao == '2':
+        return numero[-14:]
+    return ''
+
+
+def ler_cnab240(arquivo):
+    """
+    Lê os títulos liquidados de um retorno CNAB 240 (FEBRABAN), combinando
+    os segmentos T (dados do título e do pagador) e U (valores e datas).
+    """
+    segmento_t = None
+    for linha in _linhas(arquivo, 'latin-1'):
+        if len(linha) < 240 or linha[7] != '3':
+            continue
+        segmento = linha[13]
+        if segmento == 'T':
+            segmento_t = linha
+        elif segmento == 'U' and segmento_t:
+            t, u, segmento_t = segmento_t, linha, None
+            if t[15:17] not in CNAB_OCORRENCIAS_LIQUIDACAO:
+                continue
+            valor = _valor_cnab(u[77:92])
+            data = _data_cnab(u[145:153]) or _data_cnab(u[137:145])
+            if not valor or data is None:
+                continue
+            yield {
+                'data': data,
+                'valor': valor,
+                'documento': _documento_cnab(t[132], t[133:148]),
+                'nome': t[148:188].strip(),
+                'descricao': f'Liquidação de título {t[58:73].strip()}',
+                'identificador': t[37:57].strip(),
+                'referencia': _inteiro(t[58:73].strip()),
+                'forma_pagamento': 'boleto',
+            }
+
+
+def ler_cnab400(arquivo):
+    """
+    Lê os títulos liquidados (registros de detalhe) de um retorno CNAB 400.
+
+    O CPF/CNPJ do pagador é lido das posições 219-220 (tipo de inscrição: 01 =
+    CPF, 02 = CNPJ) e 221-234 (número), como no layout de remessa. Os bancos
+    que não repetem esse campo no retorno deixam o documento vazio, e os
+    créditos vão para a fila de revisão da conciliação (a referência do título
+    só é aceita junto com o CPF/CNPJ do pagador).
+    """
+    for linha in _linhas(arquivo, 'latin-1'):
+        if len(linha) < 400 or linha[0] != '1':
+            continue
+        if linha[108:110] not in CNAB_OCORRENCIAS_LIQUIDACAO:
+            continue
+        valor = _valor_cnab(linha[253:266])
+        data = _data_cnab(linha[295:301], '%d%m%y') or _data_cnab(linha[110:116], '%d%m%y')
+        if not valor or data is None:
+            continue
+        yield {
+            'data': data,
+            'valor': valor,
+            'documento': _documento_cnab(linha[219] if linha[218] == '0' else '', linha[220:234]),
+            'nome': '',
+            'descricao': f'Liquidação de título {linha[116:126].strip()}',
+            'identificador': linha[62:70].strip(),
+            'referencia': _inteiro(linha[116:126].strip()),
+            'forma_pagamento': 'boleto',
+        }
+
+
+LEITORES = {
+    'ofx': ler_ofx,
+    'csv': ler_csv,
+    'cnab240': ler_cnab240,
+    'cnab400': ler_cnab400,
+}
+
+
+def detectar_formato(nome_arquivo, primeira_linha=''):
+    """Sugere o formato do extrato pela extensão e pela primeira linha"""
+    nome = (nome_arquivo or '').lower()
+    if nome.endswith('.ofx') or 'OFXHEADER' in primeira_linha or '<OFX>' in primeira_linha:
+        return 'ofx'
+    if nome.endswith('.csv'):
+        return 'csv'
+    tamanho = len(primeira_linha.rstrip('\r\n'))
+    if tamanho == 240:
+        return 'cnab240'
+    if tamanho == 400:
+        return 'cnab400'
+    return None
+
+
+def ler_extrato(arquivo, formato):
+    """Retorna um gerador com os créditos do extrato no formato informado"""
+    try:
+        leitor = LEITORES[formato]
+    except KeyError:
+        raise ValueError(f'Formato de extrato não suportado: {formato}')
+    return leitor(arquivo)
@@ -0,0 +1,122 @@
+"""
+Ciclo de vida dos recebíveis (mensalidades)
+
+A rotina diária (comando atualizar_recebiveis) marca como 'atrasado' as
+mensalidades pendentes vencidas e grava multa e juros calculados pelo próprio
+banco, em UPDATEs sobre o conjunto inteiro em vez de salvar mensalidade por
+mensalidade. Listas, carnês e extratos passam a ler os valores já calculados.
+"""
+from datetime import date
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import DateField, DecimalField, F, Func, IntegerField, Value
+from django.db.models.functions import Round
+from django.utils import timezone
+
+from financeiro.models import Mensalidade
+from .resumo import invalidar_resumo_recebiveis
+from .saldos import recalcular_saldos
+
+
+class DiasEntre(Func):
+    """Número de dias entre duas datas (primeira - segunda)"""
+    arg_joiner = ' - '
+    template = '(%(expressions)s)'
+    output_field = IntegerField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection,
+            template='CAST(julianday(%(expressions)s) AS INTEGER)',
+            arg_joiner=') - julianday(',
+            **extra_context
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection,
+            function='DATEDIFF',
+            template='%(function)s(%(expressions)s)',
+            arg_joiner=', ',
+            **extra_context
+        )
+
+
+def expressoes_encargos(hoje):
+    """Expressões de multa e juros por atraso calculadas no banco"""
+    dinheiro = DecimalField(max_digits=10, decimal_places=2)
+    dias_atraso = DiasEntre(Value(hoje, output_field=DateField()), F('data_vencimento'))
+    return {
+        'valor_multa': Round(
+            F('valor') * Value(Mensalidade.MULTA_PERCENTUAL),
+            2,
+            output_field=dinheiro
+        ),
+        'valor_juros': Round(
+            F('valor') * Value(Mensalidade.JUROS_DIARIO_PERCENTUAL) * dias_atraso,
+            2,
+            output_field=dinheiro
+        ),
+    }
+
+
+def atualizar_recebiveis(hoje=None):
+    """
+    Executa as transições diárias dos recebíveis.
+
+    - pendente com vencimento passado -> atrasado
+    - atrasado com vencimento futuro (data alterada) -> pendente, sem encargos
+    - multa e juros das atrasadas recalculados para a data de hoje
+
+    Args:
+        hoje: Data de referência (padrão: hoje)
+
+    Returns:
+        Dicionário com as quantidades 'novas_atrasadas', 'encargos_atualizados'
+        e 'reabertas'
+    """
+    hoje = hoje or date.today()
+    agora = timezone.now()
+
+    with transaction.atomic():
+        novas_atrasadas = Mensalidade.objects.filter(
+            status='pendente',
+            data_vencimento__lt=hoje
+        ).count()
+
+        # Transição e encargos no mesmo UPDATE
+        encargos_atualizados = Mensalidade.objects.filter(
+            status__in=Mensalidade.STATUS_EM_ABERTO,
+            data_vencimento__lt=hoje
+        ).exclude(
+            encargos_calculados_em=hoje
+        ).update(
+            status='atrasado',
+            encargos_calculados_em=hoje,
+            data_atualizacao=agora,
+            **expressoes_encargos(hoje)
+        )
+
+        reabertas = Mensalidade.objects.filter(
+            status='atrasado',
+            data_vencimento__gte=hoje
+        ).update(
+            status='pendente',
+            valor_multa=Decimal('0.00'),
+            valor_juros=Decimal('0.00'),
+            encargos_calculados_em=None,
+            data_atualizacao=agora
+        )
+
+    if encargos_atualizados or reabertas:
+        invalidar_resumo_recebiveis()
+
+    # Status mudaram em lote (sem sinais): recalcular todos os saldos
+    recalcular_saldos()
+
+    return {
+        'novas_atrasadas': novas_atrasadas,
+        'encargos_atualizados': encargos_atualizados,
+        'reabertas': reabertas,
+    }
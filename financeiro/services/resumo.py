@@ -0,0 +1,83 @@
+"""
+Resumo dos recebíveis exibido nas listas do módulo financeiro
+
+Total, pago, em aberto e vencido são calculados em um único aggregate com
+somas condicionais sobre o queryset já filtrado pela lista. Os totais sem
+filtro (iguais para todos os usuários) ficam no cache sob uma chave com a
+versão dos recebíveis, incrementada pelos sinais em financeiro.signals e
+pelas rotinas que alteram mensalidades em lote.
+"""
+import time
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q, Sum
+
+from financeiro.models import Mensalidade
+
+VERSAO_CACHE_KEY = 'financeiro:resumo:versao'
+RESUMO_CACHE_KEY = 'financeiro:resumo:{chave}:v{versao}:{data}'
+
+
+def get_versao_recebiveis():
+    """Retorna a versão atual dos recebíveis usada nas chaves do cache"""
+    versao = cache.get(VERSAO_CACHE_KEY)
+    if versao is None:
+        versao = int(time.time())
+        cache.add(VERSAO_CACHE_KEY, versao, None)
+        versao = cache.get(VERSAO_CACHE_KEY, versao)
+    return versao
+
+
+def invalidar_resumo_recebiveis():
+    """Incrementa a versão dos recebíveis, invalidando os resumos em cache"""
+    try:
+        return cache.incr(VERSAO_CACHE_KEY)
+    except ValueError:
+        versao = int(time.time())
+        cache.set(VERSAO_CACHE_KEY, versao, None)
+        return versao
+
+
+def calcular_resumo(queryset, hoje=None):
+    """
+    Calcula os totais dos recebíveis do queryset em uma única consulta.
+
+    Returns:
+        Dicionário com total_recebiveis, recebiveis_pagos,
+        recebiveis_pendentes (em aberto) e recebiveis_atrasados
+    """
+    hoje = hoje or date.today()
+    totais = queryset.order_by().aggregate(
+        total_recebiveis=Sum('valor'),
+        recebiveis_pagos=Sum('valor', filter=Q(status='pago')),
+        recebiveis_pendentes=Sum('valor', filter=Q(status__in=Mensalidade.STATUS_EM_ABERTO)),
+        recebiveis_atrasados=Sum(
+            'valor',
+            filter=Q(status='atrasado') | Q(status='pendente', data_vencimento__lt=hoje)
+        ),
+    )
+    return {chave: valor or 0 for chave, valor in totais.items()}
+
+
+def resumo_recebiveis(queryset, chave_cache=None):
+    """
+    Retorna o resumo dos recebíveis do queryset.
+
+    Args:
+        queryset: Mensalidades já filtradas pela lista
+        chave_cache: Identificador do conjunto quando ele não depende de
+            filtros do usuário; nesse caso o resumo é armazenado no cache
+    """
+    timeout = getattr(settings, 'RECEBIVEIS_RESUMO_CACHE_TIMEOUT', 300)
+    if not chave_cache or not timeout:
+        return calcular_resumo(queryset)
+
+    hoje = date.today()
+    chave = RESUMO_CACHE_KEY.format(chave=chave_cache, versao=get_versao_recebiveis(), data=hoje.isoformat())
+    resumo = cache.get(chave)
+    if resumo is None:
+        resumo = calcular_resumo(queryset, hoje)
+        cache.set(chave, resumo, timeout)
+    return resumo
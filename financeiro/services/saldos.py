@@ -0,0 +1,200 @@
+"""
+Saldos pré-calculados e extrato financeiro dos associados
+
+Os totais de cada associado (quantidade e valor das mensalidades por status e
+soma dos pagamentos registrados) ficam em SaldoAssociado. Eles são
+recalculados com uma consulta agrupada sempre que uma mensalidade ou um
+pagamento do associado muda:
+
+- gravações individuais disparam os sinais em financeiro.signals, que agendam
+  o recálculo para o fim da transação (vários registros do mesmo associado na
+  mesma transação geram um único recálculo);
+- rotinas que alteram mensalidades em lote chamam recalcular_saldos() com os
+  associados afetados;
+- a rotina diária (atualizar_recebiveis) recalcula todos os saldos, corrigindo
+  qualquer divergência.
+
+O histórico do extrato é paginado por chave (data de vencimento, id), de modo
+que cada página custa o mesmo independentemente do tamanho do histórico.
+"""
+import threading
+from datetime import date
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+
+from associados.models import Associado
+from financeiro.models import Mensalidade, Pagamento, SaldoAssociado
+
+CAMPOS_SALDO = [
+    'total_mensalidades', 'mensalidades_pagas', 'mensalidades_pendentes', 'mensalidades_atrasadas',
+    'valor_total_mensalidades', 'valor_pago', 'valor_pendente', 'valor_atrasado', 'total_pagamentos',
+]
+
+_pendentes = threading.local()
+
+
+def _totais_por_associado(associado_ids=None):
+    """Calcula os totais agrupados por associado (duas consultas)"""
+    mensalidades = Mensalidade.objects.order_by()
+    pagamentos = Pagamento.objects.order_by()
+    if associado_ids is not None:
+        mensalidades = mensalidades.filter(associado_id__in=associado_ids)
+        pagamentos = pagamentos.filter(mensalidade__associado_id__in=associado_ids)
+
+    totais = {}
+    for linha in mensalidades.values('associado_id').annotate(
+        total_mensalidades=Count('id'),
+        mensalidades_pagas=Count('id', filter=Q(status='pago')),
+        mensalidades_pendentes=Count('id', filter=Q(status='pendente')),
+        mensalidades_atrasadas=Count('id', filter=Q(status='atrasado')),
+        valor_total_mensalidades=Sum('valor'),
+        valor_pago=Sum('valor', filter=Q(status='pago')),
+        valor_pendente=Sum('valor', filter=Q(status='pendente')),
+        valor_atrasado=Sum('valor', filter=Q(status='atrasado')),
+    ):
+        totais[linha.pop('associado_id')] = linha
+
+    for linha in pagamentos.values('mensalidade__associado_id').annotate(total=Sum('valor_pago')):
+        totais.setdefault(linha['mensalidade__associado_id'], {})['total_pagamentos'] = linha['total']
+
+    return totais
+
+
+def recalcular_saldos(associado_ids=None):
+    """
+    Recalcula os saldos dos associados informados (ou de todos).
+
+    Returns:
+        Quantidade de saldos gravados
+    """
+    if associado_ids is not None:
+        associado_ids = {pk for pk in associado_ids if pk}
+        if associado_ids:
+            # Associados excluídos depois do agendamento não recebem saldo
+            associado_ids = set(
+                Associado.objects.filter(pk__in=associado_ids).values_list('pk', flat=True)
+            )
+        if not associado_ids:
+            return 0
+
+    totais = _totais_por_associado(associado_ids)
+    if associado_ids is None:
+        # Saldos de associados que não têm mais mensalidades voltam a zero
+        associado_ids = set(totais) | set(SaldoAssociado.objects.values_list('associado_id', flat=True))
+
+    saldos = []
+    for associado_id in associado_ids:
+        linha = totais.get(associado_id, {})
+        saldos.append(SaldoAssociado(
+            associado_id=associado_id,
+            **{campo: linha.get(campo) or 0 for campo in CAMPOS_SALDO}
+        ))
+
+    SaldoAssociado.objects.bulk_create(
+        saldos,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['associado'],
+        update_fields=CAMPOS_SALDO + ['data_atualizacao'],
+    )
+    return len(saldos)
+
+
+def agendar_recalculo(associado_id):
+    """
+    Agenda o recálculo do saldo do associado para o fim da transação atual
+    (ou executa imediatamente, fora de transação).
+    """
+    if not hasattr(_pendentes, 'ids'):
+        _pendentes.ids = set()
+    _pendentes.ids.add(associado_id)
+    # O primeiro callback executado recalcula todos os pendentes; os demais
+    # encontram o conjunto vazio
+    transaction.on_commit(_executar_recalculos_pendentes)
+
+
+def _executar_recalculos_pendentes():
+    ids = getattr(_pendentes, 'ids', set())
+    _pendentes.ids = set()
+    if ids:
+        recalcular_saldos(ids)
+
+
+def obter_saldo(associado):
+    """Retorna o saldo do associado, calculando-o se ainda não existir"""
+    saldo = SaldoAssociado.objects.filter(associado=associado).first()
+    if saldo is None:
+        recalcular_saldos([associado.pk])
+        saldo = SaldoAssociado.objects.get(associado=associado)
+    return saldo
+
+
+def resumo_saldo(saldo):
+    """Serializa o saldo para respostas JSON"""
+    resumo = {campo: getattr(saldo, campo) for campo in CAMPOS_SALDO}
+    resumo['saldo'] = saldo.saldo
+    resumo['data_atualizacao'] = saldo.data_atualizacao.isoformat()
+    return {
+        chave: str(valor) if isinstance(valor, Decimal) else valor
+        for chave, valor in resumo.items()
+    }
+
+
+def codificar_cursor(data_vencimento, pk):
+    return f'{data_vencimento.isoformat()}_{pk}'
+
+
+def decodificar_cursor(cursor):
+    """
+    Converte o cursor 'AAAA-MM-DD_id' recebido do cliente.
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    data_texto, _, pk = cursor.partition('_')
+    return date.fromisoformat(data_texto), int(pk)
+
+
+def historico_extrato(associado, cursor=None, limite=20):
+    """
+    Retorna uma página do histórico de mensalidades do associado, da mais
+    recente para a mais antiga.
+
+    Args:
+        associado: Associado dono do extrato
+        cursor: Cursor retornado pela página anterior (ou None)
+        limite: Quantidade de lançamentos por página
+
+    Returns:
+        Tupla (mensalidades, proximo_cursor); proximo_cursor é None na última página
+    """
+    mensalidades = Mensalidade.objects.filter(associado=associado).select_related('tipo')
+    if cursor:
+        data_vencimento, pk = decodificar_cursor(cursor)
+        mensalidades = mensalidades.filter(
+            Q(data_vencimento__lt=data_vencimento) | Q(data_vencimento=data_vencimento, pk__lt=pk)
+        )
+
+    pagina = list(mensalidades.order_by('-data_vencimento', '-pk')[:limite + 1])
+    proximo = None
+    if len(pagina) > limite:
+        pagina = pagina[:limite]
+        proximo = codificar_cursor(pagina[-1].data_vencimento, pagina[-1].pk)
+    return pagina, proximo
+
+
+def serializar_lancamento(mensalidade):
+    """Serializa uma mensalidade do histórico para respostas JSON"""
+    return {
+        'id': mensalidade.pk,
+        'tipo': mensalidade.tipo.nome,
+        'valor': str(mensalidade.valor),
+        'valor_atualizado': str(mensalidade.get_valor_com_multa()),
+        'data_vencimento': mensalidade.data_vencimento.isoformat(),
+        'data_pagamento': mensalidade.data_pagamento.isoformat() if mensalidade.data_pagamento else None,
+        'status': mensalidade.status,
+        'status_display': mensalidade.get_status_display(),
+        'forma_pagamento': mensalidade.get_forma_pagamento_display() if mensalidade.forma_pagamento else None,
+    }
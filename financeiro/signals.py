@@ -0,0 +1,45 @@
+"""
+Sinais do app financeiro
+"""
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from associados.models import Associado
+
+from .models import Mensalidade, Pagamento
+from .services.resumo import invalidar_resumo_recebiveis
+from .services.saldos import agendar_recalculo
+
+
+@receiver([post_save, post_delete], sender=Mensalidade)
+def invalidar_resumo_mensalidades(sender, **kwargs):
+    """Invalida os totais de recebíveis em cache quando uma mensalidade muda"""
+    invalidar_resumo_recebiveis()
+
+
+def _exclusao_do_associado(origin):
+    # Exclusão em cascata do próprio associado: o saldo sai junto (FK CASCADE)
+    if isinstance(origin, QuerySet):
+        return origin.model is Associado
+    return isinstance(origin, Associado)
+
+
+@receiver([post_save, post_delete], sender=Mensalidade)
+def atualizar_saldo_mensalidade(sender, instance, origin=None, **kwargs):
+    """Agenda o recálculo do saldo do associado da mensalidade"""
+    if _exclusao_do_associado(origin):
+        return
+    agendar_recalculo(instance.associado_id)
+
+
+@receiver([post_save, post_delete], sender=Pagamento)
+def atualizar_saldo_pagamento(sender, instance, origin=None, **kwargs):
+    """Agenda o recálculo do saldo do associado do pagamento"""
+    if _exclusao_do_associado(origin):
+        return
+    associado_id = Mensalidade.objects.filter(
+        pk=instance.mensalidade_id
+    ).values_list('associado_id', flat=True).first()
+    if associado_id:
+        agendar_recalculo(associado_id)
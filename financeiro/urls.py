@@ -54,6 +54,13 @@ urlpatterns = [
     path('dar-baixa-recebiveis-lote/', views.dar_baixa_recebiveis_lote, name='dar_baixa_recebiveis_lote'),
     path('gerar-carne-lote/', views.gerar_carne_lote, name='gerar_carne_lote'),
 
+    # Conciliação bancária
+    path('conciliacao/', views.ExtratoBancarioListView.as_view(), name='extrato_list'),
+    path('conciliacao/importar/', views.importar_extrato, name='importar_extrato'),
+    path('conciliacao/revisao/', views.ConciliacaoRevisaoListView.as_view(), name='conciliacao_revisao'),
+    path('conciliacao/itens/<int:pk>/conciliar/', views.conciliar_item_extrato, name='conciliar_item_extrato'),
+    path('conciliacao/itens/<int:pk>/ignorar/', views.ignorar_item_extrato, name='ignorar_item_extrato'),
+
     # Configuração de Cobrança
     path('configuracao-cobranca/', views.configuracao_cobranca_edit, name='configuracao_cobranca_edit'),
     path('configuracao-cobranca/dados/', views.configuracao_cobranca_dados, name='configuracao_cobranca_dados'),
@@ -14,11 +14,17 @@ import csv
 from decimal import Decimal
 from datetime import datetime
 
-from .models import TipoMensalidade, Mensalidade, Pagamento, Despesa, RelatorioFinanceiro, ConfiguracaoCobranca
+from .models import (
+    TipoMensalidade, Mensalidade, Pagamento, Despesa, RelatorioFinanceiro, ConfiguracaoCobranca,
+    ExtratoBancario, ItemExtrato
+)
 from .forms import (
     TipoMensalidadeForm, MensalidadeForm, PagamentoForm, DespesaForm,
-    MensalidadeSearchForm, DespesaSearchForm, ConfiguracaoCobrancaForm
+    MensalidadeSearchForm, DespesaSearchForm, ConfiguracaoCobrancaForm, ExtratoBancarioForm
 )
+from .services.conciliacao import conciliar_extrato, conciliar_item_manual, sugerir_mensalidades
+from .services.resumo import invalidar_resumo_recebiveis, resumo_recebiveis
+from .services.saldos import recalcular_saldos
 from associados.models import Associado
 
 
@@ -47,14 +53,11 @@ def dashboard_financeiro(request):
         total=Sum('valor')
     )['total'] or 0
     
-    mensalidades_associados_pendentes = mensalidades_associados_mes.filter(status='pendente').aggregate(
+    mensalidades_associados_pendentes = mensalidades_associados_mes.em_aberto().aggregate(
         total=Sum('valor')
     )['total'] or 0
     
-    mensalidades_associados_atrasadas = mensalidades_associados_mes.filter(
-        status='pendente',
-        data_vencimento__lt=hoje
-    ).aggregate(
+    mensalidades_associados_atrasadas = mensalidades_associados_mes.vencidas(hoje).aggregate(
         total=Sum('valor')
     )['total'] or 0
     
@@ -84,10 +87,7 @@ def dashboard_financeiro(request):
     ).select_related('associado', 'tipo').order_by('data_vencimento')[:10]
     
     # Mensalidades em atraso
-    mensalidades_atraso = Mensalidade.objects.filter(
-        status='pendente',
-        data_vencimento__lt=hoje
-    ).select_related('associado', 'tipo').order_by('data_vencimento')[:10]
+    mensalidades_atraso = Mensalidade.objects.vencidas(hoje).select_related('associado', 'tipo').order_by('data_vencimento')[:10]
     
     # Gráfico de receitas por mês (últimos 12 meses)
     receitas_por_mes = []
@@ -220,24 +220,13 @@ class MensalidadeListView(LoginRequiredMixin, ListView):
         context = super().get_context_data(**kwargs)
         context['search_form'] = MensalidadeSearchForm(self.request.GET)
         
-        # Estatísticas
-        queryset = self.get_queryset()
-        context['total_recebiveis'] = queryset.aggregate(total=Sum('valor'))['total'] or 0
-        context['recebiveis_pagos'] = queryset.filter(status='pago').aggregate(total=Sum('valor'))['total'] or 0
-        context['recebiveis_pendentes'] = queryset.filter(status='pendente').aggregate(total=Sum('valor'))['total'] or 0
-        context['recebiveis_atrasados'] = queryset.filter(
-            status='pendente',
-            data_vencimento__lt=date.today()
-        ).aggregate(total=Sum('valor'))['total'] or 0
+        # Estatísticas sobre o queryset já filtrado (totais sem filtro vêm do cache)
+        filtrado = any(self.request.GET.get(campo) for campo in MensalidadeSearchForm.base_fields)
+        context.update(resumo_recebiveis(self.object_list, chave_cache=None if filtrado else 'mensalidades_associados'))
         
         # Dados para o modal de geração em lote
-        from .models import TipoMensalidade
         context['tipos_mensalidade'] = TipoMensalidade.objects.filter(ativo=True, categoria='mensalidade').order_by('nome')
         
-        # Associados ativos para seleção no modal
-        from associados.models import Associado
-        context['associados_ativos'] = Associado.objects.filter(ativo=True).order_by('nome')
-        
         # Anos disponíveis (atual e próximos 2 anos)
         ano_atual = date.today().year
         context['anos_disponiveis'] = range(ano_atual, ano_atual + 3)
@@ -423,11 +412,13 @@ class DespesaListView(LoginRequiredMixin, ListView):
         context = super().get_context_data(**kwargs)
         context['search_form'] = DespesaSearchForm(self.request.GET)
         
-        # Estatísticas
-        queryset = self.get_queryset()
-        context['total_despesas'] = queryset.aggregate(total=Sum('valor'))['total'] or 0
-        context['despesas_pagas'] = queryset.filter(pago=True).aggregate(total=Sum('valor'))['total'] or 0
-        context['despesas_pendentes'] = queryset.filter(pago=False).aggregate(total=Sum('valor'))['total'] or 0
+        # Estatísticas (uma única consulta sobre o queryset já filtrado)
+        totais = self.object_list.order_by().aggregate(
+            total_despesas=Sum('valor'),
+            despesas_pagas=Sum('valor', filter=Q(pago=True)),
+            despesas_pendentes=Sum('valor', filter=Q(pago=False)),
+        )
+        context.update({chave: valor or 0 for chave, valor in totais.items()})
         
         return context
 
@@ -1047,14 +1038,7 @@ class MensalidadeAssociadosListView(LoginRequiredMixin, ListView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         # Estatísticas para recebíveis de associados
-        queryset = self.get_queryset()
-        context['total_recebiveis'] = queryset.aggregate(total=Sum('valor'))['total'] or 0
-        context['recebiveis_pagos'] = queryset.filter(status='pago').aggregate(total=Sum('valor'))['total'] or 0
-        context['recebiveis_pendentes'] = queryset.filter(status='pendente').aggregate(total=Sum('valor'))['total'] or 0
-        context['recebiveis_atrasados'] = queryset.filter(
-            status='pendente',
-            data_vencimento__lt=date.today()
-        ).aggregate(total=Sum('valor'))['total'] or 0
+        context.update(resumo_recebiveis(self.object_list, chave_cache='mensalidades_associados'))
         return context
 
 
@@ -1087,14 +1071,7 @@ class MensalidadeAssociadoListView(LoginRequiredMixin, ListView):
             context['associado'] = None
         
         # Estatísticas para o associado específico
-        queryset = self.get_queryset()
-        context['total_recebiveis'] = queryset.aggregate(total=Sum('valor'))['total'] or 0
-        context['recebiveis_pagos'] = queryset.filter(status='pago').aggregate(total=Sum('valor'))['total'] or 0
-        context['recebiveis_pendentes'] = queryset.filter(status='pendente').aggregate(total=Sum('valor'))['total'] or 0
-        context['recebiveis_atrasados'] = queryset.filter(
-            status='pendente',
-            data_vencimento__lt=date.today()
-        ).aggregate(total=Sum('valor'))['total'] or 0
+        context.update(resumo_recebiveis(self.object_list))
         
         # Adicionar data atual para comparações no template
         context['today'] = date.today()
@@ -1150,11 +1127,10 @@ def dar_baixa_recebiveis_lote(request):
                     'error': 'Associado não encontrado ou inativo.'
                 })
             
-            # Buscar recebíveis do associado específico (apenas pendentes)
-            recebiveis = Mensalidade.objects.filter(
+            # Buscar recebíveis do associado específico (apenas em aberto)
+            recebiveis = Mensalidade.objects.em_aberto().filter(
                 id__in=mensalidade_ids,
-                associado_id=associado_id,
-                status='pendente'
+                associado_id=associado_id
             )
             
             count = recebiveis.count()
@@ -1170,6 +1146,8 @@ def dar_baixa_recebiveis_lote(request):
                 status='pago',
                 data_pagamento=timezone.now().date()
             )
+            invalidar_resumo_recebiveis()
+            recalcular_saldos([associado.pk])
             
             return JsonResponse({
                 'success': True,
@@ -1213,19 +1191,17 @@ def gerar_carne_associado(request, associado_id):
         # Filtrar apenas as mensalidades selecionadas
         try:
             ids_lista = [int(id.strip()) for id in mensalidades_ids.split(',') if id.strip()]
-            mensalidades = Mensalidade.objects.filter(
+            mensalidades = Mensalidade.objects.em_aberto().filter(
                 id__in=ids_lista,
-                associado=associado,
-                status='pendente'
+                associado=associado
             ).select_related('tipo').order_by('data_vencimento')
         except (ValueError, TypeError):
             messages.error(request, 'IDs de mensalidades inválidos.')
             return redirect('financeiro:mensalidade_associado_list', associado_id=associado_id)
     else:
         # Se não houver seleção, buscar todas as mensalidades pendentes
-        mensalidades = Mensalidade.objects.filter(
+        mensalidades = Mensalidade.objects.em_aberto().filter(
             associado=associado,
-            status='pendente',
             tipo__categoria='mensalidade'
         ).select_related('tipo').order_by('data_vencimento')
     
@@ -1239,6 +1215,7 @@ def gerar_carne_associado(request, associado_id):
     try:
         # Importar a função gerar_carne
         from app.utils.carne_generator import gerar_carne
+        from core.services.pdf import renderizar
         
         print(f"DEBUG: Gerando carnê para {len(mensalidades)} mensalidades")
         print(f"DEBUG: Primeira mensalidade: {mensalidades.first()}")
@@ -1270,10 +1247,12 @@ def gerar_carne_associado(request, associado_id):
         # Obter configuração de cobrança
         config_cobranca = ConfiguracaoCobranca.get_configuracao_unica()
         
-        pdf = gerar_carne(
+        # Renderização no pool de processos do serviço de PDF
+        pdf = renderizar(
+            gerar_carne,
             nome_associado=associado.nome,
             endereco=endereco_completo,
-            mensalidades_lista=mensalidades,
+            mensalidades_lista=list(mensalidades),
             config_cobranca=config_cobranca
         )
         
@@ -1452,4 +1431,126 @@ def gerar_parcela_unica(request, associado_id):
         return JsonResponse({
             'success': False,
             'error': f'Erro ao carregar dados: {str(e)}'
-        })
\ No newline at end of file
+        })
+
+
+# Conciliação bancária
+class ExtratoBancarioListView(LoginRequiredMixin, ListView):
+    """
+    Lista de extratos importados com o formulário de importação
+    """
+    model = ExtratoBancario
+    template_name = 'financeiro/extrato_list.html'
+    context_object_name = 'extratos'
+    paginate_by = 20
+    
+    def get_queryset(self):
+        return super().get_queryset().select_related('usuario_importacao')
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['form'] = kwargs.get('form') or ExtratoBancarioForm()
+        context['total_revisao'] = ItemExtrato.objects.filter(status='revisao').count()
+        return context
+
+
+@login_required
+def importar_extrato(request):
+    """
+    Importa um extrato bancário e concilia os créditos automaticamente
+    """
+    if request.method != 'POST':
+        return redirect('financeiro:extrato_list')
+    
+    form = ExtratoBancarioForm(request.POST, request.FILES)
+    if not form.is_valid():
+        for erro in form.non_field_errors():
+            messages.error(request, erro)
+        for campo, erros in form.errors.items():
+            if campo != '__all__':
+                messages.error(request, f'{form.fields[campo].label}: {" ".join(erros)}')
+        return redirect('financeiro:extrato_list')
+    
+    extrato = form.save(commit=False)
+    extrato.usuario_importacao = request.user
+    extrato.save()
+    
+    try:
+        resultado = conciliar_extrato(extrato, request.user)
+    except ValueError as e:
+        extrato.delete()
+        messages.error(request, f'Erro ao ler o extrato: {e}')
+        return redirect('financeiro:extrato_list')
+    
+    messages.success(
+        request,
+        f'Extrato importado: {resultado["conciliados"]} crédito(s) conciliado(s), '
+        f'{resultado["revisao"]} para revisão e {resultado["duplicados"]} duplicado(s) ignorado(s).'
+    )
+    if resultado['revisao']:
+        return redirect(f"{reverse_lazy('financeiro:conciliacao_revisao')}?extrato={extrato.pk}")
+    return redirect('financeiro:extrato_list')
+
+
+class ConciliacaoRevisaoListView(LoginRequiredMixin, ListView):
+    """
+    Fila de revisão dos créditos que não foram conciliados automaticamente
+    """
+    model = ItemExtrato
+    template_name = 'financeiro/conciliacao_revisao.html'
+    context_object_name = 'itens'
+    paginate_by = 50
+    
+    def get_queryset(self):
+        queryset = ItemExtrato.objects.filter(status='revisao').select_related('extrato')
+        extrato = self.request.GET.get('extrato')
+        if extrato and extrato.isdigit():
+            queryset = queryset.filter(extrato_id=extrato)
+        return queryset
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        sugerir_mensalidades(context['itens'])
+        context['extrato_id'] = self.request.GET.get('extrato', '')
+        return context
+
+
+@login_required
+def conciliar_item_extrato(request, pk):
+    """
+    Concilia manualmente um crédito da fila de revisão com uma mensalidade
+    """
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'message': 'Método não permitido.'}, status=405)
+    
+    item = get_object_or_404(ItemExtrato, pk=pk)
+    try:
+        mensalidade_id = int(request.POST.get('mensalidade_id', ''))
+    except ValueError:
+        return JsonResponse({'success': False, 'message': 'Informe o ID da mensalidade.'}, status=400)
+    
+    try:
+        conciliar_item_manual(item, mensalidade_id, request.user)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+    
+    return JsonResponse({'success': True, 'message': 'Crédito conciliado com sucesso!'})
+
+
+@login_required
+def ignorar_item_extrato(request, pk):
+    """
+    Retira um crédito da fila de revisão sem gerar pagamento
+    """
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'message': 'Método não permitido.'}, status=405)
+    
+    motivo = request.POST.get('motivo', '').strip() or 'Ignorado na revisão'
+    atualizados = ItemExtrato.objects.filter(pk=pk, status='revisao').update(
+        status='ignorado',
+        motivo=motivo[:200]
+    )
+    if not atualizados:
+        return JsonResponse({'success': False, 'message': 'Crédito não encontrado ou já tratado.'}, status=404)
+    
+    return JsonResponse({'success': True, 'message': 'Crédito ignorado.'})
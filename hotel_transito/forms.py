@@ -9,6 +9,8 @@ from .models import (
 )
 from datetime import timedelta
 
+from core.widgets import BuscaRemotaSelect
+
 
 class QuartoForm(ModelForm):
     """Formulário para cadastro e edição de quartos"""
@@ -106,7 +108,7 @@ class ReservaForm(ModelForm):
         ]
         widgets = {
             'quarto': forms.Select(attrs={'class': 'form-control'}),
-            'hospede': forms.Select(attrs={'class': 'form-control'}),
+            'hospede': BuscaRemotaSelect(fonte='hospedes', attrs={'class': 'form-control'}),
             'data_entrada': forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
             'data_saida': forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
             'hora_entrada': forms.TimeInput(attrs={'class': 'form-control', 'type': 'time'}),
@@ -166,7 +168,7 @@ class HospedagemForm(ModelForm):
         widgets = {
             'reserva': forms.Select(attrs={'class': 'form-control'}),
             'quarto': forms.Select(attrs={'class': 'form-control'}),
-            'hospede': forms.Select(attrs={'class': 'form-control'}),
+            'hospede': BuscaRemotaSelect(fonte='hospedes', attrs={'class': 'form-control'}),
             'data_entrada_real': forms.DateTimeInput(attrs={'class': 'form-control', 'type': 'datetime-local'}),
             'data_saida_real': forms.DateTimeInput(attrs={'class': 'form-control', 'type': 'datetime-local'}),
             'valor_diaria_real': forms.NumberInput(attrs={'class': 'form-control', 'step': '0.01'}),
@@ -1,8 +1,10 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 
+from core.services.sequencias import formatar_codigo, proximo_numero
+
 
 class Quarto(models.Model):
     """Modelo para cadastro de quartos do hotel de trânsito"""
@@ -189,13 +191,34 @@ class Reserva(models.Model):
     def __str__(self):
         return f"Reserva {self.codigo_reserva} - {self.hospede.nome_completo}"
     
+    @staticmethod
+    def gerar_codigo_reserva():
+        """
+        Gera o próximo código de reserva do ano (ex: RES-2025-00001).
+        
+        Chamado por save(), na mesma transação da gravação.
+        """
+        ano = timezone.localdate().year
+        return formatar_codigo('RES', proximo_numero('reserva', ano), ano)
+    
     def save(self, *args, **kwargs):
         # Calcular quantidade de diárias e valor total
         if self.data_entrada and self.data_saida:
             delta = self.data_saida - self.data_entrada
             self.quantidade_diarias = delta.days
             self.valor_total = self.valor_diaria * self.quantidade_diarias
-        super().save(*args, **kwargs)
+        
+        # Código e gravação na mesma transação (ver core.services.sequencias)
+        gerar = not self.codigo_reserva
+        try:
+            with transaction.atomic():
+                if gerar:
+                    self.codigo_reserva = self.gerar_codigo_reserva()
+                super().save(*args, **kwargs)
+        except Exception:
+            if gerar:
+                self.codigo_reserva = ''
+            raise
 
 
 class Hospedagem(models.Model):
@@ -290,10 +290,7 @@ class ReservaCreateView(LoginRequiredMixin, CreateView):
     success_url = reverse_lazy('hotel_transito:reserva_list')
     
     def form_valid(self, form):
-        # Gerar código único para a reserva
-        import uuid
-        form.instance.codigo_reserva = f"RES{uuid.uuid4().hex[:8].upper()}"
-        
+        # O código da reserva é gerado em Reserva.save()
         messages.success(self.request, 'Reserva criada com sucesso!')
         return super().form_valid(form)
 
@@ -1087,9 +1084,7 @@ def associado_reservar_quarto(request, quarto_id):
         valor_total = quarto.valor_diaria * quantidade_diarias
         
         # Criar reserva
-        import uuid
         reserva = Reserva.objects.create(
-            codigo_reserva=f"RES{uuid.uuid4().hex[:8].upper()}",
             quarto=quarto,
             hospede=hospede,
             data_entrada=data_entrada,
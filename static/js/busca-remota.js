@@ -0,0 +1,115 @@
+/**
+ * BUSCA REMOTA - Selects com opções carregadas sob demanda
+ * Complementa os widgets core.widgets.BuscaRemotaSelect/BuscaRemotaSelectMultiple:
+ * o select vem apenas com o valor selecionado e uma caixa de pesquisa consulta
+ * a URL em data-busca-remota à medida que o usuário digita.
+ */
+
+(function () {
+    'use strict';
+
+    var ATRASO_MS = 300;
+
+    function atualizarOpcoes(select, resultados) {
+        var mantidos = {};
+        Array.prototype.slice.call(select.options).forEach(function (opcao) {
+            if (opcao.value === '' || opcao.selected) {
+                mantidos[opcao.value] = true;
+            } else {
+                opcao.remove();
+            }
+        });
+
+        resultados.forEach(function (item) {
+            var valor = String(item.id);
+            if (!mantidos[valor]) {
+                select.add(new Option(item.text, valor));
+            }
+        });
+    }
+
+    function inicializar(select) {
+        if (select.dataset.buscaRemotaIniciada) {
+            return;
+        }
+        select.dataset.buscaRemotaIniciada = '1';
+
+        var campo = document.createElement('input');
+        campo.type = 'search';
+        campo.className = 'form-control form-control-sm mb-1';
+        campo.placeholder = select.dataset.placeholder || 'Digite para pesquisar...';
+        campo.autocomplete = 'off';
+        campo.setAttribute('aria-label', campo.placeholder);
+        select.parentNode.insertBefore(campo, select);
+
+        var minimo = parseInt(select.dataset.minimo || '2', 10);
+        var temporizador = null;
+        var controlador = null;
+
+        campo.addEventListener('input', function () {
+            clearTimeout(temporizador);
+            var termo = campo.value.trim();
+            if (termo.length < minimo) {
+                return;
+            }
+            temporizador = setTimeout(function () {
+                if (controlador) {
+                    controlador.abort();
+                }
+                controlador = window.AbortController ? new AbortController() : null;
+                var url = select.dataset.buscaRemota + '?q=' + encodeURIComponent(termo);
+                fetch(url, {
+                    credentials: 'same-origin',
+                    headers: {'X-Requested-With': 'XMLHttpRequest'},
+                    signal: controlador ? controlador.signal : undefined
+                })
+                    .then(function (resposta) { return resposta.json(); })
+                    .then(function (dados) {
+                        if (dados.success) {
+                            atualizarOpcoes(select, dados.results);
+                            if (!select.multiple && dados.results.length === 1 && !select.value) {
+                                select.value = String(dados.results[0].id);
+                                select.dispatchEvent(new Event('change', {bubbles: true}));
+                            }
+                        }
+                    })
+                    .catch(function (erro) {
+                        if (erro.name !== 'AbortError') {
+                            console.error('Erro na busca remota:', erro);
+                        }
+                    });
+            }, ATRASO_MS);
+        });
+    }
+
+    function inicializarEm(raiz) {
+        if (raiz.matches && raiz.matches('select[data-busca-remota]')) {
+            inicializar(raiz);
+        }
+        if (raiz.querySelectorAll) {
+            raiz.querySelectorAll('select[data-busca-remota]').forEach(inicializar);
+        }
+    }
+
+    function iniciar() {
+        inicializarEm(document);
+        // Formulários carregados depois (modais via AJAX)
+        new MutationObserver(function (mutacoes) {
+            mutacoes.forEach(function (mutacao) {
+                mutacao.addedNodes.forEach(function (no) {
+                    if (no.nodeType === 1) {
+                        inicializarEm(no);
+                    }
+                });
+            });
+        }).observe(document.body, {childList: true, subtree: true});
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', iniciar);
+    } else {
+        iniciar();
+    }
+
+    window.BuscaRemota = {inicializar: inicializarEm};
+})();